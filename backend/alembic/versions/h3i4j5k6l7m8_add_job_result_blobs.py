@@ -0,0 +1,30 @@
+"""add job_results.blobs for blob-store references
+
+Revision ID: h3i4j5k6l7m8
+Revises: g2h3i4j5k6l7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "h3i4j5k6l7m8"
+down_revision: Union[str, None] = "g2h3i4j5k6l7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "job_results",
+        sa.Column("blobs", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("job_results", "blobs")
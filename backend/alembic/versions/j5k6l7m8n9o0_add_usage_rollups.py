@@ -0,0 +1,54 @@
+"""add daily usage rollup tables and jobs.created_at index
+
+Revision ID: j5k6l7m8n9o0
+Revises: i4j5k6l7m8n9
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "j5k6l7m8n9o0"
+down_revision: Union[str, None] = "i4j5k6l7m8n9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_daily_rollups",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("jobs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pages", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("duration_seconds", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("timed_jobs", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day", "type", "status"),
+    )
+    op.create_index("ix_usage_daily_rollups_day", "usage_daily_rollups", ["day"])
+    op.create_table(
+        "usage_domain_daily",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("domain", sa.String(length=255), nullable=False),
+        sa.Column("pages", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day", "domain"),
+    )
+    op.create_index("ix_usage_domain_daily_day", "usage_domain_daily", ["day"])
+    op.create_index("ix_jobs_created_at", "jobs", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_created_at", table_name="jobs")
+    op.drop_index("ix_usage_domain_daily_day", table_name="usage_domain_daily")
+    op.drop_table("usage_domain_daily")
+    op.drop_index("ix_usage_daily_rollups_day", table_name="usage_daily_rollups")
+    op.drop_table("usage_daily_rollups")
@@ -0,0 +1,116 @@
+"""partition job_results, monitor_checks, webhook_deliveries, data_queries by month
+
+Each table is rebuilt as a RANGE-partitioned table on its timestamp column
+with monthly partitions ({table}_pYYYYMM) covering the existing rows and the
+next few months, plus a {table}_default catch-all. The primary key becomes
+(id, <timestamp>) because PostgreSQL requires the partition key in every
+unique constraint. Existing rows are copied, so this holds a lock on each
+table for the duration of its copy.
+
+Revision ID: k6l7m8n9o0p1
+Revises: j5k6l7m8n9o0
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "k6l7m8n9o0p1"
+down_revision: Union[str, None] = "j5k6l7m8n9o0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 3
+
+# table -> (partition key, foreign keys, indexes)
+TABLES = {
+    "job_results": (
+        "created_at",
+        [("job_id", "jobs", "CASCADE")],
+        [
+            ("ix_job_results_job_id", ["job_id"]),
+            ("ix_job_results_job_id_created_at_id", ["job_id", "created_at", "id"]),
+        ],
+    ),
+    "monitor_checks": (
+        "checked_at",
+        [("monitor_id", "monitors", "CASCADE")],
+        [("ix_monitor_checks_monitor_id", ["monitor_id"])],
+    ),
+    "webhook_deliveries": (
+        "created_at",
+        [("user_id", "users", "CASCADE"), ("job_id", "jobs", "SET NULL")],
+        [
+            ("ix_webhook_deliveries_user_id", ["user_id"]),
+            ("ix_webhook_deliveries_job_id", ["job_id"]),
+        ],
+    ),
+    "data_queries": (
+        "created_at",
+        [("user_id", "users", "CASCADE")],
+        [
+            ("ix_data_queries_user_id_created_at", ["user_id", "created_at"]),
+            ("ix_data_queries_platform_operation", ["platform", "operation"]),
+        ],
+    ),
+}
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _add_constraints(table: str, fks, indexes, pk: list[str]) -> None:
+    op.create_primary_key(f"{table}_pkey", table, pk)
+    for column, target, ondelete in fks:
+        op.create_foreign_key(
+            f"{table}_{column}_fkey", table, target, [column], ["id"], ondelete=ondelete
+        )
+    for name, columns in indexes:
+        op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+
+    for table, (key, fks, indexes) in TABLES.items():
+        old = f"{table}_unpartitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        op.execute(f"UPDATE {old} SET {key} = now() WHERE {key} IS NULL")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({key})"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {key} SET NOT NULL")
+
+        oldest = conn.execute(sa.text(f"SELECT min({key}) FROM {old}")).scalar()
+        month = oldest.date().replace(day=1) if oldest else this_month
+        while month <= _add_months(this_month, PREMAKE_MONTHS):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        op.execute(f"DROP TABLE {old}")
+        _add_constraints(table, fks, indexes, ["id", key])
+
+
+def downgrade() -> None:
+    for table, (_, fks, indexes) in TABLES.items():
+        old = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        op.execute(f"DROP TABLE {old} CASCADE")
+        _add_constraints(table, fks, indexes, ["id"])
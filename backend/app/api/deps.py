@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from fastapi import Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -5,7 +7,7 @@ from app.core.database import get_db
 from app.core.exceptions import AuthenticationError
 from app.core.security import decode_access_token
 from app.models.user import User
-from app.services.auth import get_user_by_api_key
+from app.services.auth import get_user_by_api_key, get_user_by_id
 
 
 async def get_current_user(
@@ -24,7 +26,11 @@ async def get_current_user(
         raise AuthenticationError("Invalid authorization format. Use: Bearer <token>")
 
     token = authorization[7:]  # Remove "Bearer "
+    return await authenticate_token(token, db)
+
 
+async def authenticate_token(token: str, db: AsyncSession) -> User:
+    """Resolve an API key or JWT to its user (served from the auth cache)."""
     # Check if it's an API key (starts with wh_)
     if token.startswith("wh_"):
         user = await get_user_by_api_key(db, token)
@@ -37,11 +43,7 @@ async def get_current_user(
     if not payload or "sub" not in payload:
         raise AuthenticationError("Invalid or expired token")
 
-    from sqlalchemy import select
-    from uuid import UUID
-
-    result = await db.execute(select(User).where(User.id == UUID(payload["sub"])))
-    user = result.scalar_one_or_none()
+    user = await get_user_by_id(db, UUID(payload["sub"]))
     if not user:
         raise AuthenticationError("User not found")
 
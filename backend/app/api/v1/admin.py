@@ -78,3 +78,17 @@ async def retry_dlq_task(task_id: str, _user=Depends(get_current_user)):
                 "task_name": task_name,
             }
     return {"success": False, "message": f"Task {task_id} not found in DLQ"}
+
+
+@router.get(
+    "/llm-cache/stats",
+    summary="LLM extraction cache statistics",
+    description="Hits, misses and tokens saved by the content-addressed LLM "
+    "chunk result cache.",
+    tags=["Admin"],
+)
+async def llm_cache_stats(_user=Depends(get_current_user)):
+    """Return LLM chunk cache counters."""
+    from app.services.llm_extract import get_llm_cache_stats
+
+    return await get_llm_cache_stats()
@@ -4,18 +4,18 @@ import io
 import json
 import logging
 import re
+import textwrap
 import zipfile
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Response
 from fastapi.responses import StreamingResponse, JSONResponse
-from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
-from app.core.exceptions import NotFoundError, RateLimitError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.exceptions import NotFoundError
+from app.core.rate_limiter import enforce_rate_limit
 from app.core.job_cache import (
     get_cached_response,
     set_cached_response,
@@ -23,7 +23,6 @@ from app.core.job_cache import (
 )
 from app.config import settings
 from app.models.job import Job
-from app.models.job_result import JobResult
 from app.models.user import User
 from app.schemas.crawl import (
     CrawlRequest,
@@ -33,6 +32,8 @@ from app.schemas.crawl import (
 )
 from app.schemas.scrape import PageMetadata
 from app.workers.crawl_worker import process_crawl
+from app.services.blob_store import hydrate_results, iter_hydrated
+from app.services.result_pages import LiveResults, cursor_of, select_results
 from app.services.quota import check_quota
 
 router = APIRouter()
@@ -103,6 +104,66 @@ def _build_result_dicts(results) -> list[dict]:
     return pages
 
 
+async def _json_array_chunks(pages):
+    """Encode an async iterable of dicts exactly as ``json.dumps(list,
+    indent=2)`` would, one element at a time."""
+    yield "["
+    first = True
+    async for page in pages:
+        yield ("\n" if first else ",\n") + textwrap.indent(
+            json.dumps(page, indent=2, ensure_ascii=False), "  "
+        )
+        first = False
+    yield "]" if first else "\n]"
+
+
+async def _csv_chunks(pages):
+    """CSV summary export, one row per page."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(
+        [
+            "url",
+            "title",
+            "status_code",
+            "word_count",
+            "reading_time_min",
+            "description",
+            "markdown_length",
+            "html_length",
+            "links_count",
+            "has_screenshot",
+            "product_name",
+            "product_price",
+            "product_brand",
+        ]
+    )
+    async for p in pages:
+        meta = p.get("metadata", {})
+        reading_secs = meta.get("reading_time_seconds", 0)
+        prod = meta.get("product_data") or {}
+        writer.writerow(
+            [
+                p["url"],
+                meta.get("title", ""),
+                meta.get("status_code", ""),
+                meta.get("word_count", ""),
+                round(reading_secs / 60, 1) if reading_secs else "",
+                meta.get("description", ""),
+                len(p.get("markdown", "")),
+                len(p.get("html", "")),
+                len(p.get("links", [])),
+                "yes" if p.get("screenshot_base64") else "no",
+                prod.get("name", ""),
+                prod.get("price", ""),
+                prod.get("brand", ""),
+            ]
+        )
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
 @router.post(
     "",
     response_model=CrawlStartResponse,
@@ -118,12 +179,12 @@ async def start_crawl(
 ):
     """Start an asynchronous crawl job."""
     # Rate limiting
-    rl = await check_rate_limit_full(f"rate:crawl:{user.id}", settings.RATE_LIMIT_CRAWL)
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Crawl rate limit exceeded. Try again in a minute.")
+    await enforce_rate_limit(
+        response,
+        f"rate:crawl:{user.id}",
+        settings.RATE_LIMIT_CRAWL,
+        "Crawl rate limit exceeded.",
+    )
 
     # Quota check
     await check_quota(db, user.id, "crawl")
@@ -165,6 +226,10 @@ async def get_crawl_status(
     job_id: str,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(
+        None,
+        description="Resume after this cursor (next_cursor of the previous page); overrides page",
+    ),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -174,8 +239,8 @@ async def get_crawl_status(
         raise NotFoundError("Crawl job not found")
 
     # Return cached response instantly for completed/failed jobs
+    cache_suffix = f"c{cursor}_pp{per_page}" if cursor else f"p{page}_pp{per_page}"
     if job.status in ("completed", "failed"):
-        cache_suffix = f"p{page}_pp{per_page}"
         cached = await get_cached_response(job_id, suffix=cache_suffix)
         if cached:
             return JSONResponse(content=json.loads(cached))
@@ -183,24 +248,11 @@ async def get_crawl_status(
     # Get paginated results (return partial results while still running)
     data = None
     total_results = 0
+    next_cursor = None
     if job.status in ("pending", "running", "completed", "started"):
-        # Count total results first (lightweight query)
-        count_result = await db.execute(
-            select(func.count())
-            .select_from(JobResult)
-            .where(JobResult.job_id == job.id)
-        )
-        total_results = count_result.scalar() or 0
-
-        offset = (page - 1) * per_page
-        result = await db.execute(
-            select(JobResult)
-            .where(JobResult.job_id == job.id)
-            .order_by(JobResult.created_at)
-            .offset(offset)
-            .limit(per_page)
-        )
-        results = result.scalars().all()
+        # The worker bumps completed_pages in the same commit as each
+        # result row, so it doubles as the result count
+        total_results = job.completed_pages or 0
 
         # Determine which formats the user originally requested
         requested_formats = set()
@@ -208,8 +260,25 @@ async def get_crawl_status(
             scrape_opts = job.config.get("scrape_options") or {}
             requested_formats = set(scrape_opts.get("formats", []))
 
+        # html/screenshot are only flagged as available, so they are never
+        # loaded; markdown and links only when they are returned
+        load = {
+            fmt for fmt in ("markdown", "links")
+            if not requested_formats or fmt in requested_formats
+        }
+        query = select_results(job.id, load, after=cursor).limit(per_page)
+        if not cursor:
+            query = query.offset((page - 1) * per_page)
+        rows = (await db.execute(query)).all()
+        results = [row[0] for row in rows]
+        if "markdown" in load:
+            await hydrate_results(results, fields=("markdown",))
+        if len(results) == per_page:
+            next_cursor = cursor_of(results[-1])
+
         data = []
-        for r in results:
+        for r, has_html, has_screenshot in rows:
+            blobs = r.blobs or {}
             page_metadata = None
             structured_data = None
             headings = None
@@ -262,10 +331,10 @@ async def get_crawl_status(
                     id=str(r.id),
                     url=r.url,
                     markdown=r.markdown if not requested_formats or "markdown" in requested_formats else None,
-                    html="available" if r.html else None,
+                    html="available" if has_html or "html" in blobs else None,
                     links=r.links if not requested_formats or "links" in requested_formats else None,
                     links_detail=links_detail if not requested_formats or "links" in requested_formats else None,
-                    screenshot="available" if r.screenshot_url else None,
+                    screenshot="available" if has_screenshot or "screenshot_url" in blobs else None,
                     structured_data=structured_data if not requested_formats or "structured_data" in requested_formats else None,
                     headings=headings if not requested_formats or "headings" in requested_formats else None,
                     images=images if not requested_formats or "images" in requested_formats else None,
@@ -291,12 +360,12 @@ async def get_crawl_status(
         total_results=total_results,
         page=page,
         per_page=per_page,
+        next_cursor=next_cursor,
         error=job.error,
     )
 
     # Cache completed/failed jobs for instant subsequent loads
     if job.status in ("completed", "failed"):
-        cache_suffix = f"p{page}_pp{per_page}"
         await set_cached_response(
             job_id, response_obj.model_dump(), suffix=cache_suffix
         )
@@ -343,23 +412,21 @@ async def export_crawl(
     if not job or job.user_id != user.id:
         raise NotFoundError("Crawl job not found")
 
-    result = await db.execute(
-        select(JobResult)
-        .where(JobResult.job_id == job.id)
-        .order_by(JobResult.created_at)
-    )
+    result = await db.execute(select_results(job.id))
     results = result.scalars().all()
 
     if not results:
         raise NotFoundError("No results to export")
 
-    pages = _build_result_dicts(results)
     short_id = job_id[:8]
 
+    async def iter_pages():
+        async for r in iter_hydrated(results):
+            yield _build_result_dicts([r])[0]
+
     if format == "json":
-        content = json.dumps(pages, indent=2, ensure_ascii=False)
         return StreamingResponse(
-            io.BytesIO(content.encode("utf-8")),
+            _json_array_chunks(iter_pages()),
             media_type="application/json",
             headers={
                 "Content-Disposition": f'attachment; filename="crawl-{short_id}.json"'
@@ -367,48 +434,8 @@ async def export_crawl(
         )
 
     if format == "csv":
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(
-            [
-                "url",
-                "title",
-                "status_code",
-                "word_count",
-                "reading_time_min",
-                "description",
-                "markdown_length",
-                "html_length",
-                "links_count",
-                "has_screenshot",
-                "product_name",
-                "product_price",
-                "product_brand",
-            ]
-        )
-        for p in pages:
-            meta = p.get("metadata", {})
-            reading_secs = meta.get("reading_time_seconds", 0)
-            prod = meta.get("product_data") or {}
-            writer.writerow(
-                [
-                    p["url"],
-                    meta.get("title", ""),
-                    meta.get("status_code", ""),
-                    meta.get("word_count", ""),
-                    round(reading_secs / 60, 1) if reading_secs else "",
-                    meta.get("description", ""),
-                    len(p.get("markdown", "")),
-                    len(p.get("html", "")),
-                    len(p.get("links", [])),
-                    "yes" if p.get("screenshot_base64") else "no",
-                    prod.get("name", ""),
-                    prod.get("price", ""),
-                    prod.get("brand", ""),
-                ]
-            )
         return StreamingResponse(
-            io.BytesIO(buf.getvalue().encode("utf-8")),
+            _csv_chunks(iter_pages()),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f'attachment; filename="crawl-{short_id}.csv"'
@@ -420,12 +447,12 @@ async def export_crawl(
     with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
         # Write index.json with summary (no heavy content)
         index = []
-        for i, p in enumerate(pages):
-            meta = p.get("metadata", {})
+        for i, r in enumerate(results):
+            meta = r.metadata_ or {}
             index.append(
                 {
                     "index": i + 1,
-                    "url": p["url"],
+                    "url": r.url,
                     "title": meta.get("title", ""),
                     "status_code": meta.get("status_code", ""),
                     "word_count": meta.get("word_count", 0),
@@ -433,8 +460,10 @@ async def export_crawl(
             )
         zf.writestr("index.json", json.dumps(index, indent=2, ensure_ascii=False))
 
-        for i, p in enumerate(pages):
-            folder = f"{i + 1:03d}_{_sanitize_filename(p['url'])}"
+        i = 0
+        async for p in iter_pages():
+            i += 1
+            folder = f"{i:03d}_{_sanitize_filename(p['url'])}"
 
             # Markdown file
             if p.get("markdown"):
@@ -470,8 +499,10 @@ async def export_crawl(
                 json.dumps(page_meta, indent=2, ensure_ascii=False),
             )
 
-        # Full data JSON as well
-        zf.writestr("full_data.json", json.dumps(pages, indent=2, ensure_ascii=False))
+        # Full data JSON as well — a second pass, written as it is read
+        with zf.open("full_data.json", "w") as full:
+            async for chunk in _json_array_chunks(iter_pages()):
+                full.write(chunk.encode("utf-8"))
 
     buf.seek(0)
     return StreamingResponse(
@@ -501,15 +532,11 @@ async def stream_crawl_results(
 
     # Pre-fetch all current results for completed jobs (fast path)
     if job.status in ("completed", "failed"):
-        result = await db.execute(
-            select(JobResult)
-            .where(JobResult.job_id == job.id)
-            .order_by(JobResult.created_at)
-        )
+        result = await db.execute(select_results(job.id))
         all_results = result.scalars().all()
 
         async def completed_gen():
-            for r in all_results:
+            async for r in iter_hydrated(all_results):
                 meta = dict(r.metadata_) if r.metadata_ else {}
                 item = {
                     "url": r.url,
@@ -541,20 +568,14 @@ async def stream_crawl_results(
 
     # For running jobs, poll for new results
     async def live_gen():
-        last_count = 0
+        live = LiveResults(job.id)
         max_idle = 60  # Stop after 60s of no new results
         idle = 0
         while idle < max_idle:
-            result = await db.execute(
-                select(JobResult)
-                .where(JobResult.job_id == job.id)
-                .order_by(JobResult.created_at)
-                .offset(last_count)
-                .limit(50)
-            )
-            new_results = result.scalars().all()
+            new_results = await live.poll(db, limit=50)
 
             if new_results:
+                await hydrate_results(new_results)
                 idle = 0
                 for r in new_results:
                     meta = dict(r.metadata_) if r.metadata_ else {}
@@ -578,7 +599,6 @@ async def stream_crawl_results(
                     if r.extract:
                         item["extract"] = r.extract
                     yield item
-                    last_count += 1
             else:
                 idle += 1
                 # Check if job finished
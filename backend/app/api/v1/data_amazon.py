@@ -12,8 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.config import settings
 from app.core.database import get_db
-from app.core.exceptions import RateLimitError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.rate_limiter import enforce_rate_limit
 from app.models.user import User
 from app.services.data_persistence import save_data_query
 from app.schemas.data_amazon import (
@@ -48,14 +47,12 @@ async def search_amazon_products(
 ):
     """Search Amazon and return structured product data."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await amazon_products(
         query=request.query,
@@ -19,8 +19,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.config import settings
 from app.core.database import get_db
-from app.core.exceptions import BadRequestError, RateLimitError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.exceptions import BadRequestError
+from app.core.rate_limiter import enforce_rate_limit
 from app.models.user import User
 from app.services.data_persistence import save_data_query
 from app.schemas.data_google import (
@@ -75,14 +75,12 @@ async def search_google(
 ):
     """Search Google and return structured SERP data."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_search(
         query=request.query,
@@ -132,14 +130,12 @@ async def search_google_shopping(
 ):
     """Search Google Shopping with filters and return structured product data."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_shopping(
         query=request.query,
@@ -196,14 +192,12 @@ async def search_google_maps(
         )
 
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_maps(
         query=request.query,
@@ -266,14 +260,12 @@ async def search_google_news(
 ):
     """Search Google News and return structured article data."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_news(
         query=request.query,
@@ -323,14 +315,12 @@ async def search_google_jobs(
 ):
     """Search Google Careers and return structured job listing data."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_jobs(
         query=request.query,
@@ -385,14 +375,12 @@ async def search_google_images(
 ):
     """Search Google Images and return structured image data."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_images(
         query=request.query,
@@ -454,14 +442,12 @@ async def search_google_flights(
         raise BadRequestError("Each lap infant requires at least one adult.")
 
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     result = await google_flights(
         origin=request.origin,
@@ -519,14 +505,12 @@ async def search_google_finance(
 ):
     """Get Google Finance market overview or stock quote."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:data:{user.id}", settings.RATE_LIMIT_DATA_API
+    await enforce_rate_limit(
+        response,
+        f"rate:data:{user.id}",
+        settings.RATE_LIMIT_DATA_API,
+        "Data API rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Data API rate limit exceeded. Try again in a minute.")
 
     if request.query:
         result = await google_finance_quote(
@@ -5,12 +5,11 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import authenticate_token
 from app.core.database import get_db, async_session
 from app.core.exceptions import AuthenticationError, NotFoundError
-from app.core.security import decode_access_token
 from app.models.job import Job
 from app.models.user import User
 
@@ -22,24 +21,7 @@ async def _get_user_from_token(token: str, db: AsyncSession) -> User:
     """Authenticate via query-param token (needed for EventSource which can't set headers)."""
     if not token:
         raise AuthenticationError("Missing token")
-
-    if token.startswith("wh_"):
-        from app.services.auth import get_user_by_api_key
-
-        user = await get_user_by_api_key(db, token)
-        if not user:
-            raise AuthenticationError("Invalid API key")
-        return user
-
-    payload = decode_access_token(token)
-    if not payload or "sub" not in payload:
-        raise AuthenticationError("Invalid or expired token")
-
-    result = await db.execute(select(User).where(User.id == UUID(payload["sub"])))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise AuthenticationError("User not found")
-    return user
+    return await authenticate_token(token, db)
 
 
 @router.get("/jobs/{job_id}/events")
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.core.exceptions import BadRequestError, NotFoundError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.rate_limiter import enforce_rate_limit
 from app.config import settings
 from app.models.job import Job
 from app.models.job_result import JobResult
@@ -24,7 +24,7 @@ from app.schemas.extract import (
     ExtractStatusResponse,
 )
 from app.services.llm_extract import extract_with_llm
-from app.services.quota import check_quota, increment_usage
+from app.services.quota import check_quota, refund_usage, reserve_quota
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -50,16 +50,12 @@ async def extract(
     3. **Multi URL**: Pass `urls` to scrape + extract asynchronously (returns job_id)
     """
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:extract:{user.id}", settings.RATE_LIMIT_SCRAPE
+    await enforce_rate_limit(
+        response,
+        f"rate:extract:{user.id}",
+        settings.RATE_LIMIT_SCRAPE,
+        "Extract rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        from app.core.exceptions import RateLimitError
-
-        raise RateLimitError("Extract rate limit exceeded. Try again in a minute.")
 
     # Validate input
     if (
@@ -72,14 +68,28 @@ async def extract(
     if not request.prompt and not request.schema_:
         raise BadRequestError("Provide at least one of: prompt or schema")
 
-    # Check quota
-    await check_quota(db, user.id, "extract")
-
     # Mode 3: Multi-URL async extraction
     if request.urls and len(request.urls) > 1:
+        await check_quota(db, user.id, "extract")
         return await _start_async_extract(request, user, db)
 
-    # Modes 1 & 2: Synchronous extraction
+    # Modes 1 & 2: charge the quota up front, refunded unless extraction succeeds
+    await reserve_quota(db, user.id, "extract")
+    resp = None
+    try:
+        resp = await _extract_sync(request, user, db)
+    finally:
+        if resp is None or not resp.success:
+            await refund_usage(db, user.id, "extract")
+    return resp
+
+
+async def _extract_sync(
+    request: ExtractRequest,
+    user: User,
+    db: AsyncSession,
+) -> ExtractResponse:
+    """Modes 1 & 2: extract from the given content, or scrape the URL first."""
     content = request.content or ""
 
     # If HTML provided, convert to markdown
@@ -156,8 +166,6 @@ async def extract(
             provider=request.provider,
         )
 
-        # Increment usage
-        await increment_usage(db, user.id, "extract")
         await db.commit()
 
         return ExtractResponse(
@@ -12,6 +12,7 @@ from app.core.exceptions import BadRequestError, NotFoundError
 from app.models.job import Job
 from app.models.job_result import JobResult
 from app.models.user import User
+from app.services.blob_store import hydrate_results
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -43,6 +44,7 @@ async def get_job_result_detail(
     r = result.scalar_one_or_none()
     if not r:
         raise NotFoundError("Result not found")
+    await hydrate_results([r])
 
     # Build full response with all content
     structured_data = None
@@ -11,8 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
-from app.core.exceptions import NotFoundError, RateLimitError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.exceptions import NotFoundError
+from app.core.rate_limiter import enforce_rate_limit
 from app.core.job_cache import get_cached_response, set_cached_response
 from app.config import settings
 from app.models.job import Job
@@ -40,12 +40,12 @@ async def map_site(
 ):
     """Map all URLs on a website. Returns discovered URLs with titles and descriptions."""
     # Rate limiting
-    rl = await check_rate_limit_full(f"rate:map:{user.id}", settings.RATE_LIMIT_MAP)
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Map rate limit exceeded. Try again in a minute.")
+    await enforce_rate_limit(
+        response,
+        f"rate:map:{user.id}",
+        settings.RATE_LIMIT_MAP,
+        "Map rate limit exceeded.",
+    )
 
     # Cross-user cache check — return instantly if another user already mapped this
     cached = await get_cached_map(
@@ -130,6 +130,68 @@ async def get_map_status(
     return response_data
 
 
+async def _final_map_links(db: AsyncSession, job: Job) -> list:
+    """Links stored on the job's result row once the map has finished."""
+    result = await db.execute(
+        select(JobResult)
+        .where(JobResult.job_id == job.id)
+        .order_by(JobResult.created_at)
+    )
+    links = []
+    for r in result.scalars().all():
+        if r.links:
+            links = r.links
+    return links
+
+
+@router.get(
+    "/{job_id}/stream",
+    summary="Stream map results as NDJSON",
+    description="Stream discovered URLs in real-time as newline-delimited JSON while the map job runs.",
+)
+async def stream_map_results(
+    job_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream map links as NDJSON, relaying them live while the job runs."""
+    import asyncio
+    from app.core.redis import redis_client
+    from app.services.streaming import ndjson_stream
+
+    job = await db.get(Job, UUID(job_id))
+    if not job or job.user_id != user.id or job.type != "map":
+        raise NotFoundError("Map job not found")
+
+    async def links_gen():
+        sent = 0
+        idle = 0
+        max_idle = 120  # Stop after 60s of no new links
+        key = f"map:{job_id}:links"
+        while job.status not in ("completed", "failed", "cancelled") and idle < max_idle:
+            raw = await redis_client.lrange(key, sent, -1) or []
+            if raw:
+                idle = 0
+                for item in raw:
+                    yield json.loads(item)
+                sent += len(raw)
+                continue
+            idle += 1
+            await db.refresh(job)
+            if job.status not in ("completed", "failed", "cancelled"):
+                await asyncio.sleep(0.5)
+
+        # The stored result is authoritative (and the only source for cache hits)
+        for link in (await _final_map_links(db, job))[sent:]:
+            yield link
+
+    return StreamingResponse(
+        ndjson_stream(links_gen()),
+        media_type="application/x-ndjson",
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
+
+
 @router.get(
     "/{job_id}/export",
     summary="Export map results",
@@ -146,18 +208,7 @@ async def export_map(
     if not job or job.user_id != user.id or job.type != "map":
         raise NotFoundError("Map job not found")
 
-    result = await db.execute(
-        select(JobResult)
-        .where(JobResult.job_id == job.id)
-        .order_by(JobResult.created_at)
-    )
-    results = result.scalars().all()
-
-    links = []
-    for r in results:
-        if r.links:
-            links = r.links
-
+    links = await _final_map_links(db, job)
     if not links:
         raise NotFoundError("No results to export")
 
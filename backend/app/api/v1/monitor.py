@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.core.exceptions import BadRequestError, NotFoundError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.rate_limiter import enforce_rate_limit
 from app.models.monitor import Monitor, MonitorCheck
 from app.models.user import User
 from app.schemas.monitor import (
@@ -22,7 +22,7 @@ from app.schemas.monitor import (
     MonitorCheckResult,
     MonitorHistoryResponse,
 )
-from app.services.quota import check_quota, increment_usage
+from app.services.quota import reserve_quota
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -62,17 +62,12 @@ async def create_monitor(
 ):
     """Create a new URL monitor for change tracking."""
     # Rate limit
-    rl = await check_rate_limit_full(f"rate:monitor:{user.id}", 30)
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        from app.core.exceptions import RateLimitError
-
-        raise RateLimitError("Monitor creation rate limit exceeded.")
-
-    # Check quota
-    await check_quota(db, user.id, "monitor")
+    await enforce_rate_limit(
+        response,
+        f"rate:monitor:{user.id}",
+        30,
+        "Monitor creation rate limit exceeded.",
+    )
 
     # Validate interval
     if request.check_interval_minutes < 5:
@@ -104,6 +99,9 @@ async def create_monitor(
     if active_count >= 100:
         raise BadRequestError("Maximum 100 active monitors per account")
 
+    # Check and charge the quota in one step, once the request is valid
+    await reserve_quota(db, user.id, "monitor")
+
     now = datetime.now(timezone.utc)
     monitor = Monitor(
         user_id=user.id,
@@ -122,8 +120,6 @@ async def create_monitor(
         next_check_at=now,  # Check immediately on creation
     )
     db.add(monitor)
-
-    await increment_usage(db, user.id, "monitor")
     await db.flush()
 
     # Trigger initial check
@@ -278,6 +278,7 @@ async def delete_schedule(
         raise NotFoundError("Schedule not found")
 
     await db.delete(schedule)
+    await db.flush()
     return {"success": True, "message": "Schedule deleted"}
 
 
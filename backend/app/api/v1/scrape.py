@@ -5,6 +5,7 @@ import io
 import json
 import logging
 import re
+import time
 import zipfile
 from datetime import datetime, timezone
 from uuid import UUID
@@ -17,8 +18,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.core.exceptions import BadRequestError, NotFoundError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.rate_limiter import enforce_rate_limit
 from app.core.metrics import scrape_requests_total
+from app.core.stage_timing import db_write, observe_cache_lookup
 from app.core.job_cache import get_cached_response, set_cached_response
 from app.core.cache import get_cached_scrape
 from app.config import settings
@@ -26,22 +28,26 @@ from app.models.job import Job
 from app.models.job_result import JobResult
 from app.models.user import User
 from app.schemas.scrape import ScrapeRequest, ScrapeResponse, ScrapeData, PageMetadata
+from app.services.blob_store import hydrate_results, offload_result
 from app.services.scraper import scrape_url, classify_error
 from app.services.llm_extract import extract_with_llm
-from app.services.quota import check_quota, increment_usage
+from app.services.memory_adaptive import MemoryAdaptiveSemaphore
+from app.services.quota import increment_usage, refund_usage, reserve_quota
+from app.services.resource_governor import governor
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Global concurrency limiter — prevents OOM when many requests arrive simultaneously.
 # Requests beyond this limit wait in queue instead of all running at once.
-_scrape_semaphore: asyncio.Semaphore | None = None
+# The resource governor moves the limit with memory pressure.
+_scrape_semaphore: MemoryAdaptiveSemaphore | None = None
 
 
-def _get_scrape_semaphore() -> asyncio.Semaphore:
+def _get_scrape_semaphore() -> MemoryAdaptiveSemaphore:
     global _scrape_semaphore
     if _scrape_semaphore is None:
-        _scrape_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_SCRAPES)
+        _scrape_semaphore = governor.limiter("api_scrape", settings.MAX_CONCURRENT_SCRAPES)
     return _scrape_semaphore
 
 
@@ -119,16 +125,12 @@ async def scrape(
 ):
     """Scrape a single URL and return content in requested formats."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:scrape:{user.id}", settings.RATE_LIMIT_SCRAPE
+    await enforce_rate_limit(
+        response,
+        f"rate:scrape:{user.id}",
+        settings.RATE_LIMIT_SCRAPE,
+        "Scrape rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        from app.core.exceptions import RateLimitError
-
-        raise RateLimitError("Scrape rate limit exceeded. Try again in a minute.")
 
     # API-level cache check — return instantly without job/quota/semaphore
     use_cache = (
@@ -137,14 +139,13 @@ async def scrape(
         and not request.extract
     )
     if use_cache:
+        _lookup_start = time.perf_counter()
         cached = await get_cached_scrape(request.url, request.formats)
+        observe_cache_lookup("scrape", bool(cached), time.perf_counter() - _lookup_start)
         if cached:
             scrape_requests_total.labels(status="success").inc()
             return ScrapeResponse(success=True, data=ScrapeData(**cached))
 
-    # Quota check
-    await check_quota(db, user.id, "scrape")
-
     # Create job record
     job = Job(
         user_id=user.id,
@@ -157,6 +158,9 @@ async def scrape(
     db.add(job)
     await db.flush()
 
+    # Charge the quota up front; refunded below unless the scrape succeeds
+    await reserve_quota(db, user.id, "scrape")
+
     try:
         # Load proxy manager if use_proxy is set
         proxy_manager = None
@@ -242,7 +246,12 @@ async def scrape(
             metadata_=metadata_dict,
             screenshot_url=result.screenshot if not _req_fmts or "screenshot" in _req_fmts else None,
         )
+        await offload_result(job_result)
         db.add(job_result)
+        with db_write("scrape_result") as write:
+            await db.flush()
+        if result.metadata and result.metadata.timings is not None:
+            result.metadata.timings["db_write_ms"] = round(write.seconds * 1000, 2)
 
         # Check if we actually got any content
         has_content = any(
@@ -260,7 +269,7 @@ async def scrape(
             job.completed_pages = 1
             job.completed_at = datetime.now(timezone.utc)
             scrape_requests_total.labels(status="success").inc()
-            await increment_usage(db, user.id, "scrape", pages=1)
+            await increment_usage(db, user.id, "scrape", count=0, pages=1)
             resp = ScrapeResponse(success=True, data=result, job_id=str(job.id))
         else:
             job.status = "failed"
@@ -339,6 +348,9 @@ async def scrape(
         return ScrapeResponse(
             success=False, error=str(e), error_code=error_code, job_id=str(job.id)
         )
+    finally:
+        if job.status != "completed":
+            await refund_usage(db, user.id, "scrape")
 
 
 @router.get(
@@ -368,6 +380,7 @@ async def get_scrape_status(
         .order_by(JobResult.created_at)
     )
     results = result.scalars().all()
+    await hydrate_results(results)
 
     # Determine which formats the user originally requested
     requested_formats = set()
@@ -498,6 +511,7 @@ async def export_scrape(
     if not results:
         raise NotFoundError("No results to export")
 
+    await hydrate_results(results)
     pages = _build_result_dicts(results)
     short_id = job_id[:8]
 
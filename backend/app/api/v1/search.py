@@ -14,8 +14,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
-from app.core.exceptions import NotFoundError, RateLimitError
-from app.core.rate_limiter import check_rate_limit_full
+from app.core.exceptions import NotFoundError
+from app.core.rate_limiter import enforce_rate_limit
 from app.core.metrics import search_jobs_total
 from app.core.job_cache import get_cached_response, set_cached_response
 from app.config import settings
@@ -30,6 +30,8 @@ from app.schemas.search import (
 )
 from app.schemas.scrape import PageMetadata
 from app.workers.search_worker import process_search
+from app.services.blob_store import hydrate_results
+from app.services.result_pages import HEAVY_COLUMNS, select_results
 from app.services.quota import check_quota
 
 router = APIRouter()
@@ -90,14 +92,12 @@ async def start_search(
 ):
     """Search the web and scrape top results."""
     # Rate limiting
-    rl = await check_rate_limit_full(
-        f"rate:search:{user.id}", settings.RATE_LIMIT_SEARCH
+    await enforce_rate_limit(
+        response,
+        f"rate:search:{user.id}",
+        settings.RATE_LIMIT_SEARCH,
+        "Search rate limit exceeded.",
     )
-    response.headers["X-RateLimit-Limit"] = str(rl.limit)
-    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-    response.headers["X-RateLimit-Reset"] = str(rl.reset)
-    if not rl.allowed:
-        raise RateLimitError("Search rate limit exceeded. Try again in a minute.")
 
     # Quota check
     await check_quota(db, user.id, "search")
@@ -156,18 +156,22 @@ async def get_search_status(
 
     data = None
     if job.status in ("pending", "running", "completed"):
-        result = await db.execute(
-            select(JobResult)
-            .where(JobResult.job_id == job.id)
-            .order_by(JobResult.created_at)
-        )
-        results = result.scalars().all()
-
         # Determine which formats the user originally requested
         requested_formats = set()
         if job.config:
             requested_formats = set(job.config.get("formats", []))
 
+        # Unrequested payload columns are never read, so don't load them
+        load = {
+            fmt for fmt in HEAVY_COLUMNS
+            if not requested_formats or fmt in requested_formats
+        }
+        result = await db.execute(select_results(job.id, load))
+        results = result.scalars().all()
+        await hydrate_results(
+            results, fields=[HEAVY_COLUMNS[fmt].key for fmt in load if fmt != "links"]
+        )
+
         data = []
         for r in results:
             meta = r.metadata_ or {}
@@ -263,6 +267,7 @@ async def export_search(
     if not results:
         raise NotFoundError("No results to export")
 
+    await hydrate_results(results)
     pages = _build_search_dicts(results)
     short_id = job_id[:8]
 
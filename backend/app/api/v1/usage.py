@@ -1,18 +1,16 @@
 """Usage tracking and analytics endpoints."""
 
 import logging
-from datetime import datetime, timezone, timedelta
-from urllib.parse import urlparse
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, func, or_, text
+from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.models.job import Job
-from app.models.job_result import JobResult
 from app.models.user import User
+from app.services import usage_rollup
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -28,101 +26,9 @@ async def get_usage_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Aggregate usage statistics for the current user."""
-    # Total jobs
-    total_jobs_q = await db.execute(
-        select(func.count(Job.id)).where(Job.user_id == user.id)
+    return await usage_rollup.cached(
+        user.id, "stats", lambda: usage_rollup.usage_stats(db, user.id)
     )
-    total_jobs = total_jobs_q.scalar() or 0
-
-    # Jobs by type
-    type_q = await db.execute(
-        select(Job.type, func.count(Job.id))
-        .where(Job.user_id == user.id)
-        .group_by(Job.type)
-    )
-    jobs_by_type = dict(type_q.all())
-
-    # Jobs by status
-    status_q = await db.execute(
-        select(Job.status, func.count(Job.id))
-        .where(Job.user_id == user.id)
-        .group_by(Job.status)
-    )
-    jobs_by_status = dict(status_q.all())
-
-    # Total pages scraped
-    pages_q = await db.execute(
-        select(func.sum(Job.completed_pages)).where(Job.user_id == user.id)
-    )
-    total_pages = pages_q.scalar() or 0
-
-    # Average pages per job
-    avg_pages_q = await db.execute(
-        select(func.avg(Job.completed_pages)).where(
-            Job.user_id == user.id, Job.status == "completed"
-        )
-    )
-    avg_pages = round(float(avg_pages_q.scalar() or 0), 1)
-
-    # Average duration (seconds) for completed jobs
-    avg_duration = 0
-    completed_with_times = await db.execute(
-        select(Job.started_at, Job.completed_at).where(
-            Job.user_id == user.id,
-            Job.status == "completed",
-            Job.started_at.isnot(None),
-            Job.completed_at.isnot(None),
-        )
-    )
-    durations = []
-    for started, completed in completed_with_times.all():
-        if started and completed:
-            durations.append((completed - started).total_seconds())
-    if durations:
-        avg_duration = round(sum(durations) / len(durations), 1)
-
-    # Success rate
-    completed_count = jobs_by_status.get("completed", 0)
-    failed_count = jobs_by_status.get("failed", 0)
-    success_rate = 0
-    if completed_count + failed_count > 0:
-        success_rate = round(
-            completed_count / (completed_count + failed_count) * 100, 1
-        )
-
-    # Jobs per day (last 30 days)
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    daily_q = await db.execute(
-        select(
-            func.date_trunc("day", Job.created_at).label("day"),
-            func.count(Job.id).label("count"),
-        )
-        .where(Job.user_id == user.id, Job.created_at >= thirty_days_ago)
-        .group_by(text("day"))
-        .order_by(text("day"))
-    )
-    jobs_per_day = [
-        {
-            "date": (
-                row.day.isoformat()
-                if hasattr(row.day, "isoformat")
-                else (str(row.day) if row.day else "")
-            ),
-            "count": row.count,
-        }
-        for row in daily_q.all()
-    ]
-
-    return {
-        "total_jobs": total_jobs,
-        "total_pages_scraped": total_pages,
-        "avg_pages_per_job": avg_pages,
-        "avg_duration_seconds": avg_duration,
-        "success_rate": success_rate,
-        "jobs_by_type": jobs_by_type,
-        "jobs_by_status": jobs_by_status,
-        "jobs_per_day": jobs_per_day,
-    }
 
 
 @router.get(
@@ -159,10 +65,16 @@ async def get_usage_history(
             )
         )
 
-    # Count total
-    count_q = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_q)
-    total = total_result.scalar() or 0
+    # Count total. Rollups can't answer this: they keep deleted and expired
+    # jobs, while the listing pages over rows that still exist.
+    async def _count():
+        count_q = select(func.count()).select_from(query.subquery())
+        return {"total": (await db.execute(count_q)).scalar() or 0}
+
+    counted = await usage_rollup.cached(
+        user.id, f"history_total:{type}:{status}:{search}", _count
+    )
+    total = counted["total"]
 
     # Sort
     sort_col = getattr(Job, sort_by, Job.created_at)
@@ -219,37 +131,9 @@ async def get_top_domains(
     limit: int = Query(20, ge=1, le=100),
 ):
     """Top most scraped domains from job results."""
-    # Get all URLs from job results for this user's jobs
-    result = await db.execute(
-        select(JobResult.url)
-        .join(Job, JobResult.job_id == Job.id)
-        .where(Job.user_id == user.id)
+    return await usage_rollup.cached(
+        user.id, f"top_domains:{limit}", lambda: usage_rollup.top_domains(db, user.id, limit)
     )
-    urls = [row[0] for row in result.all()]
-
-    # Count domains
-    domain_counts: dict[str, int] = {}
-    for url in urls:
-        try:
-            domain = urlparse(url).netloc
-            if domain.startswith("www."):
-                domain = domain[4:]
-            if domain:
-                domain_counts[domain] = domain_counts.get(domain, 0) + 1
-        except Exception:
-            continue
-
-    # Sort by count and return top N
-    sorted_domains = sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)[
-        :limit
-    ]
-
-    return {
-        "domains": [
-            {"domain": domain, "count": count} for domain, count in sorted_domains
-        ],
-        "total_unique_domains": len(domain_counts),
-    }
 
 
 @router.get(
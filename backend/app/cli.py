@@ -8,6 +8,8 @@ Usage:
     python -m app.cli crawl https://example.com --max-pages 50 --max-depth 2
     python -m app.cli crawl https://example.com --strategy dfs
     python -m app.cli map https://example.com
+    python -m app.cli -o text importtime
+    python -m app.cli -o text importtime --queue crawl --top 30
 """
 
 import argparse
@@ -206,6 +208,51 @@ async def _cmd_map(args):
     print(f"\nFound {len(urls)} URLs in sitemap", file=sys.stderr)
 
 
+def _cmd_importtime(args) -> int:
+    """Profile cold-import cost per module (like python -X importtime)."""
+    from app.config import settings
+    from app.core.startup import QUEUE_PRELOADS, profile_imports
+
+    modules = list(args.modules)
+    if args.queue:
+        modules += ["app.workers.celery_app", *QUEUE_PRELOADS[args.queue]]
+    modules = modules or ["app.main"]
+    budget_ms = settings.STARTUP_IMPORT_BUDGET_MS if args.budget_ms is None else args.budget_ms
+
+    print(f"Importing {', '.join(modules)}...", file=sys.stderr)
+    timings = profile_imports(modules)
+    total_ms = sum(t.self_us for t in timings) / 1000
+    key = (lambda t: t.self_us) if args.sort == "self" else (lambda t: t.cumulative_us)
+    top = sorted(timings, key=key, reverse=True)[:args.top]
+
+    if args.output == "json":
+        print(json.dumps({
+            "modules": modules,
+            "total_ms": round(total_ms, 1),
+            "budget_ms": budget_ms,
+            "imports": [
+                {
+                    "module": t.module,
+                    "self_ms": round(t.self_us / 1000, 1),
+                    "cumulative_ms": round(t.cumulative_us / 1000, 1),
+                    "depth": t.depth,
+                }
+                for t in top
+            ],
+        }, indent=2))
+    else:
+        print(f"{'self ms':>9} {'cumul ms':>9}  module")
+        for t in top:
+            print(f"{t.self_us / 1000:9.1f} {t.cumulative_us / 1000:9.1f}  {t.module}")
+        print(f"\n{len(timings)} modules imported in {total_ms:.0f}ms", end="")
+        print(f" (budget {budget_ms}ms)" if budget_ms else "")
+
+    if budget_ms and total_ms > budget_ms:
+        print(f"Over the startup import budget by {total_ms - budget_ms:.0f}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="datablue",
@@ -251,6 +298,28 @@ def main():
     map_parser = subparsers.add_parser("map", help="Map site structure via sitemap")
     map_parser.add_argument("url", help="Site URL to map")
 
+    # --- importtime ---
+    importtime_parser = subparsers.add_parser(
+        "importtime", help="Profile startup import cost per module",
+    )
+    importtime_parser.add_argument(
+        "modules", nargs="*",
+        help="Modules to import (default: app.main, or the worker with --queue)",
+    )
+    importtime_parser.add_argument(
+        "--queue", default=None, choices=["scrape", "crawl", "map", "search"],
+        help="Profile a worker for this queue, with the modules it preloads",
+    )
+    importtime_parser.add_argument("--top", type=int, default=25, help="Modules to list")
+    importtime_parser.add_argument(
+        "--sort", default="self", choices=["self", "cumulative"],
+        help="Order by the module's own time or including its imports",
+    )
+    importtime_parser.add_argument(
+        "--budget-ms", type=int, default=None,
+        help="Exit 1 when the total exceeds this (default: STARTUP_IMPORT_BUDGET_MS)",
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -265,6 +334,8 @@ def main():
         asyncio.run(_cmd_crawl(args))
     elif args.command == "map":
         asyncio.run(_cmd_map(args))
+    elif args.command == "importtime":
+        sys.exit(_cmd_importtime(args))
 
 
 if __name__ == "__main__":
@@ -64,6 +64,8 @@ class Settings(BaseSettings):
     BROWSER_HEADLESS: bool = True
     CHROMIUM_POOL_SIZE: int = 3
     FIREFOX_POOL_SIZE: int = 1
+    BROWSER_CONTEXT_POOL_SIZE: int = 2  # Pre-warmed contexts per browser/stealth mode (0 = off)
+    BROWSER_CONTEXT_MAX_USES: int = 10  # Recycle a pooled context after N pages
 
     # Rate Limiting (per minute)
     RATE_LIMIT_SCRAPE: int = 100
@@ -76,10 +78,52 @@ class Settings(BaseSettings):
     DEFAULT_WAIT_FOR: int = 0  # ms
     MAX_CRAWL_PAGES: int = 1000
     MAX_CRAWL_DEPTH: int = 10
+    CRAWL_CHECKPOINT_PAGES: int = 25  # Saved pages between crawl resume checkpoints
+    CRAWL_WORKERS_PER_JOB: int = 1  # Crawl tasks sharing one large crawl's frontier (1 = off)
+    CRAWL_DISTRIBUTED_MIN_PAGES: int = 500  # Smallest max_pages that gets helper workers
     MAX_CONCURRENT_SCRAPES: int = (
         5  # Per-worker API concurrency (4 workers × 5 = 20 max)
     )
     SCRAPE_API_TIMEOUT: int = 90  # Max seconds for a single scrape API call
+    HTTP_MAX_BODY_BYTES: int = 15 * 1024 * 1024  # Streamed HTTP tier body cap (0 = unlimited)
+
+    # Resource governor — adapts API, browser, tab and crawl limits at runtime
+    RESOURCE_GOVERNOR_ENABLED: bool = True
+    RESOURCE_GOVERNOR_INTERVAL: float = 5.0  # Seconds between samples
+    RESOURCE_GOVERNOR_LOW_PERCENT: float = 60.0  # Memory use below which limits may grow
+    RESOURCE_GOVERNOR_HIGH_PERCENT: float = 80.0  # Memory use at which limits shrink by one
+    RESOURCE_GOVERNOR_CRITICAL_PERCENT: float = 90.0  # Memory use at which limits drop to minimum
+    RESOURCE_GOVERNOR_LAG_HIGH_MS: int = 250  # Event-loop lag treated like high memory
+    RESOURCE_GOVERNOR_PROCESS_MB: int = 0  # RSS budget for the process plus its browsers (0 = off)
+    RESOURCE_GOVERNOR_RAISE_AFTER: int = 3  # Consecutive calm samples before a limit grows
+    RESOURCE_GOVERNOR_MAX_SCALE: float = 2.0  # Limits grow up to their configured value × this
+
+    # Document extraction (PDF, DOCX, XLSX, ...)
+    DOCUMENT_WORKERS: int = 2  # Extraction processes per API/worker process (0 = use a thread)
+    DOCUMENT_PDF_PAGES_PER_SHARD: int = 10  # PDF pages per parallel extraction shard
+    DOCUMENT_TIMEOUT_SECONDS: int = 60  # Per-document time budget; partial results past it (0 = unlimited)
+    DOCUMENT_MAX_MEMORY_MB: int = 1024  # Address-space budget per extraction process (0 = unlimited)
+
+    # Authentication cache
+    AUTH_CACHE_TTL_SECONDS: int = 60  # Redis TTL of key/user snapshots (0 = disabled)
+    AUTH_CACHE_LOCAL_TTL_SECONDS: int = 5  # In-process TTL; bounds staleness in other processes (0 = off)
+    AUTH_LAST_USED_FLUSH_SECONDS: int = 30  # Batch interval for API key last_used_at writes
+
+    # Usage quotas
+    QUOTA_RECONCILE_SECONDS: int = 30  # How often Redis quota counters are written to usage_quotas
+
+    # Usage analytics rollups
+    USAGE_ROLLUP_INTERVAL_SECONDS: int = 900  # How often settled days are folded into rollups
+    USAGE_ROLLUP_SETTLE_DAYS: int = 1  # Days before today still read live from jobs
+    USAGE_ROLLUP_LOOKBACK_DAYS: int = 3  # Rolled-up days rebuilt each pass (late status changes)
+    USAGE_CACHE_TTL_SECONDS: int = 30  # Redis TTL of /v1/usage responses (0 = disabled)
+
+    # LLM extraction
+    LLM_CHUNK_MAX_TOKENS: int = 10000  # Token cap per extraction chunk (shrunk to fit the model's context)
+    LLM_CHUNK_CONCURRENCY: int = 4  # Chunks of one document extracted in parallel
+    LLM_PROVIDER_CONCURRENCY: int = 8  # In-flight LLM calls per provider key, per process
+    LLM_PROVIDER_RPM: int = 0  # Requests/minute per provider key, per process (0 = unlimited)
+    LLM_CACHE_TTL_SECONDS: int = 7 * 86400  # Content-addressed chunk result cache (0 = disabled)
 
     # Database Pool
     DB_POOL_SIZE: int = 20
@@ -93,6 +137,10 @@ class Settings(BaseSettings):
     CACHE_ENABLED: bool = True
     CACHE_TTL_SECONDS: int = 3600
     STRATEGY_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    STRATEGY_STATS_HALF_LIFE_SECONDS: int = 21600  # Decay of per-domain strategy stats (6 hours)
+    STRATEGY_STATS_LOCAL_TTL_SECONDS: int = 30  # In-process copy of a domain's stats (0 = read Redis every race)
+    STRATEGY_STATS_MIN_SAMPLES: int = 3  # Decayed attempts before a strategy's stats drive racing
+    STRATEGY_RACE_TOP_K: int = 2  # Strategies started immediately; the rest are hedged
 
     # Go HTML-to-Markdown sidecar (empty = disabled, fallback to Python markdownify)
     GO_HTML_TO_MD_URL: str = ""
@@ -111,6 +159,14 @@ class Settings(BaseSettings):
 
     # Metrics
     METRICS_ENABLED: bool = True
+    LOOP_MONITOR_ENABLED: bool = True  # Probe event-loop scheduling delay (event_loop_lag_seconds)
+    LOOP_MONITOR_INTERVAL: float = 0.5  # Seconds between loop probes
+    LOOP_MONITOR_DEBUG: bool = False  # Capture stacks of callbacks that block the loop
+    LOOP_MONITOR_BLOCK_THRESHOLD_MS: int = 100  # Blocking time that triggers a stack capture
+
+    # Startup
+    STARTUP_IMPORT_BUDGET_MS: int = 3000  # Warn when a process's startup imports take longer (0 = off)
+    STARTUP_PRELOAD: bool = True  # Import each queue's lazily loaded modules before workers fork (see app.core.startup)
 
     # Proxy
     USE_BUILTIN_PROXIES: bool = False
@@ -124,9 +180,22 @@ class Settings(BaseSettings):
     BRAVE_SEARCH_API_KEY: str = ""
     SEARXNG_URL: str = ""  # Self-hosted SearXNG instance (empty = disabled)
 
+    # Blob store for large page payloads (empty = disabled, stored inline in job_results)
+    BLOB_STORE_BACKEND: str = ""  # "local" or "s3"
+    BLOB_STORE_PATH: str = "./data/blobs"  # Root directory for the local backend
+    BLOB_STORE_S3_BUCKET: str = ""
+    BLOB_STORE_S3_PREFIX: str = "blobs/"
+    BLOB_STORE_S3_ENDPOINT_URL: str = ""  # MinIO / R2 / any S3-compatible endpoint
+    BLOB_STORE_S3_REGION: str = ""
+    BLOB_STORE_MIN_BYTES: int = 16384  # Payloads smaller than this stay inline
+    BLOB_STORE_ZSTD_LEVEL: int = 6
+    BLOB_STORE_GC_GRACE_HOURS: int = 24  # Unreferenced blobs younger than this are kept
+
     # Data Retention
     DATA_RETENTION_DAYS: int = 30
     MONITOR_CHECK_RETENTION_DAYS: int = 90
+    CLEANUP_BATCH_SIZE: int = 5000  # Rows per delete statement (and commit) in cleanup
+    PARTITION_PREMAKE_MONTHS: int = 3  # Future monthly partitions kept created (PostgreSQL)
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
 
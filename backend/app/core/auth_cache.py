@@ -0,0 +1,173 @@
+"""
+Two-level cache for request authentication.
+
+Every authenticated request resolves a bearer token to a user. Without a
+cache that is an ApiKey lookup plus a User lookup (or a User lookup for JWTs)
+per call. Both lookups are cached as small JSON snapshots:
+
+  auth:key:{key_hash}  → {"user_id", "key_id"} for an active API key
+  auth:user:{user_id}  → user snapshot (id, email, name, is_verified, created_at)
+
+Lookups go in-process dict (AUTH_CACHE_LOCAL_TTL_SECONDS) → Redis
+(AUTH_CACHE_TTL_SECONDS) → database. Revoking a key or updating a user deletes
+both levels in this process and in Redis; other processes drop their local
+copy when its short TTL expires.
+
+API key ``last_used_at`` stamps are collected here and written to the
+database in batches (see app.services.auth.flush_api_key_last_used).
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from uuid import UUID
+
+from app.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "auth:key:"
+USER_PREFIX = "auth:user:"
+_LOCAL_MAX_ENTRIES = 10_000
+
+_local: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_pending_last_used: dict[UUID, datetime] = {}
+
+
+def _local_get(key: str) -> dict | None:
+    entry = _local.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _local.pop(key, None)
+        return None
+    return value
+
+
+def _local_set(key: str, value: dict) -> None:
+    ttl = settings.AUTH_CACHE_LOCAL_TTL_SECONDS
+    if ttl <= 0:
+        return
+    _local[key] = (time.monotonic() + ttl, value)
+    _local.move_to_end(key)
+    while len(_local) > _LOCAL_MAX_ENTRIES:
+        _local.popitem(last=False)
+
+
+async def _get(key: str) -> dict | None:
+    value = _local_get(key)
+    if value is not None:
+        return value
+    if settings.AUTH_CACHE_TTL_SECONDS <= 0:
+        return None
+    try:
+        data = await redis_client.get(key)
+        if data:
+            value = json.loads(data)
+            _local_set(key, value)
+            return value
+    except Exception as e:
+        logger.warning(f"Auth cache get failed: {e}")
+    return None
+
+
+async def _set(key: str, value: dict) -> None:
+    _local_set(key, value)
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return
+    try:
+        await redis_client.setex(key, ttl, json.dumps(value))
+    except Exception as e:
+        logger.warning(f"Auth cache set failed: {e}")
+
+
+async def _invalidate(key: str) -> None:
+    _local.pop(key, None)
+    try:
+        await redis_client.delete(key)
+    except Exception as e:
+        logger.warning(f"Auth cache invalidate failed: {e}")
+
+
+# ---------------------------------------------------------------------------
+# API keys
+# ---------------------------------------------------------------------------
+
+
+async def get_api_key(key_hash: str) -> dict | None:
+    """Cached ``{"user_id", "key_id"}`` for an active key, or None on miss."""
+    return await _get(f"{KEY_PREFIX}{key_hash}")
+
+
+async def set_api_key(key_hash: str, user_id: UUID, key_id: UUID) -> None:
+    await _set(
+        f"{KEY_PREFIX}{key_hash}", {"user_id": str(user_id), "key_id": str(key_id)}
+    )
+
+
+async def invalidate_api_key(key_hash: str) -> None:
+    """Drop a key from the cache (call after revoking it)."""
+    await _invalidate(f"{KEY_PREFIX}{key_hash}")
+
+
+# ---------------------------------------------------------------------------
+# Users
+# ---------------------------------------------------------------------------
+
+
+def user_snapshot(user) -> dict:
+    """The User columns needed to serve a request, as JSON-safe values."""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "name": user.name,
+        "is_verified": bool(user.is_verified),
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+async def get_user(user_id: UUID | str) -> dict | None:
+    """Cached user snapshot, or None on miss."""
+    return await _get(f"{USER_PREFIX}{user_id}")
+
+
+async def set_user(user) -> None:
+    await _set(f"{USER_PREFIX}{user.id}", user_snapshot(user))
+
+
+async def invalidate_user(user_id: UUID | str) -> None:
+    """Drop a user snapshot from the cache (call after updating the user)."""
+    await _invalidate(f"{USER_PREFIX}{user_id}")
+
+
+# ---------------------------------------------------------------------------
+# Batched last_used_at
+# ---------------------------------------------------------------------------
+
+
+def record_api_key_use(key_id: UUID) -> None:
+    """Note that a key was used; persisted on the next batch flush."""
+    _pending_last_used[key_id] = datetime.now(timezone.utc)
+
+
+def drain_api_key_uses() -> dict[UUID, datetime]:
+    """Take all pending last-used stamps, leaving the buffer empty."""
+    global _pending_last_used
+    pending, _pending_last_used = _pending_last_used, {}
+    return pending
+
+
+def requeue_api_key_uses(pending: dict[UUID, datetime]) -> None:
+    """Put back stamps from a failed flush, keeping any newer ones."""
+    for key_id, ts in pending.items():
+        _pending_last_used.setdefault(key_id, ts)
+
+
+def clear_local() -> None:
+    """Drop every in-process entry (tests, or after a bulk change)."""
+    _local.clear()
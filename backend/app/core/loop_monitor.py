@@ -0,0 +1,212 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A watchdog thread probes the attached event loop every
+LOOP_MONITOR_INTERVAL seconds with ``call_soon_threadsafe``. The delay until
+the probe runs is the loop's scheduling delay. It is observed in the
+``event_loop_lag_seconds`` histogram, and the resource governor reads the
+worst recent value.
+
+With LOOP_MONITOR_DEBUG on, a probe that hasn't run after
+LOOP_MONITOR_BLOCK_THRESHOLD_MS means a callback is blocking the loop. The
+thread then snapshots the loop thread's stack (``sys._current_frames``) and
+charges the stall to its call site, the innermost frame in this package
+(``app/services/scraper.py:812 in _looks_blocked``). Sites are counted in
+``event_loop_blocking_total`` and ``event_loop_blocking_seconds_total`` and
+kept in ``loop_monitor.report()``. The first stall at a site is logged with
+its full stack.
+
+Probing from a thread catches a fully blocked loop, which a coroutine
+timing its own sleep never notices. The cost is one thread per process and
+one callback per interval.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from app.config import settings
+from app.core.metrics import (
+    event_loop_blocking_seconds_total,
+    event_loop_blocking_total,
+    event_loop_lag_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC_ROOT = os.path.dirname(_APP_DIR)
+
+# Longest stall measured; a probe still pending after this is dropped
+_PROBE_GIVE_UP_SECONDS = 300.0
+
+
+@dataclass
+class BlockingSite:
+    """Stalls charged to one call site."""
+    site: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    stack: str = ""  # Most recent captured stack
+
+
+def call_site(frames: traceback.StackSummary) -> str:
+    """``path:line in function`` of the innermost frame in this package
+    (the innermost frame overall when none is)."""
+    for frame in reversed(frames):
+        if frame.filename.startswith(_APP_DIR + os.sep):
+            break
+    else:
+        frame = frames[-1]
+    path = frame.filename
+    if path.startswith(_SRC_ROOT + os.sep):
+        path = os.path.relpath(path, _SRC_ROOT)
+    return f"{path}:{frame.lineno} in {frame.name}"
+
+
+class _Probe:
+    __slots__ = ("sent", "ran", "done")
+
+    def __init__(self):
+        self.sent = time.monotonic()
+        self.ran = 0.0
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.ran = time.monotonic()
+        self.done.set()
+
+
+class LoopMonitor:
+    """Watches one event loop at a time (the one the process runs on)."""
+
+    def __init__(self):
+        self._loop = None
+        self._loop_thread_id: int | None = None
+        self._process = "api"
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._sites: dict[str, BlockingSite] = {}
+        self._max_lag = 0.0
+
+    def attach(self, loop, process: str) -> None:
+        """Start watching ``loop``. Call from the thread that runs it."""
+        if not settings.LOOP_MONITOR_ENABLED:
+            return
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._process = process
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="loop-monitor", daemon=True)
+            self._thread.start()
+
+    def detach(self) -> None:
+        self._loop = None
+        if settings.LOOP_MONITOR_DEBUG and self._sites:
+            top = ", ".join(
+                f"{s.site} ({s.count}x, {s.total_seconds:.2f}s)" for s in self.report()[:5]
+            )
+            logger.info(f"Event loop blocking sites so far: {top}")
+
+    @contextmanager
+    def watching(self, loop, process: str):
+        """Watch ``loop`` for the duration of the block (sync worker entry points)."""
+        self.attach(loop, process)
+        try:
+            yield
+        finally:
+            self.detach()
+
+    def take_max_lag(self) -> float | None:
+        """Worst scheduling delay (seconds) since the last call, or None when
+        no loop is watched."""
+        if self._loop is None:
+            return None
+        with self._lock:
+            lag, self._max_lag = self._max_lag, 0.0
+        return lag
+
+    def report(self) -> list[BlockingSite]:
+        """Blocking call sites, most total blocked time first."""
+        with self._lock:
+            sites = list(self._sites.values())
+        return sorted(sites, key=lambda s: s.total_seconds, reverse=True)
+
+    def _run(self) -> None:
+        while True:
+            loop = self._loop
+            if loop is None or loop.is_closed() or not loop.is_running():
+                time.sleep(settings.LOOP_MONITOR_INTERVAL)
+                continue
+            probe = _Probe()
+            try:
+                loop.call_soon_threadsafe(probe)
+            except RuntimeError:  # Closed between the check and the call
+                continue
+            try:
+                self._await_probe(loop, probe)
+            except Exception as e:
+                logger.debug(f"Loop monitor probe failed: {e}")
+            time.sleep(max(0.0, settings.LOOP_MONITOR_INTERVAL - (time.monotonic() - probe.sent)))
+
+    def _wait(self, loop, probe: _Probe, timeout: float) -> bool:
+        """Wait for ``probe`` to run; False on timeout or when ``loop`` stopped
+        running or was detached meanwhile (its probe may never run)."""
+        deadline = time.monotonic() + timeout
+        while not probe.done.wait(min(1.0, max(0.0, deadline - time.monotonic()))):
+            if time.monotonic() >= deadline or self._loop is not loop or not loop.is_running():
+                return False
+        return True
+
+    def _await_probe(self, loop, probe: _Probe) -> None:
+        threshold = settings.LOOP_MONITOR_BLOCK_THRESHOLD_MS / 1000
+        site = None
+        if settings.LOOP_MONITOR_DEBUG and not self._wait(loop, probe, threshold):
+            if self._loop is not loop or not loop.is_running():
+                return
+            site = self._capture()
+        if not self._wait(loop, probe, _PROBE_GIVE_UP_SECONDS):
+            return
+
+        lag = probe.ran - probe.sent
+        event_loop_lag_seconds.labels(process=self._process).observe(lag)
+        with self._lock:
+            self._max_lag = max(self._max_lag, lag)
+        if site is not None:
+            self._charge(site, lag)
+
+    def _capture(self) -> BlockingSite | None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        frames = traceback.extract_stack(frame)
+        del frame
+        key = call_site(frames)
+        stack = "".join(traceback.format_list(frames))
+        with self._lock:
+            site = self._sites.get(key)
+            first = site is None
+            if first:
+                site = self._sites[key] = BlockingSite(site=key)
+            site.stack = stack
+        if first:
+            logger.warning(f"Event loop blocked at {key}:\n{stack}")
+        return site
+
+    def _charge(self, site: BlockingSite, seconds: float) -> None:
+        with self._lock:
+            site.count += 1
+            site.total_seconds += seconds
+            site.max_seconds = max(site.max_seconds, seconds)
+        event_loop_blocking_total.labels(site=site.site).inc()
+        event_loop_blocking_seconds_total.labels(site=site.site).inc(seconds)
+        logger.info(f"Event loop blocked {seconds * 1000:.0f}ms at {site.site}")
+
+
+loop_monitor = LoopMonitor()
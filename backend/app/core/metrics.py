@@ -74,6 +74,46 @@ crawl_page_duration_seconds = Histogram(
     buckets=[0.5, 1, 2, 5, 10, 30],
 )
 
+# ---------------------------------------------------------------------------
+# Scrape pipeline stages (see app.core.stage_timing)
+# ---------------------------------------------------------------------------
+scrape_fetch_duration_seconds = Histogram(
+    "scrape_fetch_duration_seconds",
+    "Time spent by a single fetch strategy attempt",
+    ["tier", "strategy", "outcome", "domain_bucket"],  # outcome: success, invalid, error, cancelled, document
+    buckets=[0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 45],
+)
+scrape_race_wasted_seconds = Histogram(
+    "scrape_race_wasted_seconds",
+    "Time spent by race contestants that lost to another strategy",
+    ["tier", "strategy", "domain_bucket"],
+    buckets=[0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 45],
+)
+scrape_block_check_seconds = Histogram(
+    "scrape_block_check_seconds",
+    "Time spent in _looks_blocked",
+    ["outcome"],  # blocked, clean
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+scrape_extract_duration_seconds = Histogram(
+    "scrape_extract_duration_seconds",
+    "Content extraction time per output format",
+    ["format", "domain_bucket"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+)
+scrape_cache_lookup_seconds = Histogram(
+    "scrape_cache_lookup_seconds",
+    "Time spent looking up the scrape result and domain strategy caches",
+    ["cache", "result"],  # cache: scrape, strategy; result: hit, miss
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+)
+db_write_duration_seconds = Histogram(
+    "db_write_duration_seconds",
+    "Time spent flushing/committing scrape and crawl results",
+    ["operation"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+)
+
 # ---------------------------------------------------------------------------
 # Existing gauges
 # ---------------------------------------------------------------------------
@@ -81,11 +121,105 @@ active_browser_contexts = Gauge(
     "active_browser_contexts",
     "Number of currently active browser contexts",
 )
+warm_browser_contexts = Gauge(
+    "warm_browser_contexts",
+    "Idle pre-warmed browser contexts waiting in the context pool",
+    ["browser", "stealth"],
+)
+browser_context_pool_total = Counter(
+    "browser_context_pool_total",
+    "Browser context pool lookups by result (hit/miss)",
+    ["result"],
+)
 db_pool_size = Gauge(
     "db_pool_size",
     "Current database connection pool size",
 )
 
+# ---------------------------------------------------------------------------
+# LLM extraction
+# ---------------------------------------------------------------------------
+llm_cache_requests_total = Counter(
+    "llm_cache_requests_total",
+    "LLM extraction chunk cache lookups",
+    ["result"],  # hit, miss
+)
+llm_tokens_saved_total = Counter(
+    "llm_tokens_saved_total",
+    "LLM tokens not spent because a chunk result was served from cache",
+)
+llm_chunk_duration_seconds = Histogram(
+    "llm_chunk_duration_seconds",
+    "Duration of a single LLM extraction chunk call",
+    ["provider"],
+    buckets=[0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0],
+)
+
+# ---------------------------------------------------------------------------
+# Resource governor (see app.services.resource_governor)
+# ---------------------------------------------------------------------------
+governor_limit = Gauge(
+    "governor_limit",
+    "Concurrency limit currently set by the resource governor",
+    ["limiter"],  # api_scrape, chromium, firefox, nodriver_tabs, crawl
+)
+governor_in_use = Gauge(
+    "governor_in_use",
+    "Slots of a governed limit in use at the last sample",
+    ["limiter"],
+)
+governor_adjustments_total = Counter(
+    "governor_adjustments_total",
+    "Limit changes made by the resource governor",
+    ["limiter", "direction"],  # direction: up, down
+)
+governor_pressure = Gauge(
+    "governor_pressure",
+    "Resource pressure level (0=low, 1=steady, 2=high, 3=critical)",
+)
+governor_memory_percent = Gauge(
+    "governor_memory_percent",
+    "Memory use in percent of the cgroup limit, or of host memory",
+)
+governor_memory_bytes = Gauge(
+    "governor_memory_bytes",
+    "Memory seen by the resource governor",
+    ["kind"],  # process, renderers, limit
+)
+governor_loop_lag_seconds = Gauge(
+    "governor_loop_lag_seconds",
+    "Event-loop lag measured by the resource governor's monitor task",
+)
+
+# ---------------------------------------------------------------------------
+# Event loop (see app.core.loop_monitor)
+# ---------------------------------------------------------------------------
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "Scheduling delay of a callback posted to the event loop",
+    ["process"],  # api, or the Celery worker name
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+event_loop_blocking_total = Counter(
+    "event_loop_blocking_total",
+    "Callbacks that blocked the event loop past the threshold, by call site (debug mode)",
+    ["site"],
+)
+event_loop_blocking_seconds_total = Counter(
+    "event_loop_blocking_seconds_total",
+    "Time the event loop spent blocked, by call site (debug mode)",
+    ["site"],
+)
+
+# ---------------------------------------------------------------------------
+# Startup (see app.core.startup)
+# ---------------------------------------------------------------------------
+process_startup_seconds = Gauge(
+    "process_startup_seconds",
+    "Time spent importing modules at startup",
+    ["process", "phase"],  # phase: imports (module level) or preload (queue modules)
+)
+
 # ---------------------------------------------------------------------------
 # Infrastructure gauges
 # ---------------------------------------------------------------------------
@@ -0,0 +1,114 @@
+"""
+Monthly range partitions for the append-heavy history tables (PostgreSQL).
+
+The tables in ``PARTITIONED_TABLES`` are partitioned by month on their
+timestamp column (migration k6l7m8n9o0p1). Partitions are named
+``{table}_pYYYYMM``; a ``{table}_default`` partition catches anything
+outside the premade range so inserts never fail.
+
+Retention detaches and drops whole partitions instead of deleting rows, and
+the daily cleanup keeps ``PARTITION_PREMAKE_MONTHS`` future months created
+so the default partition stays empty. On other databases (SQLite in tests)
+``is_partitioned`` is False and callers fall back to chunked deletes.
+"""
+
+import logging
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# table -> partition key column
+PARTITIONED_TABLES = {
+    "job_results": "created_at",
+    "monitor_checks": "checked_at",
+    "webhook_deliveries": "created_at",
+    "data_queries": "created_at",
+}
+
+_PARTITION_RE = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month a ``{table}_pYYYYMM`` partition covers (None for default)."""
+    match = _PARTITION_RE.search(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def expired_partitions(names: list[str], cutoff: datetime) -> list[str]:
+    """Partitions whose whole month ends on or before ``cutoff``."""
+    limit = cutoff.date()
+    return sorted(
+        name
+        for name in names
+        if (month := partition_month(name)) is not None and add_months(month, 1) <= limit
+    )
+
+
+async def is_partitioned(db: AsyncSession, table: str) -> bool:
+    if db.bind.dialect.name != "postgresql":
+        return False
+    result = await db.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table"
+        ),
+        {"table": table},
+    )
+    return result.scalar() is not None
+
+
+async def list_partitions(db: AsyncSession, table: str) -> list[str]:
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result.all()]
+
+
+async def ensure_partitions(
+    db: AsyncSession, table: str, today: date, months_ahead: int
+) -> None:
+    """Create this month's and the next ``months_ahead`` partitions."""
+    current = month_start(today)
+    for n in range(months_ahead + 1):
+        await db.execute(text(create_partition_sql(table, add_months(current, n))))
+
+
+async def drop_expired_partitions(db: AsyncSession, table: str, cutoff: datetime) -> list[str]:
+    """Detach and drop partitions entirely older than ``cutoff``."""
+    dropped = expired_partitions(await list_partitions(db, table), cutoff)
+    for name in dropped:
+        await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        logger.info(f"Dropped expired partition {name}")
+    return dropped
@@ -1,70 +1,136 @@
+"""Per-key request rate limiting (GCRA in a single Redis script).
+
+The Generic Cell Rate Algorithm allows ``limit`` requests per ``window``
+seconds, spread out or in one burst, and stores only one value per key: the
+theoretical arrival time (TAT) of the next request, in milliseconds. A check
+is one EVALSHA that reads the TAT, decides, and writes it back with a TTL
+that lets idle keys expire. Time comes from the Redis server, so every API
+process shares one clock. A key still holding the sorted set of the old
+sliding-window limiter is replaced on its first check.
+
+If Redis is unavailable the limiter fails open.
+"""
+
+import math
 import time
 
+from fastapi import Response
+
+from app.core.exceptions import RateLimitError
 from app.core.redis import redis_client
 
+# KEYS[1] = limiter key; ARGV = limit, window_ms
+# Returns {allowed, remaining, retry_after_ms, reset_ms, now_ms}
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local interval = window / limit
+
+if redis.call('TYPE', KEYS[1]).ok == 'zset' then
+    -- Legacy sliding-window log from before GCRA
+    redis.call('DEL', KEYS[1])
+end
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now), now}
+end
+
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+local remaining = math.floor((now - allow_at) / interval)
+return {1, remaining, 0, math.ceil(new_tat - now), now}
+"""
+
 
 class RateLimitInfo:
     """Rate limit check result with metadata for response headers."""
 
-    __slots__ = ("allowed", "remaining", "limit", "reset")
+    __slots__ = ("allowed", "remaining", "limit", "reset", "retry_after")
 
-    def __init__(self, allowed: bool, remaining: int, limit: int, reset: int):
+    def __init__(
+        self,
+        allowed: bool,
+        remaining: int,
+        limit: int,
+        reset: int,
+        retry_after: int = 0,
+    ):
         self.allowed = allowed
         self.remaining = remaining
         self.limit = limit
-        self.reset = reset  # Unix timestamp when the window resets
+        # Unix timestamp: when the next request is allowed if denied,
+        # otherwise when the full limit is available again
+        self.reset = reset
+        self.retry_after = retry_after  # Seconds until allowed (0 if allowed)
 
 
 async def check_rate_limit(key: str, limit: int, window: int = 60) -> tuple[bool, int]:
     """
-    Sliding window rate limiter using Redis.
+    Rate limit ``key`` to ``limit`` requests per ``window`` seconds.
     Returns (is_allowed, remaining_requests).
     """
-    now = time.time()
-    pipe = redis_client.pipeline()
-
-    # Remove old entries outside the window
-    pipe.zremrangebyscore(key, 0, now - window)
-    # Add current request
-    pipe.zadd(key, {str(now): now})
-    # Count requests in window
-    pipe.zcard(key)
-    # Set expiry on the key
-    pipe.expire(key, window)
-
-    results = await pipe.execute()
-    request_count = results[2]
-
-    if request_count > limit:
-        return False, 0
-
-    return True, limit - request_count
+    info = await check_rate_limit_full(key, limit, window)
+    return info.allowed, info.remaining
 
 
 async def check_rate_limit_full(
     key: str, limit: int, window: int = 60
 ) -> RateLimitInfo:
     """
-    Sliding window rate limiter returning full info for response headers.
+    Rate limit ``key`` to ``limit`` requests per ``window`` seconds,
+    returning full info for response headers.
     """
-    now = time.time()
-    pipe = redis_client.pipeline()
-
-    pipe.zremrangebyscore(key, 0, now - window)
-    pipe.zadd(key, {str(now): now})
-    pipe.zcard(key)
-    pipe.expire(key, window)
-
-    results = await pipe.execute()
-    request_count = results[2]
-    reset_at = int(now) + window
-
-    if request_count > limit:
-        return RateLimitInfo(allowed=False, remaining=0, limit=limit, reset=reset_at)
-
+    reply = await redis_client.run_script(
+        _GCRA_SCRIPT, keys=[key], args=[max(limit, 1), window * 1000]
+    )
+    if not isinstance(reply, list) or len(reply) != 5:
+        # Redis unavailable — fail open
+        return RateLimitInfo(
+            allowed=True, remaining=limit, limit=limit, reset=int(time.time())
+        )
+
+    allowed, remaining, retry_ms, reset_ms, now_ms = (int(v) for v in reply)
+    if not allowed:
+        return RateLimitInfo(
+            allowed=False,
+            remaining=0,
+            limit=limit,
+            reset=math.ceil((now_ms + retry_ms) / 1000),
+            retry_after=max(1, math.ceil(retry_ms / 1000)),
+        )
     return RateLimitInfo(
         allowed=True,
-        remaining=limit - request_count,
+        remaining=remaining,
         limit=limit,
-        reset=reset_at,
+        reset=math.ceil((now_ms + reset_ms) / 1000),
     )
+
+
+async def enforce_rate_limit(
+    response: Response, key: str, limit: int, message: str, window: int = 60
+) -> RateLimitInfo:
+    """Check a per-endpoint limit, set the X-RateLimit-* headers and raise
+    RateLimitError (with an exact Retry-After) when it is exceeded."""
+    rl = await check_rate_limit_full(key, limit, window)
+    response.headers["X-RateLimit-Limit"] = str(rl.limit)
+    response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
+    response.headers["X-RateLimit-Reset"] = str(rl.reset)
+    if not rl.allowed:
+        raise RateLimitError(
+            f"{message} Try again in {rl.retry_after}s.",
+            headers={
+                "Retry-After": str(rl.retry_after),
+                "X-RateLimit-Limit": str(rl.limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(rl.reset),
+            },
+        )
+    return rl
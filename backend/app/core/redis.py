@@ -10,6 +10,7 @@ import logging
 import time
 
 import redis.asyncio as aioredis
+from redis.exceptions import NoScriptError
 
 from app.config import settings
 
@@ -33,6 +34,7 @@ class ResilientRedis:
         self._consecutive_failures = 0
         self._circuit_open_until = 0.0
         self._reconnect_delay = 1.0
+        self._script_shas: dict[str, str] = {}
 
     def _create_client(self) -> aioredis.Redis:
         return aioredis.from_url(
@@ -185,6 +187,11 @@ class ResilientRedis:
     async def srem(self, key, *values):
         return await self._safe_op("srem", self.client.srem, key, *values, default=0)
 
+    async def spop(self, key, count=None):
+        return await self._safe_op(
+            "spop", self.client.spop, key, count, default=[] if count else None
+        )
+
     async def zadd(self, key, mapping, *args, **kwargs):
         return await self._safe_op(
             "zadd", self.client.zadd, key, mapping, *args, default=0, **kwargs
@@ -223,9 +230,17 @@ class ResilientRedis:
     async def hgetall(self, name):
         return await self._safe_op("hgetall", self.client.hgetall, name, default={})
 
+    async def hincrby(self, name, key, amount=1):
+        return await self._safe_op(
+            "hincrby", self.client.hincrby, name, key, amount, default=0
+        )
+
     async def hdel(self, name, *keys):
         return await self._safe_op("hdel", self.client.hdel, name, *keys, default=0)
 
+    async def hlen(self, name):
+        return await self._safe_op("hlen", self.client.hlen, name, default=0)
+
     async def setex(self, name, time_val, value):
         return await self._safe_op(
             "setex", self.client.setex, name, time_val, value, default=False
@@ -234,6 +249,27 @@ class ResilientRedis:
     async def ping(self):
         return await self._safe_op("ping", self.client.ping, default=False)
 
+    async def run_script(self, script: str, keys=(), args=(), default=None):
+        """Run a Lua script atomically via EVALSHA (loads it on first use).
+
+        The SHA is cached per script text; a NOSCRIPT reply (server restart,
+        SCRIPT FLUSH) transparently reloads it.
+        """
+
+        async def _run():
+            sha = self._script_shas.get(script)
+            if sha is None:
+                sha = await self.client.script_load(script)
+                self._script_shas[script] = sha
+            try:
+                return await self.client.evalsha(sha, len(keys), *keys, *args)
+            except NoScriptError:
+                sha = await self.client.script_load(script)
+                self._script_shas[script] = sha
+                return await self.client.evalsha(sha, len(keys), *keys, *args)
+
+        return await self._safe_op("evalsha", _run, default=default)
+
     async def scan_iter(self, match=None, count=None):
         """Async generator wrapping Redis SCAN for pattern matching."""
         if self._is_circuit_open():
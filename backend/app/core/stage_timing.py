@@ -0,0 +1,147 @@
+"""
+Per-stage latency instrumentation for the scrape hot path.
+
+Every stage observes a labelled Prometheus histogram (see the "Scrape
+pipeline stages" section of app.core.metrics). While ``scrape_url`` runs, a
+``StageTimer`` is bound to the current context so the same observations are
+also summed per request; ``ScrapeRequest.include_timings`` returns that sum
+as ``ScrapeData.metadata.timings``.
+
+Stage durations in the breakdown are wall-clock and can overlap (race
+contestants and extraction formats run concurrently), so they don't add up
+to ``total_ms``.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from app.core.metrics import (
+    db_write_duration_seconds,
+    scrape_block_check_seconds,
+    scrape_cache_lookup_seconds,
+    scrape_extract_duration_seconds,
+    scrape_fetch_duration_seconds,
+    scrape_race_wasted_seconds,
+)
+
+
+class StageTimer:
+    """Accumulated stage durations (seconds) for one scrape."""
+
+    __slots__ = ("started", "stages", "tier", "strategy")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.tier: int | None = None
+        self.strategy: str | None = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def breakdown(self) -> dict[str, Any]:
+        """Stage durations in ms plus the winning tier/strategy."""
+        out: dict[str, Any] = {
+            f"{stage}_ms": round(seconds * 1000, 2)
+            for stage, seconds in self.stages.items()
+        }
+        out["total_ms"] = round((time.perf_counter() - self.started) * 1000, 2)
+        out["tier"] = self.tier
+        out["strategy"] = self.strategy
+        return out
+
+
+_current: ContextVar[StageTimer | None] = ContextVar("scrape_stage_timer", default=None)
+
+
+@contextmanager
+def timed_scrape():
+    """Bind a fresh StageTimer to the current context for one scrape."""
+    timer = StageTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def current_timer() -> StageTimer | None:
+    return _current.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add to the current request's breakdown (no-op outside a scrape)."""
+    timer = _current.get()
+    if timer is not None:
+        timer.add(stage, seconds)
+
+
+def observe_fetch(
+    tier: int | str | None, strategy: str, outcome: str, domain_bucket: str, seconds: float
+) -> None:
+    scrape_fetch_duration_seconds.labels(
+        tier=str(tier), strategy=strategy, outcome=outcome, domain_bucket=domain_bucket
+    ).observe(seconds)
+
+
+def observe_race_waste(
+    tier: int | str | None, strategy: str, domain_bucket: str, seconds: float
+) -> None:
+    scrape_race_wasted_seconds.labels(
+        tier=str(tier), strategy=strategy, domain_bucket=domain_bucket
+    ).observe(seconds)
+    record_stage("race_wasted", seconds)
+
+
+def observe_block_check(blocked: bool, seconds: float) -> None:
+    scrape_block_check_seconds.labels(
+        outcome="blocked" if blocked else "clean"
+    ).observe(seconds)
+    record_stage("block_check", seconds)
+
+
+def observe_extract(fmt: str, domain_bucket: str, seconds: float) -> None:
+    """Extraction time for one format. Executor threads don't inherit the
+    request context, so from there only the histogram is updated."""
+    scrape_extract_duration_seconds.labels(
+        format=fmt, domain_bucket=domain_bucket
+    ).observe(seconds)
+    record_stage(f"extract_{fmt}", seconds)
+
+
+def observe_cache_lookup(cache: str, hit: bool, seconds: float) -> None:
+    scrape_cache_lookup_seconds.labels(
+        cache=cache, result="hit" if hit else "miss"
+    ).observe(seconds)
+    record_stage(f"{cache}_cache_lookup", seconds)
+
+
+class _Elapsed:
+    __slots__ = ("seconds",)
+
+    def __init__(self):
+        self.seconds = 0.0
+
+
+@contextmanager
+def db_write(operation: str):
+    """Time a DB flush/commit block. Yields an object whose ``seconds`` is
+    set on exit."""
+    elapsed = _Elapsed()
+    start = time.perf_counter()
+    try:
+        yield elapsed
+    finally:
+        elapsed.seconds = time.perf_counter() - start
+        db_write_duration_seconds.labels(operation=operation).observe(elapsed.seconds)
+        record_stage("db_write", elapsed.seconds)
+
+
+def timed_call(fn, *args):
+    """Run ``fn(*args)`` and return ``(result, seconds)`` — for work handed
+    to an executor, where the caller records the stage on the loop side."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
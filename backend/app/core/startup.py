@@ -0,0 +1,192 @@
+"""
+Startup import budget, per-queue preloading and import profiling.
+
+Cold start of the API and of every Celery worker child is mostly imports.
+Three things keep it down:
+
+- Heavy dependencies are imported on first use: Playwright in
+  ``BrowserPool.initialize``, litellm in ``llm_extract``, curl_cffi,
+  nodriver and pymupdf inside the functions that need them, and Sentry only
+  when SENTRY_DSN is set.
+- ``import_phase`` wraps a process's startup imports. It pauses the cyclic
+  GC while modules load, because collections then find almost nothing to
+  free. Afterwards it freezes the survivors, so later collections skip
+  them and forked children leave their pages shared. The elapsed time is
+  exported as ``process_startup_seconds`` and logged once it passes
+  STARTUP_IMPORT_BUDGET_MS.
+- ``preload`` imports the modules a queue's tasks import lazily. It runs
+  once, in the Celery parent before the pool forks, so every child inherits
+  them, including children replaced by ``worker_max_tasks_per_child``. The
+  API runs it in a thread after startup, which keeps litellm's import off
+  the event loop on the first extraction.
+
+``python -m app.cli importtime`` reports the per-module cost of a cold
+import, like ``python -X importtime`` but sorted and totalled.
+"""
+
+import gc
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+
+from app.config import settings
+from app.core.metrics import process_startup_seconds
+
+logger = logging.getLogger(__name__)
+
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules each Celery queue's tasks import lazily (inside the task), warmed
+# by ``preload`` in the worker parent. "api" is warmed after API startup.
+QUEUE_PRELOADS: dict[str, tuple[str, ...]] = {
+    "api": ("litellm", "playwright.async_api"),
+    "scrape": (
+        "app.services.scraper",
+        "app.services.llm_extract",
+        "app.services.retention",
+        "app.services.usage_rollup",
+        "litellm",
+        "playwright.async_api",
+    ),
+    "crawl": (
+        "app.services.scraper",
+        "app.services.crawler",
+        "app.services.crawl_records",
+        "app.services.llm_extract",
+        "litellm",
+        "playwright.async_api",
+    ),
+    "map": ("app.services.mapper", "app.services.scraper", "curl_cffi.requests"),
+    "search": (
+        "app.services.search",
+        "app.services.scraper",
+        "app.services.llm_extract",
+        "litellm",
+    ),
+}
+
+
+@contextmanager
+def _gc_paused():
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        gc.freeze()
+
+
+@contextmanager
+def import_phase(process: str):
+    """Run a process's startup imports with the GC paused, then freeze them."""
+    started = time.perf_counter()
+    try:
+        with _gc_paused():
+            yield
+    finally:
+        _record(process, "imports", time.perf_counter() - started)
+
+
+def preload(queues: list[str], process: str | None = None, freeze: bool = True) -> dict[str, float]:
+    """Import the modules ``queues`` need. Returns seconds per module imported
+    now (modules already loaded cost nothing and are left out).
+
+    Pass ``freeze=False`` in a process already serving work. The GC then
+    stays on, because disabling it is process-wide and would stop
+    collection for every request during the import. A freeze would also
+    pin whatever garbage happens to be uncollected.
+    """
+    if not settings.STARTUP_PRELOAD:
+        return {}
+    modules = dict.fromkeys(m for q in queues for m in QUEUE_PRELOADS.get(q, ()))
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    with _gc_paused() if freeze else nullcontext():
+        for module in modules:
+            if module in sys.modules:
+                continue
+            t0 = time.perf_counter()
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                # Optional dependency missing here — its feature fails on use
+                logger.warning(f"Preload of {module} failed: {e}")
+                continue
+            timings[module] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+    _record(process or ",".join(queues), "preload", elapsed)
+    if timings:
+        slowest = ", ".join(
+            f"{m} {s * 1000:.0f}ms" for m, s in sorted(timings.items(), key=lambda x: -x[1])[:5]
+        )
+        logger.info(f"Preloaded {len(timings)} modules in {elapsed:.2f}s ({slowest})")
+    return timings
+
+
+def _record(process: str, phase: str, seconds: float) -> None:
+    process_startup_seconds.labels(process=process, phase=phase).set(seconds)
+    budget = settings.STARTUP_IMPORT_BUDGET_MS
+    if phase == "imports" and budget and seconds * 1000 > budget:
+        logger.warning(
+            f"Startup imports of {process} took {seconds * 1000:.0f}ms "
+            f"(budget {budget}ms) — see `python -m app.cli importtime`"
+        )
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``-X importtime`` output."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 = imported by the profiled statement itself
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse ``python -X importtime`` stderr, in the order Python wrote it
+    (a module after everything it imported)."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|", 2)
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line
+        name = parts[2][1:]
+        module = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=module,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(name) - len(module)) // 2,
+            )
+        )
+    return timings
+
+
+def profile_imports(modules: list[str]) -> list[ImportTiming]:
+    """Cold-import ``modules`` in a fresh interpreter under ``-X importtime``."""
+    code = "\n".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=_SRC_ROOT,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit code {proc.returncode}")
+    timings = parse_importtime(proc.stderr)
+    # Interpreter startup (encodings, site, ...) ends with ``site``
+    for i in range(len(timings) - 1, -1, -1):
+        if timings[i].depth == 0 and timings[i].module == "site":
+            return timings[i + 1:]
+    return timings
@@ -1,33 +1,44 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-import sentry_sdk
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-
-from app.api.v1.router import api_router
-from app.api.v1.health import router as health_router
 from app.config import settings
 from app.core.logging_config import configure_logging
-from app.middleware.request_id import RequestIDMiddleware
-from app.services.browser import browser_pool
 
 # Configure structured logging (must happen before any logger is created)
 configure_logging(log_format=settings.LOG_FORMAT, log_level=settings.LOG_LEVEL)
 
-# Initialize Sentry error tracking
-if settings.SENTRY_DSN:
-    sentry_sdk.init(
-        dsn=settings.SENTRY_DSN,
-        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
-        environment=settings.SENTRY_ENVIRONMENT,
-        release=f"datablue@{settings.APP_VERSION}",
-        send_default_pii=True,
-        enable_logs=True,
-        profile_session_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
-        profile_lifecycle="trace",
-    )
+from app.core.startup import import_phase, preload  # noqa: E402
+
+# GC paused while the app loads, its objects frozen after (see app.core.startup)
+with import_phase("api"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.middleware.gzip import GZipMiddleware
+
+    from app.api.v1.router import api_router
+    from app.api.v1.health import router as health_router
+    from app.core.loop_monitor import loop_monitor
+    from app.middleware.request_id import RequestIDMiddleware
+    from app.services.auth import run_last_used_flusher
+    from app.services.browser import browser_pool
+    from app.services.document import shutdown_document_pool
+    from app.services.resource_governor import governor
+
+    # Initialize Sentry error tracking (imported only when configured)
+    if settings.SENTRY_DSN:
+        import sentry_sdk
+
+        sentry_sdk.init(
+            dsn=settings.SENTRY_DSN,
+            traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
+            environment=settings.SENTRY_ENVIRONMENT,
+            release=f"datablue@{settings.APP_VERSION}",
+            send_default_pii=True,
+            enable_logs=True,
+            profile_session_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
+            profile_lifecycle="trace",
+        )
 
 logger = logging.getLogger(__name__)
 
@@ -38,12 +49,23 @@ async def lifespan(app: FastAPI):
     # Startup — browsers are lazy-initialized on first scrape request
     # to avoid spawning 8 browser processes across 4 Uvicorn workers
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    last_used_flusher = asyncio.create_task(run_last_used_flusher())
+    loop_monitor.attach(asyncio.get_running_loop(), "api")
+    await governor.start()
+    # litellm and Playwright load on first use; import them now, off the
+    # event loop, instead of stalling it on the first extract or render
+    preloading = asyncio.create_task(asyncio.to_thread(preload, ["api"], "api", freeze=False))
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    last_used_flusher.cancel()
+    await asyncio.gather(last_used_flusher, preloading, return_exceptions=True)
+    await governor.stop()
+    loop_monitor.detach()
     await browser_pool.shutdown()
+    shutdown_document_pool()
 
 
 app = FastAPI(
@@ -11,6 +11,7 @@ from app.models.usage_quota import UsageQuota
 from app.models.password_reset_token import PasswordResetToken
 from app.models.email_verification_token import EmailVerificationToken
 from app.models.data_query import DataQuery
+from app.models.usage_rollup import UsageDailyRollup, UsageDomainDaily
 
 __all__ = [
     "User",
@@ -27,4 +28,6 @@ __all__ = [
     "PasswordResetToken",
     "EmailVerificationToken",
     "DataQuery",
+    "UsageDailyRollup",
+    "UsageDomainDaily",
 ]
@@ -9,6 +9,8 @@ from app.core.database import Base
 
 
 class DataQuery(Base):
+    # Partitioned by month on created_at in PostgreSQL (app.core.partitions);
+    # the database primary key there is (id, created_at).
     __tablename__ = "data_queries"
     __table_args__ = (
         Index("ix_data_queries_user_id_created_at", "user_id", "created_at"),
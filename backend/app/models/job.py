@@ -13,6 +13,7 @@ class Job(Base):
     __table_args__ = (
         Index("ix_jobs_user_id_created_at", "user_id", "created_at"),
         Index("ix_jobs_status", "status"),
+        Index("ix_jobs_created_at", "created_at"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -29,6 +30,9 @@ class Job(Base):
     total_pages: Mapped[int] = mapped_column(Integer, default=0)
     completed_pages: Mapped[int] = mapped_column(Integer, default=0)
     error: Mapped[str | None] = mapped_column(Text)
+    # Crawl resume state, written periodically while a crawl runs and
+    # cleared when it finishes (see crawl_worker.process_crawl)
+    checkpoint: Mapped[dict | None] = mapped_column(JSONB)
     webhook_url: Mapped[str | None] = mapped_column(VARCHAR(2048))
     webhook_secret: Mapped[str | None] = mapped_column(VARCHAR(255))
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
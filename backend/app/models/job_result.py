@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Text, DateTime, ForeignKey
+from sqlalchemy import Index, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,7 +9,13 @@ from app.core.database import Base
 
 
 class JobResult(Base):
+    # Partitioned by month on created_at in PostgreSQL (app.core.partitions);
+    # the database primary key there is (id, created_at).
     __tablename__ = "job_results"
+    __table_args__ = (
+        # Keyset pagination of a job's results (app.services.result_pages)
+        Index("ix_job_results_job_id_created_at_id", "job_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -27,6 +33,8 @@ class JobResult(Base):
     extract: Mapped[dict | None] = mapped_column(JSONB)
     metadata_: Mapped[dict | None] = mapped_column("metadata", JSONB)
     screenshot_url: Mapped[str | None] = mapped_column(Text)
+    # {field: sha256} for payloads offloaded to the blob store
+    blobs: Mapped[dict | None] = mapped_column(JSONB)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -74,6 +74,8 @@ class Monitor(Base):
 class MonitorCheck(Base):
     """Individual check result for a monitor."""
 
+    # Partitioned by month on checked_at in PostgreSQL (app.core.partitions);
+    # the database primary key there is (id, checked_at).
     __tablename__ = "monitor_checks"
 
     id: Mapped[uuid.UUID] = mapped_column(
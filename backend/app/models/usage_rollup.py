@@ -0,0 +1,47 @@
+"""Pre-aggregated per-day usage, maintained by app.services.usage_rollup."""
+
+import uuid
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class UsageDailyRollup(Base):
+    """Jobs created on one UTC day, per user / type / status."""
+
+    __tablename__ = "usage_daily_rollups"
+    __table_args__ = (Index("ix_usage_daily_rollups_day", "day"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    jobs: Mapped[int] = mapped_column(Integer, default=0)
+    pages: Mapped[int] = mapped_column(BigInteger, default=0)
+    # Sum/count of started→completed durations (completed jobs only)
+    duration_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    timed_jobs: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class UsageDomainDaily(Base):
+    """Result pages per domain for jobs created on one UTC day."""
+
+    __tablename__ = "usage_domain_daily"
+    __table_args__ = (Index("ix_usage_domain_daily_day", "day"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    domain: Mapped[str] = mapped_column(String(255), primary_key=True)
+    pages: Mapped[int] = mapped_column(Integer, default=0)
@@ -11,6 +11,8 @@ from app.core.database import Base
 
 
 class WebhookDelivery(Base):
+    # Partitioned by month on created_at in PostgreSQL (app.core.partitions);
+    # the database primary key there is (id, created_at).
     __tablename__ = "webhook_deliveries"
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -87,4 +87,5 @@ class CrawlStatusResponse(BaseModel):
     total_results: int = 0
     page: int = 1
     per_page: int = 20
+    next_cursor: str | None = None  # Pass as ?cursor= for the next page
     error: str | None = None
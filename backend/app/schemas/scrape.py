@@ -69,6 +69,7 @@ class ScrapeRequest(BaseModel):
     css_selector: str | None = None  # CSS selector for targeted extraction
     xpath: str | None = None  # XPath expression for targeted extraction
     selectors: dict | None = None  # Multiple named selectors {name: {css/xpath: ...}}
+    include_timings: bool = False  # Return a per-stage latency breakdown in metadata.timings
 
 
 class PageMetadata(BaseModel):
@@ -85,6 +86,7 @@ class PageMetadata(BaseModel):
     favicon: str | None = None
     robots: str | None = None
     response_headers: dict[str, str] | None = None
+    timings: dict[str, Any] | None = None  # Per-stage ms (include_timings=True)
 
 
 class ScrapeData(BaseModel):
@@ -1,10 +1,13 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core import auth_cache
 from app.core.exceptions import AuthenticationError, BadRequestError
 from app.core.security import (
     hash_password,
@@ -75,20 +78,88 @@ async def create_api_key_for_user(
 
 
 async def get_user_by_api_key(db: AsyncSession, api_key: str) -> User | None:
+    """Resolve an API key to its user through the auth cache.
+
+    On a cache hit the returned User is a detached snapshot (id, email, name,
+    is_verified, created_at). ``last_used_at`` is buffered and written by
+    :func:`flush_api_key_last_used` instead of on every request.
+    """
     key_hash = hash_api_key(api_key)
-    result = await db.execute(
-        select(ApiKey).where(ApiKey.key_hash == key_hash, ApiKey.is_active == True)  # noqa: E712
-    )
-    api_key_obj = result.scalar_one_or_none()
-    if not api_key_obj:
-        return None
+    entry = await auth_cache.get_api_key(key_hash)
+    if entry:
+        user_id, key_id = UUID(entry["user_id"]), UUID(entry["key_id"])
+    else:
+        result = await db.execute(
+            select(ApiKey.id, ApiKey.user_id).where(
+                ApiKey.key_hash == key_hash, ApiKey.is_active == True  # noqa: E712
+            )
+        )
+        row = result.one_or_none()
+        if not row:
+            return None
+        key_id, user_id = row
+        await auth_cache.set_api_key(key_hash, user_id, key_id)
+
+    user = await get_user_by_id(db, user_id)
+    if user:
+        auth_cache.record_api_key_use(key_id)
+    return user
+
+
+async def get_user_by_id(db: AsyncSession, user_id: UUID) -> User | None:
+    """Load a user for authentication, served from the auth cache when possible."""
+    snapshot = await auth_cache.get_user(user_id)
+    if snapshot:
+        created_at = snapshot.get("created_at")
+        return User(
+            id=UUID(snapshot["id"]),
+            email=snapshot["email"],
+            name=snapshot.get("name"),
+            is_verified=snapshot.get("is_verified", False),
+            created_at=datetime.fromisoformat(created_at) if created_at else None,
+        )
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user:
+        await auth_cache.set_user(user)
+    return user
 
-    # Update last used
-    api_key_obj.last_used_at = datetime.now(timezone.utc)
 
-    # Get user
-    result = await db.execute(select(User).where(User.id == api_key_obj.user_id))
-    return result.scalar_one_or_none()
+async def flush_api_key_last_used(session_factory=None) -> int:
+    """Write buffered API key ``last_used_at`` stamps in one batch.
+
+    Returns the number of keys updated. Stamps are put back on failure so the
+    next flush retries them.
+    """
+    pending = auth_cache.drain_api_key_uses()
+    if not pending:
+        return 0
+    if session_factory is None:
+        from app.core.database import async_session as session_factory
+
+    try:
+        async with session_factory() as session:
+            await session.execute(
+                update(ApiKey),
+                [{"id": key_id, "last_used_at": ts} for key_id, ts in pending.items()],
+            )
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Failed to flush API key last_used_at ({len(pending)} keys): {e}")
+        auth_cache.requeue_api_key_uses(pending)
+        return 0
+    return len(pending)
+
+
+async def run_last_used_flusher() -> None:
+    """Flush ``last_used_at`` stamps every AUTH_LAST_USED_FLUSH_SECONDS until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(settings.AUTH_LAST_USED_FLUSH_SECONDS)
+            await flush_api_key_last_used()
+    finally:
+        await flush_api_key_last_used()
 
 
 async def get_user_api_keys(db: AsyncSession, user_id: UUID) -> list[ApiKey]:
@@ -108,6 +179,10 @@ async def revoke_api_key(db: AsyncSession, user_id: UUID, key_id: UUID) -> bool:
     if not api_key:
         return False
     api_key.is_active = False
+    # Commit before invalidating so a concurrent request can't re-cache the
+    # key from the still-active row.
+    await db.commit()
+    await auth_cache.invalidate_api_key(api_key.key_hash)
     return True
 
 
@@ -157,6 +232,7 @@ async def reset_password(db: AsyncSession, token: str, new_password: str) -> boo
     user.password_hash = hash_password(new_password)
     reset_token.used = True
     await db.flush()
+    await auth_cache.invalidate_user(user.id)
     return True
 
 
@@ -201,4 +277,5 @@ async def verify_email(db: AsyncSession, token: str) -> bool:
     user.is_verified = True
     verification_token.used = True
     await db.flush()
+    await auth_cache.invalidate_user(user.id)
     return True
@@ -0,0 +1,415 @@
+"""
+Content-addressed blob store for large page payloads.
+
+Markdown, HTML and screenshots at or above ``BLOB_STORE_MIN_BYTES`` are
+compressed and written once under the SHA-256 of their raw bytes. The
+JobResult row keeps only ``blobs = {field: digest}`` and a NULL column, so
+re-crawls, monitors and cache hits that produce the same page share one
+object and Postgres stops carrying multi-megabyte TOAST values.
+
+Backends: ``local`` (sharded directory tree) and ``s3`` (any S3-compatible
+endpoint — AWS, MinIO, R2). Compression is zstd when ``zstandard`` is
+installed, zlib otherwise; the codec is detected from the stored bytes, so
+a store can hold both.
+
+Readers call ``hydrate_results`` on the rows they are about to serialize;
+loaded values are set as committed state so the session never writes them
+back.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# JobResult columns eligible for offloading
+BLOB_FIELDS = ("markdown", "html", "screenshot_url")
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_HYDRATE_CONCURRENCY = 8
+
+try:
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on environment
+    _zstd = None
+
+
+def compress(data: bytes, level: int | None = None) -> bytes:
+    """zstd when available, zlib otherwise."""
+    level = settings.BLOB_STORE_ZSTD_LEVEL if level is None else level
+    if _zstd is not None:
+        return _zstd.ZstdCompressor(level=level).compress(data)
+    return zlib.compress(data, min(max(level, 1), 9))
+
+
+def decompress(payload: bytes) -> bytes:
+    if payload[:4] == _ZSTD_MAGIC:
+        if _zstd is None:
+            raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+        return _zstd.ZstdDecompressor().decompress(payload)
+    return zlib.decompress(payload)
+
+
+def digest_of(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Compress/dedup/thread-offload around a synchronous raw backend.
+
+    Subclasses implement ``_exists``, ``_touch``, ``_write``, ``_read``,
+    ``_delete`` and ``_list`` on compressed payloads.
+    """
+
+    name = "base"
+
+    async def put(self, data: bytes) -> str:
+        """Store ``data`` and return its digest. Existing blobs are only
+        touched, which keeps them clear of the orphan sweep's grace window."""
+        digest = digest_of(data)
+        await asyncio.to_thread(self._put_sync, digest, data)
+        return digest
+
+    def _put_sync(self, digest: str, data: bytes) -> None:
+        if self._exists(digest):
+            self._touch(digest)
+            return
+        self._write(digest, compress(data))
+
+    async def get(self, digest: str) -> bytes | None:
+        return await asyncio.to_thread(self._get_sync, digest)
+
+    def _get_sync(self, digest: str) -> bytes | None:
+        payload = self._read(digest)
+        return decompress(payload) if payload is not None else None
+
+    async def delete(self, digest: str) -> None:
+        await asyncio.to_thread(self._delete, digest)
+
+    async def list_older_than(self, cutoff: float) -> list[str]:
+        """Digests last written/touched before ``cutoff`` (epoch seconds)."""
+        return await asyncio.to_thread(lambda: list(self._list(cutoff)))
+
+    @abstractmethod
+    def _exists(self, digest: str) -> bool:
+        pass
+
+    @abstractmethod
+    def _touch(self, digest: str) -> None:
+        pass
+
+    @abstractmethod
+    def _write(self, digest: str, payload: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def _read(self, digest: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def _delete(self, digest: str) -> None:
+        pass
+
+    @abstractmethod
+    def _list(self, cutoff: float) -> Iterable[str]:
+        pass
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs under ``{root}/ab/cd/abcd...``; writes are temp-file + rename."""
+
+    name = "local"
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def _exists(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def _touch(self, digest: str) -> None:
+        try:
+            os.utime(self._path(digest))
+        except OSError:
+            pass
+
+    def _write(self, digest: str, payload: bytes) -> None:
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _read(self, digest: str) -> bytes | None:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _delete(self, digest: str) -> None:
+        try:
+            self._path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _list(self, cutoff: float) -> Iterable[str]:
+        if not self.root.exists():
+            return
+        for path in self.root.glob("??/??/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    yield path.name
+            except FileNotFoundError:
+                continue
+
+
+class S3BlobStore(BlobStore):
+    """Blobs as ``{prefix}{digest}`` objects in an S3-compatible bucket.
+
+    ``client`` is any object with boto3's S3 client methods; by default one
+    is built lazily from the BLOB_STORE_S3_* settings.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        client=None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url or None
+        self.region = region or None
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client(
+                "s3", endpoint_url=self.endpoint_url, region_name=self.region
+            )
+        return self._client
+
+    def _key(self, digest: str) -> str:
+        return f"{self.prefix}{digest}"
+
+    @staticmethod
+    def _is_missing(exc: Exception) -> bool:
+        code = str(getattr(exc, "response", {}).get("Error", {}).get("Code", ""))
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def _exists(self, digest: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(digest))
+            return True
+        except Exception as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def _touch(self, digest: str) -> None:
+        # Self-copy refreshes LastModified for the orphan sweep
+        key = self._key(digest)
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={"Bucket": self.bucket, "Key": key},
+                MetadataDirective="REPLACE",
+            )
+        except Exception as e:
+            logger.debug(f"Blob touch failed for {digest}: {e}")
+
+    def _write(self, digest: str, payload: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(digest), Body=payload)
+
+    def _read(self, digest: str) -> bytes | None:
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self._key(digest))
+        except Exception as e:
+            if self._is_missing(e):
+                return None
+            raise
+        return obj["Body"].read()
+
+    def _delete(self, digest: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(digest))
+
+    def _list(self, cutoff: float) -> Iterable[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                if obj["LastModified"].timestamp() < cutoff:
+                    yield obj["Key"][len(self.prefix):]
+
+
+_store: BlobStore | None = None
+
+
+def get_blob_store() -> BlobStore | None:
+    """The configured store, or None when BLOB_STORE_BACKEND is empty."""
+    global _store
+    backend = settings.BLOB_STORE_BACKEND.lower()
+    if not backend:
+        return None
+    if _store is None or _store.name != backend:
+        if backend == "local":
+            _store = LocalBlobStore(settings.BLOB_STORE_PATH)
+        elif backend == "s3":
+            _store = S3BlobStore(
+                settings.BLOB_STORE_S3_BUCKET,
+                settings.BLOB_STORE_S3_PREFIX,
+                settings.BLOB_STORE_S3_ENDPOINT_URL,
+                settings.BLOB_STORE_S3_REGION,
+            )
+        else:
+            raise ValueError(f"Unknown BLOB_STORE_BACKEND: {backend}")
+    return _store
+
+
+async def offload_result(job_result) -> None:
+    """Move large payload columns of an unsaved JobResult into the store.
+
+    A store failure leaves the value inline — the row is still written.
+    """
+    store = get_blob_store()
+    if store is None:
+        return
+    refs = dict(job_result.blobs or {})
+    for field in BLOB_FIELDS:
+        value = getattr(job_result, field)
+        if not value:
+            continue
+        data = value.encode("utf-8")
+        if len(data) < settings.BLOB_STORE_MIN_BYTES:
+            continue
+        try:
+            refs[field] = await store.put(data)
+        except Exception as e:
+            logger.warning(f"Blob offload of {field} failed, storing inline: {e}")
+            continue
+        setattr(job_result, field, None)
+    if refs:
+        job_result.blobs = refs
+
+
+async def hydrate_results(results, fields: Iterable[str] = BLOB_FIELDS) -> None:
+    """Load blob-backed fields of ``results`` in place (concurrently).
+
+    Values are set as committed state, so hydrated rows stay clean in the
+    session. Missing blobs are logged and left as None.
+    """
+    from sqlalchemy.orm.attributes import set_committed_value
+
+    wanted = set(fields)
+    pending = [
+        (r, field, digest)
+        for r in results
+        for field, digest in (r.blobs or {}).items()
+        if field in wanted and getattr(r, field) is None
+    ]
+    if not pending:
+        return
+    store = get_blob_store()
+    if store is None:
+        logger.warning("Results reference blobs but BLOB_STORE_BACKEND is not set")
+        return
+
+    semaphore = asyncio.Semaphore(_HYDRATE_CONCURRENCY)
+
+    async def _load(r, field, digest):
+        async with semaphore:
+            try:
+                data = await store.get(digest)
+            except Exception as e:
+                logger.warning(f"Blob read failed for {digest}: {e}")
+                return
+        if data is None:
+            logger.warning(f"Blob {digest} missing for result {r.id} ({field})")
+            return
+        set_committed_value(r, field, data.decode("utf-8"))
+
+    await asyncio.gather(*(_load(*item) for item in pending))
+
+
+async def iter_hydrated(results, batch_size: int = 20, fields: Iterable[str] = BLOB_FIELDS):
+    """Yield ``results`` one by one, hydrating a batch at a time — for
+    exports and streams that should not pull every blob up front. Values
+    loaded for a batch are dropped again once the consumer moves past it."""
+    from sqlalchemy.orm.attributes import set_committed_value
+
+    fields = tuple(fields)
+    for start in range(0, len(results), batch_size):
+        batch = results[start:start + batch_size]
+        await hydrate_results(batch, fields)
+        for r in batch:
+            yield r
+        for r in batch:
+            for field in r.blobs or ():
+                if field in fields:
+                    set_committed_value(r, field, None)
+
+
+async def sweep_orphans(db, store: BlobStore, grace_seconds: float, chunk_size: int = 5000) -> int:
+    """Delete blobs no JobResult references, sparing any written or touched
+    within ``grace_seconds`` (rows may still be in flight). Returns the
+    number of blobs deleted."""
+    from sqlalchemy import select
+
+    from app.models.job_result import JobResult
+
+    cutoff = time.time() - grace_seconds
+    candidates = set(await store.list_older_than(cutoff))
+    if not candidates:
+        return 0
+
+    last_id = None
+    while candidates:
+        query = (
+            select(JobResult.id, JobResult.blobs)
+            .where(JobResult.blobs.is_not(None))
+            .order_by(JobResult.id)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            query = query.where(JobResult.id > last_id)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            break
+        for row in rows:
+            candidates.difference_update((row.blobs or {}).values())
+        last_id = rows[-1].id
+
+    # A blob re-put during the scan was touched; listing again drops it
+    candidates &= set(await store.list_older_than(cutoff))
+    for digest in candidates:
+        await store.delete(digest)
+    return len(candidates)
@@ -0,0 +1,379 @@
+"""Block-page detection for scraped HTML.
+
+The detector runs on every candidate of every strategy race, so it is built
+for speed on multi-MB pages:
+
+- The visible body text is produced by a single tokenizer pass (one
+  compiled alternation that skips <script>/<style>/<noscript> blocks and
+  tags) that stops as soon as the page has more visible text than any
+  block page could have.
+- All block / soft-404 / head phrases live in one deduplicated pattern set
+  that is scanned once over the (short) visible text; every check then
+  reads from that result instead of running its own substring scans.
+  (CPython's substring search beats a regex alternation on these sizes.)
+
+detect_block() returns a BlockCheck with a reason code; get_vendor_block()
+identifies the bot-protection vendor for user-facing error messages.
+"""
+
+import re
+
+# ---------------------------------------------------------------------------
+# Patterns
+# ---------------------------------------------------------------------------
+
+_BLOCK_PATTERNS = [
+    "javascript is disabled",
+    "enable javascript",
+    "requires javascript",
+    "javascript is required",
+    "please enable javascript",
+    "you need to enable javascript",
+    "this page requires javascript",
+    "turn on javascript",
+    "activate javascript",
+    "captcha",
+    "verify you are human",
+    "verify you're human",
+    "are you a robot",
+    "not a robot",
+    "bot detection",
+    "access denied",
+    "please verify",
+    "unusual traffic",
+    "automated access",
+    "checking your browser",
+    "just a moment",
+    "attention required",
+    "please wait while we verify",
+    "ray id",
+    "performance & security by cloudflare",
+    "sucuri website firewall",
+    "pardon our interruption",
+    "press & hold",
+    "blocked by",
+    "we need to verify that you're not a robot",
+    "sorry, we just need to make sure",
+    "one more step",
+    "please click here if you are not redirected",
+    "if you are not redirected within",
+    "having trouble accessing google",
+    # Akamai Bot Manager
+    "your connection needs to be verified",
+    "connection is being verified",
+    "please verify your identity",
+    # PerimeterX / HUMAN Security
+    "robot or human",
+    "activate and hold",
+    "confirm that you're human",
+    "confirm you are human",
+]
+
+# Signals that never appear in normal content — checked on medium pages too
+_STRONG_BLOCK_PATTERNS = [
+    "checking your browser",
+    "just a moment",
+    "attention required",
+    "please wait while we verify",
+    "performance & security by cloudflare",
+    "sucuri website firewall",
+    "your connection needs to be verified",
+    "robot or human",
+    "activate and hold",
+    "confirm that you're human",
+    "confirm you are human",
+]
+
+# Checked in the first 5000 chars of raw HTML. Avoids generic words like
+# "captcha" / "robot" which appear in normal content.
+_HEAD_PATTERNS = [
+    "javascript is disabled",
+    "enable javascript",
+    "attention required",
+    "just a moment",
+    "checking your browser",
+    "please wait while we verify",
+    "verify you are human",
+    "are you a robot",
+    "not a robot",
+    "please click here if you are not redirected",
+    "having trouble accessing google",
+]
+
+# Amazon-style "no session" interstitial — two of these on a short page
+_AMAZON_INTERSTITIAL_PATTERNS = [
+    "continue shopping",
+    "conditions of use",
+    "privacy notice",
+]
+
+_SOFT_404_PATTERNS = [
+    "page not found", "page doesn't exist", "page does not exist",
+    "this page isn't available", "this page is not available",
+    "no longer available", "has been removed", "has been deleted",
+    "404 - not found", "404 not found", "error 404",
+    "sorry, we couldn't find", "sorry, we could not find",
+    "the page you requested", "the page you were looking for",
+    "nothing here", "content not found",
+]
+
+# Visible-text thresholds (chars, whitespace-collapsed)
+_MAX_BLOCK_TEXT = 3000  # Above this a page is never a block page
+_MEDIUM_TEXT = 800  # Below this every block pattern is checked
+_SHORT_TEXT = 500  # Interstitial / soft-404 checks
+_NOSCRIPT_TEXT = 300  # noscript + body shorter than this = block
+_HEAD_CHARS = 5000
+
+# Reason codes
+REASON_EMPTY = "empty"
+REASON_CHALLENGE_ELEMENT = "challenge_element"
+REASON_STRONG_PATTERN = "strong_pattern"
+REASON_BLOCK_PATTERN = "block_pattern"
+REASON_HEAD_PATTERN = "head_pattern"
+REASON_NOSCRIPT = "noscript_short_body"
+REASON_GOOGLE_INTERSTITIAL = "google_interstitial"
+REASON_AMAZON_INTERSTITIAL = "amazon_interstitial"
+REASON_SOFT_404 = "soft_404"
+
+# ---------------------------------------------------------------------------
+# Compiled matchers
+# ---------------------------------------------------------------------------
+
+_BODY_OPEN_RE = re.compile(r"<body[^>]*>", re.IGNORECASE)
+_BODY_CLOSE_RE = re.compile(r"</body>", re.IGNORECASE)
+# One token per hidden block (script/style/noscript incl. content) or tag
+_HIDDEN_OR_TAG_RE = re.compile(
+    r"<(script|style|noscript)[^>]*>.*?</\1>|<[^>]+>",
+    re.DOTALL | re.IGNORECASE,
+)
+_NOSCRIPT_RE = re.compile(r"<noscript", re.IGNORECASE)
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+# PerimeterX / HUMAN challenge element ids/classes
+_CHALLENGE_ELEMENTS = ("px-captcha", "human-challenge")
+# One case-insensitive pass over the raw HTML, without lowering all of it
+_CHALLENGE_ELEMENT_RE = re.compile(
+    "|".join(re.escape(e) for e in _CHALLENGE_ELEMENTS), re.IGNORECASE
+)
+
+# Markup only challenge interstitials carry, checked in the first
+# _SIGNATURE_CHARS of raw HTML. Safe to abort a download on.
+_CHALLENGE_SIGNATURES = _CHALLENGE_ELEMENTS + (
+    "window._cf_chl_opt",
+    "cf-browser-verification",
+    "<title>just a moment...</title>",
+    "<title>attention required! | cloudflare</title>",
+)
+_SIGNATURE_CHARS = 16384
+
+_TEXT_PATTERNS = tuple(
+    dict.fromkeys(
+        _BLOCK_PATTERNS
+        + _STRONG_BLOCK_PATTERNS
+        + _HEAD_PATTERNS
+        + _AMAZON_INTERSTITIAL_PATTERNS
+        + _SOFT_404_PATTERNS
+    )
+)
+
+
+def _find_patterns(text: str, patterns: tuple[str, ...] = _TEXT_PATTERNS) -> set[str]:
+    """All of ``patterns`` that occur in ``text`` (one scan per distinct pattern)."""
+    return {p for p in patterns if p in text}
+
+
+def _first_match(patterns: list[str], found: set[str]) -> str | None:
+    """First pattern of ``patterns`` (list order) that was found."""
+    for p in patterns:
+        if p in found:
+            return p
+    return None
+
+
+def find_challenge_signature(html: str) -> str | None:
+    """Return the challenge-page signature in the document head, if any."""
+    head = html[:_SIGNATURE_CHARS].lower()
+    for signature in _CHALLENGE_SIGNATURES:
+        if signature in head:
+            return signature
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Visible text
+# ---------------------------------------------------------------------------
+
+
+def visible_body_text(html: str, limit: int | None = None) -> tuple[str, bool]:
+    """Lower-cased, whitespace-collapsed visible text of the page body.
+
+    Script, style and noscript blocks and all tags are removed in a single
+    pass. With ``limit``, scanning stops once the text is longer than
+    ``limit`` chars and ``(partial_text, True)`` is returned.
+    """
+    start, end = 0, len(html)
+    body_open = _BODY_OPEN_RE.search(html)
+    if body_open:
+        body_close = _BODY_CLOSE_RE.search(html, body_open.end())
+        if body_close:
+            start, end = body_open.end(), body_close.start()
+
+    words: list[str] = []
+    length = -1  # chars of " ".join(words)
+    pos = start
+    truncated = False
+    tokens = _HIDDEN_OR_TAG_RE.finditer(html, start, end)
+    while pos < end:
+        token = next(tokens, None)
+        stop = token.start() if token else end
+        if stop > pos:
+            chunk = html[pos:stop].split()
+            if chunk:
+                words.extend(chunk)
+                length += sum(map(len, chunk)) + len(chunk)
+                if limit is not None and length > limit:
+                    truncated = True
+                    break
+        if token is None:
+            break
+        pos = token.end()
+
+    return " ".join(words).lower(), truncated
+
+
+# ---------------------------------------------------------------------------
+# Detection
+# ---------------------------------------------------------------------------
+
+
+class BlockCheck:
+    """Outcome of detect_block(). Truthy when the page looks blocked."""
+
+    __slots__ = ("blocked", "reason", "pattern", "text_len")
+
+    def __init__(
+        self,
+        blocked: bool,
+        reason: str | None = None,
+        pattern: str | None = None,
+        text_len: int = 0,
+    ):
+        self.blocked = blocked
+        self.reason = reason
+        self.pattern = pattern
+        self.text_len = text_len
+
+    def __bool__(self) -> bool:
+        return self.blocked
+
+    def __repr__(self) -> str:
+        return (
+            f"BlockCheck(blocked={self.blocked}, reason={self.reason!r}, "
+            f"pattern={self.pattern!r}, text_len={self.text_len})"
+        )
+
+
+def detect_block(html: str | None) -> BlockCheck:
+    """Classify a page as a block/challenge/soft-404 page or real content."""
+    if not html:
+        return BlockCheck(True, REASON_EMPTY)
+
+    body_text, truncated = visible_body_text(html, limit=_MAX_BLOCK_TEXT)
+    text_len = len(body_text)
+
+    # Bot detection service structural fingerprints — checked on raw HTML
+    # regardless of text length. Unique to challenge pages.
+    element = _CHALLENGE_ELEMENT_RE.search(html)
+    if element:
+        return BlockCheck(True, REASON_CHALLENGE_ELEMENT, element.group(0).lower(), text_len)
+    signature = find_challenge_signature(html)
+    if signature:
+        return BlockCheck(True, REASON_CHALLENGE_ELEMENT, signature, text_len)
+
+    # Pages with substantial visible text content are never block pages
+    if truncated:
+        return BlockCheck(False, text_len=text_len)
+
+    found = _find_patterns(body_text)
+
+    if _MEDIUM_TEXT <= text_len <= _MAX_BLOCK_TEXT:
+        hit = _first_match(_STRONG_BLOCK_PATTERNS, found)
+        if hit:
+            return BlockCheck(True, REASON_STRONG_PATTERN, hit, text_len)
+
+    # Every block pattern only on very short pages — moderate pages may
+    # mention "captcha" in a footer link or script ref.
+    if text_len < _MEDIUM_TEXT:
+        hit = _first_match(_BLOCK_PATTERNS, found)
+        if hit:
+            return BlockCheck(True, REASON_BLOCK_PATTERN, hit, text_len)
+
+    head_found = _find_patterns(html[:_HEAD_CHARS].lower(), _HEAD_PATTERNS)
+    hit = _first_match(_HEAD_PATTERNS, head_found)
+    if hit:
+        return BlockCheck(True, REASON_HEAD_PATTERN, hit, text_len)
+
+    if text_len < _NOSCRIPT_TEXT and _NOSCRIPT_RE.search(html):
+        return BlockCheck(True, REASON_NOSCRIPT, "<noscript", text_len)
+
+    if text_len < _SHORT_TEXT:
+        # Google redirect/interstitial page (from Google Cache attempts)
+        title = _TITLE_RE.search(html)
+        if title and "google" in title.group(1).lower():
+            return BlockCheck(True, REASON_GOOGLE_INTERSTITIAL, "google", text_len)
+
+        if sum(1 for p in _AMAZON_INTERSTITIAL_PATTERNS if p in found) >= 2:
+            return BlockCheck(True, REASON_AMAZON_INTERSTITIAL, None, text_len)
+
+        hit = _first_match(_SOFT_404_PATTERNS, found)
+        if hit:
+            return BlockCheck(True, REASON_SOFT_404, hit, text_len)
+
+    return BlockCheck(False, text_len=text_len)
+
+
+def looks_noscript_block(html: str) -> bool:
+    """noscript tag + short visible body — an IP/session-level block on
+    hard sites like Amazon."""
+    if not _NOSCRIPT_RE.search(html):
+        return False
+    body_text, truncated = visible_body_text(html, limit=_NOSCRIPT_TEXT)
+    return not truncated and len(body_text) < _NOSCRIPT_TEXT
+
+
+# ---------------------------------------------------------------------------
+# Vendor identification (user-facing block reasons)
+# ---------------------------------------------------------------------------
+
+_VENDOR_CLOUDFLARE = ("cloudflare", "performance & security by", "ray id", "checking your browser")
+_VENDOR_CAPTCHA = ("captcha", "recaptcha", "hcaptcha", "verify you are human", "verify you're human")
+_VENDOR_AKAMAI = ("akamai", "your connection needs to be verified", "connection is being verified")
+_VENDOR_JS = ("javascript is disabled", "enable javascript", "requires javascript")
+
+# (keywords, vendor code) in priority order
+_VENDOR_RULES = (
+    (_VENDOR_CLOUDFLARE, "cloudflare"),
+    (_VENDOR_CAPTCHA, "captcha"),
+    (("datadome",), "datadome"),
+    (("perimeterx",), "perimeterx"),
+    (("sucuri",), "sucuri"),
+    (("incapsula",), "incapsula"),
+    (_VENDOR_AKAMAI, "akamai"),
+    (("access denied", "403 forbidden"), "access_denied"),
+    (_VENDOR_JS, "javascript"),
+)
+
+
+def get_vendor_block(html: str | None) -> str | None:
+    """Identify the protection behind a block page (first rule that matches).
+
+    Returns a vendor code ("cloudflare", "captcha", "datadome", "perimeterx",
+    "sucuri", "incapsula", "akamai", "access_denied", "javascript") or None.
+    """
+    if not html:
+        return None
+    html_lower = html.lower()
+    for keywords, vendor in _VENDOR_RULES:
+        if any(k in html_lower for k in keywords):
+            return vendor
+    return None
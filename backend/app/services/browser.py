@@ -1,13 +1,22 @@
+from __future__ import annotations
+
 import asyncio
 import base64
 import logging
 import random
+import re
 import time
 from contextlib import asynccontextmanager
-
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from typing import TYPE_CHECKING
 
 from app.config import settings
+from app.services.memory_adaptive import MemoryAdaptiveSemaphore
+from app.services.resource_governor import governor
+
+if TYPE_CHECKING:
+    # Playwright itself is imported on first launch (see BrowserPool.initialize)
+    # so processes that never open a browser don't pay for it at startup
+    from playwright.async_api import Browser, BrowserContext, Page
 
 logger = logging.getLogger(__name__)
 
@@ -763,6 +772,112 @@ Object.defineProperty(document, 'visibilityState', {{ get: () => 'visible' }});
 """
 
 
+def _build_context_options(is_firefox: bool) -> tuple[dict, str]:
+    """Pick a random session fingerprint and build context options for it.
+
+    Returns (context_kwargs, stealth_script) — the stealth script is
+    parameterized with the same fingerprint so UA/WebGL/hardware stay
+    consistent within one context.
+    """
+    vp = random.choice(VIEWPORTS)
+    tz = random.choice(TIMEZONES)
+    hw_concurrency = random.choice([4, 8, 12, 16])
+    device_mem = random.choice([4, 8, 16])
+    webgl_vendor, webgl_renderer = random.choice(WEBGL_RENDERERS)
+    color_depth = random.choice(COLOR_DEPTHS)
+
+    if is_firefox:
+        ua = random.choice(FIREFOX_USER_AGENTS)
+        context_kwargs = dict(
+            user_agent=ua,
+            viewport=vp,
+            locale="en-US",
+            timezone_id=tz,
+            ignore_https_errors=True,
+            java_script_enabled=True,
+            has_touch=False,
+            is_mobile=False,
+            color_scheme="light",
+            extra_http_headers={
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.5",
+                "Accept-Encoding": "gzip, deflate, br",
+                "DNT": "1",
+                "Sec-Fetch-Dest": "document",
+                "Sec-Fetch-Mode": "navigate",
+                "Sec-Fetch-Site": "none",
+                "Sec-Fetch-User": "?1",
+                "Upgrade-Insecure-Requests": "1",
+            },
+        )
+        return context_kwargs, _build_firefox_stealth(hw_concurrency)
+
+    ua = random.choice(CHROME_USER_AGENTS)
+    # Build dynamic Sec-Ch-Ua from the UA string
+    _m = re.search(r"Chrome/(\d+)", ua)
+    _chrome_ver = _m.group(1) if _m else "125"
+    context_kwargs = dict(
+        user_agent=ua,
+        viewport=vp,
+        locale="en-US",
+        timezone_id=tz,
+        ignore_https_errors=True,
+        java_script_enabled=True,
+        has_touch=False,
+        is_mobile=False,
+        color_scheme="light",
+        extra_http_headers={
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Sec-Ch-Ua": f'"Chromium";v="{_chrome_ver}", "Google Chrome";v="{_chrome_ver}", "Not-A.Brand";v="24"',
+            "Sec-Ch-Ua-Mobile": "?0",
+            "Sec-Ch-Ua-Platform": '"Windows"'
+            if "Win" in ua
+            else '"macOS"'
+            if "Mac" in ua
+            else '"Linux"',
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "none",
+            "Sec-Fetch-User": "?1",
+            "Upgrade-Insecure-Requests": "1",
+        },
+    )
+    script = _build_chromium_stealth(
+        webgl_vendor,
+        webgl_renderer,
+        color_depth,
+        hw_concurrency,
+        device_mem,
+    )
+    return context_kwargs, script
+
+
+class _WarmContext:
+    """A pre-created, pre-scripted BrowserContext waiting in the context pool.
+
+    ``domain`` is None while the context is fresh; once it has served a page
+    it is bound to that page's domain and only reused for the same domain.
+    """
+
+    __slots__ = ("context", "browser", "is_firefox", "stealth", "domain", "uses")
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        browser: Browser,
+        is_firefox: bool,
+        stealth: bool,
+    ):
+        self.context = context
+        self.browser = browser
+        self.is_firefox = is_firefox
+        self.stealth = stealth
+        self.domain: str | None = None
+        self.uses = 0
+
+
 class BrowserPool:
     """Manages pools of Chromium and Firefox browsers for concurrent scraping.
 
@@ -804,8 +919,8 @@ class BrowserPool:
         self._playwright = None
         self._chromium: Browser | None = None
         self._firefox: Browser | None = None
-        self._chromium_semaphore: asyncio.Semaphore | None = None
-        self._firefox_semaphore: asyncio.Semaphore | None = None
+        self._chromium_semaphore: MemoryAdaptiveSemaphore | None = None
+        self._firefox_semaphore: MemoryAdaptiveSemaphore | None = None
         self._initialized = False
         self._loop = None
         self._init_lock: asyncio.Lock | None = None
@@ -814,6 +929,11 @@ class BrowserPool:
         self._cookie_jar: dict[str, tuple[float, list[dict]]] = {}
         self._cookie_jar_ttl: float = 1800.0  # 30 minutes
         self._cookie_jar_max_domains: int = 50
+        # Warm context pool: (is_firefox, stealth) -> idle pre-built contexts.
+        # Refilled in the background so context creation + stealth injection
+        # stays off the scrape critical path.
+        self._warm_contexts: dict[tuple[bool, bool], list[_WarmContext]] = {}
+        self._refill_task: asyncio.Task | None = None
 
     def _get_init_lock(self) -> asyncio.Lock:
         """Get or create an asyncio.Lock bound to the current event loop."""
@@ -838,6 +958,7 @@ class BrowserPool:
 
             if self._initialized and self._loop is not current_loop:
                 logger.debug("Event loop changed, reinitializing browser pool")
+                self._drop_warm_contexts()
                 self._force_kill_old_browsers()
                 self._playwright = None
                 self._chromium = None
@@ -851,6 +972,7 @@ class BrowserPool:
                 logger.warning(
                     "Chromium browser disconnected, reinitializing browser pool"
                 )
+                self._drop_warm_contexts()
                 self._force_kill_old_browsers()
                 self._playwright = None
                 self._chromium = None
@@ -858,8 +980,10 @@ class BrowserPool:
                 self._initialized = False
 
             self._loop = current_loop
-            self._chromium_semaphore = asyncio.Semaphore(settings.CHROMIUM_POOL_SIZE)
-            self._firefox_semaphore = asyncio.Semaphore(settings.FIREFOX_POOL_SIZE)
+            self._chromium_semaphore = governor.limiter("chromium", settings.CHROMIUM_POOL_SIZE)
+            self._firefox_semaphore = governor.limiter("firefox", settings.FIREFOX_POOL_SIZE)
+            from playwright.async_api import async_playwright
+
             self._playwright = await async_playwright().start()
 
             # Chromium with anti-detection flags
@@ -875,6 +999,7 @@ class BrowserPool:
             logger.info(
                 f"Browser pool initialized (chromium={settings.CHROMIUM_POOL_SIZE}, firefox={settings.FIREFOX_POOL_SIZE})"
             )
+            self._schedule_refill()
 
     async def _ensure_firefox(self):
         """Lazy-launch Firefox on first use."""
@@ -943,6 +1068,10 @@ class BrowserPool:
             pass
 
     async def shutdown(self):
+        warm = [w for pool in self._warm_contexts.values() for w in pool]
+        self._drop_warm_contexts()
+        for w in warm:
+            await self._close_context_quietly(w.context)
         if self._firefox:
             await self._firefox.close()
         if self._chromium:
@@ -972,9 +1101,17 @@ class BrowserPool:
                 return False
             return True
 
-        # Close orphaned contexts — between tasks, no contexts should exist
+        # Close orphaned contexts — between tasks, only pooled (idle) warm
+        # contexts should exist
         try:
-            orphaned = self._chromium.contexts
+            pooled = {
+                id(w.context)
+                for pool in self._warm_contexts.values()
+                for w in pool
+            }
+            orphaned = [
+                ctx for ctx in self._chromium.contexts if id(ctx) not in pooled
+            ]
             if orphaned:
                 logger.warning(
                     f"Health check: closing {len(orphaned)} orphaned browser contexts"
@@ -990,8 +1127,9 @@ class BrowserPool:
         # Reset semaphores — previous task may have leaked slots (crashed
         # CrawlSession, cancelled race strategies, etc.). Between tasks no
         # browser contexts should be active, so semaphores should be full.
-        self._chromium_semaphore = asyncio.Semaphore(settings.CHROMIUM_POOL_SIZE)
-        self._firefox_semaphore = asyncio.Semaphore(settings.FIREFOX_POOL_SIZE)
+        # The governor carries the current limits over to the new ones.
+        self._chromium_semaphore = governor.limiter("chromium", settings.CHROMIUM_POOL_SIZE)
+        self._firefox_semaphore = governor.limiter("firefox", settings.FIREFOX_POOL_SIZE)
         logger.info(
             f"Health check: semaphores reset "
             f"(chromium={settings.CHROMIUM_POOL_SIZE}, firefox={settings.FIREFOX_POOL_SIZE})"
@@ -1060,6 +1198,195 @@ class BrowserPool:
             ]
         )
 
+    # --- Warm context pool ---
+
+    async def _new_context(
+        self,
+        browser: Browser,
+        is_firefox: bool,
+        stealth: bool,
+        proxy: dict | None,
+    ) -> tuple[BrowserContext, Browser]:
+        """Create a fingerprinted context with ad blocking and stealth applied.
+
+        Relaunches the browser once if it turns out to be closed. Returns the
+        context and the (possibly relaunched) browser it belongs to.
+        """
+        context_kwargs, script = _build_context_options(is_firefox)
+        if proxy:
+            context_kwargs["proxy"] = proxy
+
+        # Try to create context, relaunch browser on failure
+        try:
+            context: BrowserContext = await browser.new_context(**context_kwargs)
+        except Exception as e:
+            if self._is_browser_closed_error(e):
+                logger.warning(
+                    f"Browser closed during new_context, relaunching {'Firefox' if is_firefox else 'Chromium'}"
+                )
+                await self._relaunch_browser(use_firefox=is_firefox)
+                browser = self._firefox if is_firefox else self._chromium
+                if browser is None:
+                    raise RuntimeError(
+                        f"{'Firefox' if is_firefox else 'Chromium'} browser failed to relaunch"
+                    ) from e
+                context = await browser.new_context(**context_kwargs)
+            else:
+                raise
+
+        # Block ads (always) — saves bandwidth, speeds up loads
+        await _setup_route_blocking(context, block_media=False)
+
+        if stealth:
+            await context.add_init_script(script)
+
+        return context, browser
+
+    def _take_warm_context(
+        self,
+        browser: Browser,
+        is_firefox: bool,
+        stealth: bool,
+        target_url: str | None,
+    ) -> _WarmContext | None:
+        """Pop a reusable warm context for this browser/stealth mode.
+
+        Prefers a context already bound to the target domain, then a fresh
+        one. Contexts bound to other domains are recycled (closed) so the
+        refill task replaces them with new fingerprints.
+        """
+        if settings.BROWSER_CONTEXT_POOL_SIZE <= 0:
+            return None
+
+        from app.core.metrics import browser_context_pool_total
+
+        pool = self._warm_contexts.get((is_firefox, stealth))
+        domain = self._get_domain(target_url) if target_url else None
+        chosen = None
+        if pool:
+            # Drop contexts left over from a crashed/relaunched browser
+            stale = [w for w in pool if w.browser is not browser]
+            for w in stale:
+                pool.remove(w)
+                self._close_in_background(w.context)
+
+            for w in pool:
+                if domain and w.domain == domain:
+                    chosen = w
+                    break
+            if chosen is None:
+                for w in pool:
+                    if w.domain is None:
+                        chosen = w
+                        break
+            if chosen is None and pool:
+                # Domain change — recycle the oldest bound context
+                self._close_in_background(pool.pop(0).context)
+            if chosen is not None:
+                pool.remove(chosen)
+
+        browser_context_pool_total.labels(
+            result="hit" if chosen is not None else "miss"
+        ).inc()
+        self._schedule_refill()
+        return chosen
+
+    def _return_warm_context(self, warm: _WarmContext, target_url: str | None) -> bool:
+        """Put a used context back into the pool. Returns False if it must be closed."""
+        warm.uses += 1
+        if warm.uses >= settings.BROWSER_CONTEXT_MAX_USES:
+            return False
+        current = self._firefox if warm.is_firefox else self._chromium
+        if warm.browser is not current or not warm.browser.is_connected():
+            return False
+        domain = self._get_domain(target_url) if target_url else None
+        if warm.domain is not None and domain != warm.domain:
+            return False
+        pool = self._warm_contexts.setdefault((warm.is_firefox, warm.stealth), [])
+        if len(pool) >= settings.BROWSER_CONTEXT_POOL_SIZE:
+            return False
+        warm.domain = domain
+        pool.append(warm)
+        return True
+
+    def _schedule_refill(self):
+        """Start the background refill task unless one is already running."""
+        if settings.BROWSER_CONTEXT_POOL_SIZE <= 0 or not self._initialized:
+            return
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        try:
+            self._refill_task = asyncio.get_running_loop().create_task(
+                self._refill_warm_contexts()
+            )
+        except RuntimeError:
+            self._refill_task = None
+
+    async def _refill_warm_contexts(self):
+        """Top up every pool to BROWSER_CONTEXT_POOL_SIZE fresh contexts.
+
+        Bounded: creates at most one pool's worth of contexts per mode and
+        gives up on the first error (the next get_page reschedules it).
+        Firefox is only warmed once it has been lazily launched.
+        """
+        from app.core.metrics import warm_browser_contexts
+
+        target = settings.BROWSER_CONTEXT_POOL_SIZE
+        modes = [(False, False), (False, True)]
+        if self._firefox is not None and self._firefox.is_connected():
+            modes += [(True, False), (True, True)]
+
+        for is_firefox, stealth in modes:
+            browser = self._firefox if is_firefox else self._chromium
+            if browser is None or not browser.is_connected():
+                continue
+            pool = self._warm_contexts.setdefault((is_firefox, stealth), [])
+            for _ in range(target):
+                if len(pool) >= target:
+                    break
+                try:
+                    context, _ = await self._new_context(
+                        browser, is_firefox, stealth, None
+                    )
+                except Exception as e:
+                    logger.debug(f"Warm context refill failed: {e}")
+                    return
+                if pool is not self._warm_contexts.get((is_firefox, stealth)):
+                    # Pool was dropped (loop change / shutdown) meanwhile
+                    await self._close_context_quietly(context)
+                    return
+                pool.append(_WarmContext(context, browser, is_firefox, stealth))
+            warm_browser_contexts.labels(
+                browser="firefox" if is_firefox else "chromium",
+                stealth=str(stealth).lower(),
+            ).set(len(pool))
+
+    def _drop_warm_contexts(self):
+        """Forget all pooled contexts and stop the refill task (no awaits).
+
+        Used when the event loop changes — the contexts belong to the old
+        browser processes which are killed separately.
+        """
+        if self._refill_task is not None and not self._refill_task.done():
+            self._refill_task.cancel()
+        self._refill_task = None
+        self._warm_contexts = {}
+
+    @staticmethod
+    async def _close_context_quietly(context: BrowserContext):
+        try:
+            await context.close()
+        except BaseException:
+            pass
+
+    def _close_in_background(self, context: BrowserContext):
+        try:
+            asyncio.get_running_loop().create_task(
+                self._close_context_quietly(context)
+            )
+        except RuntimeError:
+            pass
+
     @asynccontextmanager
     async def get_page(
         self,
@@ -1107,118 +1434,42 @@ class BrowserPool:
                     await self._relaunch_browser(use_firefox=is_firefox)
                     browser = self._firefox if is_firefox else self._chromium
 
-                vp = random.choice(VIEWPORTS)
-                tz = random.choice(TIMEZONES)
-
-                # Generate unique session fingerprint
-                hw_concurrency = random.choice([4, 8, 12, 16])
-                device_mem = random.choice([4, 8, 16])
-                webgl_vendor, webgl_renderer = random.choice(WEBGL_RENDERERS)
-                color_depth = random.choice(COLOR_DEPTHS)
-
-                if is_firefox:
-                    ua = random.choice(FIREFOX_USER_AGENTS)
-                    context_kwargs = dict(
-                        user_agent=ua,
-                        viewport=vp,
-                        locale="en-US",
-                        timezone_id=tz,
-                        ignore_https_errors=True,
-                        java_script_enabled=True,
-                        has_touch=False,
-                        is_mobile=False,
-                        color_scheme="light",
-                        extra_http_headers={
-                            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                            "Accept-Language": "en-US,en;q=0.5",
-                            "Accept-Encoding": "gzip, deflate, br",
-                            "DNT": "1",
-                            "Sec-Fetch-Dest": "document",
-                            "Sec-Fetch-Mode": "navigate",
-                            "Sec-Fetch-Site": "none",
-                            "Sec-Fetch-User": "?1",
-                            "Upgrade-Insecure-Requests": "1",
-                        },
+                # Prefer a pre-warmed context (fingerprint, routes and stealth
+                # script already applied). Proxied contexts are never pooled —
+                # the proxy is fixed at context creation time.
+                warm = None
+                if proxy is None:
+                    warm = self._take_warm_context(
+                        browser, is_firefox, stealth, target_url
                     )
+                from_pool = warm is not None
+                if from_pool:
+                    context = warm.context
                 else:
-                    ua = random.choice(CHROME_USER_AGENTS)
-                    # Build dynamic Sec-Ch-Ua from the UA string
-                    import re as _re
-                    _m = _re.search(r"Chrome/(\d+)", ua)
-                    _chrome_ver = _m.group(1) if _m else "125"
-                    context_kwargs = dict(
-                        user_agent=ua,
-                        viewport=vp,
-                        locale="en-US",
-                        timezone_id=tz,
-                        ignore_https_errors=True,
-                        java_script_enabled=True,
-                        has_touch=False,
-                        is_mobile=False,
-                        color_scheme="light",
-                        extra_http_headers={
-                            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                            "Accept-Language": "en-US,en;q=0.9",
-                            "Accept-Encoding": "gzip, deflate, br",
-                            "Sec-Ch-Ua": f'"Chromium";v="{_chrome_ver}", "Google Chrome";v="{_chrome_ver}", "Not-A.Brand";v="24"',
-                            "Sec-Ch-Ua-Mobile": "?0",
-                            "Sec-Ch-Ua-Platform": '"Windows"'
-                            if "Win" in ua
-                            else '"macOS"'
-                            if "Mac" in ua
-                            else '"Linux"',
-                            "Sec-Fetch-Dest": "document",
-                            "Sec-Fetch-Mode": "navigate",
-                            "Sec-Fetch-Site": "none",
-                            "Sec-Fetch-User": "?1",
-                            "Upgrade-Insecure-Requests": "1",
-                        },
+                    context, browser = await self._new_context(
+                        browser, is_firefox, stealth, proxy
                     )
-
-                if proxy:
-                    context_kwargs["proxy"] = proxy
-
-                # Try to create context, relaunch browser on failure
-                try:
-                    context: BrowserContext = await browser.new_context(
-                        **context_kwargs
-                    )
-                except Exception as e:
-                    if self._is_browser_closed_error(e):
-                        logger.warning(
-                            f"Browser closed during new_context, relaunching {'Firefox' if is_firefox else 'Chromium'}"
-                        )
-                        await self._relaunch_browser(use_firefox=is_firefox)
-                        browser = self._firefox if is_firefox else self._chromium
-                        if browser is None:
-                            raise RuntimeError(
-                                f"{'Firefox' if is_firefox else 'Chromium'} browser failed to relaunch"
-                            ) from e
-                        context = await browser.new_context(**context_kwargs)
-                    else:
-                        raise
-
-                # Block ads (always) — saves bandwidth, speeds up loads
-                await _setup_route_blocking(context, block_media=False)
+                    if proxy is None:
+                        warm = _WarmContext(context, browser, is_firefox, stealth)
 
                 # Restore cookies from previous sessions for this domain
                 if target_url:
                     await self._restore_cookies(context, target_url)
 
-                if stealth:
-                    if is_firefox:
-                        script = _build_firefox_stealth(hw_concurrency)
-                    else:
-                        script = _build_chromium_stealth(
-                            webgl_vendor,
-                            webgl_renderer,
-                            color_depth,
-                            hw_concurrency,
-                            device_mem,
-                        )
-                    await context.add_init_script(script)
-
-                page: Page = await context.new_page()
+                try:
+                    page: Page = await context.new_page()
+                except Exception:
+                    if not from_pool:
+                        raise
+                    # Pooled context died while idle — fall back to a fresh one
+                    await self._close_context_quietly(context)
+                    context, browser = await self._new_context(
+                        browser, is_firefox, stealth, None
+                    )
+                    warm = _WarmContext(context, browser, is_firefox, stealth)
+                    if target_url:
+                        await self._restore_cookies(context, target_url)
+                    page = await context.new_page()
                 try:
                     yield page
                 finally:
@@ -1227,7 +1478,7 @@ class BrowserPool:
                     # `except Exception` would miss it and leak page/context.
                     try:
                         await asyncio.shield(
-                            self._safe_cleanup_page(page, context, target_url)
+                            self._safe_cleanup_page(page, context, target_url, warm)
                         )
                     except (asyncio.CancelledError, Exception):
                         # shield raises CancelledError if outer task was cancelled,
@@ -1239,9 +1490,17 @@ class BrowserPool:
             semaphore.release()
 
     async def _safe_cleanup_page(
-        self, page: Page, context: BrowserContext, target_url: str | None
+        self,
+        page: Page,
+        context: BrowserContext,
+        target_url: str | None,
+        warm: _WarmContext | None = None,
     ):
-        """Cleanup page and context, safe against cancellation."""
+        """Cleanup page and context, safe against cancellation.
+
+        Poolable contexts are returned to the warm pool (cookies cleared —
+        the cookie jar restores them per domain) instead of being closed.
+        """
         if target_url:
             try:
                 await self._save_cookies(context, target_url)
@@ -1251,6 +1510,13 @@ class BrowserPool:
             await page.close()
         except BaseException:
             pass
+        if warm is not None:
+            try:
+                await context.clear_cookies()
+                if self._return_warm_context(warm, target_url):
+                    return
+            except BaseException:
+                pass
         try:
             await context.close()
         except BaseException:
@@ -1446,71 +1712,7 @@ class CrawlSession:
             await self._pool._relaunch_browser(use_firefox=is_firefox)
             browser = self._pool._firefox if is_firefox else self._pool._chromium
 
-        vp = random.choice(VIEWPORTS)
-        tz = random.choice(TIMEZONES)
-        hw_concurrency = random.choice([4, 8, 12, 16])
-        device_mem = random.choice([4, 8, 16])
-        webgl_vendor, webgl_renderer = random.choice(WEBGL_RENDERERS)
-        color_depth = random.choice(COLOR_DEPTHS)
-
-        if is_firefox:
-            ua = random.choice(FIREFOX_USER_AGENTS)
-            context_kwargs = dict(
-                user_agent=ua,
-                viewport=vp,
-                locale="en-US",
-                timezone_id=tz,
-                ignore_https_errors=True,
-                java_script_enabled=True,
-                has_touch=False,
-                is_mobile=False,
-                color_scheme="light",
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.5",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "DNT": "1",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Upgrade-Insecure-Requests": "1",
-                },
-            )
-        else:
-            ua = random.choice(CHROME_USER_AGENTS)
-            # Build dynamic Sec-Ch-Ua from the UA string
-            import re as _re
-            _m = _re.search(r"Chrome/(\d+)", ua)
-            _chrome_ver = _m.group(1) if _m else "125"
-            context_kwargs = dict(
-                user_agent=ua,
-                viewport=vp,
-                locale="en-US",
-                timezone_id=tz,
-                ignore_https_errors=True,
-                java_script_enabled=True,
-                has_touch=False,
-                is_mobile=False,
-                color_scheme="light",
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Sec-Ch-Ua": f'"Chromium";v="{_chrome_ver}", "Google Chrome";v="{_chrome_ver}", "Not-A.Brand";v="24"',
-                    "Sec-Ch-Ua-Mobile": "?0",
-                    "Sec-Ch-Ua-Platform": '"Windows"'
-                    if "Win" in ua
-                    else '"macOS"'
-                    if "Mac" in ua
-                    else '"Linux"',
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Upgrade-Insecure-Requests": "1",
-                },
-            )
+        context_kwargs, script = _build_context_options(is_firefox)
 
         if proxy:
             context_kwargs["proxy"] = proxy
@@ -1537,16 +1739,6 @@ class CrawlSession:
             await self._pool._restore_cookies(self._context, target_url)
 
         # Inject stealth script once on the context — applies to all pages
-        if is_firefox:
-            script = _build_firefox_stealth(hw_concurrency)
-        else:
-            script = _build_chromium_stealth(
-                webgl_vendor,
-                webgl_renderer,
-                color_depth,
-                hw_concurrency,
-                device_mem,
-            )
         await self._context.add_init_script(script)
 
         logger.info("CrawlSession started (persistent browser context)")
@@ -1614,72 +1806,7 @@ class CrawlSession:
             await self._pool._relaunch_browser(use_firefox=is_firefox)
             browser = self._pool._firefox if is_firefox else self._pool._chromium
 
-        vp = random.choice(VIEWPORTS)
-        tz = random.choice(TIMEZONES)
-        hw_concurrency = random.choice([4, 8, 12, 16])
-        device_mem = random.choice([4, 8, 16])
-        webgl_vendor, webgl_renderer = random.choice(WEBGL_RENDERERS)
-        color_depth = random.choice(COLOR_DEPTHS)
-
-        import re as _re
-
-        if is_firefox:
-            ua = random.choice(FIREFOX_USER_AGENTS)
-            context_kwargs = dict(
-                user_agent=ua,
-                viewport=vp,
-                locale="en-US",
-                timezone_id=tz,
-                ignore_https_errors=True,
-                java_script_enabled=True,
-                has_touch=False,
-                is_mobile=False,
-                color_scheme="light",
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.5",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "DNT": "1",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Upgrade-Insecure-Requests": "1",
-                },
-            )
-        else:
-            ua = random.choice(CHROME_USER_AGENTS)
-            # Build dynamic Sec-Ch-Ua from the UA string
-            _m = _re.search(r"Chrome/(\d+)", ua)
-            _chrome_ver = _m.group(1) if _m else "125"
-            context_kwargs = dict(
-                user_agent=ua,
-                viewport=vp,
-                locale="en-US",
-                timezone_id=tz,
-                ignore_https_errors=True,
-                java_script_enabled=True,
-                has_touch=False,
-                is_mobile=False,
-                color_scheme="light",
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Sec-Ch-Ua": f'"Chromium";v="{_chrome_ver}", "Google Chrome";v="{_chrome_ver}", "Not-A.Brand";v="24"',
-                    "Sec-Ch-Ua-Mobile": "?0",
-                    "Sec-Ch-Ua-Platform": '"Windows"'
-                    if "Win" in ua
-                    else '"macOS"'
-                    if "Mac" in ua
-                    else '"Linux"',
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Upgrade-Insecure-Requests": "1",
-                },
-            )
+        context_kwargs, script = _build_context_options(is_firefox)
 
         self._context = await browser.new_context(**context_kwargs)
 
@@ -1687,16 +1814,6 @@ class CrawlSession:
         await _setup_route_blocking(self._context, block_media=True)
 
         # Re-inject stealth
-        if is_firefox:
-            script = _build_firefox_stealth(hw_concurrency)
-        else:
-            script = _build_chromium_stealth(
-                webgl_vendor,
-                webgl_renderer,
-                color_depth,
-                hw_concurrency,
-                device_mem,
-            )
         await self._context.add_init_script(script)
 
         # Restore accumulated cookies
@@ -0,0 +1,136 @@
+"""
+Compact page records for the crawl pipeline.
+
+A crawl moves every page through ``extract_queue`` and into ``job_results``.
+Carrying the full fetch dict and a Pydantic ``ScrapeData`` per page keeps
+several copies of the page alive at once (raw HTML, cleaned HTML, every
+extracted format, the metadata model and its dump). These ``__slots__``
+records hold one reference per value instead:
+
+- ``FetchedPage`` — the producer's output. Its raw HTML buffer is handed
+  to extraction with ``take_html`` and dropped from the record right away.
+- ``PageRecord`` — what the consumer stores: only the formats the user
+  asked for, plus the links the frontier needs and the markdown word count.
+
+Pydantic models are only built at the API boundary, when results are read.
+"""
+
+from typing import Any
+from uuid import UUID
+
+from app.models.job_result import JobResult
+
+# ScrapeData fields that live in job_results.metadata, and the format that
+# has to be requested for each (None = always kept when present)
+_METADATA_FIELDS = {
+    "structured_data": "structured_data",
+    "headings": "headings",
+    "images": "images",
+    "links_detail": "links",
+    "product_data": None,
+    "tables": "tables",
+    "selector_data": None,
+    "fit_markdown": None,
+    "citations": None,
+    "markdown_with_citations": None,
+    "content_hash": None,
+}
+
+
+class FetchedPage:
+    """A fetched page waiting for extraction."""
+
+    __slots__ = (
+        "url",
+        "depth",
+        "raw_html",
+        "status_code",
+        "response_headers",
+        "screenshot_b64",
+        "action_screenshots",
+        "request",
+    )
+
+    def __init__(self, url: str, depth: int, fetch_result: dict):
+        self.url = url
+        self.depth = depth
+        self.raw_html: str | None = fetch_result.get("raw_html", "")
+        self.status_code: int = fetch_result.get("status_code", 0)
+        self.response_headers: dict = fetch_result.get("response_headers") or {}
+        self.screenshot_b64: str | None = fetch_result.get("screenshot_b64")
+        self.action_screenshots: list[str] = fetch_result.get("action_screenshots") or []
+        self.request = fetch_result["request"]
+
+    def take_html(self) -> str:
+        """Return the raw HTML and drop the record's reference to it."""
+        html, self.raw_html = self.raw_html or "", None
+        return html
+
+
+class PageRecord:
+    """One crawled page, reduced to what gets stored."""
+
+    __slots__ = (
+        "url",
+        "depth",
+        "markdown",
+        "html",
+        "links",
+        "screenshot",
+        "metadata",
+        "extract",
+        "discovered_links",
+        "word_count",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        depth: int,
+        fields: dict[str, Any],
+        page_metadata: dict[str, Any],
+        user_formats: set[str],
+    ):
+        def wanted(fmt: str | None) -> bool:
+            return fmt is None or not user_formats or fmt in user_formats
+
+        markdown = fields.get("markdown")
+        links = fields.get("links")
+        self.url = url
+        self.depth = depth
+        self.discovered_links: list[str] = links or []
+        self.word_count = len(markdown.split()) if markdown else 0
+        self.markdown: str | None = markdown if wanted("markdown") else None
+        self.html: str | None = fields.get("html") if wanted("html") else None
+        self.links: list[str] | None = links if links and wanted("links") else None
+        self.screenshot: str | None = fields.get("screenshot") if wanted("screenshot") else None
+        self.extract: Any = None
+
+        metadata = {k: v for k, v in page_metadata.items() if v is not None}
+        for name, fmt in _METADATA_FIELDS.items():
+            value = fields.get(name)
+            if value and wanted(fmt):
+                metadata[name] = value
+        self.metadata: dict[str, Any] = metadata
+
+    @classmethod
+    def from_scrape_data(cls, url: str, depth: int, scrape_data, user_formats: set[str]) -> "PageRecord":
+        """Record for a page scraped through the full ``scrape_url`` path."""
+        fields = scrape_data.model_dump(exclude={"metadata"}, exclude_none=True)
+        page_metadata = scrape_data.metadata.model_dump() if scrape_data.metadata else {}
+        return cls(url, depth, fields, page_metadata, user_formats)
+
+    def wants_screenshot(self, user_formats: set[str]) -> bool:
+        return self.screenshot is None and (not user_formats or "screenshot" in user_formats)
+
+    def to_job_result(self, job_id: UUID) -> JobResult:
+        return JobResult(
+            job_id=job_id,
+            url=self.url,
+            markdown=self.markdown,
+            html=self.html,
+            links=self.links,
+            extract=self.extract,
+            metadata_=self.metadata or None,
+            screenshot_url=self.screenshot,
+        )
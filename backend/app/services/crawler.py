@@ -39,6 +39,35 @@ _JUNK_PATH_SEGMENTS = {
 # Redis key TTL for crawl state (2 hours — covers long crawls)
 _REDIS_TTL = 7200
 
+# Sitemap URLs pushed to the frontier per batch while seeding streams in
+_SITEMAP_SEED_BATCH = 500
+
+# Pop frontier entries until one is not yet visited, and claim it — in one
+# step, so concurrent workers on the same job never fetch the same URL.
+# KEYS: frontier, visited, inflight  ARGV: "zset" | "list", ttl, worker id
+# Returns the claimed entry (JSON) or nil once the frontier is empty.
+_CLAIM_SCRIPT = """
+for _ = 1, 1000 do
+    local raw
+    if ARGV[1] == 'zset' then
+        raw = redis.call('ZPOPMIN', KEYS[1])[1]
+    else
+        raw = redis.call('LPOP', KEYS[1])
+    end
+    if not raw then
+        return nil
+    end
+    local item = cjson.decode(raw)
+    if redis.call('SADD', KEYS[2], item['url']) == 1 then
+        redis.call('HSET', KEYS[3], item['url'], item['depth'] .. ':' .. ARGV[3])
+        redis.call('EXPIRE', KEYS[2], ARGV[2])
+        redis.call('EXPIRE', KEYS[3], ARGV[2])
+        return raw
+    end
+end
+return nil
+"""
+
 
 class WebCrawler:
     """Web crawler with Redis-backed frontier for distributed Celery architecture.
@@ -58,8 +87,12 @@ class WebCrawler:
         d = domain.lower()
         return d[4:] if d.startswith("www.") else d
 
-    def __init__(self, job_id: str, config: CrawlRequest, proxy_manager=None):
+    def __init__(
+        self, job_id: str, config: CrawlRequest, proxy_manager=None, worker_id: str | None = None
+    ):
         self.job_id = job_id
+        # Recorded on each URL this worker claims (see restore_state)
+        self.worker_id = worker_id or job_id
         self.config = config
         self.base_url = config.url
         self.base_domain = urlparse(config.url).netloc
@@ -76,13 +109,23 @@ class WebCrawler:
         self._key_frontier = f"crawl:{job_id}:frontier"
         self._key_visited = f"crawl:{job_id}:visited"
         self._key_depth = f"crawl:{job_id}:depth"
+        # Claimed but not yet finished URLs (url -> "depth:worker_id"),
+        # requeued on resume unless their worker is still registered
+        self._key_inflight = f"crawl:{job_id}:inflight"
+        # State shared by every worker on the job: pinned strategy, cancel flag
+        self._key_meta = f"crawl:{job_id}:meta"
+        # Helper workers currently crawling this job (distributed crawls)
+        self._key_workers = f"crawl:{job_id}:workers"
+        self._in_flight: dict[str, int] = {}  # In-memory fallback
+        self._shared: dict[str, str] = {}  # In-memory fallback
 
         self._crawl_strategy = getattr(config, "crawl_strategy", "bfs")
 
-    async def initialize(self):
-        """Set up Redis frontier (or fallback), seed URLs, start browser session."""
-        from app.services.dedup import normalize_url
+    async def initialize(self, seed: bool = True):
+        """Set up Redis frontier (or fallback), seed URLs, start browser session.
 
+        ``seed=False`` skips seeding for a crawl resumed from a checkpoint.
+        """
         # Try to use Redis for distributed frontier
         try:
             from app.core.redis import redis_client
@@ -95,12 +138,8 @@ class WebCrawler:
             self._use_redis = False
             self._init_memory_strategy()
 
-        # Seed the start URL
-        norm_start = normalize_url(self.base_url)
-        if self._use_redis:
-            await self._redis_add_urls([(norm_start, 0)])
-        else:
-            self._strategy.seed(self.base_url)
+        if seed:
+            await self._seed_start_url()
 
         # Create persistent browser session and seed sitemaps in parallel
         # (they're independent — browser launch is slow, sitemap is IO)
@@ -122,10 +161,27 @@ class WebCrawler:
                 logger.warning(f"Sitemap seeding failed for {self.base_url}: {e}")
 
         await asyncio.gather(
-            _sitemap_with_timeout(),
+            _sitemap_with_timeout() if seed else asyncio.sleep(0),
             self._crawl_session.start(proxy=proxy, target_url=self.base_url),
         )
 
+    async def _seed_start_url(self):
+        from app.services.dedup import normalize_url
+
+        norm_start = normalize_url(self.base_url)
+        if self._use_redis:
+            await self._redis_add_urls([(norm_start, 0)])
+        else:
+            self._strategy.seed(self.base_url)
+
+    async def reseed(self):
+        """Seed the start URL and sitemaps again (resume with lost state)."""
+        await self._seed_start_url()
+        try:
+            await asyncio.wait_for(self._seed_from_sitemaps(), timeout=10)
+        except Exception as e:
+            logger.warning(f"Sitemap reseeding failed for {self.base_url}: {e}")
+
     def _init_memory_strategy(self):
         """Initialize in-memory fallback strategy (CLI mode)."""
         from app.services.deep_crawl.strategies import BFSStrategy, DFSStrategy, BestFirstStrategy
@@ -199,49 +255,65 @@ class WebCrawler:
     # ------------------------------------------------------------------
 
     async def _seed_from_sitemaps(self):
-        """Seed the crawl frontier from sitemap.xml."""
+        """Seed the crawl frontier from sitemap.xml.
+
+        Sitemap URLs are streamed and added to the frontier in batches, so
+        seeding stops fetching once ``max_pages * 5`` URLs are queued and a
+        timeout keeps whatever was seeded before it fired.
+        """
         try:
-            from app.services.mapper import _parse_sitemaps
-            from app.services.dedup import normalize_url_for_crawl
+            from contextlib import aclosing
 
-            sitemap_links = await _parse_sitemaps(self.base_url)
-            if not sitemap_links:
-                logger.debug(f"No sitemap URLs found for {self.base_url}")
-                return
+            from app.services.mapper import _iter_sitemap_links
+            from app.services.dedup import normalize_url_for_crawl
 
             added = 0
+            seen = 0
             max_seed = self.config.max_pages * 5
             seed_pairs = []
-            for link in sitemap_links:
-                if added >= max_seed:
-                    break
-                url = link.url
-                norm = normalize_url_for_crawl(url)
-                if self._use_redis:
-                    if await self._redis.sismember(self._key_visited, norm):
-                        continue
-                else:
-                    if norm in self._visited:
+            async with aclosing(_iter_sitemap_links(self.base_url)) as sitemap_links:
+                async for link in sitemap_links:
+                    seen += 1
+                    url = link.url
+                    norm = normalize_url_for_crawl(url)
+                    if self._use_redis:
+                        if await self._redis.sismember(self._key_visited, norm):
+                            continue
+                    else:
+                        if norm in self._visited:
+                            continue
+                    if not self._should_crawl(url, depth=1):
                         continue
-                if not self._should_crawl(url, depth=1):
-                    continue
-                seed_pairs.append((norm, 1))
-                added += 1
-
-            if seed_pairs:
-                if self._use_redis:
-                    await self._redis_add_urls(seed_pairs)
-                else:
-                    await self._strategy.add_discovered_urls(
-                        [u for u, _ in seed_pairs], self.base_url, 1
-                    )
+                    seed_pairs.append((norm, 1))
+                    added += 1
+                    if len(seed_pairs) >= _SITEMAP_SEED_BATCH:
+                        await self._add_sitemap_seeds(seed_pairs)
+                        seed_pairs = []
+                    if added >= max_seed:
+                        break
+
+            await self._add_sitemap_seeds(seed_pairs)
+            if not seen:
+                logger.debug(f"No sitemap URLs found for {self.base_url}")
+            elif added:
                 logger.info(
                     f"Sitemap seeding: added {added} URLs from "
-                    f"{len(sitemap_links)} sitemap entries for {self.base_url}"
+                    f"{seen} sitemap entries for {self.base_url}"
                 )
         except Exception as e:
             logger.warning(f"Sitemap seeding failed for {self.base_url}: {e}")
 
+    async def _add_sitemap_seeds(self, seed_pairs: list[tuple[str, int]]):
+        """Push a batch of sitemap-discovered URLs onto the frontier."""
+        if not seed_pairs:
+            return
+        if self._use_redis:
+            await self._redis_add_urls(seed_pairs)
+        else:
+            await self._strategy.add_discovered_urls(
+                [u for u, _ in seed_pairs], self.base_url, 1
+            )
+
     async def get_next_url(self) -> tuple[str, int] | None:
         """Get next URL from the frontier."""
         if self._use_redis:
@@ -268,6 +340,141 @@ class WebCrawler:
             self._strategy._state.visited.add(url)
             self._strategy._state.pages_crawled += 1
 
+    async def claim(self, url: str, depth: int) -> bool:
+        """Mark a popped URL visited and in flight until ``release``.
+
+        Returns False if it was already visited. In-flight URLs are put back
+        on the frontier when a crawl resumes, unless the worker that claimed
+        them is still registered, so a page that was fetching when its
+        worker died is not lost.
+        """
+        if self._use_redis:
+            if not await self._redis.sadd(self._key_visited, url):
+                return False
+            pipe = self._redis.pipeline()
+            pipe.hset(self._key_inflight, url, f"{depth}:{self.worker_id}")
+            pipe.expire(self._key_visited, _REDIS_TTL)
+            pipe.expire(self._key_inflight, _REDIS_TTL)
+            await pipe.execute()
+            return True
+        if url in self._visited:
+            return False
+        await self.mark_visited(url)
+        self._in_flight[url] = depth
+        return True
+
+    async def claim_next_url(self) -> tuple[str, int] | None:
+        """Pop and claim the next unvisited URL (None once the frontier is empty)."""
+        if self._use_redis:
+            raw = await self._redis.run_script(
+                _CLAIM_SCRIPT,
+                keys=[self._key_frontier, self._key_visited, self._key_inflight],
+                args=[
+                    "zset" if self._crawl_strategy == "bff" else "list",
+                    _REDIS_TTL,
+                    self.worker_id,
+                ],
+            )
+            if not raw:
+                return None
+            data = json.loads(raw)
+            return data["url"], data["depth"]
+
+        from app.services.dedup import normalize_url
+
+        while next_item := await self.get_next_url():
+            url, depth = next_item
+            norm = normalize_url(url)
+            if await self.claim(norm, depth):
+                return norm, depth
+        return None
+
+    async def release(self, url: str):
+        """A claimed URL is finished (saved, skipped or failed)."""
+        if self._use_redis:
+            await self._redis.hdel(self._key_inflight, url)
+        else:
+            self._in_flight.pop(url, None)
+
+    async def release_many(self, urls: list[str]):
+        """Release claimed URLs that will not be fetched (page cap or cancel)."""
+        if not urls:
+            return
+        if self._use_redis:
+            await self._redis.hdel(self._key_inflight, *urls)
+        else:
+            for url in urls:
+                self._in_flight.pop(url, None)
+
+    async def in_flight_count(self) -> int:
+        """URLs claimed by any worker on this job and not yet released."""
+        if self._use_redis:
+            return await self._redis.hlen(self._key_inflight)
+        return len(self._in_flight)
+
+    # ------------------------------------------------------------------
+    # State shared across the workers of a distributed crawl
+    # ------------------------------------------------------------------
+
+    async def _get_shared(self) -> dict[str, str]:
+        if self._use_redis:
+            return await self._redis.hgetall(self._key_meta) or {}
+        return self._shared
+
+    async def _set_shared(self, **fields: str | None):
+        if not self._use_redis:
+            for name, value in fields.items():
+                if value is None:
+                    self._shared.pop(name, None)
+                else:
+                    self._shared[name] = value
+            return
+        to_set = {k: v for k, v in fields.items() if v is not None}
+        to_clear = [k for k, v in fields.items() if v is None]
+        if to_set:
+            await self._redis.hset(self._key_meta, mapping=to_set)
+        if to_clear:
+            await self._redis.hdel(self._key_meta, *to_clear)
+        await self._redis.expire(self._key_meta, _REDIS_TTL)
+
+    async def shared_state(self) -> tuple[str | None, int | None, bool]:
+        """``(pinned_strategy, pinned_tier, cancelled)`` as set by any worker."""
+        shared = await self._get_shared()
+        tier = shared.get("pinned_tier")
+        return (
+            shared.get("pinned_strategy"),
+            int(tier) if tier is not None else None,
+            shared.get("cancelled") == "1",
+        )
+
+    async def set_pinned(self, strategy: str | None, tier: int | None):
+        await self._set_shared(
+            pinned_strategy=strategy,
+            pinned_tier=str(tier) if strategy is not None and tier is not None else None,
+        )
+
+    async def signal_cancel(self):
+        """Tell every worker on this job to stop."""
+        await self._set_shared(cancelled="1")
+
+    @property
+    def shared_frontier(self) -> bool:
+        """Whether other processes can work on this crawl (Redis frontier)."""
+        return self._use_redis
+
+    async def register_worker(self, worker_id: str):
+        await self._redis.sadd(self._key_workers, worker_id)
+        await self._redis.expire(self._key_workers, _REDIS_TTL)
+
+    async def unregister_worker(self, worker_id: str):
+        await self._redis.srem(self._key_workers, worker_id)
+
+    async def active_workers(self) -> int:
+        """Helper workers still crawling (0 when not distributed)."""
+        if not self._use_redis:
+            return 0
+        return await self._redis.scard(self._key_workers)
+
     async def is_visited(self, url: str) -> bool:
         if self._use_redis:
             return bool(await self._redis.sismember(self._key_visited, url))
@@ -545,6 +752,7 @@ class WebCrawler:
         url: str,
         pinned_strategy: str | None = None,
         pinned_tier: int | None = None,
+        domain_strategies: dict[str, dict | None] | None = None,
     ) -> dict | None:
         """Fetch-only phase for pipeline mode — returns raw data without extraction.
 
@@ -580,6 +788,7 @@ class WebCrawler:
             pinned_strategy=pinned_strategy,
             pinned_tier=pinned_tier,
             capture_screenshot=_wants_screenshot,
+            domain_strategies=domain_strategies,
         )
         if fetch_result:
             fetch_result["request"] = request
@@ -595,11 +804,20 @@ class WebCrawler:
     def export_state(self) -> dict:
         """Export crawl state for checkpoint/resume.
 
-        For Redis mode, serializes Redis state to JSON.
-        For in-memory mode, delegates to strategy.
+        For Redis mode, the frontier, visited set and in-flight URLs already
+        live in Redis, so only the key names are exported.
+        For in-memory mode, delegates to strategy, with in-flight URLs moved
+        back onto the frontier.
         """
         if not self._use_redis and self._strategy:
-            return self._strategy.export_state()
+            state = self._strategy.export_state()
+            state["visited"] = [u for u in state["visited"] if u not in self._in_flight]
+            state["pending"] = [
+                {"url": url, "depth": depth, "parent_url": None, "score": 0.0}
+                for url, depth in self._in_flight.items()
+            ] + state["pending"]
+            state["pages_crawled"] -= len(self._in_flight)
+            return state
         # Redis mode: state is already persisted in Redis
         return {
             "job_id": self.job_id,
@@ -609,17 +827,54 @@ class WebCrawler:
                 "frontier": self._key_frontier,
                 "visited": self._key_visited,
                 "depth": self._key_depth,
+                "inflight": self._key_inflight,
+                "meta": self._key_meta,
             },
         }
 
-    def restore_state(self, state_data: dict):
-        """Restore crawl state from checkpoint."""
-        if not self._use_redis and self._strategy:
-            self._strategy.restore_state(state_data)
-            self._visited = self._strategy._state.visited.copy()
+    async def restore_state(self, state_data: dict) -> bool:
+        """Restore crawl state from checkpoint.
+
+        Returns False when the checkpointed state is gone (Redis keys expired
+        or flushed, or the checkpoint is from the other frontier mode); the
+        caller should then ``reseed``.
+        """
+        if state_data.get("use_redis"):
+            if not self._use_redis:
+                return False
+            inflight = await self._redis.hgetall(self._key_inflight)
+            # Helpers of the interrupted attempt may still be fetching their
+            # claims; only requeue those of workers no longer registered
+            live = set(await self._redis.smembers(self._key_workers) or ())
+            live.discard(self.worker_id)
+            pairs = []
+            for url, claim in inflight.items():
+                depth, _, owner = claim.partition(":")
+                if owner not in live:
+                    pairs.append((url, int(depth)))
+            if pairs:
+                urls = [url for url, _ in pairs]
+                await self._redis.srem(self._key_visited, *urls)
+                await self._redis_add_urls(pairs)
+                await self._redis.hdel(self._key_inflight, *urls)
+                logger.info(f"Crawl {self.job_id}: requeued {len(pairs)} in-flight URLs")
+            return bool(
+                await self.get_visited_count() or await self._redis_frontier_size()
+            )
 
-    async def cleanup(self):
-        """Close browser session and clean up Redis keys."""
+        if self._use_redis or not self._strategy:
+            return False
+        self._strategy.seed(self.base_url)  # Sets the base domain
+        self._strategy.restore_state(state_data)
+        self._visited = self._strategy._state.visited.copy()
+        return True
+
+    async def cleanup(self, keep_state: bool = False):
+        """Close browser session and clean up Redis keys.
+
+        ``keep_state`` leaves the Redis frontier in place for a retry to
+        resume from.
+        """
         if self._crawl_session:
             try:
                 await self._crawl_session.stop()
@@ -628,12 +883,15 @@ class WebCrawler:
             self._crawl_session = None
 
         # Clean up Redis keys for this job
-        if self._use_redis and self._redis:
+        if self._use_redis and self._redis and not keep_state:
             try:
                 await self._redis.delete(
                     self._key_frontier,
                     self._key_visited,
                     self._key_depth,
+                    self._key_inflight,
+                    self._key_meta,
+                    self._key_workers,
                 )
             except Exception:
                 pass
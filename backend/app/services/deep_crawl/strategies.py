@@ -6,7 +6,7 @@ import asyncio
 import logging
 from abc import ABC, abstractmethod
 from collections import deque
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Any, AsyncIterator
 from urllib.parse import urlparse
 
@@ -81,12 +81,21 @@ class DeepCrawlStrategy(ABC):
         return self._state
 
     def export_state(self) -> dict:
-        """Export current crawl state for checkpointing."""
+        """Export current crawl state, frontier included, for checkpointing."""
+        self._state.pending = [asdict(item) for item in self._frontier_items()]
         return self._state.to_dict()
 
     def restore_state(self, state_data: dict) -> None:
-        """Restore crawl state from a checkpoint."""
+        """Restore crawl state (and the frontier) from a checkpoint."""
         self._state = CrawlState.from_dict(state_data)
+        self._restore_frontier([CrawlURL(**item) for item in self._state.pending])
+
+    def _frontier_items(self) -> list[CrawlURL]:
+        """URLs still queued, in pop order."""
+        return []
+
+    def _restore_frontier(self, items: list[CrawlURL]) -> None:
+        """Replace the frontier with ``items`` (as returned by ``_frontier_items``)."""
 
     def _normalize_url(self, url: str) -> str:
         """Minimal normalization for dedup."""
@@ -177,6 +186,12 @@ class BFSStrategy(DeepCrawlStrategy):
         for item in processed:
             self._queue.append(item)
 
+    def _frontier_items(self) -> list[CrawlURL]:
+        return list(self._queue)
+
+    def _restore_frontier(self, items: list[CrawlURL]) -> None:
+        self._queue = deque(items)
+
     def seed(self, start_url: str):
         """Seed the BFS queue with the start URL."""
         parsed = urlparse(start_url)
@@ -217,6 +232,12 @@ class DFSStrategy(DeepCrawlStrategy):
         for item in reversed(processed):
             self._stack.append(item)
 
+    def _frontier_items(self) -> list[CrawlURL]:
+        return self._stack[::-1]
+
+    def _restore_frontier(self, items: list[CrawlURL]) -> None:
+        self._stack = items[::-1]
+
     def seed(self, start_url: str):
         parsed = urlparse(start_url)
         domain = parsed.netloc.lower()
@@ -259,6 +280,12 @@ class BestFirstStrategy(DeepCrawlStrategy):
             # Negate score for min-heap (highest score = lowest negative)
             heapq.heappush(self._pqueue, (-item.score, item))
 
+    def _frontier_items(self) -> list[CrawlURL]:
+        return [item for _, item in sorted(self._pqueue)]
+
+    def _restore_frontier(self, items: list[CrawlURL]) -> None:
+        self._pqueue = [(-item.score, item) for item in items]
+
     def seed(self, start_url: str):
         import heapq
         parsed = urlparse(start_url)
@@ -1,12 +1,22 @@
 """Document extraction service for PDF, DOCX, XLSX, PPTX, CSV, RTF, EPUB and other non-HTML formats."""
 
+import asyncio
 import base64
 import csv
+import importlib
 import io
 import logging
+import multiprocessing
+import os
+import tempfile
+import weakref
 import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +36,228 @@ class DocumentResult:
     pages: list[dict] = field(default_factory=list)  # [{page_num, text, markdown}]
 
 
+# ---------------------------------------------------------------------------
+# Off-loop execution — process pool with time and memory budgets
+# ---------------------------------------------------------------------------
+#
+# PyMuPDF, pdfplumber, OCR and openpyxl are CPU-bound and hold the GIL, so
+# running them inside a coroutine stalls every other request on the loop.
+# All extractors run in a small spawn-based process pool instead (a thread
+# when the pool is disabled or cannot start, e.g. inside a daemonic worker).
+#
+# Cancelling the asyncio side of a pool job does not stop a job that is
+# already running, so a worker still busy past the time budget is killed:
+# the pool is recycled, and other documents' jobs lost with it are
+# resubmitted to the fresh pool. Thread fallback jobs can't be killed and
+# only stop being waited for.
+# ---------------------------------------------------------------------------
+
+_MAX_PDF_IMAGES = 20
+
+_pool: ProcessPoolExecutor | None = None
+_pool_unavailable = False
+
+# Pool job behind each awaitable returned by _submit
+_pool_jobs: "weakref.WeakKeyDictionary[asyncio.Future, tuple[ProcessPoolExecutor, Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Pools killed on purpose after a budget overrun
+_recycled_pools: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+
+def _limit_address_space(limit_mb: int) -> None:
+    """Cap this process's address space at its current size plus ``limit_mb``."""
+    try:
+        import resource
+
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+        limit = current + limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, OSError, ValueError) as e:
+        logger.debug(f"Document worker memory budget not applied: {e}")
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Pool initializer: import the extraction libraries once, then apply the
+    memory budget so allocations beyond it raise MemoryError in the worker."""
+    for module in ("fitz", "pdfplumber", "docx", "openpyxl"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    if memory_limit_mb > 0:
+        _limit_address_space(memory_limit_mb)
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    """Return the shared extraction pool, creating it on first use."""
+    global _pool
+    if _pool is None and not _pool_unavailable and settings.DOCUMENT_WORKERS > 0:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.DOCUMENT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.DOCUMENT_MAX_MEMORY_MB,),
+        )
+    return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor | None = None) -> None:
+    """Drop a broken pool (the current one by default) so the next
+    extraction starts a fresh one."""
+    global _pool
+    if pool is None or pool is _pool:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def _recycle_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill the workers of a pool one of whose jobs overran its budget."""
+    _recycled_pools.add(pool)
+    # ProcessPoolExecutor.terminate_workers() only exists from Python 3.14
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    _reset_pool(pool)
+
+
+def shutdown_document_pool() -> None:
+    """Stop the extraction worker processes (called on app shutdown)."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn, *args) -> asyncio.Future:
+    """Schedule ``fn(*args)`` off the event loop and return an awaitable."""
+    global _pool_unavailable
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    if pool is not None:
+        try:
+            job = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            _reset_pool(pool)
+        except (AssertionError, OSError, RuntimeError) as e:
+            # e.g. "daemonic processes are not allowed to have children"
+            logger.warning(f"Document process pool unavailable, using threads: {e}")
+            _pool_unavailable = True
+            _reset_pool(pool)
+        else:
+            fut = asyncio.wrap_future(job, loop=loop)
+            _pool_jobs[fut] = (pool, job)
+            return fut
+    return loop.run_in_executor(None, fn, *args)
+
+
+def _deadline() -> float | None:
+    """Loop-time deadline for one document, or None when unbudgeted."""
+    if settings.DOCUMENT_TIMEOUT_SECONDS <= 0:
+        return None
+    return asyncio.get_running_loop().time() + settings.DOCUMENT_TIMEOUT_SECONDS
+
+
+async def _await_within(fut: asyncio.Future, deadline: float | None, fn, *args):
+    """Await ``fut`` (``_submit(fn, *args)``), raising TimeoutError past the
+    deadline. A pool worker still running the job then is killed."""
+    timeout = None
+    if deadline is not None:
+        timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+    try:
+        return await asyncio.wait_for(fut, timeout)
+    except asyncio.TimeoutError:
+        pool, job = _pool_jobs.get(fut, (None, None))
+        # cancel() fails only for a job a worker has started
+        if pool is not None and not job.cancel() and not job.done():
+            logger.warning(f"Recycling document workers: {fn.__name__} overran its time budget")
+            _recycle_pool(pool)
+        raise
+    except BrokenProcessPool:
+        pool, _job = _pool_jobs.get(fut, (None, None))
+        if pool is not None and pool in _recycled_pools:
+            # Killed for another document's overrun — not this job's fault
+            return await _await_within(_submit(fn, *args), deadline, fn, *args)
+        _reset_pool(pool)
+        raise
+
+
+def _budget_reason(exc: BaseException) -> str:
+    """Human-readable reason for a budget-related extraction stop."""
+    if isinstance(exc, asyncio.TimeoutError):
+        return f"time budget of {settings.DOCUMENT_TIMEOUT_SECONDS}s exceeded"
+    if isinstance(exc, MemoryError):
+        return f"memory budget of {settings.DOCUMENT_MAX_MEMORY_MB} MB exceeded"
+    return "extraction worker died (likely out of memory)"
+
+
+async def _run_shards(
+    fn, source: bytes | str, ranges: list[tuple[int, int]], deadline: float | None
+) -> tuple[list, str | None]:
+    """Run ``fn(source, start, end)`` for every range in parallel.
+
+    Returns the per-range results in range order (None for ranges that did
+    not finish) and the reason extraction stopped early, if it did. Once a
+    budget is hit, shards that already completed are kept and queued ones
+    are cancelled.
+    """
+    futures = [_submit(fn, source, start, end) for start, end in ranges]
+    results: list = [None] * len(futures)
+    stop_reason = None
+    for i, fut in enumerate(futures):
+        try:
+            results[i] = await _await_within(fut, deadline, fn, source, *ranges[i])
+        except (asyncio.TimeoutError, MemoryError, BrokenProcessPool) as e:
+            stop_reason = _budget_reason(e)
+            break
+        except Exception as e:
+            start, end = ranges[i]
+            logger.warning(f"Document pages {start + 1}-{end} failed: {e}")
+            stop_reason = stop_reason or f"pages {start + 1}-{end} failed: {e}"
+
+    for i, fut in enumerate(futures):
+        if results[i] is not None:
+            continue
+        if fut.done():
+            if not fut.cancelled() and fut.exception() is None:
+                results[i] = fut.result()
+        else:
+            fut.cancel()
+    return results, stop_reason
+
+
+def _mark_partial(result: DocumentResult, reason: str) -> None:
+    """Flag a merged result as incomplete and say why in the markdown."""
+    result.metadata["partial"] = True
+    result.metadata["partial_reason"] = reason
+    result.metadata["pages_extracted"] = len(result.pages)
+    result.markdown += (
+        f"\n\n*Partial extraction: {reason} — "
+        f"{len(result.pages)} of {result.page_count} pages extracted.*"
+    )
+
+
+def _budget_error_result(doc_type: str, reason: str) -> DocumentResult:
+    """Result for a document whose budget ran out before anything was extracted."""
+    label = doc_type.upper()
+    return DocumentResult(
+        text=f"[{label} extraction stopped: {reason}]",
+        markdown=f"*{label} extraction stopped: {reason}*",
+        metadata={"error": reason, "document_type": doc_type, "partial": True},
+    )
+
+
+async def _run_extractor(fn, raw_bytes: bytes, doc_type: str) -> DocumentResult:
+    """Run a whole-document sync extractor off the loop within its budgets."""
+    try:
+        return await _await_within(_submit(fn, raw_bytes), _deadline(), fn, raw_bytes)
+    except (asyncio.TimeoutError, MemoryError, BrokenProcessPool) as e:
+        reason = _budget_reason(e)
+        logger.warning(f"{doc_type.upper()} extraction stopped: {reason}")
+        return _budget_error_result(doc_type, reason)
+
+
 def detect_document_type(
     url: str,
     content_type: str | None = None,
@@ -149,25 +381,41 @@ def _extract_pdf_tables_pymupdf(page) -> list[dict]:
     return tables
 
 
-def _extract_pdf_tables_pdfplumber(raw_bytes: bytes, page_num: int) -> list[dict]:
-    """Extract tables from a specific page using pdfplumber (fallback for complex layouts)."""
+def _open_pdf(source: bytes | str):
+    """Open a PDF from raw bytes or a file path with PyMuPDF."""
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _open_pdfplumber(source: bytes | str):
+    """Open a PDF with pdfplumber, or return None if it is unavailable."""
     try:
         import pdfplumber
     except ImportError:
-        return []
+        return None
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            return pdfplumber.open(io.BytesIO(source))
+        return pdfplumber.open(source)
+    except Exception:
+        return None
+
+
+def _extract_pdf_tables_pdfplumber(pdf, page_num: int) -> list[dict]:
+    """Extract tables from a specific page of an open pdfplumber document (fallback for complex layouts)."""
     tables = []
     try:
-        with pdfplumber.open(io.BytesIO(raw_bytes)) as pdf:
-            if page_num < len(pdf.pages):
-                plumber_page = pdf.pages[page_num]
-                for tab in plumber_page.extract_tables():
-                    if not tab:
-                        continue
-                    headers = [str(c) if c else "" for c in tab[0]]
-                    rows = [[str(c) if c else "" for c in row] for row in tab[1:]]
-                    tables.append(
-                        {"headers": headers, "rows": rows, "page": page_num + 1}
-                    )
+        if page_num < len(pdf.pages):
+            plumber_page = pdf.pages[page_num]
+            for tab in plumber_page.extract_tables():
+                if not tab:
+                    continue
+                headers = [str(c) if c else "" for c in tab[0]]
+                rows = [[str(c) if c else "" for c in row] for row in tab[1:]]
+                tables.append({"headers": headers, "rows": rows, "page": page_num + 1})
     except Exception:
         pass
     return tables
@@ -207,14 +455,8 @@ def _extract_pdf_images(
     return images
 
 
-def _build_page_markdown(
-    page,
-    page_text: str,
-    page_tables: list[dict],
-    page_images: list[dict],
-    image_offset: int,
-) -> str:
-    """Build enhanced markdown for a single PDF page using structured text analysis."""
+def _page_text_markdown(page, page_text: str) -> list[str]:
+    """Convert a PDF page's text to markdown lines using structured text analysis."""
     md_parts = []
 
     # Try structured text for heading detection
@@ -264,6 +506,32 @@ def _build_page_markdown(
         # Fallback to plain text if structured extraction fails
         md_parts.append(page_text.strip())
 
+    return md_parts
+
+
+def _page_link_lines(page) -> list[str]:
+    """Return markdown list items for the URI links on a PDF page."""
+    link_items = []
+    try:
+        for link in page.get_links():
+            uri = link.get("uri", "")
+            if uri:
+                link_items.append(f"- [{uri}]({uri})")
+    except Exception:
+        pass
+    return link_items
+
+
+def _build_page_markdown(
+    text_md: list[str],
+    page_tables: list[dict],
+    page_images: list[dict],
+    image_offset: int,
+    link_lines: list[str],
+) -> str:
+    """Assemble the markdown for a single PDF page from its extracted parts."""
+    md_parts = list(text_md)
+
     # Add tables as markdown
     for table in page_tables:
         md_parts.append("")
@@ -277,43 +545,17 @@ def _build_page_markdown(
         )
 
     # Add links
-    try:
-        links = page.get_links()
-        link_items = []
-        for link in links:
-            uri = link.get("uri", "")
-            if uri:
-                link_items.append(f"- [{uri}]({uri})")
-        if link_items:
-            md_parts.append("")
-            md_parts.extend(link_items)
-    except Exception:
-        pass
+    if link_lines:
+        md_parts.append("")
+        md_parts.extend(link_lines)
 
     return "\n".join(md_parts)
 
 
-async def extract_pdf(raw_bytes: bytes) -> DocumentResult:
-    """Extract text, tables, images and metadata from a PDF using multi-strategy approach.
-
-    Strategy 1: PyMuPDF (primary) — text, tables, images, structured text
-    Strategy 2: pdfplumber (fallback for complex table layouts)
-    Strategy 3: OCR fallback for scanned/image PDFs
-    """
+def _extract_pdf_outline(source: bytes | str) -> dict:
+    """Read document-level PDF metadata and table of contents."""
+    doc = _open_pdf(source)
     try:
-        import fitz  # PyMuPDF
-    except ImportError:
-        logger.warning("PyMuPDF not installed, returning empty result")
-        return DocumentResult(
-            text="[PDF extraction requires PyMuPDF]",
-            markdown="*PDF extraction requires PyMuPDF*",
-            metadata={"error": "PyMuPDF not installed"},
-        )
-
-    try:
-        doc = fitz.open(stream=raw_bytes, filetype="pdf")
-
-        # Extract metadata
         meta = doc.metadata or {}
         metadata = {
             "author": meta.get("author", ""),
@@ -326,125 +568,223 @@ async def extract_pdf(raw_bytes: bytes) -> DocumentResult:
             "page_count": doc.page_count,
             "document_type": "pdf",
         }
-
-        # Extract table of contents
         toc = doc.get_toc()
         if toc:
             metadata["table_of_contents"] = [
                 {"level": level, "title": title, "page": page}
                 for level, title, page in toc
             ]
+        return metadata
+    finally:
+        doc.close()
 
-        all_tables = []
-        all_images = []
-        all_pages = []
-        pages_text = []
-        md_parts = []
-        total_chars = 0
 
-        # Build header
-        title = metadata.get("title") or "PDF Document"
-        md_parts.append(f"# {title}\n")
-        if metadata.get("author"):
-            md_parts.append(f"**Author:** {metadata['author']}\n")
+def _extract_pdf_pages(source: bytes | str, start: int, end: int) -> list[dict]:
+    """Extract text, tables, images and markdown parts for pages [start, end).
 
-        # Strategy 1: PyMuPDF extraction per page
-        for page_num in range(doc.page_count):
+    Strategy 1: PyMuPDF — text, tables, images, structured text
+    Strategy 2: pdfplumber (fallback for complex table layouts), opened
+    once per shard and only when PyMuPDF finds no tables on a page.
+    """
+    doc = _open_pdf(source)
+    plumber = None
+    images_left = _MAX_PDF_IMAGES
+    pages = []
+    try:
+        for page_num in range(start, min(end, doc.page_count)):
             page = doc[page_num]
             text = page.get_text("text")
-            total_chars += len(text.strip())
-            pages_text.append(text)
 
-            # Extract tables (Strategy 1: PyMuPDF)
             page_tables = _extract_pdf_tables_pymupdf(page)
-
-            # Strategy 2: pdfplumber fallback if PyMuPDF found no tables
             if not page_tables:
-                page_tables = _extract_pdf_tables_pdfplumber(raw_bytes, page_num)
+                if plumber is None:
+                    plumber = _open_pdfplumber(source) or False
+                if plumber:
+                    page_tables = _extract_pdf_tables_pdfplumber(plumber, page_num)
 
-            all_tables.extend(page_tables)
+            page_images = []
+            if images_left > 0:
+                page_images = _extract_pdf_images(doc, page, max_images=images_left)
+                images_left -= len(page_images)
 
-            # Extract images (limit total to 20)
-            if len(all_images) < 20:
-                page_images = _extract_pdf_images(
-                    doc, page, max_images=20 - len(all_images)
-                )
-                all_images.extend(page_images)
-            else:
-                page_images = []
+            pages.append(
+                {
+                    "page_num": page_num + 1,
+                    "text": text,
+                    "tables": page_tables,
+                    "images": page_images,
+                    "text_md": _page_text_markdown(page, text),
+                    "links": _page_link_lines(page),
+                }
+            )
+    finally:
+        if plumber:
+            plumber.close()
+        doc.close()
+    return pages
 
-            # Build per-page markdown
+
+def _ocr_pdf_pages(source: bytes | str, start: int, end: int) -> list[str | None]:
+    """OCR pages [start, end) of a scanned PDF; None marks pages OCR failed on."""
+    doc = _open_pdf(source)
+    results: list[str | None] = []
+    try:
+        for page_num in range(start, min(end, doc.page_count)):
+            try:
+                tp = doc[page_num].get_textpage_ocr(language="eng")
+                results.append(doc[page_num].get_text("text", textpage=tp))
+            except Exception:
+                results.append(None)
+    finally:
+        doc.close()
+    return results
+
+
+def _pdf_shard_ranges(page_count: int, pages_per_shard: int) -> list[tuple[int, int]]:
+    """Split ``page_count`` pages into contiguous [start, end) ranges."""
+    size = max(1, pages_per_shard)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _spill_to_tempfile(raw_bytes: bytes) -> str:
+    """Write a document to a temp file so shards open it by path instead of
+    each receiving a pickled copy of the bytes."""
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="datablue-doc-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(raw_bytes)
+    return path
+
+
+def _merge_pdf_pages(
+    metadata: dict, shard_pages: list[list[dict] | None], ocr_texts: dict[int, str]
+) -> DocumentResult:
+    """Merge per-shard page results, in page order, into one DocumentResult."""
+    page_count = metadata["page_count"]
+    all_tables = []
+    all_images = []
+    all_pages = []
+    pages_text = []
+
+    for shard in shard_pages:
+        for pg in shard or ():
+            page_images = pg["images"][: max(0, _MAX_PDF_IMAGES - len(all_images))]
             page_md = _build_page_markdown(
-                page, text, page_tables, page_images, len(all_images) - len(page_images)
+                pg["text_md"], pg["tables"], page_images, len(all_images), pg["links"]
             )
-
+            all_tables.extend(pg["tables"])
+            all_images.extend(page_images)
+            pages_text.append(pg["text"])
             all_pages.append(
                 {
-                    "page_num": page_num + 1,
-                    "text": text.strip(),
+                    "page_num": pg["page_num"],
+                    "text": pg["text"].strip(),
                     "markdown": page_md,
                 }
             )
 
+    if ocr_texts:
+        for pg in all_pages:
+            ocr_text = ocr_texts.get(pg["page_num"])
+            if ocr_text:
+                pg["text"] = ocr_text.strip()
+                pg["markdown"] = ocr_text.strip()
+        pages_text = [ocr_texts[n] for n in sorted(ocr_texts)]
+
+    full_text = "\n\n".join(t for t in pages_text if t.strip())
+    word_count = len(full_text.split())
+
+    md_parts = []
+    title = metadata.get("title") or "PDF Document"
+    md_parts.append(f"# {title}\n")
+    if metadata.get("author"):
+        md_parts.append(f"**Author:** {metadata['author']}\n")
+    md_parts.append(f"**Pages:** {page_count} | **Words:** {word_count}\n")
+    md_parts.append("---\n")
+    for pg in all_pages:
+        md_parts.append(f"## Page {pg['page_num']}\n")
+        md_parts.append(pg["markdown"])
+        md_parts.append("\n---\n")
+
+    metadata["table_count"] = len(all_tables)
+    metadata["image_count"] = len(all_images)
+
+    return DocumentResult(
+        text=full_text,
+        markdown="\n\n".join(md_parts),
+        metadata=metadata,
+        page_count=page_count,
+        word_count=word_count,
+        tables=all_tables,
+        images=all_images,
+        pages=all_pages,
+    )
+
+
+async def extract_pdf(raw_bytes: bytes) -> DocumentResult:
+    """Extract text, tables, images and metadata from a PDF using multi-strategy approach.
+
+    Pages are split into shards of DOCUMENT_PDF_PAGES_PER_SHARD and extracted
+    in parallel in the document worker pool, then merged in page order.
+    Scanned PDFs (under 50 chars/page) get a second, equally sharded OCR pass.
+    If the time or memory budget runs out, the pages extracted so far are
+    returned with ``metadata["partial"]`` set.
+    """
+    try:
+        import fitz  # noqa: F401  PyMuPDF
+    except ImportError:
+        logger.warning("PyMuPDF not installed, returning empty result")
+        return DocumentResult(
+            text="[PDF extraction requires PyMuPDF]",
+            markdown="*PDF extraction requires PyMuPDF*",
+            metadata={"error": "PyMuPDF not installed"},
+        )
+
+    deadline = _deadline()
+    source: bytes | str = raw_bytes
+    try:
+        metadata = await _await_within(
+            _submit(_extract_pdf_outline, raw_bytes), deadline, _extract_pdf_outline, raw_bytes
+        )
+        ranges = _pdf_shard_ranges(
+            metadata["page_count"], settings.DOCUMENT_PDF_PAGES_PER_SHARD
+        )
+        if len(ranges) > 1:
+            source = await asyncio.to_thread(_spill_to_tempfile, raw_bytes)
+
+        shard_pages, stop_reason = await _run_shards(
+            _extract_pdf_pages, source, ranges, deadline
+        )
+
         # Strategy 3: OCR fallback for scanned PDFs
-        avg_chars = total_chars / max(doc.page_count, 1)
-        if avg_chars < 50 and doc.page_count > 0:
+        ocr_texts: dict[int, str] = {}
+        extracted = [pg for shard in shard_pages for pg in shard or ()]
+        total_chars = sum(len(pg["text"].strip()) for pg in extracted)
+        if extracted and stop_reason is None and total_chars / len(extracted) < 50:
             metadata["scanned_pdf"] = True
-            ocr_pages_text = []
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                try:
-                    tp = page.get_textpage_ocr(language="eng")
-                    ocr_text = page.get_text("text", textpage=tp)
-                    if ocr_text.strip():
-                        ocr_pages_text.append(ocr_text)
-                        all_pages[page_num]["text"] = ocr_text.strip()
-                        all_pages[page_num]["markdown"] = ocr_text.strip()
-                except Exception:
-                    # OCR unavailable — try pixmap render note
-                    try:
-                        _pix = page.get_pixmap(dpi=150)
+            ocr_shards, stop_reason = await _run_shards(
+                _ocr_pdf_pages, source, ranges, deadline
+            )
+            for (start, _end), shard in zip(ranges, ocr_shards):
+                for offset, ocr_text in enumerate(shard or ()):
+                    if ocr_text is None:
                         metadata["ocr_unavailable"] = True
                         metadata["note"] = (
                             "Scanned PDF detected but OCR (Tesseract) is not available"
                         )
-                    except Exception:
-                        pass
-            if ocr_pages_text:
-                pages_text = ocr_pages_text
+                    elif ocr_text.strip():
+                        ocr_texts[start + offset + 1] = ocr_text
+            if ocr_texts:
                 metadata["ocr_applied"] = True
 
-        full_text = "\n\n".join(t for t in pages_text if t.strip())
-        word_count = len(full_text.split())
-
-        # Finalize markdown
-        md_parts.append(f"**Pages:** {doc.page_count} | **Words:** {word_count}\n")
-        md_parts.append("---\n")
-        for pg in all_pages:
-            md_parts.append(f"## Page {pg['page_num']}\n")
-            md_parts.append(pg["markdown"])
-            md_parts.append("\n---\n")
-
-        markdown = "\n\n".join(md_parts)
-
-        metadata["table_count"] = len(all_tables)
-        metadata["image_count"] = len(all_images)
-
-        # Capture page_count BEFORE closing to avoid "document closed" bug
-        total_pages = doc.page_count
-        doc.close()
-
-        return DocumentResult(
-            text=full_text,
-            markdown=markdown,
-            metadata=metadata,
-            page_count=total_pages,
-            word_count=word_count,
-            tables=all_tables,
-            images=all_images,
-            pages=all_pages,
-        )
+        result = _merge_pdf_pages(metadata, shard_pages, ocr_texts)
+        if stop_reason is not None:
+            _mark_partial(result, stop_reason)
+        return result
 
+    except (asyncio.TimeoutError, MemoryError, BrokenProcessPool) as e:
+        reason = _budget_reason(e)
+        logger.warning(f"PDF extraction stopped before any page: {reason}")
+        return _budget_error_result("pdf", reason)
     except Exception as e:
         logger.error(f"PDF extraction failed: {e}")
         return DocumentResult(
@@ -452,6 +792,12 @@ async def extract_pdf(raw_bytes: bytes) -> DocumentResult:
             markdown=f"*PDF extraction failed: {e}*",
             metadata={"error": str(e), "document_type": "pdf"},
         )
+    finally:
+        if isinstance(source, str):
+            try:
+                os.unlink(source)
+            except OSError:
+                pass
 
 
 # ---------------------------------------------------------------------------
@@ -459,7 +805,7 @@ async def extract_pdf(raw_bytes: bytes) -> DocumentResult:
 # ---------------------------------------------------------------------------
 
 
-async def extract_docx(raw_bytes: bytes) -> DocumentResult:
+def _extract_docx_sync(raw_bytes: bytes) -> DocumentResult:
     """Extract text, images, hyperlinks, and metadata from a DOCX."""
     try:
         from docx import Document
@@ -744,12 +1090,17 @@ def _extract_docx_notes(raw_bytes: bytes) -> str:
     return "\n".join(notes)
 
 
+async def extract_docx(raw_bytes: bytes) -> DocumentResult:
+    """Run :func:`_extract_docx_sync` in the document worker pool."""
+    return await _run_extractor(_extract_docx_sync, raw_bytes, "docx")
+
+
 # ---------------------------------------------------------------------------
 # XLSX Extraction
 # ---------------------------------------------------------------------------
 
 
-async def extract_xlsx(raw_bytes: bytes) -> DocumentResult:
+def _extract_xlsx_sync(raw_bytes: bytes) -> DocumentResult:
     """Extract data from XLSX using openpyxl."""
     try:
         import openpyxl
@@ -847,12 +1198,17 @@ async def extract_xlsx(raw_bytes: bytes) -> DocumentResult:
         )
 
 
+async def extract_xlsx(raw_bytes: bytes) -> DocumentResult:
+    """Run :func:`_extract_xlsx_sync` in the document worker pool."""
+    return await _run_extractor(_extract_xlsx_sync, raw_bytes, "xlsx")
+
+
 # ---------------------------------------------------------------------------
 # PPTX Extraction
 # ---------------------------------------------------------------------------
 
 
-async def extract_pptx(raw_bytes: bytes) -> DocumentResult:
+def _extract_pptx_sync(raw_bytes: bytes) -> DocumentResult:
     """Extract text, tables, and notes from PPTX using python-pptx."""
     try:
         from pptx import Presentation
@@ -979,12 +1335,17 @@ async def extract_pptx(raw_bytes: bytes) -> DocumentResult:
         )
 
 
+async def extract_pptx(raw_bytes: bytes) -> DocumentResult:
+    """Run :func:`_extract_pptx_sync` in the document worker pool."""
+    return await _run_extractor(_extract_pptx_sync, raw_bytes, "pptx")
+
+
 # ---------------------------------------------------------------------------
 # CSV Extraction
 # ---------------------------------------------------------------------------
 
 
-async def extract_csv(raw_bytes: bytes) -> DocumentResult:
+def _extract_csv_sync(raw_bytes: bytes) -> DocumentResult:
     """Extract data from CSV/TSV files with auto-detection of delimiter and encoding."""
     # Try encoding detection
     text_content = None
@@ -1075,12 +1436,17 @@ async def extract_csv(raw_bytes: bytes) -> DocumentResult:
         )
 
 
+async def extract_csv(raw_bytes: bytes) -> DocumentResult:
+    """Run :func:`_extract_csv_sync` in the document worker pool."""
+    return await _run_extractor(_extract_csv_sync, raw_bytes, "csv")
+
+
 # ---------------------------------------------------------------------------
 # RTF Extraction
 # ---------------------------------------------------------------------------
 
 
-async def extract_rtf(raw_bytes: bytes) -> DocumentResult:
+def _extract_rtf_sync(raw_bytes: bytes) -> DocumentResult:
     """Extract text from RTF using striprtf."""
     try:
         from striprtf.striprtf import rtf_to_text
@@ -1132,12 +1498,17 @@ async def extract_rtf(raw_bytes: bytes) -> DocumentResult:
         )
 
 
+async def extract_rtf(raw_bytes: bytes) -> DocumentResult:
+    """Run :func:`_extract_rtf_sync` in the document worker pool."""
+    return await _run_extractor(_extract_rtf_sync, raw_bytes, "rtf")
+
+
 # ---------------------------------------------------------------------------
 # EPUB Extraction
 # ---------------------------------------------------------------------------
 
 
-async def extract_epub(raw_bytes: bytes) -> DocumentResult:
+def _extract_epub_sync(raw_bytes: bytes) -> DocumentResult:
     """Extract text from EPUB using zipfile + BeautifulSoup (no extra dependency)."""
     try:
         from bs4 import BeautifulSoup
@@ -1314,6 +1685,11 @@ async def extract_epub(raw_bytes: bytes) -> DocumentResult:
         )
 
 
+async def extract_epub(raw_bytes: bytes) -> DocumentResult:
+    """Run :func:`_extract_epub_sync` in the document worker pool."""
+    return await _run_extractor(_extract_epub_sync, raw_bytes, "epub")
+
+
 # ---------------------------------------------------------------------------
 # Unified dispatch
 # ---------------------------------------------------------------------------
@@ -1,13 +1,23 @@
 import asyncio
+import hashlib
 import json
 import logging
+import time
+from contextlib import asynccontextmanager
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.exceptions import BadRequestError
+from app.core.metrics import (
+    llm_cache_requests_total,
+    llm_chunk_duration_seconds,
+    llm_tokens_saved_total,
+)
+from app.core.redis import redis_client
 from app.core.security import decrypt_value
 from app.models.llm_key import LLMKey
 
@@ -40,6 +50,15 @@ DEFAULT_MODELS = {
 }
 
 
+_MAX_OUTPUT_TOKENS = 4096
+_CHUNK_OVERHEAD_TOKENS = 256  # Instruction line, chunk header and message framing
+_MIN_CHUNK_TOKENS = 1000
+_TOKEN_SAMPLE_CHARS = 20_000  # Characters tokenized to estimate chars-per-token
+
+_CACHE_PREFIX = "llm_cache:"
+_CACHE_STATS_KEY = "llm_cache:stats"
+
+
 async def extract_with_llm(
     db: AsyncSession,
     user_id: UUID,
@@ -51,6 +70,12 @@ async def extract_with_llm(
     """
     Extract structured data from content using the user's BYOK LLM key.
     Uses LiteLLM for universal provider support.
+
+    Content larger than the model's context budget is split into token-sized
+    chunks which are extracted concurrently (bounded per document and per
+    provider key) and merged in document order. Chunk results are cached by
+    content hash, so re-extracting the same page with the same prompt and
+    schema costs no tokens.
     """
     import litellm
 
@@ -78,65 +103,273 @@ async def extract_with_llm(
             "\n\nReturn ONLY valid JSON, no markdown formatting or explanation."
         )
 
-    # Check if content exceeds LLM context window (~8000 words)
-    # If so, chunk the content and process each chunk, then merge results
-    content_words = content.split()
-    max_words = 7500  # Leave room for system prompt + instructions
-
-    if len(content_words) > max_words:
-        # Use chunking to split content into processable pieces
-        from app.services.chunking import RegexChunking
-
-        chunker = RegexChunking(patterns=[r"\n\n"])
-        chunks = chunker.chunk(content)
-
-        # Merge small chunks to fill up to max_words each
-        merged_chunks = []
-        current_chunk = ""
-        for chunk in chunks:
-            if len((current_chunk + "\n\n" + chunk).split()) > max_words:
-                if current_chunk:
-                    merged_chunks.append(current_chunk)
-                current_chunk = chunk
-            else:
-                current_chunk = (current_chunk + "\n\n" + chunk).strip()
-        if current_chunk:
+    budget = _chunk_token_budget(litellm, model, system_prompt, prompt)
+    chunks = _split_content(litellm, model, content, budget)
+    limiter = _provider_limiter(f"{llm_key.provider}:{llm_key.id}")
+    call = _ChunkCall(
+        litellm, model, llm_key.provider, api_key, system_prompt, prompt, schema, limiter
+    )
+
+    if len(chunks) == 1:
+        return await _extract_chunk_cached(call, chunks[0], 0, 1)
+
+    # Extract chunks concurrently; the first failure cancels the rest
+    chunk_slots = asyncio.Semaphore(max(1, settings.LLM_CHUNK_CONCURRENCY))
+
+    async def _bounded(i: int, chunk: str):
+        async with chunk_slots:
+            return await _extract_chunk_cached(call, chunk, i, len(chunks))
+
+    tasks = [asyncio.create_task(_bounded(i, c)) for i, c in enumerate(chunks)]
+    try:
+        chunk_results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    return _merge_chunk_results([r for r in chunk_results if r])
+
+
+def _merge_chunk_results(all_results: list[Any]) -> dict[str, Any] | list[Any]:
+    """Merge per-chunk results (in document order) into one result."""
+    if not all_results:
+        return {"error": "No results from any chunk"}
+    if len(all_results) == 1:
+        return all_results[0]
+    # For list results, concatenate
+    if all(isinstance(r, list) for r in all_results):
+        merged = []
+        for r in all_results:
+            merged.extend(r)
+        return merged
+    # For dict results, merge keys (later chunks override)
+    if all(isinstance(r, dict) for r in all_results):
+        merged = {}
+        for r in all_results:
+            merged.update(r)
+        return merged
+    return all_results
+
+
+# ---------------------------------------------------------------------------
+# Token-aware chunking
+# ---------------------------------------------------------------------------
+
+
+def _count_tokens(litellm, model: str, text: str) -> int:
+    """Token count for *text* under *model*'s tokenizer (~4 chars/token fallback)."""
+    try:
+        return litellm.token_counter(model=model, text=text)
+    except Exception:
+        return len(text) // 4 + 1
+
+
+def _chunk_token_budget(
+    litellm, model: str, system_prompt: str, prompt: str | None
+) -> int:
+    """Max content tokens per chunk: the configured cap, shrunk to fit the
+    model's input window after the prompts and the reserved output."""
+    budget = settings.LLM_CHUNK_MAX_TOKENS
+    try:
+        info = litellm.get_model_info(model)
+        window = info.get("max_input_tokens") or info.get("max_tokens")
+    except Exception:
+        window = None  # Unknown model (e.g. ollama) — trust the configured cap
+    if window:
+        overhead = (
+            _count_tokens(litellm, model, system_prompt + (prompt or ""))
+            + _MAX_OUTPUT_TOKENS
+            + _CHUNK_OVERHEAD_TOKENS
+        )
+        budget = min(budget, window - overhead)
+    return max(budget, _MIN_CHUNK_TOKENS)
+
+
+def _split_content(litellm, model: str, content: str, max_tokens: int) -> list[str]:
+    """Split *content* on paragraph boundaries into chunks of at most
+    *max_tokens* tokens.
+
+    Tokens are estimated from a chars-per-token ratio measured on a sample of
+    the content, so the tokenizer runs once instead of per paragraph.
+    Paragraphs larger than a whole chunk are split on whitespace.
+    """
+    sample = content[:_TOKEN_SAMPLE_CHARS]
+    sample_tokens = _count_tokens(litellm, model, sample)
+    chars_per_token = len(sample) / sample_tokens if sample_tokens else 4.0
+    if len(content) / chars_per_token <= max_tokens:
+        return [content]
+    max_chars = max(1, int(max_tokens * chars_per_token))
+
+    from app.services.chunking import RegexChunking
+
+    pieces: list[str] = []
+    for paragraph in RegexChunking(patterns=[r"\n\n"]).chunk(content):
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        if paragraph:
+            pieces.append(paragraph)
+
+    # Merge paragraphs to fill up to max_chars each
+    merged_chunks: list[str] = []
+    current_chunk = ""
+    for piece in pieces:
+        if current_chunk and len(current_chunk) + 2 + len(piece) > max_chars:
             merged_chunks.append(current_chunk)
+            current_chunk = piece
+        else:
+            current_chunk = f"{current_chunk}\n\n{piece}" if current_chunk else piece
+    if current_chunk:
+        merged_chunks.append(current_chunk)
+    return merged_chunks or [content[:max_chars]]
 
-        if not merged_chunks:
-            merged_chunks = [" ".join(content_words[:max_words])]
 
-        # Process each chunk and merge results
-        all_results = []
-        for i, chunk in enumerate(merged_chunks):
-            chunk_result = await _extract_single_chunk(
-                litellm, model, api_key, system_prompt, prompt, chunk, schema, i, len(merged_chunks)
-            )
-            if chunk_result:
-                all_results.append(chunk_result)
-
-        # Merge chunk results
-        if not all_results:
-            return {"error": "No results from any chunk"}
-        if len(all_results) == 1:
-            return all_results[0]
-        # For list results, concatenate
-        if all(isinstance(r, list) for r in all_results):
-            merged = []
-            for r in all_results:
-                merged.extend(r)
-            return merged
-        # For dict results, merge keys (later chunks override)
-        if all(isinstance(r, dict) for r in all_results):
-            merged = {}
-            for r in all_results:
-                merged.update(r)
-            return merged
-        return all_results
-    else:
-        return await _extract_single_chunk(
-            litellm, model, api_key, system_prompt, prompt, content, schema, 0, 1
+# ---------------------------------------------------------------------------
+# Per-provider limits
+# ---------------------------------------------------------------------------
+
+
+class _ProviderLimiter:
+    """Concurrency cap plus request spacing for one provider key (per process)."""
+
+    __slots__ = ("_slots", "_interval", "_next_at")
+
+    def __init__(self, concurrency: int, rpm: int):
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next_at = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._slots:
+            if self._interval:
+                now = time.monotonic()
+                wait = self._next_at - now
+                self._next_at = max(now, self._next_at) + self._interval
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            yield
+
+
+_limiters: dict[str, _ProviderLimiter] = {}
+_limiters_loop_id: int | None = None  # Semaphores are bound to one event loop
+
+
+def _provider_limiter(key: str) -> _ProviderLimiter:
+    """Get the limiter for a provider key, resetting all limiters when the
+    running event loop changed (Celery tasks each run on a fresh loop)."""
+    global _limiters_loop_id
+    loop_id = id(asyncio.get_running_loop())
+    if loop_id != _limiters_loop_id:
+        _limiters.clear()
+        _limiters_loop_id = loop_id
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters[key] = _ProviderLimiter(
+            settings.LLM_PROVIDER_CONCURRENCY, settings.LLM_PROVIDER_RPM
         )
+    return limiter
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed chunk cache
+# ---------------------------------------------------------------------------
+
+
+class _ChunkCall:
+    """Everything except the chunk text needed to run one extraction call."""
+
+    __slots__ = (
+        "litellm", "model", "provider", "api_key", "system_prompt", "prompt",
+        "schema", "limiter",
+    )
+
+    def __init__(self, litellm, model, provider, api_key, system_prompt, prompt, schema, limiter):
+        self.litellm = litellm
+        self.model = model
+        self.provider = provider
+        self.api_key = api_key
+        self.system_prompt = system_prompt
+        self.prompt = prompt
+        self.schema = schema
+        self.limiter = limiter
+
+
+def _chunk_cache_key(
+    model: str, prompt: str | None, schema: dict | None, chunk: str
+) -> str:
+    """Cache key: SHA-256 of (model, prompt, canonical schema, chunk text)."""
+    digest = hashlib.sha256()
+    for part in (
+        model,
+        prompt or "",
+        json.dumps(schema, sort_keys=True) if schema else "",
+        chunk,
+    ):
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return f"{_CACHE_PREFIX}{digest.hexdigest()}"
+
+
+async def _extract_chunk_cached(
+    call: _ChunkCall, chunk: str, chunk_index: int, total_chunks: int
+) -> dict[str, Any] | list[Any]:
+    """Serve a chunk from the result cache, or extract it and cache the result.
+
+    The chunk position is deliberately not part of the key: the same
+    paragraph block gives the same answer whichever page it came from.
+    """
+    ttl = settings.LLM_CACHE_TTL_SECONDS
+    key = _chunk_cache_key(call.model, call.prompt, call.schema, chunk) if ttl > 0 else None
+
+    if key:
+        cached = await redis_client.get(key)
+        if cached:
+            try:
+                entry = json.loads(cached)
+                await _record_cache_hit(entry.get("tokens", 0))
+                return entry["result"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                pass
+        llm_cache_requests_total.labels(result="miss").inc()
+        await redis_client.hincrby(_CACHE_STATS_KEY, "misses", 1)
+
+    result, tokens = await _extract_single_chunk(
+        call.litellm, call.model, call.api_key, call.system_prompt, call.prompt,
+        chunk, call.schema, chunk_index, total_chunks,
+        limiter=call.limiter, provider=call.provider,
+    )
+    cacheable = result and not (isinstance(result, dict) and "raw_response" in result)
+    if key and cacheable:
+        await redis_client.set(
+            key, json.dumps({"result": result, "tokens": tokens}), ex=ttl
+        )
+    return result
+
+
+async def _record_cache_hit(tokens: int) -> None:
+    llm_cache_requests_total.labels(result="hit").inc()
+    llm_tokens_saved_total.inc(tokens)
+    await redis_client.hincrby(_CACHE_STATS_KEY, "hits", 1)
+    if tokens:
+        await redis_client.hincrby(_CACHE_STATS_KEY, "tokens_saved", tokens)
+
+
+async def get_llm_cache_stats() -> dict[str, Any]:
+    """Cluster-wide cache counters: hits, misses, hit rate and tokens saved."""
+    raw = await redis_client.hgetall(_CACHE_STATS_KEY) or {}
+    stats = {
+        field: int(raw.get(field) or 0) for field in ("hits", "misses", "tokens_saved")
+    }
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["ttl_seconds"] = settings.LLM_CACHE_TTL_SECONDS
+    return stats
 
 
 async def _extract_single_chunk(
@@ -149,8 +382,13 @@ async def _extract_single_chunk(
     schema: dict | None,
     chunk_index: int,
     total_chunks: int,
-) -> dict[str, Any] | list[Any]:
-    """Extract from a single content chunk."""
+    limiter: _ProviderLimiter | None = None,
+    provider: str = "",
+) -> tuple[dict[str, Any] | list[Any], int]:
+    """Extract from a single content chunk.
+
+    Returns the parsed result and the total tokens the call consumed.
+    """
     user_prompt = ""
     if prompt:
         user_prompt = f"Instruction: {prompt}\n\n"
@@ -159,34 +397,41 @@ async def _extract_single_chunk(
     user_prompt += f"Content to extract from:\n\n{content}"
 
     try:
-        response = await asyncio.wait_for(
-            litellm.acompletion(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                api_key=api_key,
-                response_format={"type": "json_object"} if schema else None,
-                temperature=0.1,
-                max_tokens=4096,
-            ),
-            timeout=60,
-        )
+        async with limiter.slot() if limiter else _no_limit():
+            started = time.monotonic()
+            response = await asyncio.wait_for(
+                litellm.acompletion(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    api_key=api_key,
+                    response_format={"type": "json_object"} if schema else None,
+                    temperature=0.1,
+                    max_tokens=_MAX_OUTPUT_TOKENS,
+                ),
+                timeout=60,
+            )
+            llm_chunk_duration_seconds.labels(provider=provider or "unknown").observe(
+                time.monotonic() - started
+            )
 
         result_text = response.choices[0].message.content
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "total_tokens", 0) or 0
 
         # Try to parse as JSON
         try:
-            return json.loads(result_text)
+            return json.loads(result_text), tokens
         except json.JSONDecodeError:
             # Try to extract JSON from markdown code blocks
             if "```" in result_text:
                 json_match = result_text.split("```")[1]
                 if json_match.startswith("json"):
                     json_match = json_match[4:]
-                return json.loads(json_match.strip())
-            return {"raw_response": result_text}
+                return json.loads(json_match.strip()), tokens
+            return {"raw_response": result_text}, tokens
 
     except asyncio.TimeoutError:
         logger.error(f"LLM extraction timed out for model={model} (chunk {chunk_index + 1}/{total_chunks})")
@@ -199,6 +444,11 @@ async def _extract_single_chunk(
         raise BadRequestError(f"LLM extraction failed: {type(e).__name__}: {e}")
 
 
+@asynccontextmanager
+async def _no_limit():
+    yield
+
+
 async def _get_user_llm_key(
     db: AsyncSession, user_id: UUID, provider: str | None = None
 ) -> LLMKey | None:
@@ -1,9 +1,11 @@
 import asyncio
-import gzip
 import logging
 import random
 import re
 import xml.etree.ElementTree as ET
+import zlib
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from urllib.parse import urljoin, urlparse, parse_qs, urlencode
 
 import httpx
@@ -140,38 +142,6 @@ async def _fetch_url(url: str, timeout: int = 15) -> tuple[str, int]:
     return "", 0
 
 
-async def _fetch_bytes(url: str, timeout: int = 15) -> tuple[bytes, int]:
-    """Fetch a URL and return raw bytes (for gzip handling)."""
-    try:
-        from curl_cffi.requests import AsyncSession
-
-        impersonate = random.choice(["chrome124", "chrome123", "chrome120"])
-        async with AsyncSession(impersonate=impersonate) as session:
-            resp = await session.get(
-                url,
-                timeout=timeout,
-                allow_redirects=True,
-                headers=random.choice(_HEADERS_LIST),
-            )
-            return resp.content, resp.status_code
-    except Exception:
-        pass
-
-    try:
-        async with httpx.AsyncClient(
-            timeout=timeout,
-            follow_redirects=True,
-            headers=random.choice(_HEADERS_LIST),
-            http2=True,
-        ) as client:
-            resp = await client.get(url)
-            return resp.content, resp.status_code
-    except Exception:
-        pass
-
-    return b"", 0
-
-
 async def _fetch_with_browser(url: str) -> str:
     """Fetch page content using browser with scrolling to load lazy content."""
     try:
@@ -457,58 +427,115 @@ async def _deep_discover_via_local_browser(url: str) -> tuple[str, list[str]]:
         return "", []
 
 
-async def map_website(request: MapRequest) -> list[LinkResult]:
+# ── Concurrent map pipeline ──────────────────────────────────────
+# Cheap strategies (sitemaps, homepage links) start together and feed one
+# dedup set. The browser-backed strategies (deep JS nav discovery, browser
+# fallback, deep BFS) only start once the cheap ones are done, or their
+# yield rate says they won't reach the limit soon. Everything is cancelled
+# as soon as the limit is reached.
+
+_MAP_YIELD_CHECK_INTERVAL = 1.0  # Seconds between yield-rate checks
+_MAP_CHEAP_GRACE_SECONDS = 5.0  # Cheap-only window before a yield estimate counts
+_MAP_YIELD_HORIZON_SECONDS = 20.0  # How far ahead the yield rate is projected
+_MAP_DONE = object()
+
+
+def _matches_search(link: LinkResult, search_lower: str) -> bool:
+    """True if the search term appears in the link's URL, title or description."""
+    return (
+        search_lower in link.url.lower()
+        or bool(link.title and search_lower in link.title.lower())
+        or bool(link.description and search_lower in link.description.lower())
+    )
+
+
+def _expensive_strategies_needed(
+    found: int, limit: int, rate: float, elapsed: float, cheap_done: bool
+) -> bool:
+    """Decide whether the browser strategies should start.
+
+    Not needed once the limit is met. Needed once the cheap strategies have
+    finished short of it, or — after a short grace period — when their
+    current yield rate projected over _MAP_YIELD_HORIZON_SECONDS falls short.
     """
-    Discover all URLs on a website using multiple strategies:
-    1. Sitemap.xml parsing (with gzip, sitemap index, lastmod/priority)
-    2. Quick crawl of homepage + linked pages (with anti-detection)
+    if found >= limit:
+        return False
+    if cheap_done:
+        return True
+    if elapsed < _MAP_CHEAP_GRACE_SECONDS:
+        return False
+    return found + rate * _MAP_YIELD_HORIZON_SECONDS < limit
+
+
+async def iter_map_links(request: MapRequest) -> AsyncIterator[LinkResult]:
+    """
+    Discover URLs on a website, yielding each new link as soon as it is found:
+    1. Sitemap.xml parsing (with gzip, sitemap index, lastmod/priority) and a
+       quick crawl of the homepage, run concurrently
+    2. Deep JS navigation discovery (stealth engine, then local browser)
     3. Browser fallback for blocked sites
-    4. Optional search/keyword filtering
+    4. Deep BFS crawl seeded with the URLs found so far
+    Steps 2-4 run only when the cheap strategies won't reach the limit.
 
-    All URLs are normalized (tracking params stripped) and deduplicated.
-    Junk URLs (login, cart, admin, etc.) are filtered out.
+    All URLs are normalized (tracking params stripped) and deduplicated, junk
+    URLs (login, cart, admin, etc.) are dropped, and the optional search term
+    filters links as they arrive. Stops after ``request.limit`` links.
     """
     url = request.url
-    all_links: dict[str, LinkResult] = {}
+    limit = request.limit
+    search_lower = request.search.lower() if request.search else None
+    found: dict[str, None] = {}  # every clean URL seen, in discovery order
+    out: asyncio.Queue = asyncio.Queue()
+    accepted = 0
 
     def _add_link(link: LinkResult):
-        """Add a link with normalization, dedup, and junk filtering."""
+        """Add a link with normalization, dedup, junk and search filtering."""
+        nonlocal accepted
+        if accepted >= limit:
+            return
         clean_url = _normalize_url_for_map(link.url)
-        if clean_url in all_links:
+        if clean_url in found:
             return
         if _is_junk_url(clean_url):
             return
-        all_links[clean_url] = LinkResult(
+        found[clean_url] = None
+        clean = LinkResult(
             url=clean_url,
             title=link.title,
             description=link.description,
             lastmod=getattr(link, "lastmod", None),
             priority=getattr(link, "priority", None),
         )
+        if search_lower and not _matches_search(clean, search_lower):
+            return
+        accepted += 1
+        out.put_nowait(clean)
 
-    # Strategy 1: Sitemap discovery (HIGHEST PRIORITY — canonical URLs)
-    if request.use_sitemap:
-        sitemap_links = await _parse_sitemaps(url)
-        for link in sitemap_links:
+    parsed_base = urlparse(url)
+    base_domain = parsed_base.netloc
+    if base_domain.startswith("www."):
+        base_domain = base_domain[4:]
+
+    # ── Cheap strategies ──────────────────────────────────────────
+    async def _sitemap_strategy():
+        # Sitemap discovery (HIGHEST PRIORITY — canonical URLs)
+        async with aclosing(_iter_sitemap_links(url)) as sitemap_links:
+            async for link in sitemap_links:
+                _add_link(link)
+        logger.info(f"Sitemap strategy done for {url} ({len(found)} clean URLs so far)")
+
+    async def _homepage_strategy():
+        # Quick homepage crawl with anti-detection
+        for link in await _crawl_homepage(url, request.include_subdomains):
             _add_link(link)
-        if sitemap_links:
-            logger.info(f"Sitemap strategy yielded {len(all_links)} clean URLs")
-
-    # Strategy 2: Quick homepage crawl with anti-detection
-    homepage_links = await _crawl_homepage(url, request.include_subdomains)
-    for link in homepage_links:
-        _add_link(link)
-
-    # Strategy 3: Deep JS Navigation Discovery — the god-tier strategy for doc sites.
-    # Renders the page with a real browser, detects the doc framework (GitBook,
-    # Docusaurus, MkDocs, ReadTheDocs, etc.), waits for sidebar to render,
-    # expands all collapsible nav trees, and extracts every navigation link.
-    if len(all_links) < request.limit:
-        logger.info(f"Running deep JS nav discovery for {url} (have {len(all_links)} links)")
-        parsed_base = urlparse(url)
-        base_domain = parsed_base.netloc
-        if base_domain.startswith("www."):
-            base_domain = base_domain[4:]
+
+    # ── Expensive (browser-backed) strategies ─────────────────────
+    async def _deep_nav_strategy():
+        # Deep JS Navigation Discovery — the god-tier strategy for doc sites.
+        # Renders the page with a real browser, detects the doc framework (GitBook,
+        # Docusaurus, MkDocs, ReadTheDocs, etc.), waits for sidebar to render,
+        # expands all collapsible nav trees, and extracts every navigation link.
+        logger.info(f"Running deep JS nav discovery for {url} (have {len(found)} links)")
 
         # Try stealth engine first (best anti-detection + full discovery JS)
         html, discovered_links, doc_framework = await _deep_discover_via_stealth_engine(url)
@@ -540,69 +567,365 @@ async def map_website(request: MapRequest) -> list[LinkResult]:
                 _add_link(LinkResult(url=link_url, title=None, description=None))
 
         # Also extract standard links from the deep-discovery HTML
-        if html and len(all_links) < request.limit:
+        if html and accepted < limit:
             html_links = _extract_links_from_html(html, url, base_domain, request.include_subdomains)
             for link in html_links:
                 _add_link(link)
 
-    # Strategy 4: If we still got very few links, try basic browser fallback
-    if len(all_links) < 5:
-        logger.info(f"Few links found for {url}, trying browser fallback")
-        browser_links = await _crawl_homepage_browser(url, request.include_subdomains)
-        for link in browser_links:
-            _add_link(link)
+    async def _expensive_strategies(cheap: list[asyncio.Task]):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        last_count, last_check = 0, started
+        rate = 0.0
+        while True:
+            cheap_done = all(t.done() for t in cheap)
+            now = loop.time()
+            if now > last_check:
+                rate = (accepted - last_count) / (now - last_check)
+                last_count, last_check = accepted, now
+            if accepted >= limit:
+                return
+            if _expensive_strategies_needed(
+                accepted, limit, rate, now - started, cheap_done
+            ):
+                break
+            await asyncio.wait(cheap, timeout=_MAP_YIELD_CHECK_INTERVAL)
 
-    # Strategy 5: Deep BFS crawl if we still have room under the limit
-    if len(all_links) < request.limit:
-        parsed_base = urlparse(url)
-        base_domain = parsed_base.netloc
-        seed_urls = [u for u in all_links if u != url][:20]  # seed with best URLs so far
-        if seed_urls:
-            remaining = request.limit - len(all_links)
-            logger.info(
-                f"Starting deep crawl for {url}: {len(seed_urls)} seeds, "
-                f"need {remaining} more URLs"
-            )
-            deep_links = await _deep_crawl(
-                seed_urls=seed_urls,
-                base_domain=base_domain,
-                include_subdomains=request.include_subdomains,
-                limit=remaining,
-            )
-            for link in deep_links:
+        await _deep_nav_strategy()
+
+        # If we still got very few links, try basic browser fallback
+        await asyncio.gather(*cheap, return_exceptions=True)
+        if len(found) < 5:
+            logger.info(f"Few links found for {url}, trying browser fallback")
+            for link in await _crawl_homepage_browser(url, request.include_subdomains):
                 _add_link(link)
 
-    # Strategy 6: Filter by search term
-    if request.search:
-        search_lower = request.search.lower()
-        filtered = {}
-        for url_key, link in all_links.items():
-            score = 0
-            if search_lower in url_key.lower():
-                score += 2
-            if link.title and search_lower in link.title.lower():
-                score += 3
-            if link.description and search_lower in link.description.lower():
-                score += 1
-            if score > 0:
-                filtered[url_key] = link
-        all_links = filtered
-
-    # Apply limit
-    result = list(all_links.values())[: request.limit]
-    return result
-
-
-async def _parse_sitemaps(base_url: str) -> list[LinkResult]:
-    """Discover and parse ALL sitemaps using a multi-strategy approach.
-
-    Strategy:
-        1. GUARANTEED fetch of robots.txt (4-tier cascade)
-        2. Extract every Sitemap: directive from robots.txt
-        3. If robots.txt had no sitemaps, try standard CMS fallback paths
-        4. Check homepage HTML for <link rel="sitemap"> references
-        5. Recursively follow sitemap indexes to discover all sub-sitemaps
-        6. Deduplicate results
+        # Deep BFS crawl if we still have room under the limit
+        if accepted < limit:
+            seed_urls = [u for u in found if u != url][:20]  # seed with best URLs so far
+            if seed_urls:
+                logger.info(
+                    f"Starting deep crawl for {url}: {len(seed_urls)} seeds, "
+                    f"need {limit - accepted} more URLs"
+                )
+                await _deep_crawl(
+                    seed_urls=seed_urls,
+                    base_domain=parsed_base.netloc,
+                    include_subdomains=request.include_subdomains,
+                    limit=limit - accepted,
+                    on_link=_add_link,
+                )
+
+    cheap = [asyncio.create_task(_homepage_strategy())]
+    if request.use_sitemap:
+        cheap.append(asyncio.create_task(_sitemap_strategy()))
+    tasks = cheap + [asyncio.create_task(_expensive_strategies(cheap))]
+
+    async def _finish():
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Map strategy failed for {url}: {result}")
+        out.put_nowait(_MAP_DONE)
+
+    finisher = asyncio.create_task(_finish())
+    emitted = 0
+    try:
+        while emitted < limit:
+            link = await out.get()
+            if link is _MAP_DONE:
+                break
+            emitted += 1
+            yield link
+    finally:
+        for task in (*tasks, finisher):
+            task.cancel()
+        await asyncio.gather(*tasks, finisher, return_exceptions=True)
+        logger.info(f"Map of {url}: {emitted} links from {len(found)} unique URLs")
+
+
+async def map_website(request: MapRequest) -> list[LinkResult]:
+    """Discover up to ``request.limit`` URLs on a website (see iter_map_links)."""
+    async with aclosing(iter_map_links(request)) as links:
+        return [link async for link in links]
+
+
+# ── Streaming sitemap engine ─────────────────────────────────────
+# Sitemaps are streamed: bytes arrive in chunks, gzip is inflated
+# incrementally, and an XMLPullParser emits each <url>/<sitemap> entry as
+# soon as its end tag is seen. Consumed elements are cleared, so memory is
+# bounded by the chunk size rather than by a 50k-URL document, and callers
+# can stop reading once they have enough URLs.
+
+_SITEMAP_MAX_DEPTH = 3  # Sitemap index nesting followed
+_SITEMAP_MAX_CHILDREN = 500  # Child sitemaps followed per index
+_SITEMAP_FETCH_CONCURRENCY = 4  # Child sitemaps fetched at once
+_SITEMAP_BUFFER = 1000  # Parsed links buffered ahead of the consumer
+_SITEMAP_INFLATE_CHUNK = 1024 * 1024  # Max decompressed bytes per parser feed
+
+_SITEMAP_SNIFF_BYTES = 256  # Body prefix checked for HTML error pages
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_SITEMAP_DONE = object()
+
+
+def _local_name(tag) -> str:
+    """Tag name without its XML namespace (``{ns}url`` -> ``url``)."""
+    return tag.rpartition("}")[2] if isinstance(tag, str) else ""
+
+
+def _child_text(el: ET.Element, name: str) -> str | None:
+    """Stripped text of the first direct child with local name ``name``."""
+    for child in el:
+        if _local_name(child.tag) == name:
+            return child.text.strip() if child.text else None
+    return None
+
+
+def _link_from_url_element(url_el: ET.Element) -> LinkResult | None:
+    """Build a LinkResult from a sitemap <url> element (lastmod, priority, images)."""
+    url = _child_text(url_el, "loc")
+    if not url:
+        return None
+
+    lastmod = _child_text(url_el, "lastmod")
+    changefreq = _child_text(url_el, "changefreq")
+
+    priority = None
+    priority_text = _child_text(url_el, "priority")
+    if priority_text:
+        try:
+            priority = float(priority_text)
+        except ValueError:
+            pass
+
+    # Image sitemap entries (<image:image><image:loc>)
+    image_count = sum(
+        1
+        for child in url_el
+        if _local_name(child.tag) == "image" and _child_text(child, "loc")
+    )
+
+    # Build description from metadata
+    desc_parts = []
+    if lastmod:
+        desc_parts.append(f"Updated: {lastmod}")
+    if changefreq:
+        desc_parts.append(f"Freq: {changefreq}")
+    if priority is not None:
+        desc_parts.append(f"Priority: {priority}")
+    if image_count:
+        desc_parts.append(f"{image_count} image(s)")
+
+    return LinkResult(
+        url=url,
+        title=None,
+        description=" | ".join(desc_parts) if desc_parts else None,
+        lastmod=lastmod,
+        priority=priority,
+    )
+
+
+class _SitemapStreamParser:
+    """Incremental parser for one sitemap document.
+
+    ``feed()`` accepts raw (optionally gzipped) bytes and returns the entries
+    completed so far: ``("sitemap", child_url)`` for index entries and
+    ``("url", LinkResult)`` for URL-set entries. Each entry element is
+    detached from the tree once read.
+    """
+
+    __slots__ = ("_parser", "_root", "_inflater", "_sniffed")
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: ET.Element | None = None
+        self._inflater = None
+        self._sniffed = False
+
+    def feed(self, data: bytes) -> list[tuple[str, object]]:
+        if not self._sniffed and data:
+            self._sniffed = True
+            if data[:2] == _GZIP_MAGIC:
+                self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflater is None:
+            self._parser.feed(data)
+            return self._drain()
+
+        # Inflate in bounded slices so a highly compressed chunk never
+        # materializes more than _SITEMAP_INFLATE_CHUNK bytes at once.
+        entries = []
+        while data:
+            out = self._inflater.decompress(data, _SITEMAP_INFLATE_CHUNK)
+            data = self._inflater.unconsumed_tail
+            if out:
+                self._parser.feed(out)
+                entries.extend(self._drain())
+        return entries
+
+    def _drain(self) -> list[tuple[str, object]]:
+        entries = []
+        for event, el in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = el
+                continue
+            name = _local_name(el.tag)
+            if name == "url":
+                link = _link_from_url_element(el)
+                if link is not None:
+                    entries.append(("url", link))
+            elif name == "sitemap":
+                loc = _child_text(el, "loc")
+                if loc:
+                    entries.append(("sitemap", loc))
+            else:
+                continue
+            # Entries are children of <urlset>/<sitemapindex>; dropping them
+            # from the root keeps the built tree at one entry at a time.
+            el.clear()
+            if self._root is not None and el is not self._root:
+                self._root.clear()
+        return entries
+
+
+def _is_sitemap_body(head: bytes) -> bool:
+    """True unless the first bytes of a 200 response look like an HTML page."""
+    if head[:2] == _GZIP_MAGIC:
+        return True
+    stripped = head.lstrip()
+    if stripped.startswith((b"<?xml", b"<urlset", b"<sitemapindex")):
+        return True
+    # Some servers return HTML error pages with 200 status — reject those
+    return b"<html" not in stripped[:200].lower()
+
+
+async def _stream_url_bytes(url: str, timeout: int = 20) -> AsyncIterator[bytes]:
+    """Stream a 200 response body in chunks via curl_cffi, with httpx fallback.
+
+    Yields nothing for non-200 responses. Falls back to httpx only if
+    curl_cffi failed before producing any bytes.
+    """
+    started = False
+    try:
+        from curl_cffi.requests import AsyncSession
+
+        impersonate = random.choice(["chrome124", "chrome123", "chrome120"])
+        async with AsyncSession(impersonate=impersonate) as session:
+            resp = await session.get(
+                url,
+                timeout=timeout,
+                allow_redirects=True,
+                headers=random.choice(_HEADERS_LIST),
+                stream=True,
+            )
+            try:
+                if resp.status_code != 200:
+                    logger.debug(f"curl_cffi {url} -> {resp.status_code}")
+                    return
+                async for chunk in resp.aiter_content():
+                    started = True
+                    yield chunk
+            finally:
+                # Stop the transfer if the consumer stopped reading early
+                if resp.quit_now is not None:
+                    resp.quit_now.set()
+        return
+    except Exception as e:
+        if started:
+            logger.debug(f"curl_cffi stream for {url} broke off: {e}")
+            return
+        logger.debug(f"curl_cffi failed for {url}: {e}")
+
+    try:
+        async with httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            headers=random.choice(_HEADERS_LIST),
+            http2=True,
+        ) as client:
+            async with client.stream("GET", url) as resp:
+                if resp.status_code != 200:
+                    logger.debug(f"httpx {url} -> {resp.status_code}")
+                    return
+                async for chunk in resp.aiter_bytes():
+                    yield chunk
+    except Exception as e:
+        logger.debug(f"httpx failed for {url}: {e}")
+
+
+async def _stealth_sitemap_text(url: str) -> str | None:
+    """Fetch a sitemap through the stealth engine and unwrap the XML."""
+    stealth_text = await _fetch_with_stealth_engine(url)
+    if not stealth_text:
+        return None
+    # Stealth engine wraps content in HTML — extract the XML
+    if "<?xml" in stealth_text or "<urlset" in stealth_text or "<sitemapindex" in stealth_text:
+        soup = BeautifulSoup(stealth_text, "lxml")
+        # The XML might be inside a <pre> tag
+        pre = soup.find("pre")
+        if pre:
+            return pre.get_text()
+        # Or it might be the full content
+        body_text = soup.get_text()
+        if "<?xml" in body_text or "<urlset" in body_text:
+            return body_text
+        return stealth_text
+    return None
+
+
+async def _iter_sitemap_entries(url: str) -> AsyncIterator[tuple[str, object]]:
+    """Stream one sitemap (plain or gzipped) and yield its entries as parsed.
+
+    Tries HTTP first (fast, streamed), falls back to the stealth engine for
+    blocked sitemaps. A parse error ends the document but keeps the entries
+    already yielded.
+    """
+    parser = _SitemapStreamParser()
+    head = b""
+    accepted = False
+    try:
+        async for chunk in _stream_url_bytes(url):
+            if not accepted:
+                # Sniff the first bytes: gzip and XML pass, HTML error pages don't
+                head += chunk
+                if len(head) < _SITEMAP_SNIFF_BYTES and head[:2] != _GZIP_MAGIC:
+                    continue
+                if not _is_sitemap_body(head):
+                    break
+                accepted, chunk, head = True, head, b""
+            for entry in parser.feed(chunk):
+                yield entry
+        if not accepted and head and _is_sitemap_body(head):
+            # Short body that ended before the sniff size was reached
+            accepted = True
+            for entry in parser.feed(head):
+                yield entry
+    except (ET.ParseError, zlib.error) as e:
+        logger.debug(f"Sitemap parse error for {url}: {e}")
+        return
+    if accepted:
+        return
+
+    # Stealth fallback for anti-bot protected sitemap files
+    logger.debug(f"HTTP failed for sitemap {url}, trying stealth")
+    text = await _stealth_sitemap_text(url)
+    if not text:
+        return
+    parser = _SitemapStreamParser()
+    try:
+        for entry in parser.feed(text.encode("utf-8")):
+            yield entry
+    except ET.ParseError as e:
+        logger.debug(f"Sitemap parse error for {url}: {e}")
+
+
+async def _discover_sitemap_urls(base_url: str) -> list[str]:
+    """Find sitemap URLs for a site.
+
+    1. GUARANTEED fetch of robots.txt (4-tier cascade)
+    2. Extract every Sitemap: directive from robots.txt
+    3. If robots.txt had no sitemaps, try standard CMS fallback paths
+    4. Check homepage HTML for <link rel="sitemap"> references
     """
     parsed = urlparse(base_url)
     domain = f"{parsed.scheme}://{parsed.netloc}"
@@ -661,212 +984,109 @@ async def _parse_sitemaps(base_url: str) -> list[LinkResult]:
     except Exception as e:
         logger.debug(f"Homepage <link> sitemap check failed: {e}")
 
-    # ── Step 5: Fetch and recursively parse all discovered sitemaps ──
-    all_links: list[LinkResult] = []
-    visited_sitemaps: set[str] = set()
+    # Deduplicate, preserving discovery order
+    return list(dict.fromkeys(sitemap_urls))
 
-    async def _recursive_parse(url: str, depth: int = 0):
-        """Recursively fetch and parse a sitemap, following indexes."""
-        if url in visited_sitemaps or depth > 3:
-            return
-        visited_sitemaps.add(url)
 
-        xml_text = await _fetch_sitemap_content(url)
-        if not xml_text:
-            return
+async def _iter_sitemap_links(
+    base_url: str,
+    limit: int | None = None,
+    sitemap_urls: list[str] | None = None,
+) -> AsyncIterator[LinkResult]:
+    """Discover a site's sitemaps and yield their URLs lazily.
 
-        try:
-            root = ET.fromstring(xml_text)
-        except ET.ParseError as e:
-            logger.debug(f"XML parse error for {url}: {e}")
-            return
+    Sitemap indexes are followed up to _SITEMAP_MAX_DEPTH levels, with child
+    sitemaps fetched _SITEMAP_FETCH_CONCURRENCY at a time. Links are
+    normalized and deduplicated as they stream out; iteration stops after
+    ``limit`` unique links, and closing the generator early cancels any
+    in-flight fetches — use ``contextlib.aclosing`` when breaking out.
+    """
+    if sitemap_urls is None:
+        sitemap_urls = await _discover_sitemap_urls(base_url)
 
-        ns = {
-            "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
-            "image": "http://www.google.com/schemas/sitemap-image/1.1",
-        }
+    jobs: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+    out: asyncio.Queue = asyncio.Queue(maxsize=_SITEMAP_BUFFER)
+    visited_sitemaps: set[str] = set()
+    pending = 0
+    raw_count = 0
 
-        # Check if it's a sitemap index (contains <sitemap><loc> entries)
-        index_entries = root.findall(".//sm:sitemap/sm:loc", ns)
-        # Also handle sitemaps without namespace prefix
-        if not index_entries:
-            index_entries = root.findall(".//{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap/{http://www.sitemaps.org/schemas/sitemap/0.9}loc")
-        # Also try no-namespace (some sites serve sitemaps without xmlns)
-        if not index_entries:
-            index_entries = root.findall(".//sitemap/loc")
-
-        if index_entries:
-            logger.info(f"Sitemap index at {url}: {len(index_entries)} sub-sitemaps (depth={depth})")
-            for entry in index_entries[:500]:
-                if entry.text:
-                    sub_url = entry.text.strip()
-                    await _recursive_parse(sub_url, depth + 1)
-        else:
-            # It's a URL set — extract all URLs
-            sub_links = _parse_single_sitemap_xml(root, ns)
-            if sub_links:
-                logger.info(f"Sitemap {url}: extracted {len(sub_links)} URLs")
-                all_links.extend(sub_links)
-
-    # Deduplicate sitemap URLs before fetching
-    seen_sitemap_urls = set()
-    unique_sitemap_urls = []
-    for sm_url in sitemap_urls:
-        if sm_url not in seen_sitemap_urls:
-            seen_sitemap_urls.add(sm_url)
-            unique_sitemap_urls.append(sm_url)
+    def _schedule(url: str, depth: int) -> None:
+        nonlocal pending
+        if url in visited_sitemaps or depth > _SITEMAP_MAX_DEPTH:
+            return
+        visited_sitemaps.add(url)
+        pending += 1
+        jobs.put_nowait((url, depth))
+
+    async def _worker() -> None:
+        nonlocal pending
+        while True:
+            url, depth = await jobs.get()
+            children = urls = 0
+            try:
+                async for kind, value in _iter_sitemap_entries(url):
+                    if kind == "sitemap":
+                        if children < _SITEMAP_MAX_CHILDREN:
+                            _schedule(value.strip(), depth + 1)
+                            children += 1
+                    else:
+                        urls += 1
+                        await out.put(value)
+            except Exception as e:
+                logger.debug(f"Sitemap {url} failed: {e}")
+            finally:
+                if children:
+                    logger.info(f"Sitemap index at {url}: {children} sub-sitemaps (depth={depth})")
+                elif urls:
+                    logger.info(f"Sitemap {url}: extracted {urls} URLs")
+                pending -= 1
+                if pending == 0:
+                    await out.put(_SITEMAP_DONE)
 
-    for sm_url in unique_sitemap_urls:
-        await _recursive_parse(sm_url)
+    for sm_url in sitemap_urls:
+        _schedule(sm_url, 0)
+    if not pending:
+        return
 
-    # ── Step 6: Deduplicate results ───────────────────────────────
+    workers = [asyncio.create_task(_worker()) for _ in range(_SITEMAP_FETCH_CONCURRENCY)]
     seen_urls: set[str] = set()
-    deduped: list[LinkResult] = []
-    for link in all_links:
-        normalized = _normalize_url_for_map(link.url)
-        if normalized not in seen_urls:
+    try:
+        while True:
+            link = await out.get()
+            if link is _SITEMAP_DONE:
+                break
+            raw_count += 1
+            normalized = _normalize_url_for_map(link.url)
+            if normalized in seen_urls:
+                continue
             seen_urls.add(normalized)
-            deduped.append(LinkResult(
+            yield LinkResult(
                 url=normalized,
                 title=link.title,
                 description=link.description,
                 lastmod=link.lastmod,
                 priority=link.priority,
-            ))
-
-    logger.info(
-        f"Sitemap discovery complete for {domain}: "
-        f"{len(all_links)} raw → {len(deduped)} deduplicated URLs "
-        f"from {len(visited_sitemaps)} sitemaps"
-    )
-    return deduped
-
-
-async def _fetch_sitemap_content(url: str) -> str | None:
-    """Fetch sitemap content with gzip support and stealth fallback.
-
-    Tries HTTP first (fast), falls back to stealth/browser for blocked sites.
-    """
-    if url.endswith(".gz"):
-        # Fetch as bytes and decompress
-        raw_bytes, status = await _fetch_bytes(url, timeout=20)
-        if status != 200 or not raw_bytes:
-            return None
-        try:
-            decompressed = gzip.decompress(raw_bytes)
-            return decompressed.decode("utf-8", errors="replace")
-        except Exception as e:
-            logger.debug(f"Failed to decompress gzipped sitemap {url}: {e}")
-            return None
-
-    # Try HTTP first (fast path — most sitemap XML files are not anti-bot protected)
-    text, status = await _fetch_url(url, timeout=15)
-    if status == 200 and text:
-        # Sanity check: does it look like XML?
-        stripped = text.strip()
-        if stripped.startswith("<?xml") or stripped.startswith("<urlset") or stripped.startswith("<sitemapindex"):
-            return text
-        # Some servers return HTML error pages with 200 status — reject those
-        if "<html" in stripped[:200].lower():
-            logger.debug(f"Sitemap {url} returned HTML instead of XML, trying stealth")
-        else:
-            return text
-
-    # Stealth fallback for anti-bot protected sitemap files
-    logger.debug(f"HTTP failed for sitemap {url} (status={status}), trying stealth")
-    stealth_text = await _fetch_with_stealth_engine(url)
-    if stealth_text:
-        # Stealth engine wraps content in HTML — extract the XML
-        if "<?xml" in stealth_text or "<urlset" in stealth_text or "<sitemapindex" in stealth_text:
-            # Try to extract raw XML from any HTML wrapper
-            soup = BeautifulSoup(stealth_text, "lxml")
-            # The XML might be inside a <pre> tag
-            pre = soup.find("pre")
-            if pre:
-                return pre.get_text()
-            # Or it might be the full content
-            body_text = soup.get_text()
-            if "<?xml" in body_text or "<urlset" in body_text:
-                return body_text
-            return stealth_text
-
-    return None
-
-
-def _parse_single_sitemap_xml(root: ET.Element, ns: dict) -> list[LinkResult]:
-    """Extract URLs from a sitemap XML element with lastmod, priority, and image support."""
-    links = []
-    # Try with namespace first, then without (some sites skip xmlns)
-    url_elements = root.findall(".//sm:url", ns)
-    if not url_elements:
-        url_elements = root.findall(".//{http://www.sitemaps.org/schemas/sitemap/0.9}url")
-    if not url_elements:
-        url_elements = root.findall(".//url")
-
-    for url_el in url_elements:
-        loc = url_el.find("sm:loc", ns)
-        if loc is None:
-            loc = url_el.find("{http://www.sitemaps.org/schemas/sitemap/0.9}loc")
-        if loc is None:
-            loc = url_el.find("loc")
-        if loc is None or not loc.text:
-            continue
-
-        url = loc.text.strip()
-
-        # Parse optional fields
-        lastmod_el = url_el.find("sm:lastmod", ns)
-        lastmod = (
-            lastmod_el.text.strip()
-            if lastmod_el is not None and lastmod_el.text
-            else None
+            )
+            if limit and len(seen_urls) >= limit:
+                break
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        logger.info(
+            f"Sitemap discovery for {base_url}: {raw_count} raw → "
+            f"{len(seen_urls)} deduplicated URLs from {len(visited_sitemaps)} sitemaps"
         )
 
-        priority_el = url_el.find("sm:priority", ns)
-        priority = None
-        if priority_el is not None and priority_el.text:
-            try:
-                priority = float(priority_el.text.strip())
-            except ValueError:
-                pass
 
-        changefreq_el = url_el.find("sm:changefreq", ns)
-        changefreq = (
-            changefreq_el.text.strip()
-            if changefreq_el is not None and changefreq_el.text
-            else None
-        )
+async def _parse_sitemaps(base_url: str, limit: int | None = None) -> list[LinkResult]:
+    """Discover and parse a site's sitemaps into a deduplicated list.
 
-        # Parse image sitemap entries
-        image_urls = []
-        for img_el in url_el.findall("image:image/image:loc", ns):
-            if img_el.text:
-                image_urls.append(img_el.text.strip())
-
-        # Build description from metadata
-        desc_parts = []
-        if lastmod:
-            desc_parts.append(f"Updated: {lastmod}")
-        if changefreq:
-            desc_parts.append(f"Freq: {changefreq}")
-        if priority is not None:
-            desc_parts.append(f"Priority: {priority}")
-        if image_urls:
-            desc_parts.append(f"{len(image_urls)} image(s)")
-
-        description = " | ".join(desc_parts) if desc_parts else None
-
-        links.append(
-            LinkResult(
-                url=url,
-                title=None,
-                description=description,
-                lastmod=lastmod,
-                priority=priority,
-            )
-        )
-
-    return links
+    Collects :func:`_iter_sitemap_links`; pass ``limit`` to stop fetching
+    once that many unique URLs have been found.
+    """
+    async with aclosing(_iter_sitemap_links(base_url, limit=limit)) as links:
+        return [link async for link in links]
 
 
 async def _crawl_homepage(base_url: str, include_subdomains: bool) -> list[LinkResult]:
@@ -940,8 +1160,12 @@ async def _deep_crawl(
     include_subdomains: bool,
     limit: int,
     max_depth: int = 2,
+    on_link=None,
 ) -> list[LinkResult]:
-    """BFS crawl following internal links up to max_depth to discover more URLs."""
+    """BFS crawl following internal links up to max_depth to discover more URLs.
+
+    ``on_link`` is called with each newly discovered link as it is found.
+    """
     discovered: dict[str, LinkResult] = {}
     visited: set[str] = set()
     sem = asyncio.Semaphore(5)
@@ -965,6 +1189,8 @@ async def _deep_crawl(
         for link in links:
             if link.url not in discovered and link.url not in visited:
                 discovered[link.url] = link
+                if on_link is not None:
+                    on_link(link)
                 if len(discovered) >= limit:
                     return new_pairs
                 if depth < max_depth:
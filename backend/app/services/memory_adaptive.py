@@ -1,12 +1,14 @@
-"""Memory-adaptive concurrency control for crawl operations.
+"""Memory-adaptive concurrency control.
 
-Monitors system memory usage and dynamically adjusts concurrency limits
-to prevent OOM situations. Inspired by Crawl4AI's memory-aware dispatching.
+Resizable semaphores for the API, browser pools and crawls, adjusted at
+runtime by the resource governor to prevent OOM situations. Inspired by
+Crawl4AI's memory-aware dispatching.
 """
 from __future__ import annotations
 import asyncio
 import logging
 import os
+from collections import deque
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -83,138 +85,111 @@ def get_memory_stats() -> MemoryStats:
 
 
 class MemoryAdaptiveSemaphore:
-    """Semaphore that adjusts its limit based on memory pressure.
-    
-    Periodically checks memory usage and:
-    - Increases concurrency when memory is plentiful (< low_threshold)
-    - Decreases concurrency when memory is tight (> high_threshold)
-    - Hard-blocks when memory is critical (> critical_threshold)
-    
+    """Semaphore whose limit can be changed while it is in use.
+
+    The process-wide resource governor (app.services.resource_governor)
+    moves the limit between ``min_limit`` and ``max_limit`` based on memory
+    pressure and event-loop lag. Lowering the limit never interrupts holders:
+    new acquisitions wait until enough slots have been released. Waiters are
+    served first come, first served.
+
     Args:
         base_limit: Starting concurrency limit
         min_limit: Minimum concurrency (never go below this)
         max_limit: Maximum concurrency (never exceed this)
-        low_threshold: Memory usage % below which we can increase concurrency
-        high_threshold: Memory usage % above which we decrease concurrency
-        critical_threshold: Memory usage % above which we hard-block
-        check_interval: Seconds between memory checks
+        name: Label of the limiter in the governor and its metrics
     """
-    
+
     def __init__(
         self,
         base_limit: int = 5,
         min_limit: int = 1,
         max_limit: int = 20,
-        low_threshold: float = 50.0,
-        high_threshold: float = 75.0,
-        critical_threshold: float = 90.0,
-        check_interval: float = 10.0,
+        name: str = "crawl",
     ):
+        self.name = name
         self._base_limit = base_limit
-        self._min_limit = min_limit
-        self._max_limit = max_limit
-        self._low_threshold = low_threshold
-        self._high_threshold = high_threshold
-        self._critical_threshold = critical_threshold
-        self._check_interval = check_interval
-        
+        self._min_limit = min(min_limit, base_limit)
+        self._max_limit = max(max_limit, base_limit)
         self._current_limit = base_limit
-        self._semaphore = asyncio.Semaphore(base_limit)
         self._active = 0
-        self._lock = asyncio.Lock()
-        self._monitor_task: asyncio.Task | None = None
-        self._last_stats: MemoryStats | None = None
-    
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def base_limit(self) -> int:
+        return self._base_limit
+
+    @property
+    def min_limit(self) -> int:
+        return self._min_limit
+
+    @property
+    def max_limit(self) -> int:
+        return self._max_limit
+
     @property
     def current_limit(self) -> int:
         return self._current_limit
-    
+
     @property
     def active_count(self) -> int:
         return self._active
-    
-    @property
-    def last_stats(self) -> MemoryStats | None:
-        return self._last_stats
-    
+
+    def set_limit(self, limit: int) -> int:
+        """Clamp ``limit`` to the allowed range and apply it. Returns the new limit."""
+        self._current_limit = max(self._min_limit, min(self._max_limit, limit))
+        self._wake()
+        return self._current_limit
+
     async def start_monitoring(self) -> None:
-        """Start the background memory monitoring task."""
-        if self._monitor_task is None or self._monitor_task.done():
-            self._monitor_task = asyncio.create_task(self._monitor_loop())
-    
+        """Put this semaphore under the resource governor."""
+        from app.services.resource_governor import governor
+
+        governor.register(self)
+        await governor.start()
+
     async def stop_monitoring(self) -> None:
-        """Stop the background memory monitoring task."""
-        if self._monitor_task and not self._monitor_task.done():
-            self._monitor_task.cancel()
-            try:
-                await self._monitor_task
-            except asyncio.CancelledError:
-                pass
-            self._monitor_task = None
-    
-    async def _monitor_loop(self) -> None:
-        """Periodically check memory and adjust limits."""
-        while True:
-            try:
-                await asyncio.sleep(self._check_interval)
-                stats = get_memory_stats()
-                self._last_stats = stats
-                
-                async with self._lock:
-                    old_limit = self._current_limit
-                    
-                    if stats.used_percent >= self._critical_threshold:
-                        # Critical: drop to minimum
-                        self._current_limit = self._min_limit
-                        if old_limit != self._min_limit:
-                            logger.warning(
-                                f"Memory critical ({stats.used_percent:.1f}%): "
-                                f"concurrency {old_limit} → {self._min_limit}"
-                            )
-                    elif stats.used_percent >= self._high_threshold:
-                        # High pressure: reduce by 1 (gradual)
-                        new_limit = max(self._min_limit, self._current_limit - 1)
-                        if new_limit != self._current_limit:
-                            self._current_limit = new_limit
-                            logger.info(
-                                f"Memory high ({stats.used_percent:.1f}%): "
-                                f"concurrency {old_limit} → {new_limit}"
-                            )
-                    elif stats.used_percent < self._low_threshold:
-                        # Low pressure: increase by 1 (gradual)
-                        new_limit = min(self._max_limit, self._current_limit + 1)
-                        if new_limit != self._current_limit:
-                            self._current_limit = new_limit
-                            logger.debug(
-                                f"Memory low ({stats.used_percent:.1f}%): "
-                                f"concurrency {old_limit} → {new_limit}"
-                            )
-                    
-                    # Rebuild semaphore if limit changed
-                    if self._current_limit != old_limit:
-                        # Create new semaphore with adjusted limit.
-                        # Active tasks keep running; new acquisitions use new limit.
-                        available = max(0, self._current_limit - self._active)
-                        self._semaphore = asyncio.Semaphore(available)
-                        
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                logger.debug(f"Memory monitor error: {e}")
-    
-    async def acquire(self) -> None:
+        """Take this semaphore back from the resource governor."""
+        from app.services.resource_governor import governor
+
+        governor.unregister(self)
+
+    def _wake(self) -> None:
+        # A slot is handed over together with the wake-up, so a woken waiter
+        # can't lose it to a task that calls acquire() in the meantime
+        while self._waiters and self._active < self._current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+
+    def locked(self) -> bool:
+        return self._active >= self._current_limit
+
+    async def acquire(self) -> bool:
         """Acquire a slot, respecting memory-adjusted limits."""
-        await self._semaphore.acquire()
-        self._active += 1
-    
+        if not self._waiters and self._active < self._current_limit:
+            self._active += 1
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled right after being handed a slot — give it back
+                self.release()
+            raise
+        return True
+
     def release(self) -> None:
         """Release a slot."""
         self._active = max(0, self._active - 1)
-        self._semaphore.release()
-    
+        self._wake()
+
     async def __aenter__(self):
         await self.acquire()
         return self
-    
+
     async def __aexit__(self, *args):
         self.release()
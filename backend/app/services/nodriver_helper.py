@@ -17,6 +17,8 @@ import logging
 import shutil
 import time
 
+from app.services.resource_governor import governor
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,7 +54,8 @@ class NoDriverPool:
         self._idle_timeout = 300  # 5 minutes
         self._starting = False
         self._generation = 0  # incremented on every browser start
-        self._tab_semaphore = asyncio.Semaphore(6)  # max concurrent tabs
+        # Max concurrent tabs, adjusted by the resource governor
+        self._tab_semaphore = governor.limiter("nodriver_tabs", 6)
         self._idle_tabs: list = []  # recycled tabs at about:blank
 
     @classmethod
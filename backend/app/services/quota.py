@@ -2,16 +2,29 @@
 
 Tracks per-user monthly usage and enforces limits.
 Limits of -1 mean unlimited usage.
+
+Counters live in Redis, one hash per user and period
+(``quota:{user_id}:{YYYY-MM}``), seeded from the UsageQuota row on first use.
+A Lua script checks and increments them atomically, so the request path is
+a single Redis round trip and concurrent increments can't be lost.
+:func:`reserve_quota` charges an operation up front in that one call, so
+concurrent requests can't all pass the check before any of them is counted;
+:func:`refund_usage` gives the unit back when the operation then fails. Each
+increment is also recorded as a ``d:*`` delta and the hash is marked dirty;
+:func:`reconcile_quotas` (a periodic Celery task) drains the deltas into the
+UsageQuota rows in bulk with SQL-side additions. When Redis is unavailable
+every function falls back to the database.
 """
 
 import logging
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import RateLimitError
+from app.core.redis import redis_client
 from app.models.usage_quota import UsageQuota
 
 logger = logging.getLogger(__name__)
@@ -26,15 +39,110 @@ DEFAULT_LIMITS = {
     "monitor_limit": 100,
 }
 
+OPERATIONS = ["scrape", "crawl", "extract", "search", "map", "monitor"]
+
+# Columns reconciled from Redis deltas
+COUNTER_COLUMNS = [f"{op}_used" for op in OPERATIONS] + [
+    "total_pages_scraped",
+    "total_bytes_processed",
+]
+
+QUOTA_KEY_PREFIX = "quota:"
+QUOTA_DIRTY_KEY = "quota:dirty"
+QUOTA_KEY_TTL = 45 * 86400  # Outlives the period; reconciled long before expiry
+_DELTA_PREFIX = "d:"
+
+# KEYS[1] = quota hash, KEYS[2] = dirty set
+# ARGV = op, cost, enforce, pages, bytes, ttl, dirty member, [field, value]...
+# The trailing field/value pairs seed a missing hash; without them a missing
+# hash returns {-1, 0, 0} so the caller can load the row and retry.
+# Returns {allowed, used, limit}.
+_COUNTER_SCRIPT = """
+local key = KEYS[1]
+if redis.call('EXISTS', key) == 0 then
+    if #ARGV < 8 then
+        return {-1, 0, 0}
+    end
+    for i = 8, #ARGV, 2 do
+        redis.call('HSET', key, ARGV[i], ARGV[i + 1])
+    end
+    redis.call('EXPIRE', key, tonumber(ARGV[6]))
+end
+
+local op = ARGV[1]
+local cost = tonumber(ARGV[2])
+local limit = tonumber(redis.call('HGET', key, op .. '_limit') or '-1')
+local used = tonumber(redis.call('HGET', key, op .. '_used') or '0')
+if ARGV[3] == '1' and limit ~= -1 and used + math.max(cost, 1) > limit then
+    return {0, used, limit}
+end
+
+local changed = false
+local function add(field, n)
+    if n ~= 0 then
+        redis.call('HINCRBY', key, field, n)
+        redis.call('HINCRBY', key, 'd:' .. field, n)
+        changed = true
+    end
+end
+add(op .. '_used', cost)
+add('total_pages_scraped', tonumber(ARGV[4]))
+add('total_bytes_processed', tonumber(ARGV[5]))
+if changed then
+    redis.call('SADD', KEYS[2], ARGV[7])
+end
+return {1, used + math.max(cost, 0), limit}
+"""
+
+# Atomically take (and clear) the pending d:* deltas of one quota hash.
+_DRAIN_SCRIPT = """
+local out = {}
+local fields = redis.call('HKEYS', KEYS[1])
+for _, field in ipairs(fields) do
+    if string.sub(field, 1, 2) == 'd:' then
+        table.insert(out, field)
+        table.insert(out, redis.call('HGET', KEYS[1], field))
+        redis.call('HDEL', KEYS[1], field)
+    end
+end
+return out
+"""
+
+# Put drained deltas back after a failed reconciliation.
+# KEYS[1] = quota hash, KEYS[2] = dirty set; ARGV = member, [field, n]...
+_RESTORE_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], 'd:' .. ARGV[i], ARGV[i + 1])
+end
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Refresh limits in an existing hash (limits can change in the database).
+_SYNC_LIMITS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    for i = 1, #ARGV, 2 do
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+return 0
+"""
+
 
 def _current_period() -> str:
     """Return current period string in YYYY-MM format."""
     return datetime.now(timezone.utc).strftime("%Y-%m")
 
 
-async def get_or_create_quota(db: AsyncSession, user_id: UUID) -> UsageQuota:
-    """Get or create the current month's quota record for a user."""
-    period = _current_period()
+def _quota_key(user_id: UUID | str, period: str) -> str:
+    return f"{QUOTA_KEY_PREFIX}{user_id}:{period}"
+
+
+async def get_or_create_quota(
+    db: AsyncSession, user_id: UUID, period: str | None = None
+) -> UsageQuota:
+    """Get or create a user's quota record for a period (default: this month)."""
+    period = period or _current_period()
     result = await db.execute(
         select(UsageQuota).where(
             UsageQuota.user_id == user_id,
@@ -72,42 +180,128 @@ async def get_or_create_quota(db: AsyncSession, user_id: UUID) -> UsageQuota:
     return quota
 
 
-async def check_quota(db: AsyncSession, user_id: UUID, operation: str) -> UsageQuota:
+def _quota_exceeded(operation: str, used_val: int, limit_val: int) -> RateLimitError:
+    return RateLimitError(
+        detail=f"Monthly {operation} quota exceeded ({used_val}/{limit_val}). "
+        f"Upgrade your plan or wait until next month.",
+        headers={
+            "X-Quota-Limit": str(limit_val),
+            "X-Quota-Used": str(used_val),
+            "X-Quota-Remaining": "0",
+            "Retry-After": "86400",
+        },
+    )
+
+
+async def _run_counter(
+    db: AsyncSession,
+    user_id: UUID,
+    operation: str,
+    cost: int = 0,
+    enforce: bool = True,
+    pages: int = 0,
+    bytes_processed: int = 0,
+) -> tuple[bool, int, int] | None:
+    """Check and/or increment the Redis counters in one script call.
+
+    Returns (allowed, used, limit), or None when Redis is unavailable.
+    """
+    period = _current_period()
+    keys = [_quota_key(user_id, period), QUOTA_DIRTY_KEY]
+    args = [
+        operation,
+        cost,
+        1 if enforce else 0,
+        pages,
+        bytes_processed,
+        QUOTA_KEY_TTL,
+        f"{user_id}:{period}",
+    ]
+    reply = await redis_client.run_script(_COUNTER_SCRIPT, keys=keys, args=args)
+    if isinstance(reply, list) and reply and int(reply[0]) == -1:
+        # First use this period (or Redis lost the hash) — seed from the row
+        quota = await get_or_create_quota(db, user_id, period)
+        seed = []
+        for field in list(DEFAULT_LIMITS) + COUNTER_COLUMNS:
+            seed.extend([field, getattr(quota, field) or 0])
+        reply = await redis_client.run_script(
+            _COUNTER_SCRIPT, keys=keys, args=args + seed
+        )
+    if not isinstance(reply, list) or len(reply) != 3 or int(reply[0]) == -1:
+        return None
+    return bool(int(reply[0])), int(reply[1]), int(reply[2])
+
+
+async def check_quota(db: AsyncSession, user_id: UUID, operation: str) -> None:
     """Check if user has remaining quota for an operation.
 
     Args:
-        db: Database session
+        db: Database session (only used to seed counters or as a fallback)
         user_id: User UUID
         operation: One of: scrape, crawl, extract, search, map, monitor
 
-    Returns:
-        The UsageQuota record
-
     Raises:
         RateLimitError if quota exceeded
     """
-    quota = await get_or_create_quota(db, user_id)
+    counter = await _run_counter(db, user_id, operation)
+    if counter is not None:
+        allowed, used_val, limit_val = counter
+        if not allowed:
+            raise _quota_exceeded(operation, used_val, limit_val)
+        return
 
-    limit_field = f"{operation}_limit"
-    used_field = f"{operation}_used"
-
-    limit_val = getattr(quota, limit_field, -1)
-    used_val = getattr(quota, used_field, 0)
+    quota = await get_or_create_quota(db, user_id)
+    limit_val = getattr(quota, f"{operation}_limit", -1)
+    used_val = getattr(quota, f"{operation}_used", 0)
 
     # -1 means unlimited
     if limit_val != -1 and used_val >= limit_val:
-        raise RateLimitError(
-            detail=f"Monthly {operation} quota exceeded ({used_val}/{limit_val}). "
-            f"Upgrade your plan or wait until next month.",
-            headers={
-                "X-Quota-Limit": str(limit_val),
-                "X-Quota-Used": str(used_val),
-                "X-Quota-Remaining": "0",
-                "Retry-After": "86400",
-            },
+        raise _quota_exceeded(operation, used_val, limit_val)
+
+
+async def reserve_quota(
+    db: AsyncSession, user_id: UUID, operation: str, count: int = 1
+) -> None:
+    """Check the quota and charge ``count`` operations in one atomic step.
+
+    Call :func:`refund_usage` if the operation then fails.
+
+    Raises:
+        RateLimitError if the charge would exceed the quota
+    """
+    counter = await _run_counter(db, user_id, operation, cost=count)
+    if counter is not None:
+        allowed, used_val, limit_val = counter
+        if not allowed:
+            raise _quota_exceeded(operation, used_val, limit_val)
+        return
+
+    # Redis unavailable — conditional UPDATE so the check and charge are one statement
+    quota = await get_or_create_quota(db, user_id)
+    used_col = getattr(UsageQuota, f"{operation}_used")
+    limit_col = getattr(UsageQuota, f"{operation}_limit")
+    result = await db.execute(
+        update(UsageQuota)
+        .where(
+            UsageQuota.id == quota.id,
+            or_(limit_col == -1, used_col + count <= limit_col),
+        )
+        .values({f"{operation}_used": used_col + count})
+    )
+    await db.refresh(quota)
+    if result.rowcount == 0:
+        raise _quota_exceeded(
+            operation,
+            getattr(quota, f"{operation}_used"),
+            getattr(quota, f"{operation}_limit"),
         )
 
-    return quota
+
+async def refund_usage(
+    db: AsyncSession, user_id: UUID, operation: str, count: int = 1
+) -> None:
+    """Give back operations charged by :func:`reserve_quota`."""
+    await increment_usage(db, user_id, operation, count=-count)
 
 
 async def increment_usage(
@@ -121,42 +315,61 @@ async def increment_usage(
     """Increment usage counter for an operation.
 
     Args:
-        db: Database session
+        db: Database session (only used to seed counters or as a fallback)
         user_id: User UUID
         operation: One of: scrape, crawl, extract, search, map, monitor
         count: Number of operations to add
         pages: Number of pages scraped
         bytes_processed: Bytes of content processed
     """
-    quota = await get_or_create_quota(db, user_id)
-    used_field = f"{operation}_used"
-
-    current = getattr(quota, used_field, 0)
-    setattr(quota, used_field, current + count)
+    counter = await _run_counter(
+        db,
+        user_id,
+        operation,
+        cost=count,
+        enforce=False,
+        pages=pages,
+        bytes_processed=bytes_processed,
+    )
+    if counter is not None:
+        return
 
+    # Redis unavailable — add in SQL so concurrent writers don't lose updates
+    quota = await get_or_create_quota(db, user_id)
+    values = {f"{operation}_used": getattr(UsageQuota, f"{operation}_used") + count}
     if pages:
-        quota.total_pages_scraped += pages
+        values["total_pages_scraped"] = UsageQuota.total_pages_scraped + pages
     if bytes_processed:
-        quota.total_bytes_processed += bytes_processed
-
-    await db.flush()
+        values["total_bytes_processed"] = (
+            UsageQuota.total_bytes_processed + bytes_processed
+        )
+    await db.execute(
+        update(UsageQuota).where(UsageQuota.id == quota.id).values(**values)
+    )
+    await db.refresh(quota)
 
 
 async def get_quota_summary(db: AsyncSession, user_id: UUID) -> dict:
     """Get a summary of the user's current quota usage."""
     quota = await get_or_create_quota(db, user_id)
 
-    operations = ["scrape", "crawl", "extract", "search", "map", "monitor"]
+    # Redis holds usage not yet reconciled into the row
+    live = await redis_client.hgetall(_quota_key(user_id, quota.period)) or {}
+
+    def _used(field: str) -> int:
+        value = live.get(field)
+        return int(value) if value is not None else getattr(quota, field)
+
     summary = {
         "period": quota.period,
-        "total_pages_scraped": quota.total_pages_scraped,
-        "total_bytes_processed": quota.total_bytes_processed,
+        "total_pages_scraped": _used("total_pages_scraped"),
+        "total_bytes_processed": _used("total_bytes_processed"),
         "operations": {},
     }
 
-    for op in operations:
+    for op in OPERATIONS:
         limit_val = getattr(quota, f"{op}_limit")
-        used_val = getattr(quota, f"{op}_used")
+        used_val = _used(f"{op}_used")
         summary["operations"][op] = {
             "limit": limit_val,
             "used": used_val,
@@ -165,3 +378,85 @@ async def get_quota_summary(db: AsyncSession, user_id: UUID) -> dict:
         }
 
     return summary
+
+
+async def reconcile_quotas(db: AsyncSession, batch_size: int = 500) -> int:
+    """Fold pending Redis usage deltas into UsageQuota rows.
+
+    Pops up to ``batch_size`` dirty quota hashes, drains their deltas and
+    applies them with one executemany UPDATE (``col = col + delta``). Limits
+    from the rows are then copied back into the hashes. On a database error
+    the deltas are restored so the next run retries them.
+
+    Returns the number of quota rows updated.
+    """
+    members = await redis_client.spop(QUOTA_DIRTY_KEY, batch_size)
+    if not members:
+        return 0
+
+    pending: list[tuple[UUID, str, dict[str, int]]] = []
+    for member in members:
+        user_id, period = member.rsplit(":", 1)
+        raw = await redis_client.run_script(
+            _DRAIN_SCRIPT, keys=[_quota_key(user_id, period)]
+        )
+        if not raw:
+            continue
+        deltas = {
+            field[len(_DELTA_PREFIX):]: int(value)
+            for field, value in zip(raw[::2], raw[1::2])
+            if field[len(_DELTA_PREFIX):] in COUNTER_COLUMNS
+        }
+        if deltas:
+            pending.append((UUID(user_id), period, deltas))
+    if not pending:
+        return 0
+
+    table = UsageQuota.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.user_id == bindparam("b_user_id"),
+            table.c.period == bindparam("b_period"),
+        )
+        .values({col: table.c[col] + bindparam(f"b_{col}") for col in COUNTER_COLUMNS})
+    )
+    try:
+        # Rows are normally created when the counters were seeded, but that
+        # transaction may have rolled back
+        quotas = {}
+        for user_id, period, _ in pending:
+            quotas[(user_id, period)] = await get_or_create_quota(db, user_id, period)
+        await db.execute(
+            stmt,
+            [
+                {
+                    "b_user_id": user_id,
+                    "b_period": period,
+                    **{f"b_{col}": deltas.get(col, 0) for col in COUNTER_COLUMNS},
+                }
+                for user_id, period, deltas in pending
+            ],
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        for user_id, period, deltas in pending:
+            args = [f"{user_id}:{period}"]
+            for col, n in deltas.items():
+                args.extend([col, n])
+            await redis_client.run_script(
+                _RESTORE_SCRIPT,
+                keys=[_quota_key(user_id, period), QUOTA_DIRTY_KEY],
+                args=args,
+            )
+        raise
+
+    for (user_id, period), quota in quotas.items():
+        limits = []
+        for field in DEFAULT_LIMITS:
+            limits.extend([field, getattr(quota, field)])
+        await redis_client.run_script(
+            _SYNC_LIMITS_SCRIPT, keys=[_quota_key(user_id, period)], args=limits
+        )
+    return len(pending)
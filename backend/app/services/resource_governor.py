@@ -0,0 +1,320 @@
+"""
+Process-wide resource governor.
+
+Every concurrency limit that decides how much work a process takes on is
+a MemoryAdaptiveSemaphore registered here:
+
+- ``api_scrape`` — scrape API slots (MAX_CONCURRENT_SCRAPES)
+- ``chromium`` / ``firefox`` — BrowserPool page slots
+- ``nodriver_tabs`` — NoDriverPool tabs
+- ``crawl`` — pages in flight in a crawl worker
+
+One monitor task samples the process every RESOURCE_GOVERNOR_INTERVAL
+seconds: memory use against the container (cgroup) limit, or the host when
+the process isn't limited; RSS of this process and of the browsers it
+launched (Chromium renderers included); and event-loop lag, the worst
+the loop monitor (app.core.loop_monitor) saw since the last sample, or how
+late the governor's own sleep woke up when no monitor runs. All limits then
+move together:
+
+- critical memory: every limit drops to its minimum
+- high memory, the process over its RSS budget, or a lagging loop: every
+  limit shrinks by one
+- low memory and a responsive loop for RESOURCE_GOVERNOR_RAISE_AFTER
+  samples in a row: every saturated limit grows by one, up to
+  base × RESOURCE_GOVERNOR_MAX_SCALE
+
+The band between the low and high thresholds and the streak needed to grow
+are the hysteresis that keeps limits from flapping. Decisions are exported
+as ``governor_*`` Prometheus metrics.
+"""
+
+import asyncio
+import logging
+import math
+import os
+from dataclasses import dataclass
+
+from app.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import (
+    governor_adjustments_total,
+    governor_in_use,
+    governor_limit,
+    governor_loop_lag_seconds,
+    governor_memory_bytes,
+    governor_memory_percent,
+    governor_pressure,
+)
+from app.services.memory_adaptive import MemoryAdaptiveSemaphore, get_memory_stats
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+_CGROUP_V2 = "/sys/fs/cgroup"
+_CGROUP_V1 = "/sys/fs/cgroup/memory"
+
+# Exported as governor_pressure (list index)
+PRESSURE_LEVELS = ("low", "steady", "high", "critical")
+
+
+@dataclass
+class ResourceSample:
+    """One reading of the process's resource use."""
+    memory_percent: float  # Of the cgroup limit, or of host memory
+    process_mb: float
+    renderer_mb: float  # Descendant processes: browsers and their renderers
+    limit_mb: float | None  # cgroup memory limit (None = not limited)
+    loop_lag_ms: float
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    # cgroup v2 writes "max" for no limit
+    return int(value) if value.isdigit() else None
+
+
+def _read_stat(path: str, key: str) -> int:
+    try:
+        with open(path) as f:
+            for line in f:
+                name, _, value = line.partition(" ")
+                if name == key:
+                    return int(value)
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def cgroup_memory() -> tuple[int, int] | None:
+    """``(usage, limit)`` in bytes for this process's memory cgroup, or None
+    when it has no limit. Usage leaves out reclaimable page cache
+    (inactive_file), the way ``docker stats`` does."""
+    for root, limit_file, usage_file, inactive_key in (
+        (_CGROUP_V2, "memory.max", "memory.current", "inactive_file"),
+        (_CGROUP_V1, "memory.limit_in_bytes", "memory.usage_in_bytes", "total_inactive_file"),
+    ):
+        limit = _read_int(f"{root}/{limit_file}")
+        usage = _read_int(f"{root}/{usage_file}")
+        if limit is None or usage is None:
+            continue
+        # cgroup v1 reports "no limit" as a huge page-aligned number
+        if limit >= 1 << 60:
+            return None
+        return max(0, usage - _read_stat(f"{root}/memory.stat", inactive_key)), limit
+    return None
+
+
+def _descendant_rss_proc() -> int:
+    """Sum of RSS over all descendants of this process, from /proc."""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    children: dict[int, list[int]] = {}
+    rss: dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces — split after it
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        pid = int(entry)
+        children.setdefault(int(fields[1]), []).append(pid)
+        rss[pid] = int(fields[21]) * page_size
+
+    total = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def renderer_memory_mb() -> float:
+    """RSS of every process started by this one — Playwright's driver, the
+    browsers and their renderer processes, nodriver's Chrome."""
+    try:
+        import psutil
+
+        total = 0
+        for child in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / _MB
+    except ImportError:
+        pass
+
+    try:
+        return _descendant_rss_proc() / _MB
+    except Exception:
+        return 0.0
+
+
+class ResourceGovernor:
+    """Adjusts every registered MemoryAdaptiveSemaphore from one monitor task."""
+
+    def __init__(self):
+        self._limiters: dict[str, MemoryAdaptiveSemaphore] = {}
+        self._task: asyncio.Task | None = None
+        self._calm_samples = 0
+        self.pressure = "steady"
+        self.last_sample: ResourceSample | None = None
+
+    @property
+    def limiters(self) -> dict[str, MemoryAdaptiveSemaphore]:
+        return dict(self._limiters)
+
+    def limiter(self, name: str, base_limit: int, min_limit: int = 1) -> MemoryAdaptiveSemaphore:
+        """A new governed semaphore for ``name``, replacing any earlier one.
+
+        The replacement starts with no holders — pools use that to clear
+        leaked slots — but keeps the limit the governor had reached for
+        ``name``, so a reset doesn't undo throttling under pressure.
+        """
+        base_limit = max(1, base_limit)
+        semaphore = MemoryAdaptiveSemaphore(
+            base_limit=base_limit,
+            min_limit=min_limit,
+            max_limit=math.ceil(base_limit * settings.RESOURCE_GOVERNOR_MAX_SCALE),
+            name=name,
+        )
+        previous = self._limiters.get(name)
+        if previous is not None:
+            semaphore.set_limit(previous.current_limit)
+        self.register(semaphore)
+        return semaphore
+
+    def register(self, semaphore: MemoryAdaptiveSemaphore) -> None:
+        self._limiters[semaphore.name] = semaphore
+        governor_limit.labels(limiter=semaphore.name).set(semaphore.current_limit)
+
+    def unregister(self, semaphore: MemoryAdaptiveSemaphore) -> None:
+        if self._limiters.get(semaphore.name) is semaphore:
+            del self._limiters[semaphore.name]
+
+    def sample(self, loop_lag_ms: float = 0.0) -> ResourceSample:
+        """Read memory use now. Blocking (reads /proc) — call off the loop."""
+        stats = get_memory_stats()
+        cgroup = cgroup_memory()
+        # A cgroup limit above host memory can't be reached — the host is the limit
+        if cgroup and cgroup[1] < stats.total_mb * _MB:
+            usage, limit = cgroup
+            memory_percent = usage / limit * 100
+            limit_mb = limit / _MB
+        else:
+            memory_percent = stats.used_percent
+            limit_mb = None
+        return ResourceSample(
+            memory_percent=memory_percent,
+            process_mb=stats.process_mb,
+            renderer_mb=renderer_memory_mb(),
+            limit_mb=limit_mb,
+            loop_lag_ms=loop_lag_ms,
+        )
+
+    def classify(self, sample: ResourceSample) -> str:
+        """Pressure level of a sample, one of PRESSURE_LEVELS."""
+        lag_high = settings.RESOURCE_GOVERNOR_LAG_HIGH_MS
+        budget = settings.RESOURCE_GOVERNOR_PROCESS_MB
+        over_budget = budget > 0 and sample.process_mb + sample.renderer_mb >= budget
+
+        if sample.memory_percent >= settings.RESOURCE_GOVERNOR_CRITICAL_PERCENT:
+            return "critical"
+        if (
+            over_budget
+            or sample.loop_lag_ms >= lag_high
+            or sample.memory_percent >= settings.RESOURCE_GOVERNOR_HIGH_PERCENT
+        ):
+            return "high"
+        if (
+            sample.memory_percent < settings.RESOURCE_GOVERNOR_LOW_PERCENT
+            and sample.loop_lag_ms < lag_high / 2
+        ):
+            return "low"
+        return "steady"
+
+    def tick(self, sample: ResourceSample) -> str:
+        """Apply one sample to every limit. Returns the pressure level."""
+        pressure = self.classify(sample)
+        self._calm_samples = self._calm_samples + 1 if pressure == "low" else 0
+        grow = self._calm_samples >= settings.RESOURCE_GOVERNOR_RAISE_AFTER
+        if grow:
+            self._calm_samples = 0
+
+        for semaphore in list(self._limiters.values()):
+            old = semaphore.current_limit
+            if pressure == "critical":
+                new = semaphore.set_limit(semaphore.min_limit)
+            elif pressure == "high":
+                new = semaphore.set_limit(old - 1)
+            elif grow and semaphore.locked():
+                # Only limits that are actually full — an idle pool grown to
+                # its maximum would let the next burst in all at once
+                new = semaphore.set_limit(old + 1)
+            else:
+                new = old
+
+            if new != old:
+                direction = "down" if new < old else "up"
+                governor_adjustments_total.labels(limiter=semaphore.name, direction=direction).inc()
+                logger.log(
+                    logging.WARNING if new < old else logging.INFO,
+                    f"Resource governor ({pressure}, memory {sample.memory_percent:.0f}%, "
+                    f"loop lag {sample.loop_lag_ms:.0f}ms): {semaphore.name} {old} → {new}",
+                )
+            governor_limit.labels(limiter=semaphore.name).set(new)
+            governor_in_use.labels(limiter=semaphore.name).set(semaphore.active_count)
+
+        self.pressure = pressure
+        self.last_sample = sample
+        governor_pressure.set(PRESSURE_LEVELS.index(pressure))
+        governor_memory_percent.set(sample.memory_percent)
+        governor_memory_bytes.labels(kind="process").set(sample.process_mb * _MB)
+        governor_memory_bytes.labels(kind="renderers").set(sample.renderer_mb * _MB)
+        if sample.limit_mb is not None:
+            governor_memory_bytes.labels(kind="limit").set(sample.limit_mb * _MB)
+        governor_loop_lag_seconds.set(sample.loop_lag_ms / 1000)
+        return pressure
+
+    async def start(self) -> None:
+        """Start the monitor task on the running loop (no-op if it runs)."""
+        if not settings.RESOURCE_GOVERNOR_ENABLED:
+            return
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = settings.RESOURCE_GOVERNOR_INTERVAL
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            # The loop monitor sees every stall since the last sample; our
+            # own oversleep only catches the one we happened to wake into
+            lag = loop_monitor.take_max_lag()
+            if lag is None:
+                lag = max(0.0, loop.time() - started - interval)
+            lag_ms = lag * 1000
+            try:
+                self.tick(await asyncio.to_thread(self.sample, lag_ms))
+            except Exception as e:
+                logger.debug(f"Resource governor sample failed: {e}")
+
+
+governor = ResourceGovernor()
@@ -0,0 +1,127 @@
+"""
+Keyset pagination and lightweight projections over job_results.
+
+Results of a job are ordered by ``(created_at, id)``, which the composite
+index ``ix_job_results_job_id_created_at_id`` serves directly, so a page
+deep into a 10k-page crawl costs the same as the first one. Cursors are
+opaque to clients: the position of the last row they received.
+
+Heavy payload columns are deferred — and raise if touched — unless the
+caller asks for them; whether a row has HTML or a screenshot is selected as
+a boolean instead of loading the value.
+
+``LiveResults`` follows a job that is still being written. ``created_at``
+is stamped before a row commits, so with several crawl workers a row can
+become visible after later-stamped rows a keyset cursor has already passed.
+"""
+
+import base64
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.orm import defer
+
+from app.core.exceptions import BadRequestError
+from app.models.job_result import JobResult
+
+# Result format name -> column holding it
+HEAVY_COLUMNS = {
+    "markdown": JobResult.markdown,
+    "html": JobResult.html,
+    "links": JobResult.links,
+    "screenshot": JobResult.screenshot_url,
+}
+
+
+def encode_cursor(created_at: datetime, result_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{result_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, result_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(result_id)
+    except Exception:
+        raise BadRequestError("Invalid cursor")
+
+
+def cursor_of(result: JobResult) -> str:
+    return encode_cursor(result.created_at, result.id)
+
+
+def select_results(
+    job_id: UUID,
+    load: set[str] | frozenset[str] = frozenset(HEAVY_COLUMNS),
+    after: str | None = None,
+) -> Select:
+    """Select ``(JobResult, has_html, has_screenshot)`` rows of one job in
+    keyset order, starting after ``after`` (a cursor) when given.
+
+    Heavy columns whose format is not in ``load`` are deferred with
+    raiseload, so an accidental access fails loudly instead of issuing a
+    query per row.
+    """
+    query = (
+        select(
+            JobResult,
+            JobResult.html.is_not(None).label("has_html"),
+            JobResult.screenshot_url.is_not(None).label("has_screenshot"),
+        )
+        .where(JobResult.job_id == job_id)
+        .order_by(JobResult.created_at, JobResult.id)
+        .options(
+            *(
+                defer(column, raiseload=True)
+                for name, column in HEAVY_COLUMNS.items()
+                if name not in load
+            )
+        )
+    )
+    if after:
+        query = query.where(
+            tuple_(JobResult.created_at, JobResult.id) > tuple_(*decode_cursor(after))
+        )
+    return query
+
+
+class LiveResults:
+    """Results of a running job, each returned once, in commit order.
+
+    Every poll re-scans the ids of rows stamped within ``overlap`` of the
+    newest row returned so far and loads only the unseen ones. A row is
+    missed only if it commits more than ``overlap`` after it was stamped.
+    """
+
+    def __init__(self, job_id: UUID, overlap: timedelta = timedelta(seconds=60)):
+        self.job_id = job_id
+        self.overlap = overlap
+        self._seen: dict[UUID, datetime] = {}
+        self._newest: datetime | None = None
+
+    async def poll(self, db, limit: int = 50) -> list[JobResult]:
+        """Up to ``limit`` results not returned before, oldest first."""
+        query = (
+            select(JobResult.id, JobResult.created_at)
+            .where(JobResult.job_id == self.job_id)
+            .order_by(JobResult.created_at, JobResult.id)
+        )
+        if self._newest is not None:
+            since = self._newest - self.overlap
+            query = query.where(JobResult.created_at >= since)
+            # Rows behind the window are never scanned again
+            self._seen = {i: t for i, t in self._seen.items() if t >= since}
+
+        new_ids = [row.id for row in (await db.execute(query)).all() if row.id not in self._seen]
+        if not new_ids:
+            return []
+        results = (
+            await db.execute(select_results(self.job_id).where(JobResult.id.in_(new_ids[:limit])))
+        ).scalars().all()
+        for result in results:
+            self._seen[result.id] = result.created_at
+            if self._newest is None or result.created_at > self._newest:
+                self._newest = result.created_at
+        return list(results)
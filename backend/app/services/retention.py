@@ -0,0 +1,119 @@
+"""
+Retention for jobs and the append-heavy history tables.
+
+On PostgreSQL the history tables are partitioned by month
+(app.core.partitions): whole months past their retention window are
+detached and dropped, which frees the space at once without a vacuum
+backlog, and future partitions are created ahead of time. Rows in the
+partial months at the edge of the window — and everything on databases
+without partitions — are deleted in chunks of CLEANUP_BATCH_SIZE, one
+commit per chunk, so no single statement holds locks over millions of rows.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.partitions import (
+    PARTITIONED_TABLES,
+    drop_expired_partitions,
+    ensure_partitions,
+    is_partitioned,
+)
+from app.models.data_query import DataQuery
+from app.models.job import Job
+from app.models.job_result import JobResult
+from app.models.monitor import MonitorCheck
+from app.models.webhook_delivery import WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+
+def cutoffs(now: datetime | None = None) -> dict[str, datetime]:
+    """Retention cutoff per table; rows older than it are purged."""
+    now = now or datetime.now(timezone.utc)
+    data_cutoff = now - timedelta(days=settings.DATA_RETENTION_DAYS)
+    return {
+        "jobs": data_cutoff,
+        "job_results": data_cutoff,
+        "webhook_deliveries": data_cutoff,
+        "data_queries": data_cutoff,
+        "monitor_checks": now - timedelta(days=settings.MONITOR_CHECK_RETENTION_DAYS),
+    }
+
+
+async def maintain_partitions(db: AsyncSession, now: datetime | None = None) -> list[str]:
+    """Drop expired partitions and premake upcoming ones. Returns the
+    dropped partition names (empty when the tables aren't partitioned)."""
+    now = now or datetime.now(timezone.utc)
+    limits = cutoffs(now)
+    dropped: list[str] = []
+    for table in PARTITIONED_TABLES:
+        if not await is_partitioned(db, table):
+            continue
+        dropped += await drop_expired_partitions(db, table, limits[table])
+        await ensure_partitions(db, table, now.date(), settings.PARTITION_PREMAKE_MONTHS)
+        await db.commit()
+    return dropped
+
+
+async def _delete_in_batches(db: AsyncSession, model, column, cutoff: datetime, batch_size: int) -> int:
+    total = 0
+    while True:
+        ids = select(model.id).where(column < cutoff).limit(batch_size)
+        result = await db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+async def _delete_jobs(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    """Old jobs with their results, a batch of jobs at a time."""
+    total = 0
+    while True:
+        job_ids = (
+            await db.execute(select(Job.id).where(Job.created_at < cutoff).limit(batch_size))
+        ).scalars().all()
+        if not job_ids:
+            return total
+        await db.execute(
+            delete(JobResult)
+            .where(JobResult.job_id.in_(job_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(Job).where(Job.id.in_(job_ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        total += len(job_ids)
+        if len(job_ids) < batch_size:
+            return total
+
+
+async def purge_expired(
+    db: AsyncSession, now: datetime | None = None, batch_size: int | None = None
+) -> dict[str, int]:
+    """Apply every retention rule. Returns deleted row counts per table
+    (rows removed by dropping partitions are not counted)."""
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+    limits = cutoffs(now)
+
+    dropped = await maintain_partitions(db, now)
+    if dropped:
+        logger.info(f"Dropped {len(dropped)} expired partitions: {', '.join(dropped)}")
+
+    counts = {"jobs": await _delete_jobs(db, limits["jobs"], batch_size)}
+    for table, model, column in (
+        ("webhook_deliveries", WebhookDelivery, WebhookDelivery.created_at),
+        ("monitor_checks", MonitorCheck, MonitorCheck.checked_at),
+        ("data_queries", DataQuery, DataQuery.created_at),
+    ):
+        counts[table] = await _delete_in_batches(db, model, column, limits[table], batch_size)
+    return counts
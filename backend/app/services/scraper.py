@@ -31,13 +31,29 @@ from app.services.table_extraction import extract_tables
 from app.services.selector_extraction import extract_by_css, extract_by_xpath, extract_by_selectors
 from app.services.content_filter import BM25ContentFilter, PruningContentFilter
 from app.services.markdown_utils import generate_citations, generate_fit_markdown
+from app.services.block_detector import (
+    _BLOCK_PATTERNS,  # noqa: F401
+    REASON_EMPTY,
+    REASON_SOFT_404,
+    detect_block,
+    find_challenge_signature,
+    get_vendor_block,
+    looks_noscript_block,
+)
 from app.services.strategy_cache import (
     get_domain_strategy,
     record_strategy_result,
     get_starting_tier,
 )
+from app.services.strategy_stats import (
+    flush_pending_writes,
+    get_domain_stats,
+    plan_race,
+    record_outcomes_soon,
+)
 
 from app.config import settings
+from app.core import stage_timing
 from app.core.redis import redis_client as _redis
 
 logger = logging.getLogger(__name__)
@@ -75,6 +91,9 @@ async def cleanup_async_pools() -> None:
     global _httpx_client, _httpx_loop_id, _curl_loop_id
     global _stealth_client, _stealth_loop_id
 
+    # Strategy stats writes still in flight on this loop
+    await flush_pending_writes()
+
     # httpx client
     if _httpx_client is not None:
         try:
@@ -119,6 +138,7 @@ def _reset_browser_pool_state():
         browser_pool._chromium_semaphore = None
         browser_pool._firefox_semaphore = None
         browser_pool._initialized = False
+        browser_pool._drop_warm_contexts()
     except Exception:
         pass
 
@@ -269,52 +289,8 @@ async def _fetch_via_stealth_engine(
 # Anti-bot detection patterns
 # ---------------------------------------------------------------------------
 
-_BLOCK_PATTERNS = [
-    "javascript is disabled",
-    "enable javascript",
-    "requires javascript",
-    "javascript is required",
-    "please enable javascript",
-    "you need to enable javascript",
-    "this page requires javascript",
-    "turn on javascript",
-    "activate javascript",
-    "captcha",
-    "verify you are human",
-    "verify you're human",
-    "are you a robot",
-    "not a robot",
-    "bot detection",
-    "access denied",
-    "please verify",
-    "unusual traffic",
-    "automated access",
-    "checking your browser",
-    "just a moment",
-    "attention required",
-    "please wait while we verify",
-    "ray id",
-    "performance & security by cloudflare",
-    "sucuri website firewall",
-    "pardon our interruption",
-    "press & hold",
-    "blocked by",
-    "we need to verify that you're not a robot",
-    "sorry, we just need to make sure",
-    "one more step",
-    "please click here if you are not redirected",
-    "if you are not redirected within",
-    "having trouble accessing google",
-    # Akamai Bot Manager
-    "your connection needs to be verified",
-    "connection is being verified",
-    "please verify your identity",
-    # PerimeterX / HUMAN Security
-    "robot or human",
-    "activate and hold",
-    "confirm that you're human",
-    "confirm you are human",
-]
+# Block / challenge / soft-404 phrase lists live in app.services.block_detector
+# (_BLOCK_PATTERNS is re-exported here for existing importers)
 
 # Exact domain matches
 _HARD_SITES_EXACT = {
@@ -648,6 +624,11 @@ def _is_hard_site(url: str) -> bool:
         return False
 
 
+def _domain_bucket(url: str) -> str:
+    """Low-cardinality domain label for stage metrics."""
+    return "hard" if _is_hard_site(url) else "default"
+
+
 def _get_homepage(url: str) -> str | None:
     """For hard sites, return the homepage URL for warm-up navigation."""
     try:
@@ -832,141 +813,20 @@ def _looks_noscript_block(html: str) -> bool:
     block — all HTTP fingerprints will get the same response, so there's
     no point racing more curl_cffi profiles.
     """
-    if "<noscript" not in html.lower():
-        return False
-    body_match = re.search(r"<body[^>]*>(.*?)</body>", html, re.DOTALL | re.IGNORECASE)
-    body_html = body_match.group(1) if body_match else html
-    visible = re.sub(r"<script[^>]*>.*?</script>", " ", body_html, flags=re.DOTALL | re.IGNORECASE)
-    visible = re.sub(r"<style[^>]*>.*?</style>", " ", visible, flags=re.DOTALL | re.IGNORECASE)
-    visible = re.sub(r"<noscript[^>]*>.*?</noscript>", " ", visible, flags=re.DOTALL | re.IGNORECASE)
-    body_text = re.sub(r"<[^>]+>", " ", visible).strip()
-    body_text = re.sub(r"\s+", " ", body_text)
-    return len(body_text) < 300
+    return looks_noscript_block(html)
 
 
 def _looks_blocked(html: str) -> bool:
-    if not html:
-        return True
-
-    body_match = re.search(r"<body[^>]*>(.*?)</body>", html, re.DOTALL | re.IGNORECASE)
-    body_html = body_match.group(1) if body_match else html
-
-    # Strip <script> and <style> tags AND their content before measuring text
-    visible_html = re.sub(
-        r"<script[^>]*>.*?</script>", " ", body_html, flags=re.DOTALL | re.IGNORECASE
-    )
-    visible_html = re.sub(
-        r"<style[^>]*>.*?</style>", " ", visible_html, flags=re.DOTALL | re.IGNORECASE
-    )
-    visible_html = re.sub(
-        r"<noscript[^>]*>.*?</noscript>",
-        " ",
-        visible_html,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    body_text = re.sub(r"<[^>]+>", " ", visible_html).strip().lower()
-    # Collapse whitespace for accurate length measurement
-    body_text = re.sub(r"\s+", " ", body_text)
-
-    # Bot detection service structural fingerprints — check raw HTML regardless
-    # of body_text length. These are unique to challenge pages and never appear
-    # on normal pages (even those protected by the same service).
-    html_lower = html.lower()
-    if "px-captcha" in html_lower or "human-challenge" in html_lower:
-        logger.warning(f"_looks_blocked: PerimeterX/HUMAN challenge element ({len(body_text)} chars)")
-        return True
-
-    # Pages with substantial visible text content are never block pages
-    if len(body_text) > 3000:
-        return False
-
-    # Medium pages (800-3000 chars): only check strong block signals that
-    # wouldn't appear in normal content. This closes the gap where pages
-    # with minimal content slip through unchecked.
-    if 800 <= len(body_text) <= 3000:
-        _strong_block_patterns = [
-            "checking your browser", "just a moment", "attention required",
-            "please wait while we verify", "performance & security by cloudflare",
-            "sucuri website firewall", "your connection needs to be verified",
-            "robot or human", "activate and hold",
-            "confirm that you're human", "confirm you are human",
-        ]
-        for pattern in _strong_block_patterns:
-            if pattern in body_text:
-                logger.warning(f"_looks_blocked: medium page matched '{pattern}' ({len(body_text)} chars)")
-                return True
-
-    # Only check block patterns on very short pages — pages with moderate
-    # text (e.g. partially loaded product pages) shouldn't be flagged just
-    # because they contain words like "captcha" in a footer link or script ref.
-    if len(body_text) < 800:
-        for pattern in _BLOCK_PATTERNS:
-            if pattern in body_text:
-                logger.warning(f"_looks_blocked: matched '{pattern}' (body_text={len(body_text)} chars)")
-                return True
-
-    # Only check head for patterns that STRONGLY indicate a block page
-    # Avoid generic words like "captcha" / "robot" which appear in normal content
-    head = html[:5000].lower()
-    for pattern in [
-        "javascript is disabled",
-        "enable javascript",
-        "attention required",
-        "just a moment",
-        "checking your browser",
-        "please wait while we verify",
-        "verify you are human",
-        "are you a robot",
-        "not a robot",
-        "please click here if you are not redirected",
-        "having trouble accessing google",
-    ]:
-        if pattern in head:
-            logger.warning(f"_looks_blocked: head matched '{pattern}' (body_text={len(body_text)} chars)")
-            return True
-
-    if len(body_text) < 300 and ("<noscript" in html.lower()):
-        logger.warning(f"_looks_blocked: noscript + short body ({len(body_text)} chars)")
-        return True
-
-    # Google redirect/interstitial page (from Google Cache attempts)
-    if len(body_text) < 500:
-        title_match = re.search(
-            r"<title[^>]*>(.*?)</title>", html, re.IGNORECASE | re.DOTALL
+    start = time.perf_counter()
+    check = detect_block(html)
+    stage_timing.observe_block_check(check.blocked, time.perf_counter() - start)
+    if check.blocked and check.reason != REASON_EMPTY:
+        logger.warning(
+            f"_looks_blocked: {check.reason}"
+            + (f" matched '{check.pattern}'" if check.pattern else "")
+            + f" (body_text={check.text_len} chars)"
         )
-        if title_match and "google" in title_match.group(1).lower():
-            return True
-
-    # Amazon-style "no session" interstitial: very short body with specific combo
-    if len(body_text) < 500:
-        amazon_signals = sum(
-            1
-            for p in [
-                "continue shopping",
-                "conditions of use",
-                "privacy notice",
-            ]
-            if p in body_text
-        )
-        if amazon_signals >= 2:
-            return True
-
-    # Generic soft-404 detection — short pages with "not found" patterns
-    if len(body_text) < 500:
-        soft_404_patterns = [
-            "page not found", "page doesn't exist", "page does not exist",
-            "this page isn't available", "this page is not available",
-            "no longer available", "has been removed", "has been deleted",
-            "404 - not found", "404 not found", "error 404",
-            "sorry, we couldn't find", "sorry, we could not find",
-            "the page you requested", "the page you were looking for",
-            "nothing here", "content not found",
-        ]
-        if sum(1 for p in soft_404_patterns if p in body_text) >= 1:
-            logger.warning(f"_looks_blocked: soft-404 detected ({len(body_text)} chars)")
-            return True
-
-    return False
+    return check.blocked
 
 
 # ---------------------------------------------------------------------------
@@ -1002,24 +862,56 @@ def _strip_google_cache_banner(html: str) -> str:
 class RaceResult:
     """Result from _race_strategies including winner and best fallback."""
 
-    __slots__ = ("winner_name", "winner_result", "best_html", "best_result")
+    __slots__ = (
+        "winner_name",
+        "winner_result",
+        "best_html",
+        "best_result",
+        "document_type",
+    )
 
     def __init__(self):
         self.winner_name: str | None = None
         self.winner_result = None
         self.best_html: str = ""
         self.best_result = None
+        self.document_type: str | None = None
 
     @property
     def success(self) -> bool:
         return self.winner_name is not None
 
 
+async def _split_hedged(
+    coros: list[tuple[str, Any]], url: str, timeout: float | None = None
+) -> tuple[list[tuple[str, Any]], list[tuple[str, Any]], float]:
+    """Split race contestants into (primary, hedged, hedge_delay) using the
+    domain's strategy stats. Without history everything stays primary."""
+    stats = await get_domain_stats(url)
+    primary, backups, delay = plan_race(
+        [name for name, _ in coros], stats, settings.STRATEGY_RACE_TOP_K, timeout
+    )
+    by_name = dict(coros)
+    if backups:
+        logger.debug(
+            f"Adaptive race for {url}: primary={primary}, hedged={backups} after {delay:.2f}s"
+        )
+    return (
+        [(n, by_name[n]) for n in primary],
+        [(n, by_name[n]) for n in backups],
+        delay,
+    )
+
+
 async def _race_strategies(
     coros: list[tuple[str, Any]],
     url: str,
     validate_fn=None,
     timeout: float | None = None,
+    hedged: list[tuple[str, Any]] | None = None,
+    hedge_delay: float = 0.0,
+    record_stats: bool = False,
+    tier: int | str | None = None,
 ) -> RaceResult:
     """Run multiple strategy coroutines concurrently, return first success.
 
@@ -1028,11 +920,21 @@ async def _race_strategies(
         url: URL being scraped (for logging)
         validate_fn: Optional function to validate result.
         timeout: Max seconds for this race. None = no timeout.
+        hedged: Backup (strategy_name, coroutine) tuples launched only after
+            ``hedge_delay`` seconds without a winner, or as soon as every
+            primary strategy has failed. Never-launched backups are closed.
+        hedge_delay: Seconds to wait before launching the hedged backups.
+        record_stats: Record each finished contestant's outcome and latency
+            in the per-domain strategy stats (see strategy_stats).
+        tier: Tier label for the per-contestant fetch and race-waste metrics.
 
     Returns:
         RaceResult with winner (if any) and best fallback HTML.
     """
     race = RaceResult()
+    hedged = list(hedged or [])
+    if not coros:
+        coros, hedged = hedged, []
     if not coros:
         return race
 
@@ -1080,16 +982,33 @@ async def _race_strategies(
 
     loop.set_exception_handler(_suppress_playwright_errors)
 
-    tasks = [
-        asyncio.create_task(_named_wrapper(name, coro), name=name)
-        for name, coro in coros
-    ]
-
-    pending = set(tasks)
     race_start = time.time()
+    started_at: dict[str, float] = {}
+    finished: dict[str, tuple[str, float]] = {}  # name -> (outcome, seconds)
+    outcomes: list[tuple[str, bool, float]] = []
+
+    def _launch(entries):
+        launched = set()
+        now = time.time()
+        for name, coro in entries:
+            started_at[name] = now
+            launched.add(asyncio.create_task(_named_wrapper(name, coro), name=name))
+        return launched
+
+    pending = _launch(coros)
+    hedge_at = race_start + hedge_delay if hedged else None
 
     try:
-        while pending:
+        while pending or hedged:
+            # Launch hedged backups once the delay has elapsed or every
+            # primary strategy has already finished without a winner
+            if hedged and (not pending or time.time() >= hedge_at):
+                logger.info(
+                    f"Race: launching hedged backups for {url}: {[n for n, _ in hedged]}"
+                )
+                pending |= _launch(hedged)
+                hedged = []
+
             # Calculate remaining timeout
             wait_timeout = None
             if timeout is not None:
@@ -1098,6 +1017,11 @@ async def _race_strategies(
                 if elapsed >= timeout:
                     logger.warning(f"Race timeout ({timeout}s) for {url}, pending: {[t.get_name() for t in pending]}")
                     break
+            if hedged:
+                until_hedge = max(0.0, hedge_at - time.time())
+                wait_timeout = (
+                    until_hedge if wait_timeout is None else min(wait_timeout, until_hedge)
+                )
 
             done, pending = await asyncio.wait(
                 pending,
@@ -1106,12 +1030,37 @@ async def _race_strategies(
             )
 
             if not done:
+                if hedged:
+                    continue  # Hedge deadline reached — launch backups
                 # Timeout on wait — no task completed in time
                 logger.warning(f"Race: wait timeout for {url}, pending: {[t.get_name() for t in pending]}")
                 break
 
             for task in done:
                 try:
+                    if isinstance(task.exception(), _DocumentResponse):
+                        # Every contestant fetches the same URL — no point
+                        # waiting for the others to download the document
+                        race.document_type = task.exception().doc_type
+                        finished[task.get_name()] = (
+                            "document",
+                            time.time() - started_at.get(task.get_name(), race_start),
+                        )
+                        logger.info(
+                            f"Race: {task.get_name()} detected {race.document_type} document for {url}"
+                        )
+                        for p in pending:
+                            p.cancel()
+                        pending = set()
+                        for _, coro in hedged:
+                            coro.close()
+                        hedged = []
+                        break
+                    if task.exception() is not None:
+                        elapsed = time.time() - started_at.get(task.get_name(), race_start)
+                        finished[task.get_name()] = ("error", elapsed)
+                        if record_stats:
+                            outcomes.append((task.get_name(), False, elapsed * 1000))
                     name, result = task.result()
 
                     # Track best HTML for fallback regardless of validation.
@@ -1132,13 +1081,21 @@ async def _race_strategies(
                             race.best_html = html
                             race.best_result = result
 
-                    if validate_fn(result):
+                    valid = validate_fn(result)
+                    elapsed = time.time() - started_at[name]
+                    finished[name] = ("success" if valid else "invalid", elapsed)
+                    if record_stats:
+                        outcomes.append((name, bool(valid), elapsed * 1000))
+                    if valid:
                         race.winner_name = name
                         race.winner_result = result
                         logger.info(f"Race winner: {name} for {url}")
                         for p in pending:
                             p.cancel()
                         pending = set()
+                        for _, coro in hedged:
+                            coro.close()
+                        hedged = []
                         # Drain remaining done tasks so asyncio doesn't log
                         # "Task exception was never retrieved" for losers
                         for other in done:
@@ -1159,8 +1116,24 @@ async def _race_strategies(
             task.cancel()
         if pending:
             await asyncio.gather(*pending, return_exceptions=True)
+        # Backups that were never launched — close to avoid "never awaited"
+        for _, coro in hedged:
+            coro.close()
         loop.set_exception_handler(_original_handler)
 
+    # Per-contestant fetch time; everything but the winner is race-loss waste
+    bucket = _domain_bucket(url)
+    unfinished = "cancelled" if race.winner_name or race.document_type else "timeout"
+    now = time.time()
+    for name, started in started_at.items():
+        outcome, elapsed = finished.get(name) or (unfinished, now - started)
+        stage_timing.observe_fetch(tier, name, outcome, bucket, elapsed)
+        if race.winner_name and name != race.winner_name:
+            stage_timing.observe_race_waste(tier, name, bucket, elapsed)
+
+    if outcomes:
+        record_outcomes_soon(url, outcomes)
+
     return race
 
 
@@ -1183,13 +1156,32 @@ async def scrape_url(
     Tier 2: Browser race → race(chromium_stealth, firefox_stealth, nodriver_stealth, stealth_engine)
     Tier 3: Heavy race (hard sites) → race(google_search, advanced_prewarm)
     Tier 4: Fallback → google_cache
+
+    Each stage is timed (see app.core.stage_timing); with
+    ``request.include_timings`` the breakdown is returned in
+    ``metadata.timings``.
     """
+    with stage_timing.timed_scrape() as timer:
+        result = await _scrape_url(request, proxy_manager, crawl_session, hook_manager)
+        if request.include_timings and result.metadata is not None:
+            result.metadata.timings = timer.breakdown()
+        return result
+
+
+async def _scrape_url(
+    request: ScrapeRequest,
+    proxy_manager=None,
+    crawl_session=None,
+    hook_manager=None,
+) -> ScrapeData:
     from app.core.cache import get_cached_scrape, set_cached_scrape
     from app.core.metrics import scrape_duration_seconds
     from app.services.document import detect_document_type
 
     url = request.url
     start_time = time.time()
+    bucket = _domain_bucket(url)
+    timer = stage_timing.current_timer()
 
     # Domain throttle — ensure polite delay between requests to same domain
     domain = urlparse(url).netloc
@@ -1216,7 +1208,11 @@ async def scrape_url(
         and not request.extract
     )
     if use_cache:
+        _lookup_start = time.perf_counter()
         cached = await get_cached_scrape(url, request.formats)
+        stage_timing.observe_cache_lookup(
+            "scrape", bool(cached), time.perf_counter() - _lookup_start
+        )
         if cached:
             try:
                 return ScrapeData(**cached)
@@ -1256,8 +1252,13 @@ async def scrape_url(
     winning_tier = None
 
     # --- Strategy cache lookup ---
+    _lookup_start = time.perf_counter()
     strategy_data = await get_domain_strategy(url)
+    stage_timing.observe_cache_lookup(
+        "strategy", bool(strategy_data), time.perf_counter() - _lookup_start
+    )
     starting_tier = get_starting_tier(strategy_data, hard_site)
+    fetch_start = time.time()
 
     network_data = None  # Populated when capture_network=True
 
@@ -1422,14 +1423,23 @@ async def scrape_url(
                     logger.info(f"Strategy cache hit for {url}: {last_strategy}")
 
             elapsed_ms = (time.time() - tier_start) * 1000
+            stage_timing.observe_fetch(
+                0, last_strategy, "success" if fetched else "invalid", bucket, elapsed_ms / 1000
+            )
             if fetched:
                 await record_strategy_result(url, winning_strategy, 0, True, elapsed_ms)
             else:
                 # Cached strategy returned blocked/empty content — invalidate cache
                 await record_strategy_result(url, last_strategy, 0, False, elapsed_ms)
                 logger.info(f"Strategy cache miss for {url}: {last_strategy} produced blocked content")
+        except _DocumentResponse as e:
+            return await _handle_document_url(
+                url, e.doc_type, request, proxy_manager, start_time
+            )
         except Exception as e:
+            stage_timing.observe_fetch(0, last_strategy, "error", bucket, time.time() - tier_start)
             logger.debug(f"Strategy cache hit attempt failed for {url}: {e}")
+        stage_timing.record_stage("tier0", time.time() - tier_start)
 
     # === Tier 0.5: Cookie HTTP — curl_cffi with browser cookies (crawl mode) ===
     if not fetched and crawl_session and not needs_browser:
@@ -1451,8 +1461,21 @@ async def scrape_url(
                         url, "cookie_http", 0, True, elapsed_ms
                     )
                     logger.info(f"Cookie HTTP hit for {url}")
+                stage_timing.observe_fetch(
+                    0,
+                    "cookie_http",
+                    "success" if fetched else "invalid",
+                    bucket,
+                    time.time() - tier_start,
+                )
+        except _DocumentResponse as e:
+            return await _handle_document_url(
+                url, e.doc_type, request, proxy_manager, start_time
+            )
         except Exception as e:
+            stage_timing.observe_fetch(0, "cookie_http", "error", bucket, time.time() - tier_start)
             logger.debug(f"Cookie HTTP failed for {url}: {e}")
+        stage_timing.record_stage("tier0", time.time() - tier_start)
 
     # Helper to accumulate best HTML + screenshot from race losers
     screenshot_b64_best = None
@@ -1510,7 +1533,13 @@ async def scrape_url(
                 ),
             )
 
-        race = await _race_strategies(http_coros, url, timeout=10)
+        race = await _race_strategies(http_coros, url, timeout=10, tier=1)
+        stage_timing.record_stage("tier1", time.time() - tier_start)
+        if race.document_type:
+            # Served a document without a document URL — extract it instead
+            return await _handle_document_url(
+                url, race.document_type, request, proxy_manager, start_time
+            )
         _update_best(race)
         if race.success:
             html, sc, hdrs = _unpack_http_result(race.winner_result)
@@ -1664,9 +1693,20 @@ async def scrape_url(
                 ))
                 t2_timeout = 20
 
+        primary_coros, hedged_coros, hedge_delay = await _split_hedged(
+            browser_coros, url, timeout=t2_timeout
+        )
         race = await _race_strategies(
-            browser_coros, url, validate_fn=_validate_browser, timeout=t2_timeout
+            primary_coros,
+            url,
+            validate_fn=_validate_browser,
+            timeout=t2_timeout,
+            hedged=hedged_coros,
+            hedge_delay=hedge_delay,
+            record_stats=True,
+            tier=2,
         )
+        stage_timing.record_stage("tier2", time.time() - tier_start)
         _update_best(race)
         if race.success:
             (
@@ -1712,8 +1752,9 @@ async def scrape_url(
         ]
 
         race = await _race_strategies(
-            heavy_coros, url, validate_fn=_validate_browser, timeout=35
+            heavy_coros, url, validate_fn=_validate_browser, timeout=35, tier=3
         )
+        stage_timing.record_stage("tier3", time.time() - tier_start)
         _update_best(race)
         if race.success:
             (
@@ -1748,8 +1789,9 @@ async def scrape_url(
             return bool(html) and len(html) > 500 and not _looks_blocked(html)
 
         race = await _race_strategies(
-            fallback_coros, url, validate_fn=_validate_fallback, timeout=12
+            fallback_coros, url, validate_fn=_validate_fallback, timeout=12, tier=4
         )
+        stage_timing.record_stage("tier4", time.time() - tier_start)
         _update_best(race)
         if race.success:
             html, sc, hdrs = _unpack_http_result(race.winner_result)
@@ -1783,9 +1825,19 @@ async def scrape_url(
                     _fetch_with_curl_cffi_multi(url, request.timeout, proxy_url=_bp_url),
                     timeout=20,
                 )
+                _proxy_ok = bool(
+                    _proxy_http
+                    and _proxy_http[0]
+                    and len(_proxy_http[0]) > 500
+                    and not _looks_blocked(_proxy_http[0])
+                )
+                stage_timing.observe_fetch(
+                    5, "proxy_http", "success" if _proxy_ok else "invalid", bucket,
+                    time.time() - tier_start,
+                )
                 if _proxy_http and _proxy_http[0] and len(_proxy_http[0]) > 500:
                     _proxy_html = _proxy_http[0]
-                    if not _looks_blocked(_proxy_html):
+                    if _proxy_ok:
                         raw_html = _proxy_html
                         status_code = _proxy_http[1]
                         response_headers = _proxy_http[2]
@@ -1796,6 +1848,9 @@ async def scrape_url(
                         await record_strategy_result(url, winning_strategy, 3, True, elapsed_ms)
                         logger.info(f"Proxy HTTP succeeded for {url}")
             except Exception as _phe:
+                stage_timing.observe_fetch(
+                    5, "proxy_http", "error", bucket, time.time() - tier_start
+                )
                 logger.debug(f"Proxy HTTP failed for {url}: {_phe}")
 
             # Fall back to browser with proxy (slower but handles JS)
@@ -1807,7 +1862,7 @@ async def scrape_url(
                     browser_coros.append(
                         ("proxy_stealth_chromium", _fetch_via_stealth_engine(url, request, proxy=_bp_pw)),
                     )
-                race = await _race_strategies(browser_coros, url, validate_fn=_validate_browser, timeout=45)
+                race = await _race_strategies(browser_coros, url, validate_fn=_validate_browser, timeout=45, tier=5)
                 _update_best(race)
                 if race.success:
                     raw_html, status_code, screenshot_b64, action_screenshots, response_headers = _unpack_browser_result(race.winner_result)
@@ -1819,6 +1874,9 @@ async def scrape_url(
                     logger.info(f"Proxy browser succeeded for {url}: {winning_strategy}")
                 else:
                     await _builtin_pm.mark_failed(_builtin_obj)
+            stage_timing.record_stage("tier5", time.time() - tier_start)
+
+    stage_timing.record_stage("fetch", time.time() - fetch_start)
 
     # --- Final fallback: use best available content even if blocked ---
     if not fetched:
@@ -1899,16 +1957,23 @@ async def scrape_url(
     # === Parallel content extraction ===
     result_data: dict[str, Any] = {}
     _extract_start = time.time()
+    if timer is not None:
+        timer.tier, timer.strategy = winning_tier, winning_strategy
 
     # Fast path: combined extraction + markdown in single parse (saves ~200-350ms)
     loop = asyncio.get_running_loop()
     extraction_futures = []
     extraction_keys = []
 
+    def _run_timed(fn, *args):
+        # (result, seconds) — per-format time is recorded back on the loop
+        return loop.run_in_executor(
+            _extraction_executor, stage_timing.timed_call, fn, *args
+        )
+
     if "markdown" in request.formats:
         # extract_and_convert does extraction + markdown in 1 parse instead of 3
-        clean_html, markdown_result = await loop.run_in_executor(
-            _extraction_executor,
+        (clean_html, markdown_result), _elapsed = await _run_timed(
             extract_and_convert,
             raw_html,
             url,
@@ -1916,8 +1981,10 @@ async def scrape_url(
             request.include_tags,
             request.exclude_tags,
         )
+        stage_timing.observe_extract("markdown", bucket, _elapsed)
         result_data["markdown"] = markdown_result
     else:
+        _clean_start = time.perf_counter()
         if request.only_main_content:
             clean_html = extract_main_content(raw_html, url)
         else:
@@ -1926,39 +1993,25 @@ async def scrape_url(
             clean_html = apply_tag_filters(
                 clean_html, request.include_tags, request.exclude_tags
             )
+        stage_timing.observe_extract("html", bucket, time.perf_counter() - _clean_start)
     if "links" in request.formats:
-        extraction_futures.append(
-            loop.run_in_executor(_extraction_executor, extract_links, raw_html, url)
-        )
+        extraction_futures.append(_run_timed(extract_links, raw_html, url))
         extraction_keys.append("links")
-        extraction_futures.append(
-            loop.run_in_executor(
-                _extraction_executor, extract_links_detailed, raw_html, url
-            )
-        )
+        extraction_futures.append(_run_timed(extract_links_detailed, raw_html, url))
         extraction_keys.append("links_detail")
     if "structured_data" in request.formats:
-        extraction_futures.append(
-            loop.run_in_executor(
-                _extraction_executor, extract_structured_data, raw_html
-            )
-        )
+        extraction_futures.append(_run_timed(extract_structured_data, raw_html))
         extraction_keys.append("structured_data")
     if "headings" in request.formats:
-        extraction_futures.append(
-            loop.run_in_executor(_extraction_executor, extract_headings, raw_html)
-        )
+        extraction_futures.append(_run_timed(extract_headings, raw_html))
         extraction_keys.append("headings")
     if "images" in request.formats:
-        extraction_futures.append(
-            loop.run_in_executor(_extraction_executor, extract_images, raw_html, url)
-        )
+        extraction_futures.append(_run_timed(extract_images, raw_html, url))
         extraction_keys.append("images")
 
     # metadata extraction always runs — guard against None response_headers
     extraction_futures.append(
-        loop.run_in_executor(
-            _extraction_executor,
+        _run_timed(
             extract_metadata,
             raw_html,
             url,
@@ -1969,18 +2022,17 @@ async def scrape_url(
     extraction_keys.append("_metadata")
 
     # Await all extractions concurrently
-    if extraction_futures:
-        extraction_results = await asyncio.gather(*extraction_futures)
-        for key, value in zip(extraction_keys, extraction_results):
-            if key == "_metadata":
-                continue
-            result_data[key] = value
-        # metadata is always the last one
-        metadata_dict = extraction_results[-1]
-    else:
-        metadata_dict = extract_metadata(raw_html, url, status_code, response_headers)
+    extraction_results = await asyncio.gather(*extraction_futures)
+    for key, (value, elapsed) in zip(extraction_keys, extraction_results):
+        stage_timing.observe_extract(key.lstrip("_"), bucket, elapsed)
+        if key == "_metadata":
+            continue
+        result_data[key] = value
+    # metadata is always the last one
+    metadata_dict = extraction_results[-1][0]
 
     _extract_elapsed = (time.time() - _extract_start) * 1000
+    stage_timing.record_stage("extract", _extract_elapsed / 1000)
     _fetch_elapsed = (_extract_start - start_time) * 1000
     _total_elapsed = (time.time() - start_time) * 1000
     logger.info(
@@ -2128,63 +2180,35 @@ def classify_error(
 
 def get_block_reason(html: str | None, status_code: int = 0) -> str:
     """Return a human-readable block reason based on HTML content and status code."""
-    html_lower = (html or "").lower()
-
     if status_code == 429:
         return "Rate limited (429) — the target site is throttling requests. Try again later or use a proxy."
 
-    if any(
-        kw in html_lower
-        for kw in (
-            "cloudflare",
-            "performance & security by",
-            "ray id",
-            "checking your browser",
-        )
-    ):
+    vendor = get_vendor_block(html)
+
+    if vendor == "cloudflare":
         return (
             "Blocked by Cloudflare WAF — the site is using Cloudflare bot protection."
         )
 
-    if any(
-        kw in html_lower
-        for kw in (
-            "captcha",
-            "recaptcha",
-            "hcaptcha",
-            "verify you are human",
-            "verify you're human",
-        )
-    ):
+    if vendor == "captcha":
         return "CAPTCHA detected — the site requires human verification. Try using a browser-based strategy or proxy."
 
-    if "datadome" in html_lower:
+    if vendor == "datadome":
         return "Blocked by DataDome — the site uses DataDome bot detection."
 
-    if "perimeterx" in html_lower:
+    if vendor == "perimeterx":
         return "Blocked by PerimeterX — the site uses PerimeterX bot detection."
 
-    if "sucuri" in html_lower:
+    if vendor == "sucuri":
         return "Blocked by Sucuri WAF — the site uses Sucuri firewall protection."
 
-    if "incapsula" in html_lower:
+    if vendor == "incapsula":
         return "Blocked by Imperva/Incapsula — the site uses Imperva bot management."
 
-    if any(
-        kw in html_lower
-        for kw in (
-            "akamai",
-            "your connection needs to be verified",
-            "connection is being verified",
-        )
-    ):
+    if vendor == "akamai":
         return "Blocked by Akamai Bot Manager — the site uses Akamai bot protection."
 
-    if (
-        status_code == 403
-        or "access denied" in html_lower
-        or "403 forbidden" in html_lower
-    ):
+    if status_code == 403 or vendor == "access_denied":
         return "Access denied (403) — the site explicitly blocked the request."
 
     if status_code == 451:
@@ -2192,12 +2216,12 @@ def get_block_reason(html: str | None, status_code: int = 0) -> str:
             "Unavailable for legal reasons (451) — content restricted in your region."
         )
 
-    if any(
-        kw in html_lower
-        for kw in ("javascript is disabled", "enable javascript", "requires javascript")
-    ):
+    if vendor == "javascript":
         return "JavaScript required — the site needs JavaScript execution. A browser-based strategy may work."
 
+    if html and detect_block(html).reason == REASON_SOFT_404:
+        return "Page not found — the site returned a soft 404 page instead of content."
+
     return "All scraping strategies failed — the site may be using advanced bot protection. Try enabling proxy rotation."
 
 
@@ -2306,6 +2330,125 @@ async def _handle_document_url(
     )
 
 
+# ---------------------------------------------------------------------------
+# Streaming HTTP bodies — early abort on documents, size cap, challenges
+# ---------------------------------------------------------------------------
+
+_DOCUMENT_TYPES = ("pdf", "docx", "xlsx", "pptx", "csv", "rtf", "epub")
+
+# Content types that can never be scraped as HTML (checked after the
+# document sniff, so e.g. a PDF served as octet-stream is still handled)
+_BINARY_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/",
+    "application/octet-stream",
+    "application/zip",
+)
+
+_SNIFF_BYTES = 8  # Enough for every magic number detect_document_type knows
+
+
+class _DocumentResponse(Exception):
+    """An HTTP strategy hit a document (PDF, DOCX, ...) rather than a page.
+
+    Raised from the first streamed chunk so the race stops downloading and
+    the caller can hand the URL to _handle_document_url().
+    """
+
+    def __init__(self, doc_type: str):
+        super().__init__(f"document response ({doc_type})")
+        self.doc_type = doc_type
+
+
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+def _decode_body(body: bytes, content_type: str) -> str:
+    """Decode a response body using the Content-Type charset (default UTF-8)."""
+    match = _CHARSET_RE.search(content_type or "")
+    if match:
+        try:
+            return body.decode(match.group(1), errors="replace")
+        except LookupError:
+            pass
+    return body.decode("utf-8", errors="replace")
+
+
+async def _read_streamed_body(
+    url: str, chunks, content_type: str
+) -> tuple[bytes, str | None]:
+    """Read a streamed response body, stopping as early as possible.
+
+    - Document signatures (content type / magic bytes) in the first chunk
+      raise _DocumentResponse.
+    - Binary content types are abandoned immediately (empty body).
+    - A challenge-page signature in the head stops the download; the head
+      is returned so validation still sees the challenge.
+    - Bodies larger than HTTP_MAX_BODY_BYTES are truncated.
+
+    Returns (body, abort_reason) — abort_reason is None for a full read.
+    """
+    from app.services.document import detect_document_type
+
+    max_bytes = settings.HTTP_MAX_BODY_BYTES
+    ct = (content_type or "").lower()
+    buf = bytearray()
+    sniffed = False
+    head_checked = False
+
+    async for chunk in chunks:
+        buf += chunk
+        if not sniffed and len(buf) >= _SNIFF_BYTES:
+            sniffed = True
+            doc_type = detect_document_type(url, content_type, bytes(buf[:_SNIFF_BYTES]))
+            if doc_type in _DOCUMENT_TYPES:
+                raise _DocumentResponse(doc_type)
+            if ct.startswith(_BINARY_CONTENT_TYPES):
+                return b"", f"binary content-type {ct}"
+        if not head_checked and len(buf) >= 16384:
+            head_checked = True
+            signature = find_challenge_signature(
+                bytes(buf[:16384]).decode("utf-8", errors="ignore")
+            )
+            if signature:
+                return bytes(buf), f"challenge signature '{signature}'"
+        if max_bytes and len(buf) >= max_bytes:
+            return bytes(buf[:max_bytes]), f"body exceeds {max_bytes} bytes"
+
+    if not sniffed and buf:
+        doc_type = detect_document_type(url, content_type, bytes(buf))
+        if doc_type in _DOCUMENT_TYPES:
+            raise _DocumentResponse(doc_type)
+        if ct.startswith(_BINARY_CONTENT_TYPES):
+            return b"", f"binary content-type {ct}"
+    return bytes(buf), None
+
+
+async def _curl_get_streamed(session, url: str, **kwargs) -> tuple[str, int, dict[str, str]]:
+    """curl_cffi GET with a streamed, early-aborting body read."""
+    response = await session.get(url, stream=True, **kwargs)
+    try:
+        resp_headers = {k.lower(): v for k, v in response.headers.items()}
+        body, aborted = await _read_streamed_body(
+            url, response.aiter_content(), resp_headers.get("content-type", "")
+        )
+    finally:
+        # Tell curl to stop receiving (no-op after a complete read), then
+        # wait for the transfer task so the handle goes back to the session
+        if response.quit_now is not None:
+            response.quit_now.set()
+        try:
+            await response.aclose()
+        except Exception as e:
+            # An aborted transfer ends with a curl write error
+            logger.debug(f"Closing stream of {url}: {e}")
+    if aborted:
+        logger.info(f"Stopped download of {url}: {aborted}")
+    return _decode_body(body, resp_headers.get("content-type", "")), response.status_code, resp_headers
+
+
 # ---------------------------------------------------------------------------
 # Strategy 1: curl_cffi — multi-profile TLS fingerprint impersonation
 # ---------------------------------------------------------------------------
@@ -2319,7 +2462,7 @@ async def _fetch_with_curl_cffi_single(
     custom_headers: dict[str, str] | None = None,
     custom_cookies: dict[str, str] | None = None,
 ) -> tuple[str, int, dict[str, str]]:
-    """HTTP fetch with a single TLS fingerprint profile (pooled session)."""
+    """HTTP fetch with a single TLS fingerprint profile (pooled session, streamed body)."""
     timeout_seconds = timeout / 1000
     headers = _get_headers_for_profile(profile, url)
     if custom_headers:
@@ -2335,22 +2478,19 @@ async def _fetch_with_curl_cffi_single(
         from curl_cffi.requests import AsyncSession
 
         async with AsyncSession(impersonate=profile) as session:
-            kwargs: dict[str, Any] = dict(
+            return await _curl_get_streamed(
+                session,
+                url,
                 timeout=timeout_seconds,
                 allow_redirects=True,
                 headers=headers,
                 proxy=proxy_url,
             )
-            response = await session.get(url, **kwargs)
-    else:
-        session = _get_curl_session(profile)
-        kwargs: dict[str, Any] = dict(
-            timeout=timeout_seconds, allow_redirects=True, headers=headers
-        )
-        response = await session.get(url, **kwargs)
 
-    resp_headers = {k.lower(): v for k, v in response.headers.items()}
-    return response.text or "", response.status_code, resp_headers
+    session = _get_curl_session(profile)
+    return await _curl_get_streamed(
+        session, url, timeout=timeout_seconds, allow_redirects=True, headers=headers
+    )
 
 
 async def _fetch_with_curl_cffi_multi(
@@ -2360,35 +2500,77 @@ async def _fetch_with_curl_cffi_multi(
     custom_headers: dict[str, str] | None = None,
     custom_cookies: dict[str, str] | None = None,
 ) -> tuple[str, int, dict[str, str]]:
-    """HTTP fetch racing 3 TLS fingerprints concurrently (batch 1), then 2 more if needed."""
+    """HTTP fetch racing TLS fingerprints concurrently.
 
-    # Batch 1: race first 3 profiles concurrently
-    batch1 = _CURL_CFFI_PROFILES[:3]
-    batch1_coros = [
-        (
-            f"curl_cffi:{p}",
-            _fetch_with_curl_cffi_single(
-                url,
-                timeout,
-                profile=p,
-                proxy_url=proxy_url,
-                custom_headers=custom_headers,
-                custom_cookies=custom_cookies,
-            ),
-        )
-        for p in batch1
-    ]
+    With per-domain stats, the profiles with the best expected
+    time-to-success start first and the rest are hedged after a
+    data-driven delay. Without history: 3 profiles (batch 1), then the
+    remaining 2 if needed.
+    """
+
+    def _profile_coros(profiles):
+        return [
+            (
+                f"curl_cffi:{p}",
+                _fetch_with_curl_cffi_single(
+                    url,
+                    timeout,
+                    profile=p,
+                    proxy_url=proxy_url,
+                    custom_headers=custom_headers,
+                    custom_cookies=custom_cookies,
+                ),
+            )
+            for p in profiles
+        ]
 
     def _validate_http(result):
         html, sc, _ = result
         return bool(html) and sc < 400 and not _looks_blocked(html) and not _looks_noscript_block(html)
 
+    # Adaptive: one hedged race over all profiles, ordered by domain stats
+    stats = await get_domain_stats(url)
+    primary, backups, hedge_delay = plan_race(
+        [f"curl_cffi:{p}" for p in _CURL_CFFI_PROFILES],
+        stats,
+        settings.STRATEGY_RACE_TOP_K,
+        timeout=20,
+    )
+    if backups:
+        by_name = dict(_profile_coros(_CURL_CFFI_PROFILES))
+        race = await _race_strategies(
+            [(n, by_name[n]) for n in primary],
+            url,
+            validate_fn=_validate_http,
+            timeout=20,
+            hedged=[(n, by_name[n]) for n in backups],
+            hedge_delay=hedge_delay,
+            record_stats=True,
+            tier=1,
+        )
+        if race.document_type:
+            raise _DocumentResponse(race.document_type)
+        if race.success:
+            logger.info(
+                f"{race.winner_name} succeeded for {url} ({len(race.winner_result[0])} chars)"
+            )
+            return race.winner_result
+        return race.best_result or ("", 0, {})
+
+    # Batch 1: race first 3 profiles concurrently
     best_html = ""
     best_result = ("", 0, {})
 
     race = await _race_strategies(
-        batch1_coros, url, validate_fn=_validate_http, timeout=10
+        _profile_coros(_CURL_CFFI_PROFILES[:3]),
+        url,
+        validate_fn=_validate_http,
+        timeout=10,
+        record_stats=True,
+        tier=1,
     )
+    if race.document_type:
+        raise _DocumentResponse(race.document_type)
     if race.success:
         logger.info(
             f"{race.winner_name} succeeded for {url} ({len(race.winner_result[0])} chars)"
@@ -2401,24 +2583,16 @@ async def _fetch_with_curl_cffi_multi(
     # Batch 2: race remaining 2 profiles
     batch2 = _CURL_CFFI_PROFILES[3:]
     if batch2:
-        batch2_coros = [
-            (
-                f"curl_cffi:{p}",
-                _fetch_with_curl_cffi_single(
-                    url,
-                    timeout,
-                    profile=p,
-                    proxy_url=proxy_url,
-                    custom_headers=custom_headers,
-                    custom_cookies=custom_cookies,
-                ),
-            )
-            for p in batch2
-        ]
-
         race = await _race_strategies(
-            batch2_coros, url, validate_fn=_validate_http, timeout=10
+            _profile_coros(batch2),
+            url,
+            validate_fn=_validate_http,
+            timeout=10,
+            record_stats=True,
+            tier=1,
         )
+        if race.document_type:
+            raise _DocumentResponse(race.document_type)
         if race.success:
             logger.info(
                 f"{race.winner_name} succeeded for {url} ({len(race.winner_result[0])} chars)"
@@ -2458,15 +2632,25 @@ async def _fetch_with_httpx(
             http2=True,
             proxy=proxy_url,
         ) as client:
-            response = await client.get(url, cookies=cookies_kwarg)
-    else:
-        client = await _get_httpx_client()
-        response = await client.get(
-            url, headers=headers, timeout=timeout_seconds, cookies=cookies_kwarg
-        )
+            return await _httpx_get_streamed(client, url, cookies=cookies_kwarg)
 
-    resp_headers = {k.lower(): v for k, v in response.headers.items()}
-    return response.text, response.status_code, resp_headers
+    client = await _get_httpx_client()
+    return await _httpx_get_streamed(
+        client, url, headers=headers, timeout=timeout_seconds, cookies=cookies_kwarg
+    )
+
+
+async def _httpx_get_streamed(client, url: str, **kwargs) -> tuple[str, int, dict[str, str]]:
+    """httpx GET with a streamed, early-aborting body read."""
+    async with client.stream("GET", url, **kwargs) as response:
+        resp_headers = {k.lower(): v for k, v in response.headers.items()}
+        body, aborted = await _read_streamed_body(
+            url, response.aiter_bytes(), resp_headers.get("content-type", "")
+        )
+        status_code = response.status_code
+    if aborted:
+        logger.info(f"Stopped download of {url}: {aborted}")
+    return _decode_body(body, resp_headers.get("content-type", "")), status_code, resp_headers
 
 
 # ---------------------------------------------------------------------------
@@ -2499,23 +2683,22 @@ async def _fetch_with_cookie_http(
         from curl_cffi.requests import AsyncSession
 
         async with AsyncSession(impersonate="chrome124") as session:
-            kwargs: dict[str, Any] = dict(
+            html, status_code, resp_headers = await _curl_get_streamed(
+                session,
+                url,
                 timeout=timeout_seconds,
                 allow_redirects=True,
                 headers=headers,
                 proxy=proxy_url,
             )
-            response = await session.get(url, **kwargs)
     else:
         session = _get_curl_session("chrome124")
-        kwargs: dict[str, Any] = dict(
-            timeout=timeout_seconds, allow_redirects=True, headers=headers
+        html, status_code, resp_headers = await _curl_get_streamed(
+            session, url, timeout=timeout_seconds, allow_redirects=True, headers=headers
         )
-        response = await session.get(url, **kwargs)
 
-    resp_headers = {k.lower(): v for k, v in response.headers.items()}
     resp_headers["x-datablue-strategy"] = "cookie_http"
-    return response.text, response.status_code, resp_headers
+    return html, status_code, resp_headers
 
 
 # ---------------------------------------------------------------------------
@@ -3438,6 +3621,7 @@ async def scrape_url_fetch_only(
     pinned_tier: int | None = None,
     min_tier: int = 0,
     capture_screenshot: bool = False,
+    domain_strategies: dict[str, dict | None] | None = None,
 ) -> dict | None:
     """Fetch phase only — returns raw HTML + metadata without content extraction.
 
@@ -3449,6 +3633,9 @@ async def scrape_url_fetch_only(
 
     min_tier: Skip tiers below this value. Set to 2 for browser-only crawling
     (skips HTTP tiers 0-1).
+
+    domain_strategies: Strategy data prefetched with get_domain_strategies()
+    (crawl frontier batches) — skips the per-URL strategy cache read.
     """
     from app.services.document import detect_document_type
 
@@ -3485,7 +3672,7 @@ async def scrape_url_fetch_only(
     winning_strategy = None
     winning_tier = None
 
-    strategy_data = await get_domain_strategy(url)
+    strategy_data = await get_domain_strategy(url, prefetched=domain_strategies)
     starting_tier = max(get_starting_tier(strategy_data, hard_site), min_tier)
 
     # Custom headers/cookies for HTTP strategies
@@ -3575,6 +3762,8 @@ async def scrape_url_fetch_only(
                     winning_tier = pinned_tier
             if fetched:
                 logger.debug(f"Pinned strategy hit for {url}: {pinned_strategy}")
+        except _DocumentResponse:
+            return None  # Caller falls back to scrape_url() for documents
         except Exception as e:
             logger.debug(f"Pinned strategy {pinned_strategy} failed for {url}: {e}")
 
@@ -3631,6 +3820,8 @@ async def scrape_url_fetch_only(
             else:
                 # Cached strategy returned blocked/empty content — invalidate cache
                 await record_strategy_result(url, last_strategy, 0, False, elapsed_ms)
+        except _DocumentResponse:
+            return None  # Caller falls back to scrape_url() for documents
         except Exception:
             pass
 
@@ -3653,6 +3844,8 @@ async def scrape_url_fetch_only(
                     await record_strategy_result(
                         url, "cookie_http", 0, True, elapsed_ms
                     )
+        except _DocumentResponse:
+            return None  # Caller falls back to scrape_url() for documents
         except Exception:
             pass
 
@@ -3685,7 +3878,9 @@ async def scrape_url_fetch_only(
                 )
             )
 
-        race = await _race_strategies(http_coros, url, timeout=10)
+        race = await _race_strategies(http_coros, url, timeout=10, tier=1)
+        if race.document_type:
+            return None  # Caller falls back to scrape_url() for documents
         if race.best_html and len(race.best_html) > len(raw_html_best):
             raw_html_best = race.best_html
         if race.success:
@@ -3813,8 +4008,18 @@ async def scrape_url_fetch_only(
                 )
                 t2_timeout = 20
 
+        primary_coros, hedged_coros, hedge_delay = await _split_hedged(
+            browser_coros, url, timeout=t2_timeout
+        )
         race = await _race_strategies(
-            browser_coros, url, validate_fn=_validate_browser, timeout=t2_timeout
+            primary_coros,
+            url,
+            validate_fn=_validate_browser,
+            timeout=t2_timeout,
+            hedged=hedged_coros,
+            hedge_delay=hedge_delay,
+            record_stats=True,
+            tier=2,
         )
         if race.best_html and len(race.best_html) > len(raw_html_best):
             raw_html_best = race.best_html
@@ -3857,7 +4062,7 @@ async def scrape_url_fetch_only(
             return bool(html) and not _looks_blocked(html)
 
         race = await _race_strategies(
-            heavy_coros, url, validate_fn=_validate_browser, timeout=35
+            heavy_coros, url, validate_fn=_validate_browser, timeout=35, tier=3
         )
         if race.best_html and len(race.best_html) > len(raw_html_best):
             raw_html_best = race.best_html
@@ -3887,7 +4092,7 @@ async def scrape_url_fetch_only(
             return bool(html) and len(html) > 500 and not _looks_blocked(html)
 
         race = await _race_strategies(
-            fallback_coros, url, validate_fn=_validate_fallback, timeout=12
+            fallback_coros, url, validate_fn=_validate_fallback, timeout=12, tier=4
         )
         if race.best_html and len(race.best_html) > len(raw_html_best):
             raw_html_best = race.best_html
@@ -3990,11 +4195,43 @@ def extract_content(
     action_screenshots: list[str] | None = None,
 ) -> ScrapeData:
     """CPU-bound content extraction — synchronous, designed for ThreadPoolExecutor."""
+    result_data, metadata_dict = extract_fields(
+        raw_html, url, request, status_code, response_headers,
+        screenshot_b64, action_screenshots,
+    )
+    return ScrapeData(**result_data, metadata=PageMetadata(**metadata_dict))
+
+
+def extract_fields(
+    raw_html: str,
+    url: str,
+    request: ScrapeRequest,
+    status_code: int,
+    response_headers: dict,
+    screenshot_b64: str | None,
+    action_screenshots: list[str] | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """``extract_content`` as plain dicts: ``(fields, metadata)``.
+
+    Only the requested formats (plus ``content_hash``) appear in ``fields``.
+    The crawl pipeline uses this directly to skip building Pydantic models
+    for pages that go straight to the database.
+    """
     result_data: dict[str, Any] = {}
+    bucket = _domain_bucket(url)
+
+    def _timed(fmt, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stage_timing.observe_extract(fmt, bucket, time.perf_counter() - start)
 
     if "markdown" in request.formats:
         # Fast path: combined extraction + markdown in 1 parse (saves ~200-350ms)
-        clean_html, result_data["markdown"] = extract_and_convert(
+        clean_html, result_data["markdown"] = _timed(
+            "markdown",
+            extract_and_convert,
             raw_html,
             url,
             only_main_content=request.only_main_content,
@@ -4002,6 +4239,7 @@ def extract_content(
             exclude_tags=request.exclude_tags,
         )
     else:
+        _clean_start = time.perf_counter()
         if request.only_main_content:
             clean_html = extract_main_content(raw_html, url)
         else:
@@ -4010,22 +4248,27 @@ def extract_content(
             clean_html = apply_tag_filters(
                 clean_html, request.include_tags, request.exclude_tags
             )
+        stage_timing.observe_extract("html", bucket, time.perf_counter() - _clean_start)
     if "links" in request.formats:
-        result_data["links"] = extract_links(raw_html, url)
-        result_data["links_detail"] = extract_links_detailed(raw_html, url)
+        result_data["links"] = _timed("links", extract_links, raw_html, url)
+        result_data["links_detail"] = _timed(
+            "links_detail", extract_links_detailed, raw_html, url
+        )
     if "structured_data" in request.formats:
-        result_data["structured_data"] = extract_structured_data(raw_html)
+        result_data["structured_data"] = _timed(
+            "structured_data", extract_structured_data, raw_html
+        )
 
     # Product data extraction — opt-in via "product_data" in formats
     if "product_data" in request.formats:
         _sd = result_data.get("structured_data") or extract_structured_data(raw_html)
-        product_data = extract_product_data(raw_html, _sd)
+        product_data = _timed("product_data", extract_product_data, raw_html, _sd)
         if product_data:
             result_data["product_data"] = product_data
 
     # Table extraction
     if "tables" in request.formats:
-        result_data["tables"] = extract_tables(raw_html)
+        result_data["tables"] = _timed("tables", extract_tables, raw_html)
 
     # CSS/XPath selector extraction
     if getattr(request, "css_selector", None):
@@ -4040,9 +4283,9 @@ def extract_content(
         result_data["selector_data"] = sel_data
 
     if "headings" in request.formats:
-        result_data["headings"] = extract_headings(raw_html)
+        result_data["headings"] = _timed("headings", extract_headings, raw_html)
     if "images" in request.formats:
-        result_data["images"] = extract_images(raw_html, url)
+        result_data["images"] = _timed("images", extract_images, raw_html, url)
     if "html" in request.formats:
         result_data["html"] = clean_html
     if "raw_html" in request.formats:
@@ -4065,7 +4308,9 @@ def extract_content(
     # Fit markdown (BM25 content filtering) — opt-in via "fit_markdown" in formats
     if "fit_markdown" in request.formats and result_data.get("markdown"):
         try:
-            fit_result = generate_fit_markdown(result_data["markdown"], raw_html)
+            fit_result = _timed(
+                "fit_markdown", generate_fit_markdown, result_data["markdown"], raw_html
+            )
             if fit_result.fit_markdown and fit_result.fit_markdown != result_data["markdown"]:
                 result_data["fit_markdown"] = fit_result.fit_markdown
         except Exception:
@@ -4079,7 +4324,9 @@ def extract_content(
         normalized = re.sub(r"\s+", " ", md_text).strip().lower()
         content_hash = hashlib.md5(normalized.encode("utf-8", errors="replace")).hexdigest()
 
-    metadata_dict = extract_metadata(raw_html, url, status_code, response_headers or {})
+    metadata_dict = _timed(
+        "metadata", extract_metadata, raw_html, url, status_code, response_headers or {}
+    )
 
     # Override word_count with markdown-based count — raw HTML body text
     # undercounts on image-heavy pages (e.g. Amazon) where most content
@@ -4088,24 +4335,6 @@ def extract_content(
         metadata_dict["word_count"] = len(md_text.split())
         metadata_dict["reading_time_seconds"] = max(1, round(len(md_text.split()) / 200)) * 60
 
-    metadata = PageMetadata(**metadata_dict)
-
-    return ScrapeData(
-        markdown=result_data.get("markdown"),
-        html=result_data.get("html"),
-        raw_html=result_data.get("raw_html"),
-        links=result_data.get("links"),
-        links_detail=result_data.get("links_detail"),
-        screenshot=result_data.get("screenshot"),
-        structured_data=result_data.get("structured_data"),
-        headings=result_data.get("headings"),
-        images=result_data.get("images"),
-        product_data=result_data.get("product_data"),
-        selector_data=result_data.get("selector_data"),
-        tables=result_data.get("tables"),
-        fit_markdown=result_data.get("fit_markdown"),
-        citations=result_data.get("citations"),
-        markdown_with_citations=result_data.get("markdown_with_citations"),
-        content_hash=content_hash,
-        metadata=metadata,
-    )
+    if content_hash:
+        result_data["content_hash"] = content_hash
+    return result_data, metadata_dict
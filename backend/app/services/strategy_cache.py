@@ -3,11 +3,14 @@
 Remembers which scraping strategy works for each domain so repeat visits
 can skip failing tiers and jump straight to the last known working strategy.
 
-Redis key: "strategy:{domain}" | TTL: configurable (default 24 hours)
-Value: JSON with last_success_strategy, last_success_tier, fail counts, timing
+Redis key: "strategy:{domain}" (hash) | TTL: configurable (default 24 hours)
+Fields: last_success_strategy, last_success_tier, last_success_time,
+        avg_success_ms, fail_count_tier1, fail_count_tier2
+
+Updates run as a single Lua script so concurrent scrapes of the same domain
+can't overwrite each other's counters or the EMA timing.
 """
 
-import json
 import logging
 import time
 from urllib.parse import urlparse
@@ -16,6 +19,47 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# KEYS[1] = strategy:{domain}
+# ARGV    = strategy, tier, success (1/0), time_ms, now, ttl_s
+# Returns the number of cached-success fields removed (tier 0 invalidation).
+_RECORD_SCRIPT = """
+if redis.call('TYPE', KEYS[1]).ok == 'string' then
+    -- Legacy JSON value from before the hash layout
+    redis.call('DEL', KEYS[1])
+end
+local tier = tonumber(ARGV[2])
+local time_ms = tonumber(ARGV[4])
+local removed = 0
+if ARGV[3] == '1' then
+    local prev = tonumber(redis.call('HGET', KEYS[1], 'avg_success_ms')) or time_ms
+    -- Any success resets ALL fail counts: the domain is reachable, so
+    -- don't skip lower tiers on the next visit.
+    redis.call('HSET', KEYS[1],
+        'last_success_strategy', ARGV[1],
+        'last_success_tier', tier,
+        'last_success_time', ARGV[5],
+        'avg_success_ms', string.format('%.1f', prev * 0.7 + time_ms * 0.3),
+        'fail_count_tier1', 0,
+        'fail_count_tier2', 0)
+else
+    if tier == 0 then
+        removed = redis.call('HDEL', KEYS[1],
+            'last_success_strategy', 'last_success_tier', 'last_success_time')
+    end
+    if tier <= 1 then
+        redis.call('HINCRBY', KEYS[1], 'fail_count_tier1', 1)
+    end
+    if tier == 2 then
+        redis.call('HINCRBY', KEYS[1], 'fail_count_tier2', 1)
+    end
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[6]))
+return removed
+"""
+
+_INT_FIELDS = ("last_success_tier", "fail_count_tier1", "fail_count_tier2")
+_FLOAT_FIELDS = ("last_success_time", "avg_success_ms")
+
 
 def _get_domain(url: str) -> str:
     """Extract bare domain from URL (strips www.)."""
@@ -42,9 +86,34 @@ async def _get_redis():
         return None
 
 
-async def get_domain_strategy(url: str) -> dict | None:
+def _parse_strategy(raw: dict | None) -> dict | None:
+    """Convert a strategy hash (all string values) into typed strategy data."""
+    if not raw:
+        return None
+    data: dict = {}
+    for key, value in raw.items():
+        try:
+            if key in _INT_FIELDS:
+                data[key] = int(float(value))
+            elif key in _FLOAT_FIELDS:
+                data[key] = float(value)
+            else:
+                data[key] = value
+        except (TypeError, ValueError):
+            continue
+    return data or None
+
+
+async def get_domain_strategy(
+    url: str, prefetched: dict[str, dict | None] | None = None
+) -> dict | None:
     """Fetch cached strategy data for a domain.
 
+    Args:
+        url: URL whose domain to look up
+        prefetched: Optional result of get_domain_strategies(); when it
+            covers this URL's domain no Redis round trip is made.
+
     Returns dict with keys:
         last_success_strategy: str  (e.g. "curl_cffi:chrome124")
         last_success_tier: int      (0-4)
@@ -58,14 +127,16 @@ async def get_domain_strategy(url: str) -> dict | None:
     if not domain:
         return None
 
+    if prefetched is not None and domain in prefetched:
+        return prefetched[domain]
+
     redis = await _get_redis()
     if not redis:
         return None
 
     try:
-        raw = await redis.get(_redis_key(domain))
-        if raw:
-            data = json.loads(raw)
+        data = _parse_strategy(await redis.hgetall(_redis_key(domain)))
+        if data:
             logger.debug(
                 f"Strategy cache hit for {domain}: tier={data.get('last_success_tier')}, strategy={data.get('last_success_strategy')}"
             )
@@ -76,6 +147,38 @@ async def get_domain_strategy(url: str) -> dict | None:
     return None
 
 
+async def get_domain_strategies(urls: list[str]) -> dict[str, dict | None]:
+    """Bulk-fetch strategy data for the domains of many URLs in one round trip.
+
+    Returns {domain: strategy_data_or_None} for every distinct domain that
+    was read — pass it to get_domain_strategy(prefetched=...). Returns {}
+    when Redis is unavailable, so callers fall back to per-URL lookups.
+    """
+    domains = list(dict.fromkeys(d for d in map(_get_domain, urls) if d))
+    if not domains:
+        return {}
+
+    redis = await _get_redis()
+    if not redis:
+        return {}
+
+    try:
+        pipe = redis.pipeline()
+        for domain in domains:
+            pipe.hgetall(_redis_key(domain))
+        results = await pipe.execute(raise_on_error=False)
+    except Exception as e:
+        logger.debug(f"Strategy cache bulk read error: {e}")
+        return {}
+
+    strategies: dict[str, dict | None] = {}
+    for domain, raw in zip(domains, results):
+        if isinstance(raw, Exception):
+            continue  # Legacy value / read error — leave to per-URL lookup
+        strategies[domain] = _parse_strategy(raw)
+    return strategies
+
+
 async def record_strategy_result(
     url: str,
     strategy: str,
@@ -100,51 +203,26 @@ async def record_strategy_result(
     if not redis:
         return
 
-    key = _redis_key(domain)
-    ttl = settings.STRATEGY_CACHE_TTL_SECONDS
-
     try:
-        # Read existing data
-        raw = await redis.get(key)
-        data = (
-            json.loads(raw)
-            if raw
-            else {
-                "fail_count_tier1": 0,
-                "fail_count_tier2": 0,
-            }
+        await redis.run_script(
+            _RECORD_SCRIPT,
+            keys=[_redis_key(domain)],
+            args=[
+                strategy,
+                tier,
+                1 if success else 0,
+                f"{time_ms:.1f}",
+                f"{time.time():.3f}",
+                settings.STRATEGY_CACHE_TTL_SECONDS,
+            ],
         )
-
-        if success:
-            data["last_success_strategy"] = strategy
-            data["last_success_tier"] = tier
-            data["last_success_time"] = time.time()
-            # Exponential moving average for timing
-            prev_avg = data.get("avg_success_ms", time_ms)
-            data["avg_success_ms"] = prev_avg * 0.7 + time_ms * 0.3
-            # Any success resets ALL fail counts — the domain is reachable,
-            # so don't skip lower tiers on the next visit.
-            data["fail_count_tier1"] = 0
-            data["fail_count_tier2"] = 0
-        else:
-            if tier == 0:
-                # Tier 0 = cached strategy failed (blocked/empty content).
-                # Invalidate the cached strategy so next request starts fresh
-                # from tier 1 instead of retrying the same failing strategy.
-                data.pop("last_success_strategy", None)
-                data.pop("last_success_tier", None)
-                data.pop("last_success_time", None)
-                logger.info(
-                    f"Strategy cache invalidated for {domain}: "
-                    f"{strategy} returned blocked content"
-                )
-            # Increment fail count for the specific tier that failed
-            if tier <= 1:
-                data["fail_count_tier1"] = data.get("fail_count_tier1", 0) + 1
-            if tier == 2:
-                data["fail_count_tier2"] = data.get("fail_count_tier2", 0) + 1
-
-        await redis.set(key, json.dumps(data), ex=ttl)
+        if not success and tier == 0:
+            # Tier 0 = cached strategy failed (blocked/empty content); the
+            # script dropped it so the next request starts fresh from tier 1.
+            logger.info(
+                f"Strategy cache invalidated for {domain}: "
+                f"{strategy} returned blocked content"
+            )
     except Exception as e:
         logger.debug(f"Strategy cache write error for {domain}: {e}")
 
@@ -0,0 +1,311 @@
+"""Per-domain strategy statistics for adaptive tier racing.
+
+Tracks, for every (domain, strategy) pair, exponentially decayed attempt and
+success counters plus a decayed time-to-success histogram. The racer uses
+them to start only the strategies with the best expected time-to-success
+and to hedge the rest after a data-driven delay, instead of launching every
+contestant of a tier at once.
+
+Redis key: "strategy_stats:{domain}" (hash) | TTL: STRATEGY_CACHE_TTL_SECONDS
+Fields:    "{strategy}|n", "{strategy}|ok", "{strategy}|t", "{strategy}|b{i}"
+
+Reads are cached in-process for STRATEGY_STATS_LOCAL_TTL_SECONDS, and this
+process's own outcomes are folded into the cached copy, so a race on a busy
+domain doesn't wait on Redis. Outcomes are written by ``record_outcomes_soon``
+in a tracked background task, off the scrape's critical path.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass, field
+
+from app.config import settings
+from app.services.strategy_cache import _get_domain
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the time-to-success histogram buckets. The last
+# bucket is open-ended and reported as twice the largest bound.
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+_N_BUCKETS = len(LATENCY_BUCKETS_MS) + 1
+
+# In-process copy of recently read domains: domain -> (expires_at, stats)
+_LOCAL_MAX_DOMAINS = 4096
+_local_stats: dict[str, tuple[float, dict[str, "StrategyStats"]]] = {}
+
+# Outcome writes in flight (kept referenced until done)
+_pending_writes: set[asyncio.Task] = set()
+
+# Decay all of a strategy's counters to "now", then add this attempt.
+# Several outcomes are applied in one call so a whole race costs one
+# round trip.
+#
+# KEYS[1] = strategy_stats:{domain}
+# ARGV    = now, half_life_s, ttl_s, n_buckets, then (strategy, ok, bucket)*
+_RECORD_SCRIPT = """
+local now = tonumber(ARGV[1])
+local half_life = tonumber(ARGV[2])
+local nb = tonumber(ARGV[4])
+local i = 5
+while i <= #ARGV do
+    local s = ARGV[i]
+    local ok = tonumber(ARGV[i + 1])
+    local bucket = tonumber(ARGV[i + 2])
+    local last = tonumber(redis.call('HGET', KEYS[1], s .. '|t')) or now
+    local decay = 1
+    if now > last then
+        decay = math.pow(0.5, (now - last) / half_life)
+    end
+    local fields = {s .. '|n', s .. '|ok'}
+    for b = 0, nb - 1 do
+        fields[#fields + 1] = s .. '|b' .. b
+    end
+    local vals = redis.call('HMGET', KEYS[1], unpack(fields))
+    local out = {}
+    for j = 1, #fields do
+        local v = (tonumber(vals[j]) or 0) * decay
+        if j == 1 then
+            v = v + 1
+        elseif ok == 1 and (j == 2 or j - 3 == bucket) then
+            v = v + 1
+        end
+        out[#out + 1] = fields[j]
+        out[#out + 1] = string.format('%.4f', v)
+    end
+    out[#out + 1] = s .. '|t'
+    out[#out + 1] = tostring(now)
+    redis.call('HSET', KEYS[1], unpack(out))
+    i = i + 3
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 1
+"""
+
+
+@dataclass
+class StrategyStats:
+    """Decayed outcome counters for one strategy on one domain."""
+
+    attempts: float = 0.0
+    successes: float = 0.0
+    buckets: list[float] = field(default_factory=lambda: [0.0] * _N_BUCKETS)
+
+    @property
+    def success_rate(self) -> float:
+        """Success probability with a uniform prior (Laplace smoothing)."""
+        return (self.successes + 1.0) / (self.attempts + 2.0)
+
+    def latency_percentile(self, pct: float) -> float | None:
+        """Approximate time-to-success percentile in ms (bucket upper bound)."""
+        total = sum(self.buckets)
+        if total <= 0:
+            return None
+        target = total * pct / 100.0
+        running = 0.0
+        for i, count in enumerate(self.buckets):
+            running += count
+            if running >= target and count > 0:
+                break
+        if i < len(LATENCY_BUCKETS_MS):
+            return float(LATENCY_BUCKETS_MS[i])
+        return float(LATENCY_BUCKETS_MS[-1] * 2)
+
+    @property
+    def expected_ms(self) -> float:
+        """Expected time until this strategy yields usable content.
+
+        Median success latency inflated by the expected number of tries
+        (1 / success_rate) — a strategy that is fast but usually blocked
+        ranks behind a slower reliable one.
+        """
+        p50 = self.latency_percentile(50)
+        if p50 is None:
+            p50 = float(LATENCY_BUCKETS_MS[-1] * 2)
+        return p50 / self.success_rate
+
+
+def _redis_key(domain: str) -> str:
+    return f"strategy_stats:{domain}"
+
+
+def _bucket_index(latency_ms: float) -> int:
+    return bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)
+
+
+async def _get_redis():
+    """Get the shared Redis connection."""
+    try:
+        from app.core.redis import get_redis
+
+        return await get_redis()
+    except Exception:
+        return None
+
+
+def parse_stats(raw: dict, now: float | None = None) -> dict[str, StrategyStats]:
+    """Turn a strategy_stats hash into StrategyStats, decayed to ``now``."""
+    now = now if now is not None else time.time()
+    half_life = max(1, settings.STRATEGY_STATS_HALF_LIFE_SECONDS)
+    parsed: dict[str, dict[str, float]] = {}
+    for key, value in (raw or {}).items():
+        strategy, _, suffix = key.rpartition("|")
+        if not strategy:
+            continue
+        try:
+            parsed.setdefault(strategy, {})[suffix] = float(value)
+        except (TypeError, ValueError):
+            continue
+
+    stats: dict[str, StrategyStats] = {}
+    for strategy, fields in parsed.items():
+        last = fields.get("t", now)
+        decay = 0.5 ** (max(0.0, now - last) / half_life)
+        stats[strategy] = StrategyStats(
+            attempts=fields.get("n", 0.0) * decay,
+            successes=fields.get("ok", 0.0) * decay,
+            buckets=[fields.get(f"b{i}", 0.0) * decay for i in range(_N_BUCKETS)],
+        )
+    return stats
+
+
+async def get_domain_stats(url: str) -> dict[str, StrategyStats]:
+    """Decayed per-strategy stats for the URL's domain ({} if none)."""
+    domain = _get_domain(url)
+    if not domain:
+        return {}
+
+    cached = _local_stats.get(domain)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    redis = await _get_redis()
+    if not redis:
+        return {}
+
+    try:
+        raw = await redis.hgetall(_redis_key(domain))
+        stats = parse_stats(raw)
+    except Exception as e:
+        logger.debug(f"Strategy stats read error for {domain}: {e}")
+        return {}
+
+    ttl = settings.STRATEGY_STATS_LOCAL_TTL_SECONDS
+    if ttl > 0:
+        _local_stats.pop(domain, None)
+        if len(_local_stats) >= _LOCAL_MAX_DOMAINS:
+            # Oldest read first (insertion order)
+            del _local_stats[next(iter(_local_stats))]
+        _local_stats[domain] = (time.monotonic() + ttl, stats)
+    return stats
+
+
+def _apply_local(domain: str, outcomes: list[tuple[str, bool, float]]) -> None:
+    """Fold outcomes into the cached stats, as the Redis script does (the
+    decay over the few seconds a copy lives is negligible)."""
+    cached = _local_stats.get(domain)
+    if not cached:
+        return
+    stats = cached[1]
+    for strategy, success, latency_ms in outcomes:
+        entry = stats.setdefault(strategy, StrategyStats())
+        entry.attempts += 1
+        if success:
+            entry.successes += 1
+            entry.buckets[_bucket_index(latency_ms)] += 1
+
+
+def record_outcomes_soon(url: str, outcomes: list[tuple[str, bool, float]]) -> None:
+    """Record outcomes without waiting for Redis.
+
+    The local copy is updated now; the write runs as a background task on
+    the running loop (dropped when there is none).
+    """
+    if not outcomes:
+        return
+    domain = _get_domain(url)
+    if not domain:
+        return
+    _apply_local(domain, outcomes)
+    try:
+        task = asyncio.get_running_loop().create_task(record_outcomes(url, outcomes))
+    except RuntimeError:
+        return
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def flush_pending_writes() -> None:
+    """Wait for this loop's background outcome writes (before it closes)."""
+    loop = asyncio.get_running_loop()
+    pending = [t for t in _pending_writes if t.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def record_outcomes(
+    url: str, outcomes: list[tuple[str, bool, float]]
+) -> None:
+    """Record (strategy, success, latency_ms) outcomes for a domain atomically."""
+    if not outcomes:
+        return
+    domain = _get_domain(url)
+    if not domain:
+        return
+
+    redis = await _get_redis()
+    if not redis:
+        return
+
+    args: list = [
+        f"{time.time():.3f}",
+        settings.STRATEGY_STATS_HALF_LIFE_SECONDS,
+        settings.STRATEGY_CACHE_TTL_SECONDS,
+        _N_BUCKETS,
+    ]
+    for strategy, success, latency_ms in outcomes:
+        args.extend(
+            [strategy, 1 if success else 0, _bucket_index(latency_ms) if success else -1]
+        )
+
+    try:
+        await redis.run_script(_RECORD_SCRIPT, keys=[_redis_key(domain)], args=args)
+    except Exception as e:
+        logger.debug(f"Strategy stats write error for {domain}: {e}")
+
+
+def plan_race(
+    names: list[str],
+    stats: dict[str, StrategyStats],
+    top_k: int,
+    timeout: float | None = None,
+) -> tuple[list[str], list[str], float]:
+    """Split race contestants into (primary, hedged_backups, hedge_delay_s).
+
+    Without enough history for any contestant every strategy starts
+    immediately (no hedging). Otherwise strategies with history are ranked
+    by expected time-to-success, contestants without history follow in
+    their original order, the top ``top_k`` start immediately and the rest
+    are launched once the leader's p90 time-to-success has elapsed.
+    """
+    min_samples = settings.STRATEGY_STATS_MIN_SAMPLES
+    known = [
+        n for n in names if n in stats and stats[n].attempts >= min_samples
+    ]
+    if not known or top_k <= 0 or len(names) <= top_k:
+        return list(names), [], 0.0
+
+    known.sort(key=lambda n: stats[n].expected_ms)
+    ranked = known + [n for n in names if n not in known]
+    primary, backups = ranked[:top_k], ranked[top_k:]
+
+    leader = stats[primary[0]]
+    delay_ms = leader.latency_percentile(90)
+    if delay_ms is None or leader.success_rate < 0.5:
+        # Leader rarely succeeds — don't make the backups wait long
+        delay_ms = float(LATENCY_BUCKETS_MS[1])
+    delay = delay_ms / 1000.0
+    if timeout is not None:
+        delay = min(delay, timeout / 2)
+    return primary, backups, delay
@@ -0,0 +1,340 @@
+"""
+Daily usage rollups behind the /v1/usage endpoints.
+
+A periodic compactor (``cleanup_worker.compact_usage_rollups``) folds every
+settled UTC day of jobs into ``usage_daily_rollups`` (per user / type /
+status) and ``usage_domain_daily`` (result pages per domain). Reads combine
+a user's rollups with a live aggregate over the days after their newest
+rollup — a short range on the (user_id, created_at) index — so answers stay
+current without scanning a user's whole history.
+
+Each pass rebuilds the last USAGE_ROLLUP_LOOKBACK_DAYS rolled-up days, which
+picks up jobs that finished (or were deleted) after their day was first
+rolled up. Older rollups are kept when jobs expire: they record usage, not
+rows.
+"""
+
+import json
+import logging
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.redis import redis_client
+from app.models.job import Job
+from app.models.job_result import JobResult
+from app.models.usage_rollup import UsageDailyRollup, UsageDomainDaily
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "usage:"
+_STREAM_BATCH = 5000
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _as_date(value) -> date:
+    """DB date/datetime values (SQLite hands back strings)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def domain_of(url: str) -> str:
+    """Netloc without a leading ``www.`` ("" when unparseable)."""
+    try:
+        domain = urlparse(url).netloc
+    except ValueError:
+        return ""
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+def _duration(started_at, completed_at) -> float | None:
+    if started_at and completed_at:
+        return (completed_at - started_at).total_seconds()
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Compactor
+# ---------------------------------------------------------------------------
+
+
+def settled_before(now: datetime | None = None) -> date:
+    """First day still read live; days before it may be rolled up."""
+    now = now or datetime.now(timezone.utc)
+    return now.date() - timedelta(days=settings.USAGE_ROLLUP_SETTLE_DAYS)
+
+
+async def rebuild_day(db: AsyncSession, day: date) -> int:
+    """Recompute both rollup tables for one day. Returns the bucket count."""
+    lo, hi = _day_start(day), _day_start(day + timedelta(days=1))
+    in_day = (Job.created_at >= lo, Job.created_at < hi)
+
+    # (user_id, type, status) -> [jobs, pages, duration_seconds, timed_jobs]
+    buckets: dict[tuple, list] = defaultdict(lambda: [0, 0, 0.0, 0])
+    jobs = await db.stream(
+        select(
+            Job.user_id, Job.type, Job.status, Job.completed_pages,
+            Job.started_at, Job.completed_at,
+        )
+        .where(*in_day)
+        .execution_options(yield_per=_STREAM_BATCH)
+    )
+    async for user_id, type_, status, pages, started_at, completed_at in jobs:
+        bucket = buckets[(user_id, type_, status)]
+        bucket[0] += 1
+        bucket[1] += pages or 0
+        if status == "completed":
+            seconds = _duration(started_at, completed_at)
+            if seconds is not None:
+                bucket[2] += seconds
+                bucket[3] += 1
+
+    domains: Counter = Counter()
+    urls = await db.stream(
+        select(Job.user_id, JobResult.url)
+        .join(Job, JobResult.job_id == Job.id)
+        .where(*in_day)
+        .execution_options(yield_per=_STREAM_BATCH)
+    )
+    async for user_id, url in urls:
+        domain = domain_of(url)
+        if domain:
+            domains[(user_id, domain[:255])] += 1
+
+    await db.execute(delete(UsageDailyRollup).where(UsageDailyRollup.day == day))
+    await db.execute(delete(UsageDomainDaily).where(UsageDomainDaily.day == day))
+    if buckets:
+        await db.execute(
+            insert(UsageDailyRollup),
+            [
+                {
+                    "user_id": user_id, "day": day, "type": type_, "status": status,
+                    "jobs": jobs_, "pages": pages, "duration_seconds": seconds,
+                    "timed_jobs": timed,
+                }
+                for (user_id, type_, status), (jobs_, pages, seconds, timed) in buckets.items()
+            ],
+        )
+    if domains:
+        await db.execute(
+            insert(UsageDomainDaily),
+            [
+                {"user_id": user_id, "day": day, "domain": domain, "pages": pages}
+                for (user_id, domain), pages in domains.items()
+            ],
+        )
+    return len(buckets)
+
+
+async def compact(db: AsyncSession, now: datetime | None = None) -> int:
+    """Roll up every settled day not yet rolled up, plus the lookback
+    window. Commits per day; returns the number of days rebuilt."""
+    cutoff = settled_before(now)
+    newest = (await db.execute(select(func.max(UsageDailyRollup.day)))).scalar()
+    if newest is None:
+        first = (await db.execute(select(func.min(Job.created_at)))).scalar()
+        if first is None:
+            return 0
+        day = _as_date(first)
+    else:
+        day = _as_date(newest) + timedelta(days=1 - settings.USAGE_ROLLUP_LOOKBACK_DAYS)
+
+    rebuilt = 0
+    while day < cutoff:
+        await rebuild_day(db, day)
+        await db.commit()
+        rebuilt += 1
+        day += timedelta(days=1)
+    return rebuilt
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+async def _live_since(db: AsyncSession, user_id: UUID) -> date | None:
+    """Day after the user's newest rollup (None = nothing rolled up yet)."""
+    newest = (
+        await db.execute(
+            select(func.max(UsageDailyRollup.day)).where(UsageDailyRollup.user_id == user_id)
+        )
+    ).scalar()
+    return _as_date(newest) + timedelta(days=1) if newest is not None else None
+
+
+def _live_jobs(user_id: UUID, since: date | None) -> list:
+    conditions = [Job.user_id == user_id]
+    if since is not None:
+        conditions.append(Job.created_at >= _day_start(since))
+    return conditions
+
+
+async def usage_stats(db: AsyncSession, user_id: UUID, now: datetime | None = None) -> dict:
+    """The /v1/usage/stats payload from rollups plus the live tail."""
+    now = now or datetime.now(timezone.utc)
+    window_start = (now - timedelta(days=30)).date()
+    since = await _live_since(db, user_id)
+
+    # (type, status) -> [jobs, pages, duration_seconds, timed_jobs]
+    buckets: dict[tuple, list] = defaultdict(lambda: [0, 0, 0.0, 0])
+    per_day: Counter = Counter()
+
+    if since is not None:
+        rolled = await db.execute(
+            select(
+                UsageDailyRollup.type,
+                UsageDailyRollup.status,
+                func.sum(UsageDailyRollup.jobs),
+                func.sum(UsageDailyRollup.pages),
+                func.sum(UsageDailyRollup.duration_seconds),
+                func.sum(UsageDailyRollup.timed_jobs),
+            )
+            .where(UsageDailyRollup.user_id == user_id)
+            .group_by(UsageDailyRollup.type, UsageDailyRollup.status)
+        )
+        for type_, status, jobs, pages, seconds, timed in rolled.all():
+            bucket = buckets[(type_, status)]
+            bucket[0] += jobs or 0
+            bucket[1] += pages or 0
+            bucket[2] += seconds or 0.0
+            bucket[3] += timed or 0
+        rolled_days = await db.execute(
+            select(UsageDailyRollup.day, func.sum(UsageDailyRollup.jobs))
+            .where(UsageDailyRollup.user_id == user_id, UsageDailyRollup.day >= window_start)
+            .group_by(UsageDailyRollup.day)
+        )
+        for day, jobs in rolled_days.all():
+            per_day[_as_date(day)] += jobs or 0
+
+    live_day = func.date(Job.created_at)
+    live = await db.execute(
+        select(
+            live_day, Job.type, Job.status,
+            func.count(Job.id), func.coalesce(func.sum(Job.completed_pages), 0),
+        )
+        .where(*_live_jobs(user_id, since))
+        .group_by(live_day, Job.type, Job.status)
+    )
+    for day, type_, status, jobs, pages in live.all():
+        bucket = buckets[(type_, status)]
+        bucket[0] += jobs
+        bucket[1] += pages
+        day = _as_date(day)
+        if day >= window_start:
+            per_day[day] += jobs
+
+    timed = await db.execute(
+        select(Job.type, Job.started_at, Job.completed_at).where(
+            *_live_jobs(user_id, since),
+            Job.status == "completed",
+            Job.started_at.isnot(None),
+            Job.completed_at.isnot(None),
+        )
+    )
+    for type_, started_at, completed_at in timed.all():
+        seconds = _duration(started_at, completed_at)
+        if seconds is not None:
+            bucket = buckets[(type_, "completed")]
+            bucket[2] += seconds
+            bucket[3] += 1
+
+    jobs_by_type: Counter = Counter()
+    jobs_by_status: Counter = Counter()
+    for (type_, status), (jobs, _, _, _) in buckets.items():
+        jobs_by_type[type_] += jobs
+        jobs_by_status[status] += jobs
+    completed = [b for (_, status), b in buckets.items() if status == "completed"]
+    completed_jobs = sum(b[0] for b in completed)
+    timed_jobs = sum(b[3] for b in completed)
+
+    completed_count = jobs_by_status.get("completed", 0)
+    failed_count = jobs_by_status.get("failed", 0)
+    success_rate = 0
+    if completed_count + failed_count > 0:
+        success_rate = round(completed_count / (completed_count + failed_count) * 100, 1)
+
+    return {
+        "total_jobs": sum(jobs_by_type.values()),
+        "total_pages_scraped": sum(b[1] for b in buckets.values()),
+        "avg_pages_per_job": (
+            round(sum(b[1] for b in completed) / completed_jobs, 1) if completed_jobs else 0
+        ),
+        "avg_duration_seconds": (
+            round(sum(b[2] for b in completed) / timed_jobs, 1) if timed_jobs else 0
+        ),
+        "success_rate": success_rate,
+        "jobs_by_type": {k: v for k, v in jobs_by_type.items() if v},
+        "jobs_by_status": {k: v for k, v in jobs_by_status.items() if v},
+        "jobs_per_day": [
+            {"date": _day_start(day).isoformat(), "count": count}
+            for day, count in sorted(per_day.items())
+        ],
+    }
+
+
+async def top_domains(db: AsyncSession, user_id: UUID, limit: int) -> dict:
+    """The /v1/usage/top-domains payload from rollups plus the live tail."""
+    since = await _live_since(db, user_id)
+    counts: Counter = Counter()
+
+    if since is not None:
+        rolled = await db.execute(
+            select(UsageDomainDaily.domain, func.sum(UsageDomainDaily.pages))
+            .where(UsageDomainDaily.user_id == user_id)
+            .group_by(UsageDomainDaily.domain)
+        )
+        for domain, pages in rolled.all():
+            counts[domain] += pages or 0
+
+    urls = await db.stream(
+        select(JobResult.url)
+        .join(Job, JobResult.job_id == Job.id)
+        .where(*_live_jobs(user_id, since))
+        .execution_options(yield_per=_STREAM_BATCH)
+    )
+    async for (url,) in urls:
+        domain = domain_of(url)
+        if domain:
+            counts[domain] += 1
+
+    return {
+        "domains": [
+            {"domain": domain, "count": count}
+            for domain, count in counts.most_common(limit)
+        ],
+        "total_unique_domains": len(counts),
+    }
+
+
+async def cached(user_id: UUID, name: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+    """Serve ``compute()`` through a short-lived per-user Redis entry."""
+    ttl = settings.USAGE_CACHE_TTL_SECONDS
+    key = f"{CACHE_PREFIX}{user_id}:{name}"
+    if ttl > 0:
+        try:
+            hit = await redis_client.get(key)
+            if hit:
+                return json.loads(hit)
+        except Exception as e:
+            logger.warning(f"Usage cache get failed: {e}")
+
+    data = await compute()
+    if ttl > 0:
+        try:
+            await redis_client.setex(key, ttl, json.dumps(data, default=str))
+        except Exception as e:
+            logger.warning(f"Usage cache set failed: {e}")
+    return data
@@ -4,17 +4,18 @@ import traceback
 from datetime import datetime, timezone
 
 import redis
-import sentry_sdk
 from celery import Celery
 from celery.signals import (
     task_failure, worker_shutting_down, after_setup_logger,
-    after_setup_task_logger, celeryd_init,
+    after_setup_task_logger, celeryd_init, worker_init,
 )
 
 from app.config import settings
 
-# Initialize Sentry for Celery workers
+# Initialize Sentry for Celery workers (imported only when configured)
 if settings.SENTRY_DSN:
+    import sentry_sdk
+
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
         traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
@@ -71,10 +72,22 @@ celery_app.conf.update(
             "task": "app.workers.monitor_worker.check_monitors",
             "schedule": 60.0,  # Every 60 seconds
         },
+        "reconcile-quotas": {
+            "task": "app.workers.cleanup_worker.reconcile_quotas",
+            "schedule": float(settings.QUOTA_RECONCILE_SECONDS),
+        },
+        "compact-usage-rollups": {
+            "task": "app.workers.cleanup_worker.compact_usage_rollups",
+            "schedule": float(settings.USAGE_ROLLUP_INTERVAL_SECONDS),
+        },
         "cleanup-old-data-daily": {
             "task": "app.workers.cleanup_worker.cleanup_old_data",
             "schedule": 86400.0,  # Every 24 hours
         },
+        "sweep-orphan-blobs-daily": {
+            "task": "app.workers.cleanup_worker.sweep_orphan_blobs",
+            "schedule": 86400.0,  # Every 24 hours
+        },
     },
     # Graceful shutdown
     worker_max_tasks_per_child=100,  # Prevent memory leaks
@@ -177,6 +190,7 @@ from celery.signals import worker_process_init  # noqa: E402
 
 # Module-level flag set by celeryd_init, inherited by forked children via COW.
 _is_crawl_worker = False
+_worker_queues: list[str] = []
 
 
 @celeryd_init.connect
@@ -186,7 +200,7 @@ def _detect_crawl_worker(conf=None, instance=None, options=None, **kwargs):
     Runs in the main (parent) process before prefork. The flag is inherited
     by all child processes via fork, so worker_process_init can check it.
     """
-    global _is_crawl_worker
+    global _is_crawl_worker, _worker_queues
     raw_queues = (options or {}).get("queues") or []
     # Celery passes queues as a list (e.g. ['crawl'] or ['search', 'map']).
     # Handle both list and legacy comma-separated string formats.
@@ -195,6 +209,7 @@ def _detect_crawl_worker(conf=None, instance=None, options=None, **kwargs):
     else:
         queue_list = [str(q).strip().lower() for q in raw_queues]
     _is_crawl_worker = "crawl" in queue_list
+    _worker_queues = queue_list
     queue_str = ",".join(queue_list) or "default"
     if _is_crawl_worker:
         logger.info(
@@ -208,6 +223,20 @@ def _detect_crawl_worker(conf=None, instance=None, options=None, **kwargs):
         )
 
 
+@worker_init.connect
+def preload_queue_modules(sender=None, **kwargs):
+    """Import what this worker's queues import lazily, once, in the parent.
+
+    Task modules defer their heavy imports (litellm, Playwright, curl_cffi)
+    to the task body. Loading them here, before the pool forks, means no
+    child pays for them on its first task, including children replaced
+    after worker_max_tasks_per_child tasks. See app.core.startup.
+    """
+    from app.core.startup import preload
+
+    preload(_worker_queues, process=",".join(_worker_queues) or "worker")
+
+
 @worker_process_init.connect
 def prewarm_browser_pool(sender=None, **kwargs):
     """Launch Chromium and create the persistent event loop on worker fork.
@@ -1,6 +1,5 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
 
 from app.workers.celery_app import celery_app
 
@@ -8,13 +7,15 @@ logger = logging.getLogger(__name__)
 
 
 def _run_async(coro):
+    from app.core.loop_monitor import loop_monitor
     from app.services.scraper import reset_pool_state_sync
     reset_pool_state_sync()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        with loop_monitor.watching(loop, "cleanup"):
+            return loop.run_until_complete(coro)
     finally:
         try:
             from app.services.scraper import cleanup_async_pools
@@ -26,70 +27,104 @@ def _run_async(coro):
 
 @celery_app.task(name="app.workers.cleanup_worker.cleanup_old_data", bind=True)
 def cleanup_old_data(self):
-    """Delete old jobs, webhook deliveries, and monitor checks based on retention settings."""
+    """Drop expired history partitions and delete old jobs, webhook deliveries,
+    monitor checks and data queries in chunks, per the retention settings."""
 
     async def _do_cleanup():
-        from sqlalchemy import delete, select
+        from app.core.database import create_worker_session_factory
+        from app.services.retention import purge_expired
 
-        from app.config import settings
+        session_factory, db_engine = create_worker_session_factory()
+
+        try:
+            async with session_factory() as db:
+                counts = await purge_expired(db)
+                for table, count in counts.items():
+                    if count:
+                        logger.info(f"Cleaned up {count} old rows from {table}")
+
+        except Exception as e:
+            logger.error(f"Cleanup task failed: {e}")
+        finally:
+            await db_engine.dispose()
+
+    _run_async(_do_cleanup())
+
+
+@celery_app.task(name="app.workers.cleanup_worker.reconcile_quotas", bind=True)
+def reconcile_quotas(self):
+    """Fold Redis quota counter deltas into the usage_quotas table."""
+
+    async def _do_reconcile():
         from app.core.database import create_worker_session_factory
-        from app.models.job import Job
-        from app.models.job_result import JobResult
-        from app.models.webhook_delivery import WebhookDelivery
-        from app.models.monitor import MonitorCheck
+        from app.services.quota import reconcile_quotas as _reconcile
 
         session_factory, db_engine = create_worker_session_factory()
+        total = 0
+        try:
+            async with session_factory() as db:
+                # Drain everything that is dirty now, in bounded batches
+                for _ in range(100):
+                    updated = await _reconcile(db)
+                    total += updated
+                    if not updated:
+                        break
+            if total:
+                logger.info(f"Reconciled {total} quota counters")
+        except Exception as e:
+            logger.error(f"Quota reconciliation failed: {e}")
+        finally:
+            await db_engine.dispose()
 
-        job_cutoff = datetime.now(timezone.utc) - timedelta(
-            days=settings.DATA_RETENTION_DAYS
-        )
-        webhook_cutoff = datetime.now(timezone.utc) - timedelta(
-            days=settings.DATA_RETENTION_DAYS
-        )
-        monitor_cutoff = datetime.now(timezone.utc) - timedelta(
-            days=settings.MONITOR_CHECK_RETENTION_DAYS
-        )
+    _run_async(_do_reconcile())
 
+
+@celery_app.task(name="app.workers.cleanup_worker.sweep_orphan_blobs", bind=True)
+def sweep_orphan_blobs(self):
+    """Delete blob-store objects no job result references any more."""
+
+    async def _do_sweep():
+        from app.config import settings
+        from app.core.database import create_worker_session_factory
+        from app.services.blob_store import get_blob_store, sweep_orphans
+
+        store = get_blob_store()
+        if store is None:
+            return
+
+        session_factory, db_engine = create_worker_session_factory()
         try:
             async with session_factory() as db:
-                # Delete old job results first (FK constraint)
-                old_jobs = await db.execute(
-                    select(Job.id).where(Job.created_at < job_cutoff)
-                )
-                old_job_ids = [row[0] for row in old_jobs.fetchall()]
-
-                if old_job_ids:
-                    await db.execute(
-                        delete(JobResult).where(JobResult.job_id.in_(old_job_ids))
-                    )
-                    await db.execute(delete(Job).where(Job.id.in_(old_job_ids)))
-                    logger.info(
-                        f"Cleaned up {len(old_job_ids)} old jobs and their results"
-                    )
-
-                # Delete old webhook deliveries
-                result = await db.execute(
-                    delete(WebhookDelivery).where(
-                        WebhookDelivery.created_at < webhook_cutoff
-                    )
+                deleted = await sweep_orphans(
+                    db, store, grace_seconds=settings.BLOB_STORE_GC_GRACE_HOURS * 3600
                 )
-                webhook_count = result.rowcount
-                if webhook_count:
-                    logger.info(f"Cleaned up {webhook_count} old webhook deliveries")
+            if deleted:
+                logger.info(f"Deleted {deleted} orphaned blobs")
+        except Exception as e:
+            logger.error(f"Blob sweep failed: {e}")
+        finally:
+            await db_engine.dispose()
+
+    _run_async(_do_sweep())
 
-                # Delete old monitor checks
-                result = await db.execute(
-                    delete(MonitorCheck).where(MonitorCheck.checked_at < monitor_cutoff)
-                )
-                check_count = result.rowcount
-                if check_count:
-                    logger.info(f"Cleaned up {check_count} old monitor checks")
 
-                await db.commit()
+@celery_app.task(name="app.workers.cleanup_worker.compact_usage_rollups", bind=True)
+def compact_usage_rollups(self):
+    """Fold settled days of jobs into the daily usage rollup tables."""
+
+    async def _do_compact():
+        from app.core.database import create_worker_session_factory
+        from app.services.usage_rollup import compact
 
+        session_factory, db_engine = create_worker_session_factory()
+        try:
+            async with session_factory() as db:
+                days = await compact(db)
+            if days:
+                logger.info(f"Rebuilt usage rollups for {days} days")
         except Exception as e:
-            logger.error(f"Cleanup task failed: {e}")
+            logger.error(f"Usage rollup compaction failed: {e}")
         finally:
             await db_engine.dispose()
 
-    _run_async(_do_cleanup())
+    _run_async(_do_compact())
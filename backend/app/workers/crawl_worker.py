@@ -16,6 +16,57 @@ _WORKER_NAME = "crawl"
 # Shared thread pool for CPU-bound content extraction in crawl pipeline
 _extraction_executor = ThreadPoolExecutor(max_workers=8)
 
+# Distributed crawls: how long a worker whose frontier ran dry keeps polling
+# while other workers still have pages in flight (they may discover links),
+# and how long the lead task waits for helpers to exit before finishing
+_PEER_WAIT_SECONDS = 180
+_HELPER_DRAIN_SECONDS = 300
+
+# Raw HTML kept per page for the screenshot fallback (browser OOM guard)
+_SCREENSHOT_HTML_MAX = 512_000
+
+
+async def _reserve_page(db, job_id: UUID, max_pages: int) -> tuple[int, str] | None:
+    """Count one more saved page on a crawl job, atomically across workers.
+
+    Returns ``(completed_pages, status)`` after the increment, or None when
+    the job already has ``max_pages`` pages (the page is not to be saved).
+    """
+    from sqlalchemy import update
+
+    from app.models.job import Job
+
+    row = (
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.completed_pages < max_pages)
+            .values(completed_pages=Job.completed_pages + 1)
+            .returning(Job.completed_pages, Job.status)
+            .execution_options(synchronize_session=False)
+        )
+    ).first()
+    return (row[0], row[1]) if row else None
+
+
+async def _fetch_batch(crawler, batch_items, fetch, deliver, should_stop) -> None:
+    """Fetch claimed ``(url, depth)`` items in order, handing results to ``deliver``.
+
+    Every claimed URL leaves the frontier's in-flight set: ``fetch``
+    returning None releases it, a delivered result is released by the
+    consumer, and once ``should_stop()`` is true the rest of the batch is
+    released unfetched. Otherwise peers would wait on those URLs and a
+    resumed crawl would put them back on the frontier.
+    """
+    for i, (url, depth) in enumerate(batch_items):
+        if should_stop():
+            await crawler.release_many([u for u, _ in batch_items[i:]])
+            return
+        result = await fetch(url, depth)
+        if result is None:
+            await crawler.release(url)
+        else:
+            await deliver(result)
+
 
 # Persistent event loop — survives across tasks so the browser pool,
 # HTTP clients, and cookie jar stay warm between crawl jobs.
@@ -49,6 +100,8 @@ def _drain_leaked_tasks(loop: asyncio.AbstractEventLoop, pre_tasks: set):
 
 def _run_async(coro):
     global _persistent_loop, _task_generation
+    from app.core.loop_monitor import loop_monitor
+
     _task_generation += 1
     gen = _task_generation
 
@@ -62,7 +115,8 @@ def _run_async(coro):
             f"(background_tasks={len(pre_tasks)})"
         )
         try:
-            return _persistent_loop.run_until_complete(coro)
+            with loop_monitor.watching(_persistent_loop, _WORKER_NAME):
+                return _persistent_loop.run_until_complete(coro)
         finally:
             _drain_leaked_tasks(_persistent_loop, pre_tasks)
             try:
@@ -82,7 +136,8 @@ def _run_async(coro):
 
     _persistent_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(_persistent_loop)
-    return _persistent_loop.run_until_complete(coro)
+    with loop_monitor.watching(_persistent_loop, _WORKER_NAME):
+        return _persistent_loop.run_until_complete(coro)
 
 
 @celery_app.task(
@@ -97,22 +152,36 @@ def _run_async(coro):
     soft_time_limit=3600,
     time_limit=3660,
 )
-def process_crawl(self, job_id: str, config: dict):
-    """Process a crawl job using BFS crawler with producer-consumer pipeline."""
+def process_crawl(self, job_id: str, config: dict, helper: bool = False):
+    """Process a crawl job using BFS crawler with producer-consumer pipeline.
+
+    Crawls of at least CRAWL_DISTRIBUTED_MIN_PAGES pages are spread over
+    CRAWL_WORKERS_PER_JOB tasks: this (lead) task dispatches ``helper``
+    tasks that pop from the same Redis frontier. Helpers share the visited
+    set, pinned strategy and page budget, and never finish the job — the
+    lead task does once they have exited.
+    """
     from app.core.metrics import worker_task_total, worker_task_duration_seconds, worker_active_tasks
 
     _start = _time_mod.monotonic()
     worker_active_tasks.labels(worker=_WORKER_NAME).inc()
 
     async def _do_crawl():
+        from sqlalchemy import select, update
+
+        from app.config import settings
         from app.core.database import create_worker_session_factory
+        from app.core.stage_timing import db_write
         from app.models.job import Job
         from app.models.job_result import JobResult
+        from app.services.blob_store import offload_result
         from app.schemas.crawl import CrawlRequest
         from app.services.crawler import WebCrawler
         from app.services.dedup import normalize_url
         from app.services.llm_extract import extract_with_llm
-        from app.services.scraper import extract_content
+        from app.services.crawl_records import FetchedPage, PageRecord
+        from app.services.scraper import extract_fields
+        from app.services.strategy_cache import get_domain_strategies
 
         # Create fresh DB connections for this event loop
         session_factory, db_engine = create_worker_session_factory()
@@ -136,10 +205,19 @@ def process_crawl(self, job_id: str, config: dict):
                 logger.error(f"Crawl job {job_id} not found in DB — aborting")
                 return
             user_id = job.user_id
-            job.status = "running"
-            job.total_pages = request.max_pages
-            job.started_at = datetime.now(timezone.utc)
-            await db.commit()
+            if helper and job.status != "running":
+                logger.info(f"Crawl helper for {job_id}: job is {job.status}, exiting")
+                return
+            # A checkpoint means an earlier attempt of this task was cut off
+            # (retry, soft time limit, worker restart) — resume from it
+            checkpoint = job.checkpoint if job.status == "running" and not helper else None
+            resumed_pages = job.completed_pages or 0
+            if not helper:
+                job.status = "running"
+                job.total_pages = request.max_pages
+                if checkpoint is None:
+                    job.started_at = datetime.now(timezone.utc)
+                await db.commit()
 
         # Load proxy manager if use_proxy is set
         proxy_manager = None
@@ -155,8 +233,32 @@ def process_crawl(self, job_id: str, config: dict):
         from app.services.browser import browser_pool
         await browser_pool.health_check()
 
-        crawler = WebCrawler(job_id, request, proxy_manager=proxy_manager)
-        await crawler.initialize()
+        # Celery retries keep the task id, so a resumed attempt owns its
+        # predecessor's claims
+        worker_id = self.request.id or job_id
+        crawler = WebCrawler(job_id, request, proxy_manager=proxy_manager, worker_id=worker_id)
+        await crawler.initialize(seed=checkpoint is None and not helper)
+        if helper:
+            if not crawler.shared_frontier:
+                logger.warning(f"Crawl helper for {job_id}: no Redis frontier, exiting")
+                await crawler.cleanup(keep_state=True)
+                await db_engine.dispose()
+                return
+            await crawler.register_worker(worker_id)
+        if checkpoint is not None:
+            if not await crawler.restore_state(checkpoint.get("crawler") or {}):
+                # Frontier state is gone — start over, minus saved pages
+                async with session_factory() as db:
+                    saved = await db.execute(
+                        select(JobResult.url).where(JobResult.job_id == UUID(job_id))
+                    )
+                    for (saved_url,) in saved.all():
+                        await crawler.mark_visited(normalize_url(saved_url))
+                await crawler.reseed()
+            logger.warning(
+                f"Resuming crawl {job_id} from checkpoint at "
+                f"{resumed_pages} pages"
+            )
 
         # Determine extract config from scrape_options
         extract_config = None
@@ -170,14 +272,35 @@ def process_crawl(self, job_id: str, config: dict):
         if request.scrape_options:
             _user_formats = set(request.scrape_options.formats)
 
+        # Pinned strategy — set by warm-up or by first successful fetch
+        _pinned_strategy: str | None = None
+        _pinned_tier: int | None = None
+        if checkpoint is not None:
+            _pinned_strategy = checkpoint.get("pinned_strategy")
+            _pinned_tier = checkpoint.get("pinned_tier")
+            await crawler.set_pinned(_pinned_strategy, _pinned_tier)
+        pages_crawled = resumed_pages
+        _last_checkpoint = pages_crawled
+        _keep_state = helper
+
+        def _checkpoint() -> dict:
+            return {
+                "crawler": crawler.export_state(),
+                "pinned_strategy": _pinned_strategy,
+                "pinned_tier": _pinned_tier,
+                "pages_crawled": pages_crawled,
+                "saved_at": datetime.now(timezone.utc).isoformat(),
+            }
+
         try:
-            pages_crawled = 0
-            # Memory-adaptive semaphore: adjusts concurrency based on system memory
+            # Memory-adaptive semaphore: bounds pages in flight (fetched but
+            # not yet saved). The resource governor shrinks it under memory
+            # pressure, down to one page at a time.
             from app.services.memory_adaptive import MemoryAdaptiveSemaphore
             semaphore = MemoryAdaptiveSemaphore(
-                base_limit=concurrency,
+                base_limit=concurrency * 2,
                 min_limit=1,
-                max_limit=concurrency * 2,
+                max_limit=concurrency * 4,
             )
             await semaphore.start_monitoring()
             cancelled = False
@@ -216,85 +339,60 @@ def process_crawl(self, job_id: str, config: dict):
             # URL as a normal page (with tier cascade + strategy pinning).
             # =============================================================
             _warmup_result = None
-            try:
-                logger.warning(f"Session warm-up for {request.url}")
-                _warmup_scrape = await asyncio.wait_for(
-                    crawler.scrape_page(request.url),
-                    timeout=60,
-                )
-                _warmup_data = _warmup_scrape["scrape_data"]
-                _warmup_md = (_warmup_data.markdown or "").strip()
-                _warmup_words = len(_warmup_md.split())
-                _warmup_html = _warmup_data.html or ""
-
-                from app.services.scraper import _looks_blocked
-                _wu_blocked = _looks_blocked(_warmup_html)
-                if _wu_blocked:
-                    logger.warning(
-                        f"Warm-up returned blocked content "
-                        f"({_warmup_words} words, {len(_warmup_html)} chars HTML) "
-                        f"— skipping, BFS consumer will handle seed URL"
-                    )
-                elif _warmup_words < 50:
-                    logger.warning(
-                        f"Warm-up got thin content ({_warmup_words} words) "
-                        f"— skipping"
-                    )
-                else:
-                    logger.warning(
-                        f"Warm-up succeeded ({_warmup_words} words)"
+            if checkpoint is None and not helper:
+                try:
+                    logger.warning(f"Session warm-up for {request.url}")
+                    _warmup_scrape = await asyncio.wait_for(
+                        crawler.scrape_page(request.url),
+                        timeout=60,
                     )
-                    _warmup_result = _warmup_scrape
-            except Exception as e:
-                logger.warning(f"Warm-up failed: {e}")
+                    _warmup_data = _warmup_scrape["scrape_data"]
+                    _warmup_md = (_warmup_data.markdown or "").strip()
+                    _warmup_words = len(_warmup_md.split())
+                    _warmup_html = _warmup_data.html or ""
+
+                    from app.services.scraper import _looks_blocked
+                    _wu_blocked = _looks_blocked(_warmup_html)
+                    if _wu_blocked:
+                        logger.warning(
+                            f"Warm-up returned blocked content "
+                            f"({_warmup_words} words, {len(_warmup_html)} chars HTML) "
+                            f"— skipping, BFS consumer will handle seed URL"
+                        )
+                    elif _warmup_words < 50:
+                        logger.warning(
+                            f"Warm-up got thin content ({_warmup_words} words) "
+                            f"— skipping"
+                        )
+                    else:
+                        logger.warning(
+                            f"Warm-up succeeded ({_warmup_words} words)"
+                        )
+                        _warmup_result = _warmup_scrape
+                    # Only _warmup_result may keep the page alive past here
+                    del _warmup_scrape, _warmup_data, _warmup_md, _warmup_html
+                except Exception as e:
+                    logger.warning(f"Warm-up failed: {e}")
             gc.collect()
 
-            # Pinned strategy — set by warm-up or by first successful fetch
-            _pinned_strategy: str | None = None
-            _pinned_tier: int | None = None
-
             # If warm-up succeeded, save result as page 1 and mark seed visited
             _warmup_links = []
             if _warmup_result:
-                _wu_data = _warmup_result["scrape_data"]
-                _warmup_links = _warmup_result.get("discovered_links", [])
-
-                # Build metadata for DB storage
-                _wu_meta = {}
-                if _wu_data.metadata:
-                    _wu_meta = _wu_data.metadata.model_dump(exclude_none=True)
-                if _wu_data.structured_data and (not _user_formats or "structured_data" in _user_formats):
-                    _wu_meta["structured_data"] = _wu_data.structured_data
-                if _wu_data.headings and (not _user_formats or "headings" in _user_formats):
-                    _wu_meta["headings"] = _wu_data.headings
-                if _wu_data.images and (not _user_formats or "images" in _user_formats):
-                    _wu_meta["images"] = _wu_data.images
-                if _wu_data.links_detail and (not _user_formats or "links" in _user_formats):
-                    _wu_meta["links_detail"] = _wu_data.links_detail
-                if _wu_data.product_data:
-                    _wu_meta["product_data"] = _wu_data.product_data
-                if _wu_data.tables and (not _user_formats or "tables" in _user_formats):
-                    _wu_meta["tables"] = _wu_data.tables
-                if _wu_data.content_hash:
-                    _wu_meta["content_hash"] = _wu_data.content_hash
+                _wu_record = PageRecord.from_scrape_data(
+                    request.url, 0, _warmup_result["scrape_data"], _user_formats
+                )
+                _warmup_links = _wu_record.discovered_links
+                del _warmup_result
 
                 async with session_factory() as db:
-                    job_result = JobResult(
-                        job_id=UUID(job_id),
-                        url=request.url,
-                        markdown=_wu_data.markdown if not _user_formats or "markdown" in _user_formats else None,
-                        html=_wu_data.html if not _user_formats or "html" in _user_formats else None,
-                        links=_wu_data.links if _wu_data.links and (not _user_formats or "links" in _user_formats) else None,
-                        metadata_=_wu_meta if _wu_meta else None,
-                        screenshot_url=_wu_data.screenshot if not _user_formats or "screenshot" in _user_formats else None,
-                    )
+                    job_result = _wu_record.to_job_result(UUID(job_id))
+                    await offload_result(job_result)
                     db.add(job_result)
 
                     pages_crawled = 1
-                    _wu_wc = len((_wu_data.markdown or "").split())
                     logger.warning(
                         f"Saved page {pages_crawled}/{request.max_pages}: "
-                        f"{request.url} ({_wu_wc}w) [warm-up]"
+                        f"{request.url} ({_wu_record.word_count}w) [warm-up]"
                     )
 
                     job = await db.get(Job, UUID(job_id))
@@ -311,19 +409,41 @@ def process_crawl(self, job_id: str, config: dict):
                     await crawler.add_to_frontier(_warmup_links, 1)
 
                 # Free warm-up data — it's saved in DB now
-                del _wu_data, _wu_meta, _warmup_result
+                del _wu_record, job_result
                 gc.collect()
 
                 # Pin strategy to crawl_session — cookies are now established
                 _pinned_strategy = "crawl_session"
                 _pinned_tier = 2
+                await crawler.set_pinned(_pinned_strategy, _pinned_tier)
                 logger.warning(
                     f"Pinned strategy: crawl_session (from warm-up) "
                     f"for crawl {job_id}"
                 )
 
+            if not helper:
+                async with session_factory() as db:
+                    job = await db.get(Job, UUID(job_id))
+                    if job:
+                        job.checkpoint = _checkpoint()
+                    await db.commit()
+
+                # Large crawl: bring more crawl workers onto the shared frontier
+                if (
+                    crawler.shared_frontier
+                    and settings.CRAWL_WORKERS_PER_JOB > 1
+                    and request.max_pages >= settings.CRAWL_DISTRIBUTED_MIN_PAGES
+                ):
+                    # Helpers of an interrupted attempt may still be running
+                    helpers = settings.CRAWL_WORKERS_PER_JOB - 1 - await crawler.active_workers()
+                    for _ in range(helpers):
+                        process_crawl.apply_async(args=[job_id, config], kwargs={"helper": True})
+                    if helpers > 0:
+                        logger.warning(f"Dispatched {helpers} crawl helpers for {job_id}")
+
             # Producer-consumer pipeline queue
-            extract_queue = asyncio.Queue(maxsize=concurrency * 2)
+            # (sized to the semaphore's maximum so the semaphore is what binds)
+            extract_queue = asyncio.Queue(maxsize=concurrency * 4)
             extract_done = asyncio.Event()
 
             async def fetch_producer():
@@ -332,26 +452,31 @@ def process_crawl(self, job_id: str, config: dict):
 
                 empty_retries = 0
                 max_empty_retries = 5  # Wait up to 5 times for consumer to add links
+                peer_waits = 0
 
                 while pages_crawled < request.max_pages and not cancelled:
+                    # Pick up strategy pins and cancellation from other workers.
+                    # A degraded Redis reads as "nothing pinned" — keep our own
+                    # pin unless another worker actually published one.
+                    shared_strategy, shared_tier, _shared_cancel = await crawler.shared_state()
+                    if shared_strategy is not None:
+                        _pinned_strategy, _pinned_tier = shared_strategy, shared_tier
+                    if _shared_cancel:
+                        cancelled = True
+                        break
+
                     batch_items = []
                     remaining = request.max_pages - pages_crawled
                     # Fetch extra to compensate for pages that may be
                     # skipped (duplicates, empty, failures).
                     batch_size = min(concurrency * 2, remaining + concurrency)
 
+                    # Claimed atomically: no other worker gets the same URL
                     while len(batch_items) < batch_size:
-                        next_item = await crawler.get_next_url()
+                        next_item = await crawler.claim_next_url()
                         if not next_item:
                             break
-                        url, depth = next_item
-
-                        norm_url = normalize_url(url)
-                        if await crawler.is_visited(norm_url):
-                            continue
-
-                        await crawler.mark_visited(norm_url)
-                        batch_items.append((url, depth))
+                        batch_items.append(next_item)
 
                     if not batch_items:
                         # Frontier is empty — but consumer may still be extracting
@@ -375,12 +500,23 @@ def process_crawl(self, job_id: str, config: dict):
                             empty_retries += 1
                             await asyncio.sleep(1)
                             continue  # Retry — consumer may have added new links
-                        else:
-                            break  # Truly no more URLs
+                        # Other workers on this job may still add links
+                        if await crawler.in_flight_count() and peer_waits < _PEER_WAIT_SECONDS:
+                            peer_waits += 1
+                            await asyncio.sleep(1)
+                            continue
+                        break  # Truly no more URLs
 
                     empty_retries = 0
+                    peer_waits = 0
+
+                    # One round trip for the strategy data of every domain
+                    # in this batch instead of one read per page
+                    batch_strategies = await get_domain_strategies(
+                        [u for u, _ in batch_items]
+                    )
 
-                    async def fetch_one(url: str, depth: int) -> dict | None:
+                    async def fetch_one(url: str, depth: int) -> FetchedPage | PageRecord | None:
                         nonlocal _pinned_strategy, _pinned_tier
                         try:
                             # Domain throttle — respect robots.txt Crawl-Delay
@@ -398,6 +534,7 @@ def process_crawl(self, job_id: str, config: dict):
                                     url,
                                     pinned_strategy=_pinned_strategy,
                                     pinned_tier=_pinned_tier,
+                                    domain_strategies=batch_strategies,
                                 ),
                                 timeout=35,
                             )
@@ -428,6 +565,7 @@ def process_crawl(self, job_id: str, config: dict):
                                     )
                                     _pinned_strategy = None
                                     _pinned_tier = None
+                                    await crawler.set_pinned(None, None)
 
                                 if _is_blocked:
                                     logger.warning(f"Skipping blocked page: {url}")
@@ -449,22 +587,16 @@ def process_crawl(self, job_id: str, config: dict):
                                             logger.warning(
                                                 f"Pinned strategy: {ws} (tier {wt}) for crawl {job_id}"
                                             )
-                                return {
-                                    "url": url,
-                                    "depth": depth,
-                                    "fetch_result": fetch_result,
-                                }
+                                        await crawler.set_pinned(_pinned_strategy, _pinned_tier)
+                                return FetchedPage(url, depth, fetch_result)
                             logger.warning(f"fetch_page_only returned None for {url}, trying scrape_page")
                             result = await asyncio.wait_for(
                                 crawler.scrape_page(url),
                                 timeout=30,
                             )
-                            return {
-                                "url": url,
-                                "depth": depth,
-                                "scrape_data": result["scrape_data"],
-                                "discovered_links": result["discovered_links"],
-                            }
+                            return PageRecord.from_scrape_data(
+                                url, depth, result["scrape_data"], _user_formats
+                            )
                         except asyncio.TimeoutError:
                             logger.warning(f"Fetch timed out for {url} after 35s")
                             return None
@@ -472,14 +604,23 @@ def process_crawl(self, job_id: str, config: dict):
                             logger.warning(f"Failed to fetch {url}: {e}")
                             return None
 
+                    async def fetch_slot(url, depth):
+                        # Released by the consumer once the page is saved
+                        await semaphore.acquire()
+                        result = await fetch_one(url, depth)
+                        if result is None:
+                            semaphore.release()
+                        return result
+
                     # Fetch sequentially and queue each result immediately
                     # so the consumer can process pages while producer fetches.
-                    for url, depth in batch_items:
-                        if pages_crawled >= request.max_pages or cancelled:
-                            break
-                        result = await fetch_one(url, depth)
-                        if result is not None:
-                            await extract_queue.put(result)
+                    await _fetch_batch(
+                        crawler,
+                        batch_items,
+                        fetch_slot,
+                        extract_queue.put,
+                        lambda: pages_crawled >= request.max_pages or cancelled,
+                    )
 
                 logger.warning(
                     f"Producer done for {job_id}: pages_crawled={pages_crawled}, "
@@ -487,28 +628,21 @@ def process_crawl(self, job_id: str, config: dict):
                 )
                 extract_done.set()
 
-            async def _capture_screenshot(crawler, url, item, scrape_data):
+            async def _capture_screenshot(url, raw_html_orig):
                 """Capture viewport screenshot bypassing the browser pool semaphore.
 
                 Creates a lightweight browser context directly on the Chromium
                 instance.  Retries once after a browser crash (forces relaunch).
 
-                HTML is capped at 512 KB to prevent OOM crashes — only the
-                above-the-fold content matters for a 1280x720 viewport.
+                ``raw_html_orig`` is the fetched HTML, already capped at
+                _SCREENSHOT_HTML_MAX — only the above-the-fold content matters
+                for a 1280x720 viewport. Without it the URL is navigated to.
                 """
                 import re as _re
                 from app.services.browser import browser_pool
 
-                # Grab raw HTML from the fetch phase if available
-                raw_html_orig = None
-                if "fetch_result" in item:
-                    raw_html_orig = item["fetch_result"].get("raw_html")
-
-                # Cap HTML size to prevent browser OOM (viewport is 1280x720,
-                # only above-the-fold content matters for screenshot).
-                _MAX_HTML = 512_000
-                if raw_html_orig and len(raw_html_orig) > _MAX_HTML:
-                    raw_html_orig = raw_html_orig[:_MAX_HTML] + "</body></html>"
+                if raw_html_orig and len(raw_html_orig) >= _SCREENSHOT_HTML_MAX:
+                    raw_html_orig += "</body></html>"
 
                 for _attempt in range(2):
                     # Ensure browser is alive (reinitializes if crashed)
@@ -587,6 +721,7 @@ def process_crawl(self, job_id: str, config: dict):
             async def extract_consumer():
                 """Extract content from fetched pages, save to DB."""
                 nonlocal pages_crawled, cancelled, _pinned_strategy, _pinned_tier
+                nonlocal _last_checkpoint
 
                 while True:
                     try:
@@ -596,49 +731,59 @@ def process_crawl(self, job_id: str, config: dict):
                             break
                         continue
 
+                    claimed_url = item.url
                     try:
-                        url = item["url"]
-                        depth = item["depth"]
+                        url = item.url
+                        depth = item.depth
                         _item_t0 = _time_mod.monotonic()
                         logger.warning(
                             f"Consumer: processing {url} "
                             f"(queue={extract_queue.qsize()})"
                         )
 
-                        if "scrape_data" in item:
+                        shot_html = None
+                        if isinstance(item, PageRecord):
                             # Already fully extracted (fallback path)
-                            scrape_data = item["scrape_data"]
-                            discovered_links = item.get("discovered_links", [])
+                            record = item
                         else:
-                            # Pipeline path: extract content in thread pool
-                            fetch_result = item["fetch_result"]
-                            req = fetch_result["request"]
-
-                            scrape_data = await asyncio.wait_for(
+                            # Pipeline path: extract content in thread pool.
+                            # The raw HTML leaves the queued item here; only
+                            # a capped prefix is kept when a screenshot still
+                            # has to be rendered from it.
+                            raw_html = item.take_html()
+                            fields, page_metadata = await asyncio.wait_for(
                                 loop.run_in_executor(
                                     _extraction_executor,
-                                    extract_content,
-                                    fetch_result.get("raw_html", ""),
+                                    extract_fields,
+                                    raw_html,
                                     url,
-                                    req,
-                                    fetch_result.get("status_code", 0),
-                                    fetch_result.get("response_headers") or {},
-                                    fetch_result.get("screenshot_b64"),
-                                    fetch_result.get("action_screenshots", []),
+                                    item.request,
+                                    item.status_code,
+                                    item.response_headers,
+                                    item.screenshot_b64,
+                                    item.action_screenshots,
                                 ),
                                 timeout=60,  # Per-page extraction timeout
                             )
-                            discovered_links = scrape_data.links or []
+                            record = PageRecord(url, depth, fields, page_metadata, _user_formats)
+                            del fields, page_metadata
+                            if record.wants_screenshot(_user_formats):
+                                if item.screenshot_b64:
+                                    # Browser tier already captured screenshot during fetch
+                                    record.screenshot = item.screenshot_b64
+                                else:
+                                    shot_html = raw_html[:_SCREENSHOT_HTML_MAX]
+                            del raw_html
                             logger.warning(
                                 f"Consumer: extracted {url} "
                                 f"({_time_mod.monotonic() - _item_t0:.1f}s)"
                             )
+                        del item
 
                         # Skip truly empty pages — catches bot-detection
                         # interstitials and blank renders, but preserves thin
                         # landing pages, category indexes, and short content.
-                        md_text = (scrape_data.markdown or "").strip()
-                        _word_count = len(md_text.split())
+                        _word_count = record.word_count
                         _skip = False
 
                         if _word_count < 15:
@@ -655,10 +800,12 @@ def process_crawl(self, job_id: str, config: dict):
                                     crawler.scrape_page(url),
                                     timeout=60,
                                 )
-                                scrape_data = _retry_result["scrape_data"]
-                                discovered_links = _retry_result.get("discovered_links", [])
-                                md_text = (scrape_data.markdown or "").strip()
-                                _word_count = len(md_text.split())
+                                record = PageRecord.from_scrape_data(
+                                    url, depth, _retry_result["scrape_data"], _user_formats
+                                )
+                                del _retry_result
+                                shot_html = None
+                                _word_count = record.word_count
                                 _skip = _word_count < 15
                                 if not _skip:
                                     logger.info(f"Seed URL retry succeeded ({_word_count} words): {url}")
@@ -667,9 +814,9 @@ def process_crawl(self, job_id: str, config: dict):
 
                         if _skip:
                             # Still harvest links for frontier expansion
-                            if discovered_links:
+                            if record.discovered_links:
                                 await crawler.add_to_frontier(
-                                    discovered_links, depth + 1
+                                    record.discovered_links, depth + 1
                                 )
                             # task_done() is called in the finally block
                             continue
@@ -677,51 +824,21 @@ def process_crawl(self, job_id: str, config: dict):
                         # Enforce page limit — producer may have queued
                         # extra items before the counter caught up.
                         if pages_crawled >= request.max_pages:
-                            if discovered_links:
+                            if record.discovered_links:
                                 await crawler.add_to_frontier(
-                                    discovered_links, depth + 1
+                                    record.discovered_links, depth + 1
                                 )
                             continue
 
-                        # Build rich metadata — only include data the user requested
-                        metadata = {}
-                        if scrape_data.metadata:
-                            metadata = scrape_data.metadata.model_dump(
-                                exclude_none=True
-                            )
-                        if scrape_data.structured_data and (not _user_formats or "structured_data" in _user_formats):
-                            metadata["structured_data"] = scrape_data.structured_data
-                        if scrape_data.headings and (not _user_formats or "headings" in _user_formats):
-                            metadata["headings"] = scrape_data.headings
-                        if scrape_data.images and (not _user_formats or "images" in _user_formats):
-                            metadata["images"] = scrape_data.images
-                        if scrape_data.links_detail and (not _user_formats or "links" in _user_formats):
-                            metadata["links_detail"] = scrape_data.links_detail
-                        if scrape_data.product_data:
-                            metadata["product_data"] = scrape_data.product_data
-                        if scrape_data.tables and (not _user_formats or "tables" in _user_formats):
-                            metadata["tables"] = scrape_data.tables
-                        if scrape_data.selector_data:
-                            metadata["selector_data"] = scrape_data.selector_data
-                        if scrape_data.fit_markdown:
-                            metadata["fit_markdown"] = scrape_data.fit_markdown
-                        if scrape_data.citations:
-                            metadata["citations"] = scrape_data.citations
-                        if scrape_data.markdown_with_citations:
-                            metadata["markdown_with_citations"] = scrape_data.markdown_with_citations
-                        if scrape_data.content_hash:
-                            metadata["content_hash"] = scrape_data.content_hash
-
                         # LLM extraction if configured
-                        extract_data = None
-                        if extract_config and scrape_data.markdown:
+                        if extract_config and record.markdown:
                             try:
                                 async with session_factory() as llm_db:
-                                    extract_data = await asyncio.wait_for(
+                                    record.extract = await asyncio.wait_for(
                                         extract_with_llm(
                                             db=llm_db,
                                             user_id=user_id,
-                                            content=scrape_data.markdown,
+                                            content=record.markdown,
                                             prompt=extract_config.prompt,
                                             schema=extract_config.schema_,
                                         ),
@@ -731,24 +848,13 @@ def process_crawl(self, job_id: str, config: dict):
                                 logger.warning(f"LLM extraction failed for {url}: {e}")
 
                         # Capture screenshot — only if user requested it.
-                        # Priority: 1) scrape_data.screenshot (full scrape path)
-                        #           2) fetch_result screenshot_b64 (browser-tier capture)
+                        # Priority: 1) screenshot from the full scrape path
+                        #           2) screenshot_b64 from the browser-tier fetch
                         #           3) _capture_screenshot fallback (render raw HTML)
-                        screenshot_val = None
-                        if _user_formats and "screenshot" not in _user_formats:
-                            pass  # User didn't request screenshots — skip entirely
-                        elif scrape_data.screenshot:
-                            screenshot_val = scrape_data.screenshot
-                        elif "fetch_result" in item and item["fetch_result"].get("screenshot_b64"):
-                            # Browser tier already captured screenshot during fetch
-                            screenshot_val = item["fetch_result"]["screenshot_b64"]
-                        else:
-                            # HTTP-tier fallback: render raw HTML in a fresh browser page
+                        if record.wants_screenshot(_user_formats):
                             try:
-                                screenshot_val = await asyncio.wait_for(
-                                    _capture_screenshot(
-                                        crawler, url, item, scrape_data
-                                    ),
+                                record.screenshot = await asyncio.wait_for(
+                                    _capture_screenshot(url, shot_html),
                                     timeout=20,
                                 )
                             except (asyncio.TimeoutError, Exception) as _ss_err:
@@ -756,55 +862,65 @@ def process_crawl(self, job_id: str, config: dict):
                                     f"Screenshot capture timed out / failed "
                                     f"for {url}: {_ss_err}"
                                 )
+                        shot_html = None
 
-                        # Store result — only include fields the user requested
+                        # Store result — the record only holds the formats
+                        # the user requested
                         async with session_factory() as db:
-                            job_result = JobResult(
-                                job_id=UUID(job_id),
-                                url=url,
-                                markdown=scrape_data.markdown if not _user_formats or "markdown" in _user_formats else None,
-                                html=scrape_data.html if not _user_formats or "html" in _user_formats else None,
-                                links=scrape_data.links if scrape_data.links and (not _user_formats or "links" in _user_formats) else None,
-                                extract=extract_data,
-                                metadata_=metadata if metadata else None,
-                                screenshot_url=screenshot_val if not _user_formats or "screenshot" in _user_formats else None,
-                            )
+                            # Takes a slot of the page budget shared by all
+                            # workers on the job, in the same transaction
+                            reserved = await _reserve_page(db, UUID(job_id), request.max_pages)
+                            if reserved is None:
+                                pages_crawled = request.max_pages
+                                continue
+                            pages_crawled, job_status = reserved
+
+                            job_result = record.to_job_result(UUID(job_id))
+                            await offload_result(job_result)
                             db.add(job_result)
 
-                            pages_crawled += 1
                             logger.warning(
                                 f"Saved page {pages_crawled}/{request.max_pages}: {url} "
                                 f"({_word_count}w)"
                             )
 
-                            job = await db.get(Job, UUID(job_id))
-                            if job:
-                                job.completed_pages = pages_crawled
-                                if job.status == "cancelled":
-                                    cancelled = True
-                            await db.commit()
+                            if job_status == "cancelled":
+                                cancelled = True
+                            if (
+                                not helper
+                                and pages_crawled - _last_checkpoint >= settings.CRAWL_CHECKPOINT_PAGES
+                            ):
+                                _last_checkpoint = pages_crawled
+                                await db.execute(
+                                    update(Job)
+                                    .where(Job.id == UUID(job_id))
+                                    .values(checkpoint=_checkpoint())
+                                )
+                            with db_write("crawl_page"):
+                                await db.commit()
+                        if cancelled:
+                            await crawler.signal_cancel()
 
                         # Add discovered links to frontier (skip if we've
                         # already hit the page limit — no point expanding)
-                        if discovered_links and pages_crawled < request.max_pages:
-                            await crawler.add_to_frontier(discovered_links, depth + 1)
-
-                        # Explicitly free large objects to prevent OOM.
-                        # The scrape_data, metadata, and fetch_result dicts
-                        # hold full HTML/markdown/images that accumulate fast.
-                        del metadata, scrape_data
-                        if "fetch_result" in item:
-                            del item["fetch_result"]
-                        if "scrape_data" in item:
-                            del item["scrape_data"]
-                        del item
+                        if record.discovered_links and pages_crawled < request.max_pages:
+                            await crawler.add_to_frontier(record.discovered_links, depth + 1)
+
+                        # Free the page before the next one is taken off the
+                        # queue. The record and the ORM row are the only
+                        # holders of its content; collect explicitly because
+                        # extraction leaves BeautifulSoup reference cycles
+                        # that refcounting alone never frees.
+                        del record, job_result
                         gc.collect()
 
                     except Exception as e:
                         logger.warning(
-                            f"Extract/save failed for {item.get('url', '?')}: {e}"
+                            f"Extract/save failed for {claimed_url}: {e}"
                         )
                     finally:
+                        semaphore.release()
+                        await crawler.release(claimed_url)
                         extract_queue.task_done()
 
             # Run producer and consumer concurrently
@@ -813,10 +929,21 @@ def process_crawl(self, job_id: str, config: dict):
                 extract_consumer(),
             )
 
+            if helper:
+                return
+
+            # Helpers on the shared frontier finish their in-flight pages
+            waited = 0
+            while await crawler.active_workers() and waited < _HELPER_DRAIN_SECONDS:
+                await asyncio.sleep(2)
+                waited += 2
+
             # Mark job as completed or failed
             async with session_factory() as db:
                 job = await db.get(Job, UUID(job_id))
                 if job and job.status != "cancelled":
+                    # Includes pages saved by helper workers
+                    pages_crawled = job.completed_pages or 0
                     if pages_crawled > 0:
                         job.status = "completed"
                     else:
@@ -825,6 +952,8 @@ def process_crawl(self, job_id: str, config: dict):
                     job.total_pages = pages_crawled
                     job.completed_pages = pages_crawled
                     job.completed_at = datetime.now(timezone.utc)
+                if job:
+                    job.checkpoint = None
                 await db.commit()
 
             # Send webhook if configured
@@ -857,12 +986,34 @@ def process_crawl(self, job_id: str, config: dict):
                     logger.warning(f"Webhook delivery failed for crawl {job_id}: {e}")
 
         except Exception as e:
+            if helper:
+                # The lead task owns the job's outcome
+                logger.error(f"Crawl helper for {job_id} failed: {e}")
+                return
+            # Leave the job running with a fresh checkpoint and let Celery's
+            # autoretry resume it, unless retries are used up
+            if self.request.retries < self.max_retries and not isinstance(
+                e, (ValueError, KeyError, TypeError)
+            ):
+                logger.warning(
+                    f"Crawl job {job_id} interrupted at {pages_crawled} pages, "
+                    f"will resume on retry: {e}"
+                )
+                async with session_factory() as db:
+                    job = await db.get(Job, UUID(job_id))
+                    if job:
+                        job.checkpoint = _checkpoint()
+                    await db.commit()
+                _keep_state = True
+                raise
+
             logger.error(f"Crawl job {job_id} failed: {e}")
             async with session_factory() as db:
                 job = await db.get(Job, UUID(job_id))
                 if job:
                     job.status = "failed"
                     job.error = str(e)
+                    job.checkpoint = None
                 await db.commit()
 
             # Send failure webhook
@@ -894,7 +1045,9 @@ def process_crawl(self, job_id: str, config: dict):
                 loop.set_exception_handler(_original_handler)
             except Exception:
                 pass
-            await crawler.cleanup()
+            if helper:
+                await crawler.unregister_worker(worker_id)
+            await crawler.cleanup(keep_state=_keep_state)
             await db_engine.dispose()
 
     try:
@@ -14,13 +14,15 @@ _WORKER_NAME = "extract"
 
 
 def _run_async(coro):
+    from app.core.loop_monitor import loop_monitor
     from app.services.scraper import reset_pool_state_sync
     reset_pool_state_sync()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        with loop_monitor.watching(loop, _WORKER_NAME):
+            return loop.run_until_complete(coro)
     finally:
         try:
             from app.services.scraper import cleanup_async_pools
@@ -53,6 +55,7 @@ def process_extract(self, job_id: str, config: dict):
         from app.core.database import create_worker_session_factory
         from app.models.job import Job
         from app.models.job_result import JobResult
+        from app.services.blob_store import offload_result
         from app.schemas.scrape import ScrapeRequest
         from app.services.scraper import scrape_url
         from app.services.llm_extract import extract_with_llm
@@ -156,6 +159,7 @@ def process_extract(self, job_id: str, config: dict):
                                 "provider": provider,
                             },
                         )
+                        await offload_result(job_result)
                         db.add(job_result)
                         completed += 1
                         job = await db.get(Job, UUID(job_id))
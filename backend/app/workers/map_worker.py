@@ -1,6 +1,8 @@
 import asyncio
+import json
 import logging
 import time as _time_mod
+from contextlib import aclosing
 from datetime import datetime, timezone
 from uuid import UUID
 
@@ -10,15 +12,32 @@ logger = logging.getLogger(__name__)
 
 _WORKER_NAME = "map"
 
+# Links are published to map:{job_id}:links while the map runs so
+# GET /v1/map/{job_id}/stream can relay them before the job completes.
+_STREAM_BATCH = 50
+_STREAM_FLUSH_SECONDS = 0.5
+_STREAM_TTL = 3600
+
+
+async def _publish_links(job_id: str, items: list[str]) -> None:
+    """Append serialized links to the job's live stream list."""
+    from app.core.redis import redis_client
+
+    key = f"map:{job_id}:links"
+    await redis_client.rpush(key, *items)
+    await redis_client.expire(key, _STREAM_TTL)
+
 
 def _run_async(coro):
+    from app.core.loop_monitor import loop_monitor
     from app.services.scraper import reset_pool_state_sync
     reset_pool_state_sync()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        with loop_monitor.watching(loop, _WORKER_NAME):
+            return loop.run_until_complete(coro)
     finally:
         try:
             from app.services.scraper import cleanup_async_pools
@@ -52,7 +71,7 @@ def process_map(self, job_id: str, config: dict):
         from app.models.job import Job
         from app.models.job_result import JobResult
         from app.schemas.map import MapRequest
-        from app.services.mapper import map_website
+        from app.services.mapper import iter_map_links
 
         session_factory, db_engine = create_worker_session_factory()
 
@@ -83,8 +102,23 @@ def process_map(self, job_id: str, config: dict):
                 links_data = cached
                 logger.info(f"Map cache hit for {request.url} ({len(links_data)} links)")
             else:
-                links = await map_website(request)
-                links_data = [link.model_dump() for link in links]
+                links_data = []
+                pending: list[str] = []
+                last_flush = _time_mod.monotonic()
+                async with aclosing(iter_map_links(request)) as links:
+                    async for link in links:
+                        item = link.model_dump()
+                        links_data.append(item)
+                        pending.append(json.dumps(item, default=str))
+                        if (
+                            len(pending) >= _STREAM_BATCH
+                            or _time_mod.monotonic() - last_flush >= _STREAM_FLUSH_SECONDS
+                        ):
+                            await _publish_links(job_id, pending)
+                            pending = []
+                            last_flush = _time_mod.monotonic()
+                if pending:
+                    await _publish_links(job_id, pending)
                 # Cache for other users
                 await set_cached_map(
                     request.url, request.limit, request.include_subdomains,
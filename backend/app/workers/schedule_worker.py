@@ -10,13 +10,15 @@ logger = logging.getLogger(__name__)
 
 
 def _run_async(coro):
+    from app.core.loop_monitor import loop_monitor
     from app.services.scraper import reset_pool_state_sync
     reset_pool_state_sync()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        with loop_monitor.watching(loop, "schedule"):
+            return loop.run_until_complete(coro)
     finally:
         try:
             from app.services.scraper import cleanup_async_pools
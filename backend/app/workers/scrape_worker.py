@@ -12,13 +12,15 @@ _WORKER_NAME = "scrape"
 
 def _run_async(coro):
     """Run an async function from a sync Celery task."""
+    from app.core.loop_monitor import loop_monitor
     from app.services.scraper import reset_pool_state_sync
     reset_pool_state_sync()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        with loop_monitor.watching(loop, _WORKER_NAME):
+            return loop.run_until_complete(coro)
     finally:
         try:
             from app.services.scraper import cleanup_async_pools
@@ -49,8 +51,10 @@ def process_scrape(self, job_id: str, url: str, config: dict):
 
     async def _do_scrape():
         from app.core.database import create_worker_session_factory
+        from app.core.stage_timing import db_write
         from app.models.job import Job
         from app.models.job_result import JobResult
+        from app.services.blob_store import offload_result
         from app.schemas.scrape import ScrapeRequest
         from app.services.scraper import scrape_url
 
@@ -116,13 +120,15 @@ def process_scrape(self, job_id: str, url: str, config: dict):
                     screenshot_url=result.screenshot if not _req_fmts or "screenshot" in _req_fmts else None,
                     metadata_=metadata if metadata else None,
                 )
+                await offload_result(job_result)
                 db.add(job_result)
 
                 job.status = "completed"
                 job.completed_pages = 1
                 job.total_pages = 1
                 job.completed_at = datetime.now(timezone.utc)
-                await db.commit()
+                with db_write("scrape_result"):
+                    await db.commit()
 
             # Fire webhook if configured
             if request.webhook_url:
@@ -43,13 +43,15 @@ async def _fetch_youtube_metadata(url: str) -> dict | None:
 
 
 def _run_async(coro):
+    from app.core.loop_monitor import loop_monitor
     from app.services.scraper import reset_pool_state_sync
     reset_pool_state_sync()
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        return loop.run_until_complete(coro)
+        with loop_monitor.watching(loop, _WORKER_NAME):
+            return loop.run_until_complete(coro)
     finally:
         try:
             from app.services.scraper import cleanup_async_pools
@@ -82,6 +84,7 @@ def process_search(self, job_id: str, config: dict):
         from app.core.database import create_worker_session_factory
         from app.models.job import Job
         from app.models.job_result import JobResult
+        from app.services.blob_store import offload_result
         from app.schemas.search import SearchRequest
         from app.schemas.scrape import ScrapeRequest
         from app.services.search import web_search
@@ -134,6 +137,7 @@ def process_search(self, job_id: str, config: dict):
                             screenshot_url=item.get("screenshot"),
                             metadata_=item.get("metadata"),
                         )
+                        await offload_result(job_result)
                         db.add(job_result)
                     job = await db.get(Job, UUID(job_id))
                     if job:
@@ -219,6 +223,7 @@ def process_search(self, job_id: str, config: dict):
                                 "source": "youtube_oembed",
                             },
                         )
+                        await offload_result(job_result)
                         db.add(job_result)
                         completed += 1
                         job = await db.get(Job, UUID(job_id))
@@ -312,6 +317,7 @@ def process_search(self, job_id: str, config: dict):
                             screenshot_url=result.screenshot if not _req_fmts or "screenshot" in _req_fmts else None,
                             metadata_=metadata,
                         )
+                        await offload_result(job_result)
                         db.add(job_result)
 
                         completed += 1
@@ -342,6 +348,7 @@ def process_search(self, job_id: str, config: dict):
                                 "error": str(e),
                             },
                         )
+                        await offload_result(job_result)
                         db.add(job_result)
                         completed += 1
                         job = await db.get(Job, UUID(job_id))
@@ -0,0 +1,4 @@
+"""Offline benchmark harnesses for DataBlue hot paths.
+
+Run from the backend directory, e.g. ``python -m benchmarks.hotpath``.
+"""
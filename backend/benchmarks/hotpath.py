@@ -0,0 +1,366 @@
+"""Hot-path benchmark suite for the extraction pipeline.
+
+Runs offline against the saved HTML pages in ``backend/`` and measures the
+CPU-bound functions every scrape goes through: ``extract_content`` per
+output format, ``_looks_blocked``, ``normalize_url``, ``extract_links``, the
+BM25 / pruning content filters and the google_* parsers.
+
+For each case it reports throughput, p50/p99/mean latency and peak Python
+heap (tracemalloc, measured in a separate run so it doesn't skew timings)
+as JSON, and optionally compares p50 against a stored baseline.
+
+Usage:
+    cd backend
+    python -m benchmarks.hotpath                          # full run, JSON to stdout
+    python -m benchmarks.hotpath --quick -k google_       # 3 iterations of matching cases
+    python -m benchmarks.hotpath --save-baseline benchmarks/baseline.json
+    python -m benchmarks.hotpath -o results.json --baseline benchmarks/baseline.json
+
+Exit status is 1 when any case's p50 is slower than ``--threshold`` times
+its baseline. Baselines are machine-specific and not committed
+(benchmarks/baseline.json is gitignored): record one with --save-baseline
+on the machine that runs the comparison.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# (name, file, url the page was captured from)
+CORPUS = [
+    ("jobs", "jobs_page.html", "https://www.google.com/search?q=python+developer&udm=8"),
+    ("news", "news_page.html", "https://news.google.com/search?q=el+mencho"),
+    ("gfinance_market", "gfinance_market_overview.html", "https://www.google.com/finance/"),
+    ("gfinance_aapl", "gfinance_quote_aapl.html", "https://www.google.com/finance/quote/AAPL:NASDAQ"),
+    ("gfinance_btc", "gfinance_quote_btc.html", "https://www.google.com/finance/quote/BTC-USD"),
+]
+
+EXTRACT_FORMATS = [
+    ["markdown"],
+    ["html"],
+    ["links"],
+    ["structured_data"],
+    ["headings", "images"],
+    ["tables"],
+    ["markdown", "fit_markdown"],
+]
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    items: int = 1  # Logical operations per call (for per-item throughput)
+    input_bytes: int = 0
+
+
+@dataclass
+class Page:
+    name: str
+    url: str
+    html: str
+
+
+def load_corpus(names: list[str] | None = None) -> list[Page]:
+    pages = []
+    for name, filename, url in CORPUS:
+        if names and name not in names:
+            continue
+        path = BACKEND_DIR / filename
+        if path.exists():
+            pages.append(Page(name, url, path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def build_cases(pages: list[Page]) -> list[Case]:
+    """All benchmark cases for the given corpus pages."""
+    from app.schemas.scrape import ScrapeRequest
+    from app.services import google_finance, google_jobs, google_news
+    from app.services.content import extract_links
+    from app.services.content_filter import BM25ContentFilter, PruningContentFilter
+    from app.services.dedup import normalize_url
+    from app.services.scraper import _looks_blocked, extract_content
+
+    cases: list[Case] = []
+    all_links: list[str] = []
+
+    for page in pages:
+        size = len(page.html.encode("utf-8", errors="replace"))
+        for formats in EXTRACT_FORMATS:
+            request = ScrapeRequest(url=page.url, formats=formats)
+            cases.append(
+                Case(
+                    f"extract_content[{'+'.join(formats)}]/{page.name}",
+                    lambda p=page, r=request: extract_content(p.html, p.url, r, 200, {}, None),
+                    input_bytes=size,
+                )
+            )
+        main_request = ScrapeRequest(url=page.url, formats=["markdown"], only_main_content=True)
+        cases.append(
+            Case(
+                f"extract_content[markdown,main]/{page.name}",
+                lambda p=page, r=main_request: extract_content(p.html, p.url, r, 200, {}, None),
+                input_bytes=size,
+            )
+        )
+        cases.append(
+            Case(f"looks_blocked/{page.name}", lambda p=page: _looks_blocked(p.html), input_bytes=size)
+        )
+        cases.append(
+            Case(
+                f"extract_links/{page.name}",
+                lambda p=page: extract_links(p.html, p.url),
+                input_bytes=size,
+            )
+        )
+        cases.append(
+            Case(
+                f"filter_bm25/{page.name}",
+                lambda p=page: BM25ContentFilter().filter_content(p.html),
+                input_bytes=size,
+            )
+        )
+        cases.append(
+            Case(
+                f"filter_pruning/{page.name}",
+                lambda p=page: PruningContentFilter().filter_content(p.html),
+                input_bytes=size,
+            )
+        )
+        all_links.extend(extract_links(page.html, page.url))
+
+    if all_links:
+        cases.append(
+            Case(
+                "normalize_url",
+                lambda: [normalize_url(u) for u in all_links],
+                items=len(all_links),
+            )
+        )
+
+    by_name = {p.name: p for p in pages}
+    if "jobs" in by_name:
+        html = by_name["jobs"].html
+        cases.append(
+            Case(
+                "google_jobs/parse",
+                lambda: google_jobs._parse_jobs_blob(google_jobs._extract_af_init_data(html)),
+                input_bytes=len(html),
+            )
+        )
+    if "news" in by_name:
+        html = by_name["news"].html
+        cases.append(
+            Case(
+                "google_news/parse",
+                lambda: google_news._parse_af_articles(google_news._extract_af_init_data(html)),
+                input_bytes=len(html),
+            )
+        )
+    if "gfinance_market" in by_name:
+        html = by_name["gfinance_market"].html
+        cases.append(
+            Case(
+                "google_finance/market_overview",
+                lambda: google_finance._parse_market_overview(
+                    google_finance._extract_af_blocks(html)
+                ),
+                input_bytes=len(html),
+            )
+        )
+    for name, symbol in (("gfinance_aapl", "AAPL:NASDAQ"), ("gfinance_btc", "BTC-USD")):
+        if name in by_name:
+            html = by_name[name].html
+            cases.append(
+                Case(
+                    f"google_finance/quote/{name}",
+                    lambda h=html, s=symbol: google_finance._parse_quote(
+                        google_finance._extract_af_blocks(h), s
+                    ),
+                    input_bytes=len(html),
+                )
+            )
+    return cases
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def measure(
+    case: Case,
+    min_iterations: int = 5,
+    min_seconds: float = 1.0,
+    max_iterations: int = 200,
+    warmup: int = 1,
+) -> dict:
+    """Time ``case`` until both ``min_iterations`` and ``min_seconds`` are
+    reached (capped at ``max_iterations``), then measure peak memory once."""
+    for _ in range(warmup):
+        case.fn()
+
+    timings: list[float] = []
+    gc.collect()
+    started = time.perf_counter()
+    while len(timings) < max_iterations and (
+        len(timings) < min_iterations or time.perf_counter() - started < min_seconds
+    ):
+        t0 = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    result = {
+        "iterations": len(timings),
+        "p50_ms": round(_percentile(timings, 50) * 1000, 3),
+        "p99_ms": round(_percentile(timings, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "ops_per_sec": round(len(timings) * case.items / total, 2) if total else None,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+    if case.input_bytes and total:
+        result["mb_per_sec"] = round(len(timings) * case.input_bytes / total / 1e6, 2)
+    return result
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Cases whose p50 regressed past ``threshold`` x the baseline p50."""
+    regressions = []
+    base_cases = baseline.get("cases", {})
+    for name, current in results.get("cases", {}).items():
+        base = base_cases.get(name)
+        if not base or not base.get("p50_ms"):
+            continue
+        ratio = current["p50_ms"] / base["p50_ms"]
+        current["baseline_p50_ms"] = base["p50_ms"]
+        current["ratio"] = round(ratio, 3)
+        if ratio > threshold:
+            regressions.append(
+                {"case": name, "baseline_p50_ms": base["p50_ms"],
+                 "p50_ms": current["p50_ms"], "ratio": round(ratio, 3)}
+            )
+    return regressions
+
+
+def run(
+    pattern: str | None = None,
+    pages: list[str] | None = None,
+    min_iterations: int = 5,
+    min_seconds: float = 1.0,
+    max_iterations: int = 200,
+    warmup: int = 1,
+    progress=None,
+) -> dict:
+    """Run every case whose name contains ``pattern`` and return the report."""
+    cases = build_cases(load_corpus(pages))
+    if pattern:
+        cases = [c for c in cases if pattern in c.name]
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()}-{platform.machine()} ({os.cpu_count()} cpu)",
+        "settings": {
+            "min_iterations": min_iterations,
+            "min_seconds": min_seconds,
+            "max_iterations": max_iterations,
+        },
+        "cases": {},
+    }
+    for case in cases:
+        report["cases"][case.name] = measure(
+            case, min_iterations, min_seconds, max_iterations, warmup
+        )
+        if progress:
+            stats = report["cases"][case.name]
+            progress(f"{case.name:60s} p50={stats['p50_ms']:>10.3f}ms p99={stats['p99_ms']:>10.3f}ms")
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--filter", help="Only run cases whose name contains this")
+    parser.add_argument("--pages", nargs="+", help="Corpus pages to use (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="Minimum iterations per case")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds per case")
+    parser.add_argument("--max-iterations", type=int, default=200)
+    parser.add_argument("--quick", action="store_true", help="3 iterations, no minimum time, no warmup")
+    parser.add_argument("-o", "--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare p50 against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed p50 slowdown ratio")
+    parser.add_argument("--save-baseline", help="Write this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    logging.disable(logging.WARNING)  # _looks_blocked etc. log on every call
+
+    min_iterations, min_seconds, warmup = args.iterations, args.min_time, 1
+    if args.quick:
+        min_iterations, min_seconds, warmup = 3, 0.0, 0
+
+    report = run(
+        args.filter,
+        args.pages,
+        min_iterations,
+        min_seconds,
+        args.max_iterations,
+        warmup,
+        progress=lambda line: print(line, file=sys.stderr),
+    )
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(report, baseline, args.threshold)
+        report["baseline"] = {
+            "file": args.baseline,
+            "created_at": baseline.get("created_at"),
+            "threshold": args.threshold,
+            "regressions": regressions,
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + "\n")
+
+    for reg in regressions:
+        print(
+            f"REGRESSION {reg['case']}: p50 {reg['p50_ms']}ms vs {reg['baseline_p50_ms']}ms "
+            f"(x{reg['ratio']})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
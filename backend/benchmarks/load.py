@@ -0,0 +1,270 @@
+"""Load driver: push scrape, crawl and map jobs through a running API.
+
+Targets the synthetic sites from ``benchmarks.origin`` (or any base URLs)
+and reports, per job kind, throughput and end-to-end latency as JSON. Crawl
+and map jobs are started through the API and polled until the Celery
+workers finish them, so the numbers cover the whole pipeline. Origin
+request counters (``/__stats``) are included when the targets expose them,
+which shows how much work the caches absorbed.
+
+Usage:
+    cd backend
+    python -m benchmarks.origin --sites 2 --pages 1000 --latency-ms 30 &
+    python -m benchmarks.load --api http://localhost:8000 --api-key wh_... \\
+        --target http://127.0.0.1:8900 --target http://127.0.0.1:8901 \\
+        --scrape 200 --crawl 4 --map 4 --concurrency 16 --crawl-pages 100
+
+``--cache-bust`` appends a unique query string to every scrape URL so the
+cross-user scrape cache never answers; leave it off to measure cache hits.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.hotpath import _percentile
+
+_TERMINAL = ("completed", "failed", "cancelled")
+
+
+@dataclass
+class KindStats:
+    latencies: list[float] = field(default_factory=list)
+    ok: int = 0
+    failed: int = 0
+    pages: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def error(self, reason: str) -> None:
+        self.failed += 1
+        self.errors[reason] = self.errors.get(reason, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        values = sorted(self.latencies)
+        return {
+            "jobs": self.ok + self.failed,
+            "ok": self.ok,
+            "failed": self.failed,
+            "errors": self.errors,
+            "pages": self.pages,
+            "jobs_per_sec": round((self.ok + self.failed) / elapsed, 3) if elapsed else None,
+            "pages_per_sec": round(self.pages / elapsed, 3) if elapsed else None,
+            "latency_ms": {
+                "p50": round(_percentile(values, 50) * 1000, 1),
+                "p90": round(_percentile(values, 90) * 1000, 1),
+                "p99": round(_percentile(values, 99) * 1000, 1),
+                "max": round(values[-1] * 1000, 1) if values else 0.0,
+            },
+        }
+
+
+class LoadDriver:
+    def __init__(
+        self,
+        api: str,
+        api_key: str,
+        targets: list[str],
+        pages_per_site: int,
+        concurrency: int,
+        crawl_pages: int,
+        map_limit: int,
+        cache_bust: bool,
+        poll_interval: float = 1.0,
+        job_timeout: float = 600.0,
+        formats: list[str] | None = None,
+    ):
+        self.api = api.rstrip("/")
+        self.targets = [t.rstrip("/") for t in targets]
+        self.pages_per_site = pages_per_site
+        self.crawl_pages = crawl_pages
+        self.map_limit = map_limit
+        self.cache_bust = cache_bust
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self.formats = formats or ["markdown"]
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {"scrape": KindStats(), "crawl": KindStats(), "map": KindStats()}
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(180.0, connect=10.0),
+            limits=httpx.Limits(max_connections=concurrency * 2),
+        )
+        self._counter = itertools.count()
+        self._rng = random.Random(0)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def _scrape_url(self) -> str:
+        site = self._rng.choice(self.targets)
+        n = self._rng.randrange(self.pages_per_site)
+        url = f"{site}/p/{n}" if n else f"{site}/"
+        if self.cache_bust:
+            url += f"?lt={next(self._counter)}"
+        return url
+
+    async def _poll(self, path: str) -> dict:
+        deadline = time.monotonic() + self.job_timeout
+        while True:
+            resp = await self.client.get(f"{self.api}{path}", params={"per_page": 1})
+            resp.raise_for_status()
+            body = resp.json()
+            if body.get("status") in _TERMINAL:
+                return body
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{path} still {body.get('status')}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run(self, kind: str, job) -> None:
+        stats = self.stats[kind]
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                ok, pages = await job()
+            except httpx.HTTPStatusError as e:
+                stats.error(f"http_{e.response.status_code}")
+                return
+            except Exception as e:
+                stats.error(type(e).__name__)
+                return
+            stats.latencies.append(time.perf_counter() - start)
+            stats.pages += pages
+            if ok:
+                stats.ok += 1
+            else:
+                stats.error("job_failed")
+
+    async def scrape(self) -> tuple[bool, int]:
+        resp = await self.client.post(
+            f"{self.api}/v1/scrape", json={"url": self._scrape_url(), "formats": self.formats}
+        )
+        resp.raise_for_status()
+        body = resp.json()
+        return bool(body.get("success")), 1 if body.get("success") else 0
+
+    async def crawl(self, target: str) -> tuple[bool, int]:
+        resp = await self.client.post(
+            f"{self.api}/v1/crawl",
+            json={
+                "url": f"{target}/",
+                "max_pages": self.crawl_pages,
+                "max_depth": 10,
+                "scrape_options": {"formats": self.formats},
+            },
+        )
+        resp.raise_for_status()
+        body = await self._poll(f"/v1/crawl/{resp.json()['job_id']}")
+        return body["status"] == "completed", int(body.get("completed_pages") or 0)
+
+    async def map(self, target: str) -> tuple[bool, int]:
+        resp = await self.client.post(
+            f"{self.api}/v1/map", json={"url": f"{target}/", "limit": self.map_limit}
+        )
+        resp.raise_for_status()
+        body = resp.json()
+        if body.get("job_id"):
+            body = await self._poll(f"/v1/map/{body['job_id']}")
+            return body.get("status") == "completed", int(body.get("total") or 0)
+        return bool(body.get("success")), int(body.get("total") or 0)  # Cached
+
+    async def origin_stats(self, reset: bool = False) -> dict:
+        out = {}
+        for target in self.targets:
+            try:
+                resp = await self.client.get(f"{target}/__stats", params={"reset": reset})
+                out[target] = resp.json().get("counts", {})
+            except Exception:
+                continue
+        return out
+
+    async def run(self, scrapes: int, crawls: int, maps: int) -> dict:
+        await self.origin_stats(reset=True)
+        jobs = [self._run("scrape", self.scrape) for _ in range(scrapes)]
+        for i in range(crawls):
+            target = self.targets[i % len(self.targets)]
+            jobs.append(self._run("crawl", lambda t=target: self.crawl(t)))
+        for i in range(maps):
+            target = self.targets[i % len(self.targets)]
+            jobs.append(self._run("map", lambda t=target: self.map(t)))
+        self._rng.shuffle(jobs)
+
+        started = time.perf_counter()
+        await asyncio.gather(*jobs)
+        elapsed = time.perf_counter() - started
+
+        return {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "api": self.api,
+            "targets": self.targets,
+            "elapsed_sec": round(elapsed, 2),
+            "kinds": {
+                kind: stats.summary(elapsed)
+                for kind, stats in self.stats.items()
+                if stats.ok or stats.failed
+            },
+            "origin": await self.origin_stats(),
+        }
+
+
+async def _main(args) -> dict:
+    driver = LoadDriver(
+        api=args.api,
+        api_key=args.api_key,
+        targets=args.target,
+        pages_per_site=args.pages,
+        concurrency=args.concurrency,
+        crawl_pages=args.crawl_pages,
+        map_limit=args.map_limit,
+        cache_bust=args.cache_bust,
+        poll_interval=args.poll_interval,
+        job_timeout=args.job_timeout,
+        formats=args.formats,
+    )
+    try:
+        return await driver.run(args.scrape, args.crawl, args.map)
+    finally:
+        await driver.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--api", default=os.environ.get("DATABLUE_API_URL", "http://localhost:8000"))
+    parser.add_argument("--api-key", default=os.environ.get("DATABLUE_API_KEY"))
+    parser.add_argument("--target", action="append", help="Site base URL (repeatable)")
+    parser.add_argument("--pages", type=int, default=500, help="Pages per target site")
+    parser.add_argument("--scrape", type=int, default=100, help="Scrape jobs to run")
+    parser.add_argument("--crawl", type=int, default=0, help="Crawl jobs to run")
+    parser.add_argument("--map", type=int, default=0, help="Map jobs to run")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--crawl-pages", type=int, default=50)
+    parser.add_argument("--map-limit", type=int, default=500)
+    parser.add_argument("--formats", nargs="+", default=["markdown"])
+    parser.add_argument("--cache-bust", action="store_true")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--job-timeout", type=float, default=600.0)
+    parser.add_argument("-o", "--output", help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error("--api-key (or DATABLUE_API_KEY) is required")
+    args.target = args.target or ["http://127.0.0.1:8900"]
+
+    report = asyncio.run(_main(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if all(k["failed"] == 0 for k in report["kinds"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+"""Local test origin: synthetic websites for load-testing scrape, crawl and map.
+
+Serves one or more deterministic synthetic sites, one per port, so the
+tier cascade, crawl concurrency and caches can be exercised without
+touching the internet. Each site has:
+
+- ``/`` and ``/p/{n}`` content pages of configurable size, linked as a
+  tree (``children`` per page) plus ``extra_links`` random edges
+- ``/robots.txt`` disallowing ``/private/`` (pages link there too) and
+  pointing at the sitemap
+- ``/sitemap.xml`` — a plain urlset, or a sitemap index with
+  ``/sitemap-{k}.xml`` children once the site exceeds ``sitemap_chunk`` URLs
+- soft-404 pages (200 with "page not found" copy) at ``soft_404_rate``
+- Cloudflare-style challenge pages (``Just a moment...`` /
+  ``window._cf_chl_opt``) that match the block detector's patterns, at
+  ``challenge_rate``; with ``js_challenge`` every page first serves a
+  challenge whose script sets a ``cf_clearance`` cookie and reloads, so
+  only the browser tiers get through
+- per-request latency (``latency_ms`` ± ``jitter_ms``) and random 503s at
+  ``error_rate``
+- ``/__stats`` with request counters (reset with ``?reset=1``)
+
+Usage:
+    cd backend
+    python -m benchmarks.origin --sites 3 --pages 2000 --latency-ms 40 --jitter-ms 20
+    # → http://127.0.0.1:8900/, http://127.0.0.1:8901/, http://127.0.0.1:8902/
+
+The API and workers must be able to reach the origin (same host, or
+``--host 0.0.0.0`` when they run in containers).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
+
+_WORDS = (
+    "data pipeline crawler latency throughput browser session cache request "
+    "response render extract markdown schema index content page network proxy "
+    "domain strategy signal queue worker memory budget sample metric origin "
+    "stream parser token frontier sitemap archive report system harvest"
+).split()
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    pages: int = 500
+    children: int = 4  # Tree fan-out: page n links to n*children+1 .. n*children+children
+    extra_links: int = 3  # Additional random in-site links per page
+    page_kb: float = 20.0  # Approximate visible text per page
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    soft_404_rate: float = 0.0
+    challenge_rate: float = 0.0
+    js_challenge: bool = False
+    error_rate: float = 0.0
+    sitemap_chunk: int = 1000  # URLs per sitemap file before switching to an index
+    seed: int = 1
+
+
+def _page_rng(config: SiteConfig, n: int) -> random.Random:
+    return random.Random(f"{config.seed}:{n}")
+
+
+def page_kind(config: SiteConfig, n: int) -> str:
+    """``content``, ``soft_404`` or ``challenge`` for page ``n`` (stable per seed)."""
+    if n == 0:
+        return "content"
+    roll = _page_rng(config, n).random()
+    if roll < config.challenge_rate:
+        return "challenge"
+    if roll < config.challenge_rate + config.soft_404_rate:
+        return "soft_404"
+    return "content"
+
+
+def page_links(config: SiteConfig, n: int) -> list[str]:
+    """In-site paths page ``n`` links to."""
+    first = n * config.children + 1
+    links = [f"/p/{c}" for c in range(first, min(first + config.children, config.pages))]
+    rng = _page_rng(config, n)
+    links += [f"/p/{rng.randrange(config.pages)}" for _ in range(config.extra_links)]
+    if n % 10 == 0:
+        links.append(f"/private/{n}")  # Disallowed by robots.txt
+    return links
+
+
+def _paragraphs(rng: random.Random, size: int) -> list[str]:
+    out, total = [], 0
+    while total < size:
+        text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(40, 90))).capitalize() + "."
+        out.append(text)
+        total += len(text)
+    return out
+
+
+@lru_cache(maxsize=4096)
+def render_page(config: SiteConfig, n: int) -> str:
+    rng = _page_rng(config, n)
+    title = f"Page {n} — {' '.join(rng.choice(_WORDS) for _ in range(3)).title()}"
+    body = "\n".join(f"<p>{p}</p>" for p in _paragraphs(rng, int(config.page_kb * 1024)))
+    links = "\n".join(f'<li><a href="{href}">{href}</a></li>' for href in page_links(config, n))
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<meta name="description" content="Synthetic test page {n}">
+<link rel="canonical" href="/p/{n}">
+<style>body{{font-family:sans-serif;max-width:48em;margin:auto}}</style>
+<script>window.__page = {n};</script>
+</head><body>
+<header><nav><a href="/">Home</a> | <a href="/p/{max(n - 1, 0)}">Previous</a></nav></header>
+<main><article><h1>{title}</h1>
+<h2>Overview</h2>
+{body}
+<table><tr><th>Page</th><th>Links</th></tr><tr><td>{n}</td><td>{len(page_links(config, n))}</td></tr></table>
+</article></main>
+<aside><h2>Related</h2><ul>
+{links}
+</ul></aside>
+<footer><p>Synthetic origin · seed {config.seed}</p></footer>
+</body></html>"""
+
+
+SOFT_404_HTML = """<!DOCTYPE html>
+<html><head><title>Not Found</title></head><body>
+<h1>Page not found</h1>
+<p>Sorry, we couldn't find the page you were looking for.</p>
+<p><a href="/">Back to the homepage</a></p>
+</body></html>"""
+
+# Matches the block detector's head patterns and challenge signatures
+CHALLENGE_HTML = """<!DOCTYPE html>
+<html lang="en-US"><head><title>Just a moment...</title>
+<meta http-equiv="refresh" content="30">
+<script>window._cf_chl_opt = {{cvId: "3", cType: "managed", cRay: "{ray}"}};</script>
+{script}
+</head><body>
+<div class="main-wrapper"><h1>Checking your browser before accessing the site.</h1>
+<p>This process is automatic. Your browser will redirect to your requested content shortly.</p>
+<p>Please allow up to 5 seconds…</p></div>
+<div class="footer">Ray ID: {ray} · Performance &amp; security by Cloudflare</div>
+</body></html>"""
+
+_CLEARANCE_SCRIPT = """<script>
+setTimeout(function () {
+  document.cookie = "cf_clearance=ok; path=/";
+  location.reload();
+}, 300);
+</script>"""
+
+
+def challenge_page(path: str, passable: bool) -> str:
+    ray = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return CHALLENGE_HTML.format(ray=ray, script=_CLEARANCE_SCRIPT if passable else "")
+
+
+def robots_txt(base_url: str) -> str:
+    return f"User-agent: *\nDisallow: /private/\n\nSitemap: {base_url}/sitemap.xml\n"
+
+
+def sitemap_xml(config: SiteConfig, base_url: str, chunk: int | None = None) -> str | None:
+    """The root sitemap (``chunk=None``) or one child sitemap; None if out of range."""
+    urls = [f"{base_url}/"] + [f"{base_url}/p/{n}" for n in range(1, config.pages)]
+    if chunk is None and len(urls) > config.sitemap_chunk:
+        count = -(-len(urls) // config.sitemap_chunk)
+        entries = "\n".join(
+            f"  <sitemap><loc>{base_url}/sitemap-{k}.xml</loc></sitemap>" for k in range(count)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            f"{entries}\n</sitemapindex>\n"
+        )
+    if chunk is not None:
+        urls = urls[chunk * config.sitemap_chunk : (chunk + 1) * config.sitemap_chunk]
+        if not urls:
+            return None
+    entries = "\n".join(
+        f"  <url><loc>{u}</loc><lastmod>2024-01-01</lastmod><priority>0.5</priority></url>"
+        for u in urls
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        f"{entries}\n</urlset>\n"
+    )
+
+
+def create_site(config: SiteConfig) -> FastAPI:
+    """ASGI app serving one synthetic site."""
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+    stats: Counter = Counter()
+    rng = random.Random(config.seed)
+
+    def _base(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    async def _delay() -> Response | None:
+        stats["requests"] += 1
+        if config.latency_ms or config.jitter_ms:
+            ms = max(0.0, config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms))
+            await asyncio.sleep(ms / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            stats["error"] += 1
+            return PlainTextResponse("Service Unavailable", status_code=503)
+        return None
+
+    async def _page(request: Request, n: int) -> Response:
+        error = await _delay()
+        if error:
+            return error
+        if n < 0 or n >= config.pages:
+            stats["not_found"] += 1
+            return HTMLResponse(SOFT_404_HTML, status_code=404)
+        kind = page_kind(config, n)
+        if kind == "challenge":
+            stats["challenge"] += 1
+            return HTMLResponse(challenge_page(request.url.path, passable=False), status_code=403)
+        if config.js_challenge and request.cookies.get("cf_clearance") != "ok":
+            stats["js_challenge"] += 1
+            return HTMLResponse(challenge_page(request.url.path, passable=True), status_code=503)
+        if kind == "soft_404":
+            stats["soft_404"] += 1
+            return HTMLResponse(SOFT_404_HTML)
+        stats["content"] += 1
+        return HTMLResponse(render_page(config, n))
+
+    @app.get("/")
+    async def home(request: Request):
+        return await _page(request, 0)
+
+    @app.get("/p/{n}")
+    async def page(request: Request, n: int):
+        return await _page(request, n)
+
+    @app.get("/private/{n}")
+    async def private(request: Request, n: int):
+        stats["private"] += 1
+        return await _page(request, n)
+
+    @app.get("/robots.txt")
+    async def robots(request: Request):
+        stats["robots"] += 1
+        return PlainTextResponse(robots_txt(_base(request)))
+
+    @app.get("/sitemap.xml")
+    async def sitemap(request: Request):
+        stats["sitemap"] += 1
+        return Response(sitemap_xml(config, _base(request)), media_type="application/xml")
+
+    @app.get("/sitemap-{chunk}.xml")
+    async def sitemap_chunk(request: Request, chunk: int):
+        stats["sitemap"] += 1
+        body = sitemap_xml(config, _base(request), chunk)
+        if body is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        return Response(body, media_type="application/xml")
+
+    @app.get("/__stats")
+    async def site_stats(reset: bool = False):
+        snapshot = dict(stats)
+        if reset:
+            stats.clear()
+        return JSONResponse({"config": asdict(config), "counts": snapshot})
+
+    return app
+
+
+async def serve(configs: list[SiteConfig], host: str, port: int) -> None:
+    import uvicorn
+
+    servers = [
+        uvicorn.Server(
+            uvicorn.Config(
+                create_site(config), host=host, port=port + i, log_level="warning",
+                access_log=False, lifespan="off",
+            )
+        )
+        for i, config in enumerate(configs)
+    ]
+    for i in range(len(configs)):
+        print(f"site {i}: http://{host}:{port + i}/")
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900, help="Port of the first site")
+    parser.add_argument("--sites", type=int, default=1, help="Sites to serve (one port each)")
+    defaults = SiteConfig()
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--children", type=int, default=defaults.children)
+    parser.add_argument("--extra-links", type=int, default=defaults.extra_links)
+    parser.add_argument("--page-kb", type=float, default=defaults.page_kb)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--soft-404-rate", type=float, default=defaults.soft_404_rate)
+    parser.add_argument("--challenge-rate", type=float, default=defaults.challenge_rate)
+    parser.add_argument("--js-challenge", action="store_true", help="Require a JS-set cookie on every page")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--sitemap-chunk", type=int, default=defaults.sitemap_chunk)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args(argv)
+
+    base = SiteConfig(
+        pages=args.pages,
+        children=args.children,
+        extra_links=args.extra_links,
+        page_kb=args.page_kb,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        soft_404_rate=args.soft_404_rate,
+        challenge_rate=args.challenge_rate,
+        js_challenge=args.js_challenge,
+        error_rate=args.error_rate,
+        sitemap_chunk=args.sitemap_chunk,
+        seed=args.seed,
+    )
+    configs = [replace(base, seed=base.seed + i) for i in range(args.sites)]
+    try:
+        asyncio.run(serve(configs, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -138,6 +138,8 @@ def mock_redis():
     r.lpop = AsyncMock(return_value=None)
     r.llen = AsyncMock(return_value=0)
     r.expire = AsyncMock()
+    r.hgetall = AsyncMock(return_value={})
+    r.run_script = AsyncMock(return_value=None)  # Scripted paths fall back
     return r
 
 
@@ -221,7 +223,7 @@ async def client(db_session: AsyncSession, mock_redis):
     - browser pool is mocked
     """
 
-    # Patch rate limiter to always allow — patch at every import site
+    # Patch rate limiter to always allow (endpoints go through enforce_rate_limit)
     from app.core.rate_limiter import RateLimitInfo
 
     async def _always_allow(*args, **kwargs):
@@ -232,23 +234,10 @@ async def client(db_session: AsyncSession, mock_redis):
             "app.core.rate_limiter.check_rate_limit_full",
             side_effect=_always_allow,
         ),
-        patch(
-            "app.api.v1.scrape.check_rate_limit_full",
-            side_effect=_always_allow,
-        ),
-        patch(
-            "app.api.v1.crawl.check_rate_limit_full",
-            side_effect=_always_allow,
-        ),
-        patch(
-            "app.api.v1.search.check_rate_limit_full",
-            side_effect=_always_allow,
-        ),
-        patch(
-            "app.api.v1.map.check_rate_limit_full",
-            side_effect=_always_allow,
-        ),
         patch("app.core.rate_limiter.redis_client", mock_redis),
+        patch("app.core.auth_cache.redis_client", mock_redis),
+        patch("app.services.quota.redis_client", mock_redis),
+        patch("app.services.usage_rollup.redis_client", mock_redis),
         patch("app.services.browser.browser_pool") as bp_mock,
     ):
         bp_mock.initialize = AsyncMock()
@@ -207,3 +207,70 @@ class TestCrawlStatus:
         data = resp.json()
         assert data["status"] == "pending"
         assert data["data"] == []
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination_walks_all_results(
+        self, client: AsyncClient, auth_headers, db_session: AsyncSession, test_user
+    ):
+        """next_cursor pages through every result once, ties on created_at included."""
+        job = Job(
+            id=uuid.uuid4(),
+            user_id=test_user.id,
+            type="crawl",
+            status="running",
+            config={"url": "https://example.com", "scrape_options": {"formats": ["links"]}},
+            total_pages=5,
+            completed_pages=5,
+        )
+        db_session.add(job)
+        same_time = datetime.now(timezone.utc)
+        for i in range(5):
+            db_session.add(
+                JobResult(
+                    job_id=job.id,
+                    url=f"https://example.com/{i}",
+                    markdown="# Not requested",
+                    html="<p>x</p>" if i % 2 else None,
+                    links=[f"https://example.com/{i + 1}"],
+                    created_at=same_time,
+                )
+            )
+        await db_session.flush()
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"per_page": 2, **({"cursor": cursor} if cursor else {})}
+            resp = await client.get(f"/v1/crawl/{job.id}", params=params, headers=auth_headers)
+            assert resp.status_code == 200
+            body = resp.json()
+            assert body["total_results"] == 5
+            for item in body["data"]:
+                assert "markdown" not in item
+                assert item["links"]
+                assert (item.get("html") == "available") == (item["url"][-1] in "13")
+            seen += [item["url"] for item in body["data"]]
+            pages += 1
+            cursor = body.get("next_cursor")
+            if not cursor:
+                break
+        assert pages == 3
+        assert sorted(seen) == [f"https://example.com/{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(
+        self, client: AsyncClient, auth_headers, db_session: AsyncSession, test_user
+    ):
+        job = Job(
+            id=uuid.uuid4(),
+            user_id=test_user.id,
+            type="crawl",
+            status="running",
+            config={"url": "https://example.com"},
+        )
+        db_session.add(job)
+        await db_session.flush()
+
+        resp = await client.get(
+            f"/v1/crawl/{job.id}", params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+        assert resp.status_code == 400
@@ -15,10 +15,10 @@ class TestExtractWithContent:
         """POST /v1/extract with direct content returns extracted data."""
         with (
             patch(
-                "app.api.v1.extract.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.extract.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.extract.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.extract.reserve_quota", new_callable=AsyncMock),
+            patch("app.api.v1.extract.refund_usage", new_callable=AsyncMock),
             patch(
                 "app.api.v1.extract.extract_with_llm", new_callable=AsyncMock
             ) as mock_extract,
@@ -51,10 +51,10 @@ class TestExtractWithContent:
         """POST /v1/extract with HTML content extracts data."""
         with (
             patch(
-                "app.api.v1.extract.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.extract.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.extract.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.extract.reserve_quota", new_callable=AsyncMock),
+            patch("app.api.v1.extract.refund_usage", new_callable=AsyncMock),
             patch(
                 "app.api.v1.extract.extract_with_llm", new_callable=AsyncMock
             ) as mock_extract,
@@ -91,7 +91,7 @@ class TestExtractValidation:
     async def test_extract_no_content_or_url(self, client: AsyncClient, auth_headers):
         """POST /v1/extract without content/url returns 400."""
         with patch(
-            "app.api.v1.extract.check_rate_limit_full", new_callable=AsyncMock
+            "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
         ) as mock_rl:
             mock_rl.return_value = MagicMock(
                 allowed=True, limit=100, remaining=99, reset=60
@@ -111,7 +111,7 @@ class TestExtractValidation:
     async def test_extract_no_prompt_or_schema(self, client: AsyncClient, auth_headers):
         """POST /v1/extract without prompt or schema returns 400."""
         with patch(
-            "app.api.v1.extract.check_rate_limit_full", new_callable=AsyncMock
+            "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
         ) as mock_rl:
             mock_rl.return_value = MagicMock(
                 allowed=True, limit=100, remaining=99, reset=60
@@ -146,9 +146,12 @@ class TestExtractLLMError:
         """POST /v1/extract when LLM fails returns success=false."""
         with (
             patch(
-                "app.api.v1.extract.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.extract.check_quota", new_callable=AsyncMock),
+            patch("app.api.v1.extract.reserve_quota", new_callable=AsyncMock),
+            patch(
+                "app.api.v1.extract.refund_usage", new_callable=AsyncMock
+            ) as mock_refund,
             patch(
                 "app.api.v1.extract.extract_with_llm", new_callable=AsyncMock
             ) as mock_extract,
@@ -171,6 +174,7 @@ class TestExtractLLMError:
             data = resp.json()
             assert data["success"] is False
             assert "LLM API error" in data["error"]
+            mock_refund.assert_awaited_once()
 
 
 class TestGetExtractStatus:
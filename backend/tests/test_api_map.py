@@ -1,10 +1,15 @@
 """Integration tests for /v1/map endpoints."""
 
+import json
 import uuid
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.models.job_result import JobResult
 
 
 class TestMapSite:
@@ -13,7 +18,7 @@ class TestMapSite:
         """POST /v1/map dispatches Celery task and returns job_id."""
         with (
             patch(
-                "app.api.v1.map.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
             patch("app.api.v1.map.get_cached_map", new_callable=AsyncMock) as mock_cache,
             patch("app.api.v1.map.process_map") as mock_task,
@@ -48,7 +53,7 @@ class TestMapSite:
     async def test_map_site_missing_url(self, client: AsyncClient, auth_headers):
         """POST /v1/map without url field returns 422."""
         with patch(
-            "app.api.v1.map.check_rate_limit_full", new_callable=AsyncMock
+            "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
         ) as mock_rl:
             mock_rl.return_value = MagicMock(
                 allowed=True, limit=50, remaining=49, reset=60
@@ -86,3 +91,45 @@ class TestExportMap:
         """GET /v1/map/{id}/export without auth returns 401."""
         resp = await client.get(f"/v1/map/{uuid.uuid4()}/export?format=json")
         assert resp.status_code == 401
+
+
+class TestStreamMap:
+    @pytest.mark.asyncio
+    async def test_stream_relays_live_links_then_stored_result(
+        self, client: AsyncClient, auth_headers, db_session: AsyncSession, test_user
+    ):
+        """GET /v1/map/{id}/stream relays links published while running, then the rest."""
+        job = Job(
+            id=uuid.uuid4(),
+            user_id=test_user.id,
+            type="map",
+            status="running",
+            config={"url": "https://example.com"},
+        )
+        db_session.add(job)
+        await db_session.flush()
+        links = [{"url": f"https://example.com/{i}"} for i in range(3)]
+
+        async def _lrange(key, start, end):
+            assert key == f"map:{job.id}:links"
+            # The worker finishes right after publishing the first two links
+            job.status = "completed"
+            db_session.add(JobResult(job_id=job.id, url="https://example.com", links=links))
+            await db_session.flush()
+            return [json.dumps(link) for link in links[:2]]
+
+        with patch("app.core.redis.redis_client") as redis:
+            redis.lrange = AsyncMock(side_effect=_lrange)
+            resp = await client.get(f"/v1/map/{job.id}/stream", headers=auth_headers)
+
+        assert resp.status_code == 200
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line.get("url") for line in lines[:3]] == [link["url"] for link in links]
+        assert lines[-1] == {"status": "completed"}
+        redis.lrange.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_not_found(self, client: AsyncClient, auth_headers):
+        """GET /v1/map/{id}/stream with invalid job returns 404."""
+        resp = await client.get(f"/v1/map/{uuid.uuid4()}/stream", headers=auth_headers)
+        assert resp.status_code == 404
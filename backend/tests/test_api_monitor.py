@@ -13,10 +13,9 @@ class TestCreateMonitor:
         """POST /v1/monitors creates a monitor and returns it."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.monitor.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
             patch("app.workers.monitor_worker.check_single_monitor_task") as mock_task,
         ):
             mock_rl.return_value = MagicMock(
@@ -63,9 +62,9 @@ class TestCreateMonitor:
         """POST /v1/monitors with interval < 5 returns 400."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
         ):
             mock_rl.return_value = MagicMock(
                 allowed=True, limit=30, remaining=29, reset=60
@@ -91,9 +90,9 @@ class TestCreateMonitor:
         """POST /v1/monitors with invalid notify_on returns 400."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
         ):
             mock_rl.return_value = MagicMock(
                 allowed=True, limit=30, remaining=29, reset=60
@@ -136,10 +135,9 @@ class TestListMonitors:
         """GET /v1/monitors returns created monitors."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.monitor.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
             patch("app.workers.monitor_worker.check_single_monitor_task") as mock_task,
         ):
             mock_rl.return_value = MagicMock(
@@ -180,10 +178,9 @@ class TestUpdateMonitor:
         # Create a monitor first
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.monitor.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
             patch("app.workers.monitor_worker.check_single_monitor_task") as mock_task,
         ):
             mock_rl.return_value = MagicMock(
@@ -222,10 +219,9 @@ class TestDeleteMonitor:
         """DELETE /v1/monitors/{id} removes the monitor."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.monitor.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
             patch("app.workers.monitor_worker.check_single_monitor_task") as mock_task,
         ):
             mock_rl.return_value = MagicMock(
@@ -267,10 +263,9 @@ class TestTriggerCheck:
         """POST /v1/monitors/{id}/check queues a check task."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.monitor.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
             patch("app.workers.monitor_worker.check_single_monitor_task") as mock_task,
         ):
             mock_rl.return_value = MagicMock(
@@ -308,10 +303,9 @@ class TestMonitorHistory:
         """GET /v1/monitors/{id}/history returns empty when no checks exist."""
         with (
             patch(
-                "app.api.v1.monitor.check_rate_limit_full", new_callable=AsyncMock
+                "app.core.rate_limiter.check_rate_limit_full", new_callable=AsyncMock
             ) as mock_rl,
-            patch("app.api.v1.monitor.check_quota", new_callable=AsyncMock),
-            patch("app.api.v1.monitor.increment_usage", new_callable=AsyncMock),
+            patch("app.api.v1.monitor.reserve_quota", new_callable=AsyncMock),
             patch("app.workers.monitor_worker.check_single_monitor_task") as mock_task,
         ):
             mock_rl.return_value = MagicMock(
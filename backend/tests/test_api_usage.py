@@ -1,10 +1,8 @@
 """Integration tests for /v1/usage endpoints.
 
-NOTE: The /v1/usage/stats endpoint uses func.date_trunc() which is
-PostgreSQL-specific. On the SQLite test backend this function is emulated
-but returns plain strings rather than datetime objects.  We work around
-this by patching the jobs_per_day portion of the stats endpoint where
-needed, and by directly testing the other aggregation logic.
+Stats and top domains are served from app.services.usage_rollup: rolled-up
+days plus a live aggregate over recent jobs. TestUsageRollups checks both
+halves agree.
 """
 
 import uuid
@@ -370,3 +368,76 @@ class TestTopDomains:
     async def test_top_domains_unauthenticated(self, client: AsyncClient):
         resp = await client.get("/v1/usage/top-domains")
         assert resp.status_code == 401
+
+
+# ---------------------------------------------------------------------------
+# Rollups (app.services.usage_rollup)
+# ---------------------------------------------------------------------------
+
+
+class TestUsageRollups:
+    @pytest.mark.asyncio
+    async def test_stats_live_only(
+        self, client: AsyncClient, auth_headers, db_session: AsyncSession, test_user
+    ):
+        """Without rollups everything is aggregated live."""
+        await _seed_jobs(db_session, test_user.id, count=5)
+
+        resp = await client.get("/v1/usage/stats", headers=auth_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total_jobs"] == 5
+        assert data["total_pages_scraped"] == 2 + 4 + 10
+        assert data["avg_pages_per_job"] == round(16 / 3, 1)
+        assert data["avg_duration_seconds"] == 600.0
+        assert data["jobs_by_type"] == {"scrape": 2, "crawl": 2, "batch": 1}
+        assert len(data["jobs_per_day"]) == 5
+        assert data["jobs_per_day"][0]["date"].endswith("T00:00:00+00:00")
+
+    @pytest.mark.asyncio
+    async def test_compaction_preserves_answers(
+        self, client: AsyncClient, auth_headers, db_session: AsyncSession, test_user
+    ):
+        """Stats and top domains are the same before and after rolling up."""
+        from sqlalchemy import func, select
+
+        from app.models.usage_rollup import UsageDailyRollup
+        from app.services.usage_rollup import compact
+
+        jobs = await _seed_jobs(db_session, test_user.id, count=5)
+        await _seed_job_results(
+            db_session, jobs[3].id, ["https://www.example.com/a", "https://other.com/b"]
+        )
+        await _seed_job_results(db_session, jobs[0].id, ["https://example.com/c"])
+
+        before = (await client.get("/v1/usage/stats", headers=auth_headers)).json()
+        domains_before = (await client.get("/v1/usage/top-domains", headers=auth_headers)).json()
+
+        # Days before yesterday (jobs 2-4) are settled and get rolled up
+        assert await compact(db_session) >= 3
+        rolled = (
+            await db_session.execute(select(func.sum(UsageDailyRollup.jobs)))
+        ).scalar()
+        assert rolled == 3
+
+        assert (await client.get("/v1/usage/stats", headers=auth_headers)).json() == before
+        domains_after = (await client.get("/v1/usage/top-domains", headers=auth_headers)).json()
+        assert domains_after == domains_before
+        assert domains_after["domains"][0] == {"domain": "example.com", "count": 2}
+
+    @pytest.mark.asyncio
+    async def test_rollups_outlive_deleted_jobs(
+        self, client: AsyncClient, auth_headers, db_session: AsyncSession, test_user
+    ):
+        """Expired jobs still count once their day is rolled up."""
+        from app.services.usage_rollup import compact
+
+        jobs = await _seed_jobs(db_session, test_user.id, count=5)
+        await compact(db_session)
+        await db_session.delete(jobs[4])
+        await db_session.flush()
+
+        data = (await client.get("/v1/usage/stats", headers=auth_headers)).json()
+        assert data["total_jobs"] == 5
+        history = (await client.get("/v1/usage/history", headers=auth_headers)).json()
+        assert history["total"] == 4
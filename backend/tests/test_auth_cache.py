@@ -0,0 +1,135 @@
+"""Unit tests for app.core.auth_cache — cached token resolution and batched last_used_at."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.core import auth_cache
+from app.models.api_key import ApiKey
+from app.services.auth import (
+    create_api_key_for_user,
+    flush_api_key_last_used,
+    get_user_by_api_key,
+    get_user_by_id,
+    revoke_api_key,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+
+@pytest.fixture(autouse=True)
+def fake_redis():
+    fake = _FakeRedis()
+    auth_cache.clear_local()
+    auth_cache.drain_api_key_uses()
+    with patch.object(auth_cache, "redis_client", fake):
+        yield fake
+    auth_cache.clear_local()
+    auth_cache.drain_api_key_uses()
+
+
+def _count_queries(db_session):
+    calls = []
+    original = db_session.execute
+
+    async def _execute(*args, **kwargs):
+        calls.append(args[0])
+        return await original(*args, **kwargs)
+
+    return calls, patch.object(db_session, "execute", _execute)
+
+
+class TestUserLookup:
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_database(self, db_session, test_user):
+        calls, spy = _count_queries(db_session)
+        with spy:
+            first = await get_user_by_id(db_session, test_user.id)
+            second = await get_user_by_id(db_session, test_user.id)
+        assert len(calls) == 1
+        assert first is test_user
+        assert second.id == test_user.id
+        assert second.email == test_user.email
+        assert second.created_at == test_user.created_at
+
+    @pytest.mark.asyncio
+    async def test_redis_serves_other_processes(self, db_session, test_user):
+        await get_user_by_id(db_session, test_user.id)
+        auth_cache.clear_local()  # as seen by another API process
+        calls, spy = _count_queries(db_session)
+        with spy:
+            user = await get_user_by_id(db_session, test_user.id)
+        assert not calls
+        assert user.name == test_user.name
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user(self, db_session, test_user):
+        await get_user_by_id(db_session, test_user.id)
+        test_user.is_verified = True
+        await auth_cache.invalidate_user(test_user.id)
+        user = await get_user_by_id(db_session, test_user.id)
+        assert user.is_verified
+
+
+class TestApiKeyLookup:
+    @pytest.mark.asyncio
+    async def test_cached_key_resolution(self, db_session, test_user):
+        full_key, _ = await create_api_key_for_user(db_session, test_user.id)
+        await get_user_by_api_key(db_session, full_key)
+        calls, spy = _count_queries(db_session)
+        with spy:
+            user = await get_user_by_api_key(db_session, full_key)
+        assert not calls
+        assert user.id == test_user.id
+
+    @pytest.mark.asyncio
+    async def test_revoke_invalidates(self, db_session, test_user):
+        full_key, api_key = await create_api_key_for_user(db_session, test_user.id)
+        assert await get_user_by_api_key(db_session, full_key)
+        assert await revoke_api_key(db_session, test_user.id, api_key.id)
+        assert await get_user_by_api_key(db_session, full_key) is None
+
+    @pytest.mark.asyncio
+    async def test_last_used_written_in_batches(self, db_session, test_user):
+        full_key, api_key = await create_api_key_for_user(db_session, test_user.id)
+        for _ in range(3):
+            await get_user_by_api_key(db_session, full_key)
+        assert api_key.last_used_at is None
+
+        @asynccontextmanager
+        async def _session():
+            yield db_session
+
+        assert await flush_api_key_last_used(_session) == 1
+        assert await flush_api_key_last_used(_session) == 0
+        result = await db_session.execute(
+            select(ApiKey.last_used_at).where(ApiKey.id == api_key.id)
+        )
+        assert result.scalar_one() is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self, test_user):
+        auth_cache.record_api_key_use(test_user.id)
+
+        @asynccontextmanager
+        async def _broken():
+            raise RuntimeError("db down")
+            yield
+
+        assert await flush_api_key_last_used(_broken) == 0
+        assert test_user.id in auth_cache.drain_api_key_uses()
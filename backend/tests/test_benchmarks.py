@@ -0,0 +1,54 @@
+"""Unit tests for benchmarks.hotpath — timing, percentiles and baseline comparison."""
+
+from benchmarks.hotpath import Case, Page, _percentile, build_cases, compare, measure
+
+
+class TestMeasure:
+    def test_respects_iteration_bounds(self):
+        calls = []
+        case = Case("noop", lambda: calls.append(1), items=10, input_bytes=1000)
+        result = measure(case, min_iterations=4, min_seconds=0.0, max_iterations=50, warmup=2)
+        # warmup + timed iterations + one tracemalloc run
+        assert result["iterations"] == 4
+        assert len(calls) == 2 + 4 + 1
+        assert result["p50_ms"] <= result["p99_ms"]
+        assert result["ops_per_sec"] > 0
+        assert "mb_per_sec" in result
+        assert result["peak_mem_kb"] >= 0
+
+    def test_max_iterations_caps_min_time(self):
+        result = measure(Case("noop", lambda: None), min_iterations=1, min_seconds=60, max_iterations=7)
+        assert result["iterations"] == 7
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert _percentile(values, 50) == 50
+        assert _percentile(values, 99) == 99
+        assert _percentile([3.0], 99) == 3.0
+        assert _percentile([], 50) == 0.0
+
+
+class TestCompare:
+    def test_flags_only_regressions_past_threshold(self):
+        results = {"cases": {"a": {"p50_ms": 13.0}, "b": {"p50_ms": 11.0}, "new": {"p50_ms": 1.0}}}
+        baseline = {"cases": {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}}}
+        regressions = compare(results, baseline, threshold=1.25)
+        assert [r["case"] for r in regressions] == ["a"]
+        assert results["cases"]["b"]["ratio"] == 1.1
+        assert "ratio" not in results["cases"]["new"]
+
+
+class TestCases:
+    def test_cases_run_on_small_page(self):
+        html = (
+            "<html><head><title>T</title></head><body><main><h1>Hello</h1>"
+            "<p>Some text <a href='/a?b=1&utm_source=x'>link</a></p>"
+            "<table><tr><th>h</th></tr><tr><td>1</td></tr></table></main></body></html>"
+        )
+        cases = build_cases([Page("tiny", "https://example.com/", html)])
+        names = {c.name for c in cases}
+        assert "extract_content[markdown]/tiny" in names
+        assert "looks_blocked/tiny" in names
+        assert "normalize_url" in names
+        for case in cases:
+            case.fn()
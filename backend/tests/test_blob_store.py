@@ -0,0 +1,258 @@
+"""Unit tests for app.services.blob_store — content-addressed payload storage."""
+
+import io
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.job import Job
+from app.models.job_result import JobResult
+from app.services import blob_store
+from app.services.blob_store import (
+    LocalBlobStore,
+    S3BlobStore,
+    compress,
+    decompress,
+    digest_of,
+    hydrate_results,
+    offload_result,
+    sweep_orphans,
+)
+
+BIG_MARKDOWN = "# Heading\n\n" + "Some repeated paragraph text. " * 2000
+BIG_HTML = "<html><body>" + "<p>Block of page markup.</p>" * 2000 + "</body></html>"
+
+
+@pytest.fixture
+def local_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BLOB_STORE_BACKEND", "local")
+    monkeypatch.setattr(settings, "BLOB_STORE_PATH", str(tmp_path / "blobs"))
+    monkeypatch.setattr(settings, "BLOB_STORE_MIN_BYTES", 1024)
+    monkeypatch.setattr(blob_store, "_store", None)
+    yield blob_store.get_blob_store()
+    blob_store._store = None
+
+
+class _MissingKey(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class _FakeS3:
+    """Dict-backed stand-in for the handful of boto3 S3 calls used."""
+
+    def __init__(self):
+        self.objects: dict[str, tuple[bytes, datetime]] = {}
+        self.puts = 0
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _MissingKey()
+        return {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.puts += 1
+        self.objects[Key] = (Body, datetime.now(timezone.utc))
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _MissingKey()
+        return {"Body": io.BytesIO(self.objects[Key][0])}
+
+    def copy_object(self, Bucket, Key, CopySource, MetadataDirective):
+        body, _ = self.objects[CopySource["Key"]]
+        self.objects[Key] = (body, datetime.now(timezone.utc))
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def get_paginator(self, name):
+        fake = self
+
+        class _Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {
+                    "Contents": [
+                        {"Key": key, "LastModified": modified}
+                        for key, (_, modified) in fake.objects.items()
+                        if key.startswith(Prefix)
+                    ]
+                }
+
+        return _Paginator()
+
+
+class TestCodec:
+    def test_roundtrip_and_digest(self):
+        data = BIG_MARKDOWN.encode()
+        packed = compress(data)
+        assert len(packed) < len(data) // 10
+        assert decompress(packed) == data
+        assert digest_of(data) == digest_of(BIG_MARKDOWN.encode())
+
+
+class TestBackends:
+    def test_incomplete_backend_fails_at_construction(self):
+        class ReadOnlyStore(blob_store.BlobStore):
+            def _read(self, digest):
+                return None
+
+        with pytest.raises(TypeError, match="abstract"):
+            ReadOnlyStore()
+
+    @pytest.mark.asyncio
+    async def test_local_put_get_dedup(self, tmp_path):
+        store = LocalBlobStore(tmp_path)
+        digest = await store.put(b"payload")
+        assert await store.put(b"payload") == digest
+        assert len(list(tmp_path.glob("??/??/*"))) == 1
+        assert await store.get(digest) == b"payload"
+        assert await store.get("0" * 64) is None
+        await store.delete(digest)
+        assert await store.get(digest) is None
+
+    @pytest.mark.asyncio
+    async def test_s3_put_get_dedup(self):
+        client = _FakeS3()
+        store = S3BlobStore("bucket", prefix="blobs/", client=client)
+        digest = await store.put(b"payload")
+        await store.put(b"payload")
+        assert client.puts == 1
+        assert list(client.objects) == [f"blobs/{digest}"]
+        assert await store.get(digest) == b"payload"
+        assert await store.get("0" * 64) is None
+        assert await store.list_older_than(time.time() + 60) == [digest]
+
+
+class TestOffloadAndHydrate:
+    @pytest.mark.asyncio
+    async def test_disabled_keeps_payload_inline(self, monkeypatch):
+        monkeypatch.setattr(settings, "BLOB_STORE_BACKEND", "")
+        r = JobResult(job_id=uuid.uuid4(), url="https://example.com", markdown=BIG_MARKDOWN)
+        await offload_result(r)
+        assert r.markdown == BIG_MARKDOWN
+        assert r.blobs is None
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_through_db(self, local_store, db_session, test_user):
+        job = Job(id=uuid.uuid4(), user_id=test_user.id, type="crawl", status="completed", config={})
+        db_session.add(job)
+        rows = []
+        for _ in range(2):  # Same page twice — stored once
+            r = JobResult(
+                job_id=job.id,
+                url="https://example.com",
+                markdown=BIG_MARKDOWN,
+                html=BIG_HTML,
+                screenshot_url="tiny",
+            )
+            await offload_result(r)
+            rows.append(r)
+        db_session.add_all(rows)
+        await db_session.flush()
+
+        assert rows[0].markdown is None and rows[0].html is None
+        assert rows[0].screenshot_url == "tiny"  # Under BLOB_STORE_MIN_BYTES
+        assert rows[0].blobs == rows[1].blobs
+        assert set(rows[0].blobs) == {"markdown", "html"}
+        assert len(await local_store.list_older_than(time.time() + 60)) == 2
+
+        db_session.expunge_all()
+        loaded = (
+            await db_session.execute(select(JobResult).where(JobResult.job_id == job.id))
+        ).scalars().all()
+        await hydrate_results(loaded, fields=("markdown",))
+        assert loaded[0].markdown == BIG_MARKDOWN
+        assert loaded[0].html is None
+        assert not db_session.dirty
+
+    @pytest.mark.asyncio
+    async def test_sweep_deletes_only_unreferenced(self, local_store, db_session, test_user):
+        job = Job(id=uuid.uuid4(), user_id=test_user.id, type="crawl", status="completed", config={})
+        r = JobResult(job_id=job.id, url="https://example.com", markdown=BIG_MARKDOWN)
+        await offload_result(r)
+        db_session.add_all([job, r])
+        await db_session.flush()
+        orphan = await local_store.put(b"x" * 2048)
+        fresh = await local_store.put(b"y" * 2048)
+
+        old = time.time() - 7200
+        for digest in (orphan, r.blobs["markdown"]):
+            os.utime(local_store._path(digest), (old, old))
+
+        deleted = await sweep_orphans(db_session, local_store, grace_seconds=3600)
+        assert deleted == 1
+        assert await local_store.get(orphan) is None
+        assert await local_store.get(fresh) is not None
+        assert await local_store.get(r.blobs["markdown"]) is not None
+
+
+class TestCrawlEndpoints:
+    @staticmethod
+    async def _crawl_with_blobs(db_session, test_user):
+        job = Job(
+            id=uuid.uuid4(),
+            user_id=test_user.id,
+            type="crawl",
+            status="completed",
+            config={"url": "https://example.com"},
+            total_pages=2,
+            completed_pages=2,
+        )
+        db_session.add(job)
+        for i in range(2):
+            r = JobResult(
+                job_id=job.id,
+                url=f"https://example.com/{i}",
+                markdown=BIG_MARKDOWN + str(i),
+                html=BIG_HTML,
+                metadata_={"title": f"Page {i}", "status_code": 200},
+            )
+            await offload_result(r)
+            db_session.add(r)
+        await db_session.flush()
+        db_session.expunge_all()
+        return job
+
+    @pytest.mark.asyncio
+    async def test_status_hydrates_markdown(
+        self, local_store, client, auth_headers, db_session, test_user
+    ):
+        job = await self._crawl_with_blobs(db_session, test_user)
+        resp = await client.get(f"/v1/crawl/{job.id}", headers=auth_headers)
+        pages = resp.json()["data"]
+        assert pages[0]["markdown"] == BIG_MARKDOWN + "0"
+        assert pages[0]["html"] == "available"
+
+    @pytest.mark.asyncio
+    async def test_json_export_streams_hydrated_pages(
+        self, local_store, client, auth_headers, db_session, test_user
+    ):
+        job = await self._crawl_with_blobs(db_session, test_user)
+        resp = await client.get(
+            f"/v1/crawl/{job.id}/export", params={"format": "json"}, headers=auth_headers
+        )
+        pages = json.loads(resp.text)
+        assert [p["markdown"] for p in pages] == [BIG_MARKDOWN + "0", BIG_MARKDOWN + "1"]
+        assert pages[1]["html"] == BIG_HTML
+        assert resp.text == json.dumps(pages, indent=2, ensure_ascii=False)
+
+    @pytest.mark.asyncio
+    async def test_zip_export_includes_blob_content(
+        self, local_store, client, auth_headers, db_session, test_user
+    ):
+        import zipfile
+
+        job = await self._crawl_with_blobs(db_session, test_user)
+        resp = await client.get(f"/v1/crawl/{job.id}/export", headers=auth_headers)
+        with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+            names = zf.namelist()
+            full = json.loads(zf.read("full_data.json"))
+            first_md = zf.read(next(n for n in names if n.endswith("content.md"))).decode()
+        assert first_md == BIG_MARKDOWN + "0"
+        assert len(full) == 2 and full[1]["html"] == BIG_HTML
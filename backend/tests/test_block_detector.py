@@ -0,0 +1,128 @@
+"""Unit tests for app.services.block_detector — block-page detection."""
+
+from app.services.block_detector import (
+    REASON_AMAZON_INTERSTITIAL,
+    REASON_CHALLENGE_ELEMENT,
+    REASON_EMPTY,
+    REASON_HEAD_PATTERN,
+    REASON_NOSCRIPT,
+    REASON_SOFT_404,
+    REASON_STRONG_PATTERN,
+    detect_block,
+    find_challenge_signature,
+    get_vendor_block,
+    looks_noscript_block,
+    visible_body_text,
+)
+from app.services.scraper import _looks_blocked, get_block_reason
+
+
+def _page(body: str, head: str = "<title>Shop</title>") -> str:
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+
+ARTICLE = "<p>" + "Real article content about gardening. " * 120 + "</p>"
+
+
+class TestVisibleBodyText:
+    def test_strips_hidden_blocks_and_tags(self):
+        html = _page(
+            "<script>var x = '<p>hidden</p>';</script><style>p{}</style>"
+            "<noscript>Enable JS</noscript><div>Hello   <b>World</b></div>"
+        )
+        text, truncated = visible_body_text(html)
+        assert text == "hello world"
+        assert not truncated
+
+    def test_without_body_uses_whole_document(self):
+        text, _ = visible_body_text("<title>Only Title</title><p>x</p>")
+        assert text == "only title x"
+
+    def test_limit_stops_early(self):
+        paragraphs = "<p>Twenty characters.</p>" * 500
+        text, truncated = visible_body_text(_page(paragraphs), limit=100)
+        assert truncated
+        assert 100 < len(text) < 130
+
+
+class TestDetectBlock:
+    def test_empty(self):
+        assert detect_block("").reason == REASON_EMPTY
+        assert _looks_blocked("")
+
+    def test_real_content_not_blocked(self):
+        check = detect_block(_page(ARTICLE + "<footer>captcha policy</footer>"))
+        assert not check
+        assert check.reason is None
+
+    def test_cloudflare_challenge(self):
+        check = detect_block(
+            _page("<h1>Just a moment...</h1><p>Checking your browser</p>",
+                  head="<title>Just a moment...</title>")
+        )
+        assert check.reason == REASON_CHALLENGE_ELEMENT
+        assert check.pattern == "<title>just a moment...</title>"
+
+    def test_medium_page_only_strong_patterns(self):
+        filler = "<p>" + "Some product text here. " * 45 + "</p>"
+        assert not detect_block(_page(filler + "<p>solve the captcha</p>"))
+        check = detect_block(_page(filler + "<p>robot or human?</p>"))
+        assert check.reason == REASON_STRONG_PATTERN
+
+    def test_challenge_element_on_large_page(self):
+        check = detect_block(_page(ARTICLE + '<div id="px-captcha"></div>'))
+        assert check.reason == REASON_CHALLENGE_ELEMENT
+
+    def test_challenge_element_any_case(self):
+        # Past the signature window, so only the element check can see it
+        check = detect_block(_page(ARTICLE * 20 + '<div class="Human-Challenge"></div>'))
+        assert check.reason == REASON_CHALLENGE_ELEMENT
+        assert check.pattern == "human-challenge"
+
+    def test_challenge_signature_in_head(self):
+        html = _page(ARTICLE, head="<script>window._cf_chl_opt={}</script>")
+        assert find_challenge_signature(html) == "window._cf_chl_opt"
+        assert detect_block(html).reason == REASON_CHALLENGE_ELEMENT
+        assert find_challenge_signature(_page(ARTICLE)) is None
+
+    def test_head_pattern(self):
+        filler = "<p>" + "Catalogue listing text. " * 45 + "</p>"
+        html = _page(filler, head="<title>Please enable JavaScript</title>")
+        assert detect_block(html).reason == REASON_HEAD_PATTERN
+
+    def test_noscript_short_body(self):
+        html = _page("<noscript>x</noscript><div>Loading</div>")
+        assert detect_block(html).reason == REASON_NOSCRIPT
+        assert looks_noscript_block(html)
+        assert not looks_noscript_block(_page(ARTICLE + "<noscript></noscript>"))
+
+    def test_amazon_interstitial(self):
+        html = _page("<a>Continue shopping</a><a>Conditions of Use</a>")
+        assert detect_block(html).reason == REASON_AMAZON_INTERSTITIAL
+
+    def test_soft_404(self):
+        html = _page("<h1>Page not found</h1><p>Try the homepage.</p>")
+        check = detect_block(html)
+        assert check.reason == REASON_SOFT_404
+        assert check.pattern == "page not found"
+        assert get_block_reason(html).startswith("Page not found")
+
+
+class TestVendor:
+    def test_vendor_priority(self):
+        assert get_vendor_block("Cloudflare Ray ID: 1 captcha") == "cloudflare"
+        assert get_vendor_block("<div>hCaptcha</div>") == "captcha"
+        assert get_vendor_block("blocked by DataDome") == "datadome"
+        assert get_vendor_block("<h1>Access Denied</h1>") == "access_denied"
+        assert get_vendor_block("hello") is None
+        assert get_vendor_block(None) is None
+
+    def test_block_reason_messages(self):
+        assert get_block_reason("", 429).startswith("Rate limited")
+        assert get_block_reason("x", 403).startswith("Access denied")
+        assert get_block_reason("Please enable JavaScript", 200).startswith(
+            "JavaScript required"
+        )
+        assert get_block_reason(_page(ARTICLE), 200).startswith(
+            "All scraping strategies failed"
+        )
@@ -0,0 +1,137 @@
+"""Unit tests for the warm BrowserContext pool in app.services.browser."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.browser import BrowserPool, _WarmContext, _build_context_options
+
+
+def _fake_browser():
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+
+    async def _new_context(**kwargs):
+        ctx = MagicMock()
+        ctx.kwargs = kwargs
+        ctx.route = AsyncMock()
+        ctx.add_init_script = AsyncMock()
+        ctx.close = AsyncMock()
+        return ctx
+
+    browser.new_context = AsyncMock(side_effect=_new_context)
+    return browser
+
+
+def _pool_with_browser():
+    pool = BrowserPool()
+    pool._chromium = _fake_browser()
+    pool._initialized = True
+    return pool
+
+
+class TestBuildContextOptions:
+    def test_chromium_options_consistent_with_ua(self):
+        kwargs, script = _build_context_options(is_firefox=False)
+        assert "Chrome/" in kwargs["user_agent"]
+        version = kwargs["user_agent"].split("Chrome/")[1].split(".")[0]
+        assert f'v="{version}"' in kwargs["extra_http_headers"]["Sec-Ch-Ua"]
+        assert "navigator" in script
+
+    def test_firefox_options(self):
+        kwargs, script = _build_context_options(is_firefox=True)
+        assert "Firefox/" in kwargs["user_agent"]
+        assert "Sec-Ch-Ua" not in kwargs["extra_http_headers"]
+        assert script
+
+
+class TestWarmContextPool:
+    @pytest.mark.asyncio
+    async def test_refill_creates_contexts_per_mode(self):
+        pool = _pool_with_browser()
+        with patch("app.services.browser.settings.BROWSER_CONTEXT_POOL_SIZE", 2):
+            await pool._refill_warm_contexts()
+        assert len(pool._warm_contexts[(False, False)]) == 2
+        assert len(pool._warm_contexts[(False, True)]) == 2
+        # Stealth contexts get the init script, light ones don't
+        stealth_ctx = pool._warm_contexts[(False, True)][0].context
+        light_ctx = pool._warm_contexts[(False, False)][0].context
+        stealth_ctx.add_init_script.assert_awaited_once()
+        light_ctx.add_init_script.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_take_prefers_same_domain(self):
+        pool = _pool_with_browser()
+        browser = pool._chromium
+        fresh = _WarmContext(MagicMock(), browser, False, True)
+        bound = _WarmContext(MagicMock(), browser, False, True)
+        bound.domain = "example.com"
+        pool._warm_contexts[(False, True)] = [fresh, bound]
+
+        with patch.object(pool, "_schedule_refill"):
+            taken = pool._take_warm_context(
+                browser, False, True, "https://example.com/page"
+            )
+        assert taken is bound
+        assert pool._warm_contexts[(False, True)] == [fresh]
+
+    @pytest.mark.asyncio
+    async def test_domain_change_recycles_bound_context(self):
+        pool = _pool_with_browser()
+        browser = pool._chromium
+        bound = _WarmContext(MagicMock(), browser, False, True)
+        bound.context.close = AsyncMock()
+        bound.domain = "other.com"
+        pool._warm_contexts[(False, True)] = [bound]
+
+        with patch.object(pool, "_schedule_refill"):
+            taken = pool._take_warm_context(
+                browser, False, True, "https://example.com/"
+            )
+        assert taken is None
+        assert pool._warm_contexts[(False, True)] == []
+
+    @pytest.mark.asyncio
+    async def test_stale_browser_contexts_dropped(self):
+        pool = _pool_with_browser()
+        old = _WarmContext(MagicMock(), _fake_browser(), False, False)
+        old.context.close = AsyncMock()
+        pool._warm_contexts[(False, False)] = [old]
+
+        with patch.object(pool, "_schedule_refill"):
+            taken = pool._take_warm_context(
+                pool._chromium, False, False, "https://example.com/"
+            )
+        assert taken is None
+        assert pool._warm_contexts[(False, False)] == []
+
+    def test_return_binds_domain_and_respects_max_uses(self):
+        pool = _pool_with_browser()
+        warm = _WarmContext(MagicMock(), pool._chromium, False, False)
+        with (
+            patch("app.services.browser.settings.BROWSER_CONTEXT_POOL_SIZE", 2),
+            patch("app.services.browser.settings.BROWSER_CONTEXT_MAX_USES", 2),
+        ):
+            assert pool._return_warm_context(warm, "https://example.com/a")
+            assert warm.domain == "example.com"
+            pool._warm_contexts[(False, False)].remove(warm)
+            # Second use hits the max — must be closed, not pooled
+            assert not pool._return_warm_context(warm, "https://example.com/b")
+
+    def test_return_rejected_when_pool_full(self):
+        pool = _pool_with_browser()
+        pool._warm_contexts[(False, False)] = [
+            _WarmContext(MagicMock(), pool._chromium, False, False)
+        ]
+        warm = _WarmContext(MagicMock(), pool._chromium, False, False)
+        with patch("app.services.browser.settings.BROWSER_CONTEXT_POOL_SIZE", 1):
+            assert not pool._return_warm_context(warm, "https://example.com/")
+
+    def test_drop_clears_pool(self):
+        pool = _pool_with_browser()
+        pool._warm_contexts[(False, False)] = [
+            _WarmContext(MagicMock(), pool._chromium, False, False)
+        ]
+        pool._drop_warm_contexts()
+        assert pool._warm_contexts == {}
+        assert pool._refill_task is None
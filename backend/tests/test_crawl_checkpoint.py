@@ -0,0 +1,128 @@
+"""Unit tests for crawl checkpoint/resume — WebCrawler.export_state/restore_state."""
+
+import json
+
+import pytest
+
+from app.schemas.crawl import CrawlRequest
+from app.services.crawler import WebCrawler
+from app.services.deep_crawl.strategies import BestFirstStrategy, BFSStrategy, DFSStrategy
+
+fakeredis = pytest.importorskip("fakeredis")
+
+URLS = [f"https://example.com/p{i}" for i in range(3)]
+
+
+def _memory_crawler() -> WebCrawler:
+    crawler = WebCrawler("job-1", CrawlRequest(url="https://example.com"))
+    crawler._init_memory_strategy()
+    crawler._strategy.seed(crawler.base_url)
+    return crawler
+
+
+def _redis_crawler(client, worker_id: str | None = None) -> WebCrawler:
+    crawler = WebCrawler("job-1", CrawlRequest(url="https://example.com"), worker_id=worker_id)
+    crawler._redis = client
+    crawler._use_redis = True
+    return crawler
+
+
+class TestStrategyFrontier:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cls", [BFSStrategy, DFSStrategy, BestFirstStrategy])
+    async def test_roundtrip_keeps_pop_order(self, cls):
+        strategy = cls(max_depth=3, max_pages=100)
+        strategy.seed("https://example.com")
+        await strategy.add_discovered_urls(URLS, "https://example.com", 1)
+        expected = [item.url for item in strategy._frontier_items()]
+
+        # Through JSON, like a checkpoint stored on the job row
+        state = json.loads(json.dumps(strategy.export_state()))
+        restored = cls(max_depth=3, max_pages=100)
+        restored.restore_state(state)
+
+        popped = []
+        while batch := await restored.get_next_urls():
+            popped += [item.url for item in batch]
+        assert popped == expected
+        assert len(popped) == 4
+
+
+class TestMemoryCheckpoint:
+    @pytest.mark.asyncio
+    async def test_in_flight_urls_are_requeued(self):
+        crawler = _memory_crawler()
+        url, depth = await crawler.get_next_url()
+        await crawler.claim(url, depth)
+        await crawler.add_to_frontier(URLS, 1)
+        done, _ = await crawler.get_next_url()
+        await crawler.claim(done, 1)
+        await crawler.release(done)
+
+        state = json.loads(json.dumps(crawler.export_state()))
+        resumed = _memory_crawler()
+        assert await resumed.restore_state(state) is True
+
+        assert await resumed.is_visited(done)
+        assert not await resumed.is_visited(url)
+        assert await resumed.get_next_url() == (url, 0)
+        assert await resumed.get_frontier_size() == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_checkpoint_not_restorable_in_memory(self):
+        assert await _memory_crawler().restore_state({"use_redis": True}) is False
+
+
+class TestRedisCheckpoint:
+    @pytest.mark.asyncio
+    async def test_restore_requeues_in_flight(self):
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        crawler = _redis_crawler(client)
+        await crawler._redis_add_urls([(u, 1) for u in URLS])
+        url, depth = await crawler.get_next_url()
+        await crawler.claim(url, depth)
+        done, _ = await crawler.get_next_url()
+        await crawler.claim(done, 1)
+        await crawler.release(done)
+        state = crawler.export_state()
+        await crawler.cleanup(keep_state=True)
+
+        resumed = _redis_crawler(client)
+        assert await resumed.restore_state(state) is True
+        assert not await resumed.is_visited(url)
+        assert await resumed.is_visited(done)
+        assert await resumed.get_frontier_size() == 2
+        assert await client.hlen(resumed._key_inflight) == 0
+
+        await resumed.cleanup()
+        assert not await client.exists(resumed._key_frontier, resumed._key_visited)
+
+    @pytest.mark.asyncio
+    async def test_restore_leaves_live_helpers_claims(self):
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        coordinator = _redis_crawler(client, "task-1")
+        await coordinator._redis_add_urls([(u, 1) for u in URLS])
+        helper = _redis_crawler(client, "helper-1")
+        await helper.register_worker("helper-1")
+        gone = _redis_crawler(client, "helper-2")  # Unregistered: its worker died
+        claims = []
+        for crawler in (coordinator, helper, gone):
+            url, depth = await crawler.get_next_url()
+            await crawler.claim(url, depth)
+            claims.append(url)
+        own, busy, dead = claims
+        state = coordinator.export_state()
+
+        resumed = _redis_crawler(client, "task-1")
+        assert await resumed.restore_state(state) is True
+        assert await client.hkeys(resumed._key_inflight) == [busy]
+        assert await resumed.is_visited(busy)
+        assert not await resumed.is_visited(own)
+        assert not await resumed.is_visited(dead)
+        assert await resumed.get_frontier_size() == 2
+
+    @pytest.mark.asyncio
+    async def test_lost_state_is_reported(self):
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        crawler = _redis_crawler(client)
+        assert await crawler.restore_state(crawler.export_state()) is False
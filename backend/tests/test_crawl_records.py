@@ -0,0 +1,81 @@
+"""Unit tests for app.services.crawl_records — compact crawl page records."""
+
+import uuid
+
+from app.schemas.scrape import PageMetadata, ScrapeData, ScrapeRequest
+from app.services.crawl_records import FetchedPage, PageRecord
+from app.services.scraper import extract_content, extract_fields
+
+HTML = """
+<html><head><title>Widgets</title></head><body>
+<h1>All about widgets</h1>
+<p>Widgets are small mechanical parts used in many machines and devices.</p>
+<a href="/a">A</a> <a href="https://example.com/b">B</a>
+</body></html>
+"""
+URL = "https://example.com/"
+
+
+class TestFetchedPage:
+    def test_take_html_releases_buffer(self):
+        request = ScrapeRequest(url=URL)
+        page = FetchedPage(URL, 1, {"raw_html": HTML, "status_code": 200, "request": request})
+        assert page.take_html() == HTML
+        assert page.raw_html is None
+        assert page.take_html() == ""
+        assert page.response_headers == {} and page.action_screenshots == []
+
+
+class TestPageRecord:
+    def test_keeps_only_requested_formats(self):
+        fields = {
+            "markdown": "one two three",
+            "html": "<p>one two three</p>",
+            "links": ["https://example.com/a"],
+            "links_detail": {"internal": 1},
+            "headings": [{"level": 1, "text": "x"}],
+            "product_data": {"name": "Widget"},
+            "content_hash": "abc",
+        }
+        record = PageRecord(URL, 2, fields, {"title": "T", "description": None}, {"markdown"})
+
+        assert record.markdown == "one two three"
+        assert record.html is None and record.links is None
+        # The frontier still gets the links and the skip check the word count
+        assert record.discovered_links == ["https://example.com/a"]
+        assert record.word_count == 3
+        assert record.metadata == {"title": "T", "product_data": {"name": "Widget"}, "content_hash": "abc"}
+        assert record.wants_screenshot({"markdown"}) is False
+        assert record.wants_screenshot(set()) is True
+
+    def test_to_job_result(self):
+        record = PageRecord(URL, 0, {"markdown": "hi"}, {}, set())
+        record.extract = {"k": "v"}
+        job_id = uuid.uuid4()
+        result = record.to_job_result(job_id)
+        assert (result.job_id, result.url, result.markdown) == (job_id, URL, "hi")
+        assert result.extract == {"k": "v"}
+        assert result.metadata_ is None
+
+    def test_from_scrape_data(self):
+        data = ScrapeData(
+            markdown="a b", html="<p>a b</p>", tables=[{"rows": []}],
+            metadata=PageMetadata(title="T", source_url=URL, status_code=200),
+        )
+        record = PageRecord.from_scrape_data(URL, 0, data, {"html", "tables"})
+        assert record.markdown is None and record.html == "<p>a b</p>"
+        assert record.metadata["tables"] == [{"rows": []}]
+        assert record.metadata["title"] == "T"
+
+
+class TestExtractFields:
+    def test_matches_extract_content(self):
+        request = ScrapeRequest(url=URL, formats=["markdown", "links", "headings"])
+        fields, metadata = extract_fields(HTML, URL, request, 200, {}, None)
+        scrape_data = extract_content(HTML, URL, request, 200, {}, None)
+
+        assert fields.keys() <= {"markdown", "links", "links_detail", "headings", "content_hash"}
+        assert fields["markdown"] == scrape_data.markdown
+        assert fields["links"] == scrape_data.links
+        assert fields.get("content_hash") == scrape_data.content_hash
+        assert PageMetadata(**metadata) == scrape_data.metadata
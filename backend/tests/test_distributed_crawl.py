@@ -0,0 +1,115 @@
+"""Unit tests for distributed crawls — several workers on one shared frontier."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.redis import ResilientRedis
+from app.models.job import Job
+from app.schemas.crawl import CrawlRequest
+from app.services.crawler import WebCrawler
+from app.workers.crawl_worker import _fetch_batch, _reserve_page
+
+fakeredis = pytest.importorskip("fakeredis")
+
+URLS = [f"https://example.com/p{i}" for i in range(20)]
+
+
+@pytest.fixture
+def redis():
+    client = ResilientRedis()
+    client._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
+def _worker(redis, strategy: str = "bfs") -> WebCrawler:
+    crawler = WebCrawler(
+        "job-1", CrawlRequest(url="https://example.com", crawl_strategy=strategy)
+    )
+    crawler._redis = redis
+    crawler._use_redis = True
+    return crawler
+
+
+class TestSharedFrontier:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strategy", ["bfs", "bff"])
+    async def test_workers_never_claim_the_same_url(self, redis, strategy):
+        workers = [_worker(redis, strategy) for _ in range(3)]
+        # Duplicates on the frontier (discovered by two pages) are claimed once
+        await workers[0]._redis_add_urls([(u, 1) for u in URLS + URLS[:5]])
+
+        async def drain(crawler):
+            claimed = []
+            while item := await crawler.claim_next_url():
+                claimed.append(item[0])
+                await asyncio.sleep(0)
+            return claimed
+
+        results = await asyncio.gather(*(drain(w) for w in workers))
+        claimed = [url for urls in results for url in urls]
+        assert sorted(claimed) == sorted(URLS)
+        assert await workers[0].in_flight_count() == len(URLS)
+
+        for url in claimed:
+            await workers[1].release(url)
+        assert await workers[2].in_flight_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_pin_and_cancel_are_shared(self, redis):
+        first, second = _worker(redis), _worker(redis)
+        await first.set_pinned("curl_cffi", 1)
+        assert await second.shared_state() == ("curl_cffi", 1, False)
+
+        await second.set_pinned(None, None)
+        await second.signal_cancel()
+        assert await first.shared_state() == (None, None, True)
+
+    @pytest.mark.asyncio
+    async def test_helper_registry(self, redis):
+        crawler = _worker(redis)
+        await crawler.register_worker("task-a")
+        await crawler.register_worker("task-b")
+        await crawler.unregister_worker("task-a")
+        assert await crawler.active_workers() == 1
+        await crawler.cleanup()
+        assert await crawler.active_workers() == 0
+
+
+class TestPageBudget:
+    @pytest.mark.asyncio
+    async def test_batch_past_budget_is_released(self, redis):
+        crawler = _worker(redis)
+        await crawler._redis_add_urls([(u, 1) for u in URLS[:6]])
+        batch = [await crawler.claim_next_url() for _ in range(6)]
+        saved = []
+
+        async def deliver(url):
+            saved.append(url)
+            await crawler.release(url)  # As the consumer does
+
+        async def fetch(url, depth):
+            return None if url == URLS[0] else url
+
+        # Budget of two pages: the first fetch fails, two are saved
+        await _fetch_batch(crawler, batch, fetch, deliver, lambda: len(saved) >= 2)
+        assert saved == URLS[1:3]
+        assert await crawler.in_flight_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_reserve_stops_at_max_pages(self, db_session, test_user):
+        job = Job(
+            id=uuid.uuid4(), user_id=test_user.id, type="crawl",
+            status="running", config={}, completed_pages=0,
+        )
+        db_session.add(job)
+        await db_session.commit()
+
+        assert await _reserve_page(db_session, job.id, 2) == (1, "running")
+        assert await _reserve_page(db_session, job.id, 2) == (2, "running")
+        assert await _reserve_page(db_session, job.id, 2) is None
+        await db_session.commit()
+
+        await db_session.refresh(job)
+        assert job.completed_pages == 2
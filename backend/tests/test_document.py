@@ -1,9 +1,15 @@
 """Unit tests for app.services.document — type detection, PDF/DOCX extraction."""
 
+import asyncio
 import io
+import time
+from unittest.mock import patch
+
 import pytest
 
+from app.services import document
 from app.services.document import (
+    _pdf_shard_ranges,
     detect_document_type,
     extract_pdf,
     extract_docx,
@@ -354,3 +360,128 @@ class TestExtractDocx:
         docx_bytes = _create_minimal_docx(["Para 1", "Para 2", "Para 3"])
         result = await extract_docx(docx_bytes)
         assert result.metadata.get("paragraph_count", 0) >= 3
+
+
+# ---------------------------------------------------------------------------
+# Off-loop extraction — sharding and budgets
+# ---------------------------------------------------------------------------
+
+
+def _create_pdf_pages(count: int) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    for i in range(count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1} content", fontsize=12)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def _in_threads():
+    """Run extraction in threads so patched module functions are used."""
+    return patch.object(document, "_get_pool", return_value=None)
+
+
+class TestOffLoopExtraction:
+    def test_shard_ranges(self):
+        assert _pdf_shard_ranges(5, 2) == [(0, 2), (2, 4), (4, 5)]
+        assert _pdf_shard_ranges(0, 10) == []
+
+    @pytest.mark.asyncio
+    async def test_sharded_pdf_merges_pages_in_order(self):
+        with _in_threads(), patch.object(
+            document.settings, "DOCUMENT_PDF_PAGES_PER_SHARD", 2
+        ):
+            result = await extract_pdf(_create_pdf_pages(5))
+        assert [p["page_num"] for p in result.pages] == [1, 2, 3, 4, 5]
+        assert result.text.index("Page 2 content") < result.text.index(
+            "Page 5 content"
+        )
+        assert "partial" not in result.metadata
+
+    @pytest.mark.asyncio
+    async def test_time_budget_returns_partial_pages(self):
+        real = document._extract_pdf_pages
+
+        def _slow_tail(source, start, end):
+            if start >= 2:
+                time.sleep(1.5)
+            return real(source, start, end)
+
+        with _in_threads(), patch.object(
+            document, "_extract_pdf_pages", _slow_tail
+        ), patch.object(
+            document.settings, "DOCUMENT_PDF_PAGES_PER_SHARD", 2
+        ), patch.object(document.settings, "DOCUMENT_TIMEOUT_SECONDS", 1):
+            result = await extract_pdf(_create_pdf_pages(4))
+        assert result.page_count == 4
+        assert [p["page_num"] for p in result.pages] == [1, 2]
+        assert result.metadata["partial"] is True
+        assert "time budget" in result.metadata["partial_reason"]
+        assert "Partial extraction" in result.markdown
+
+    @pytest.mark.asyncio
+    async def test_whole_document_timeout_returns_error_result(self):
+        def _hang(raw_bytes):
+            time.sleep(1.5)
+
+        with _in_threads(), patch.object(
+            document, "_extract_docx_sync", _hang
+        ), patch.object(document.settings, "DOCUMENT_TIMEOUT_SECONDS", 1):
+            result = await extract_docx(b"PK")
+        assert result.metadata["partial"] is True
+        assert "time budget" in result.metadata["error"]
+
+
+class TestProcessPoolBudget:
+    @pytest.fixture
+    def one_worker_pool(self):
+        document.shutdown_document_pool()
+        with patch.object(document.settings, "DOCUMENT_WORKERS", 1), patch.object(
+            document.settings, "DOCUMENT_MAX_MEMORY_MB", 0
+        ), patch.object(document, "_pool_unavailable", False):
+            yield
+            document.shutdown_document_pool()
+
+    @pytest.mark.asyncio
+    async def test_overrun_kills_worker_and_frees_pool(self, one_worker_pool):
+        # Pool warm-up: the first job pays for spawning the worker
+        assert await document._await_within(document._submit(abs, -1), None, abs, -1) == 1
+        pool = document._get_pool()
+        workers = list(pool._processes.values())
+
+        loop = asyncio.get_running_loop()
+        with pytest.raises(asyncio.TimeoutError):
+            await document._await_within(
+                document._submit(time.sleep, 60), loop.time() + 0.5, time.sleep, 60
+            )
+        for worker in workers:
+            worker.join(5)
+            assert not worker.is_alive()
+
+        # The only worker was stuck for a minute; a fresh pool answers now
+        started = time.monotonic()
+        fut = document._submit(abs, -2)
+        assert await asyncio.wait_for(document._await_within(fut, None, abs, -2), 30) == 2
+        assert document._get_pool() is not pool
+        assert time.monotonic() - started < 30
+
+    @pytest.mark.asyncio
+    async def test_other_jobs_survive_a_recycle(self, one_worker_pool):
+        with patch.object(document.settings, "DOCUMENT_WORKERS", 2), patch.object(
+            document, "_recycle_pool", wraps=document._recycle_pool
+        ) as recycle:
+            # Start both workers
+            await asyncio.gather(
+                *(document._submit(time.sleep, 0.5) for _ in range(2))
+            )
+            loop = asyncio.get_running_loop()
+            overrun = document._submit(time.sleep, 60)
+            other = document._submit(time.sleep, 3)
+            with pytest.raises(asyncio.TimeoutError):
+                await document._await_within(overrun, loop.time() + 1, time.sleep, 60)
+            assert recycle.call_count == 1
+            # Lost with the killed pool, resubmitted to the fresh one
+            assert await document._await_within(other, None, time.sleep, 3) is None
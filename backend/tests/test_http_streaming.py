@@ -0,0 +1,155 @@
+"""Unit tests for the streamed HTTP body reader in app.services.scraper."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.services.scraper import (
+    _DocumentResponse,
+    _curl_get_streamed,
+    _decode_body,
+    _race_strategies,
+    _read_streamed_body,
+)
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestReadStreamedBody:
+    @pytest.mark.asyncio
+    async def test_full_html_read(self):
+        body, aborted = await _read_streamed_body(
+            "https://example.com/", _chunks(b"<html>", b"<body>ok</body></html>"),
+            "text/html",
+        )
+        assert body == b"<html><body>ok</body></html>"
+        assert aborted is None
+
+    @pytest.mark.asyncio
+    async def test_pdf_magic_in_first_chunk_raises(self):
+        with pytest.raises(_DocumentResponse) as exc:
+            await _read_streamed_body(
+                "https://example.com/download?id=1",
+                _chunks(b"%PDF-1.7\n", b"never read"),
+                "application/octet-stream",
+            )
+        assert exc.value.doc_type == "pdf"
+
+    @pytest.mark.asyncio
+    async def test_document_content_type_raises(self):
+        with pytest.raises(_DocumentResponse) as exc:
+            await _read_streamed_body(
+                "https://example.com/report", _chunks(b"a,b,c\n1,2,3\n"), "text/csv"
+            )
+        assert exc.value.doc_type == "csv"
+
+    @pytest.mark.asyncio
+    async def test_binary_content_type_abandoned(self):
+        body, aborted = await _read_streamed_body(
+            "https://example.com/logo", _chunks(b"\x89PNG\r\n\x1a\n" + b"0" * 100),
+            "image/png",
+        )
+        assert body == b""
+        assert "binary" in aborted
+
+    @pytest.mark.asyncio
+    async def test_max_body_size_truncates(self):
+        with patch("app.services.scraper.settings.HTTP_MAX_BODY_BYTES", 1000):
+            body, aborted = await _read_streamed_body(
+                "https://example.com/",
+                _chunks(*([b"<p>" + b"x" * 97] * 50)),
+                "text/html",
+            )
+        assert len(body) == 1000
+        assert "exceeds" in aborted
+
+    @pytest.mark.asyncio
+    async def test_challenge_signature_stops_download(self):
+        head = b"<html><head><title>Just a moment...</title></head><body>"
+        consumed = []
+
+        async def _stream():
+            for part in [head + b" " * 20000, b"x" * 20000, b"y" * 20000]:
+                consumed.append(part)
+                yield part
+
+        body, aborted = await _read_streamed_body(
+            "https://example.com/", _stream(), "text/html"
+        )
+        assert "challenge" in aborted
+        assert len(consumed) == 1
+        assert body.startswith(head)
+
+
+class _StreamedResponse:
+    """Stand-in for a curl_cffi stream=True response."""
+
+    status_code = 200
+    headers = {"Content-Type": "text/html"}
+
+    def __init__(self):
+        self.quit_now = asyncio.Event()
+        self.astream_task = None
+
+    async def aiter_content(self):
+        yield b"<html><head><title>Just a moment...</title></head><body>" + b" " * 20000
+        await self.quit_now.wait()
+        yield b"never read"
+
+    async def _transfer(self):
+        await self.quit_now.wait()
+        raise RuntimeError("curl: (23) Failure writing output")
+
+    async def aclose(self):
+        await self.astream_task
+
+
+class _Session:
+    def __init__(self):
+        self.response = _StreamedResponse()
+
+    async def get(self, url, stream=False, **kwargs):
+        self.response.astream_task = asyncio.ensure_future(self.response._transfer())
+        return self.response
+
+
+class TestCurlGetStreamed:
+    @pytest.mark.asyncio
+    async def test_aborted_transfer_is_closed(self):
+        session = _Session()
+        html, status, _ = await _curl_get_streamed(session, "https://example.com/")
+        assert "Just a moment" in html
+        assert status == 200
+        assert session.response.quit_now.is_set()
+        assert session.response.astream_task.done()
+
+
+class TestDecodeBody:
+    def test_charset_from_content_type(self):
+        assert _decode_body("café".encode("latin-1"), "text/html; charset=ISO-8859-1") == "café"
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        assert _decode_body("café".encode(), "text/html; charset=bogus") == "café"
+
+
+class TestRaceDocumentDetection:
+    @pytest.mark.asyncio
+    async def test_document_response_stops_race(self):
+        async def _doc():
+            raise _DocumentResponse("pdf")
+
+        async def _slow():
+            import asyncio
+
+            await asyncio.sleep(5)
+            return "<html>late</html>", 200, {}
+
+        race = await _race_strategies(
+            [("curl", _doc()), ("httpx", _slow())], "https://example.com/x", timeout=10
+        )
+        assert race.document_type == "pdf"
+        assert not race.success
@@ -0,0 +1,191 @@
+"""Unit tests for app.services.llm_extract — chunking, concurrency and result cache."""
+
+import asyncio
+import json
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import litellm
+import pytest
+
+from app.services import llm_extract
+from app.services.llm_extract import (
+    _ProviderLimiter,
+    _chunk_cache_key,
+    _chunk_token_budget,
+    _split_content,
+    extract_with_llm,
+    get_llm_cache_stats,
+)
+
+
+class _FakeRedis:
+    """Dict-backed stand-in for the handful of redis_client calls used here."""
+
+    def __init__(self):
+        self.data = {}
+        self.hashes = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    async def hincrby(self, name, key, amount=1):
+        h = self.hashes.setdefault(name, {})
+        h[key] = h.get(key, 0) + amount
+        return h[key]
+
+    async def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+
+def _response(payload, tokens=100):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))],
+        usage=SimpleNamespace(total_tokens=tokens),
+    )
+
+
+@contextmanager
+def _llm(completion):
+    """Patch the user key lookup, Redis and litellm.acompletion."""
+    key = SimpleNamespace(
+        id=uuid.uuid4(), provider="openai", model="gpt-4o-mini", encrypted_key="x"
+    )
+    fake = _FakeRedis()
+    with patch.object(
+        llm_extract, "_get_user_llm_key", AsyncMock(return_value=key)
+    ), patch.object(llm_extract, "decrypt_value", return_value="sk-test"), patch.object(
+        llm_extract, "redis_client", fake
+    ), patch.object(litellm, "acompletion", completion):
+        yield fake
+
+
+def _paragraphs(count: int, words: int = 200) -> str:
+    return "\n\n".join(
+        f"Paragraph {i}. " + " ".join(f"word{j}" for j in range(words)) for i in range(count)
+    )
+
+
+class TestChunking:
+    def test_small_content_is_one_chunk(self):
+        assert _split_content(litellm, "gpt-4o-mini", "short text", 1000) == ["short text"]
+
+    def test_chunks_respect_token_budget(self):
+        content = _paragraphs(60)
+        chunks = _split_content(litellm, "gpt-4o-mini", content, 2000)
+        assert len(chunks) > 1
+        assert all(
+            litellm.token_counter(model="gpt-4o-mini", text=c) <= 2200 for c in chunks
+        )
+        assert "".join(chunks).replace("\n", "") == content.replace("\n", "")
+
+    def test_oversized_paragraph_is_split(self):
+        content = " ".join(f"w{i}" for i in range(20000))
+        chunks = _split_content(litellm, "gpt-4o-mini", content, 1000)
+        assert len(chunks) > 1
+        assert " ".join(chunks).split() == content.split()
+
+    def test_budget_fits_model_window(self):
+        with patch.object(llm_extract.settings, "LLM_CHUNK_MAX_TOKENS", 10**6):
+            budget = _chunk_token_budget(litellm, "gpt-4o-mini", "system", None)
+        assert budget < 128000 - 4096
+
+    def test_unknown_model_uses_configured_cap(self):
+        with patch.object(llm_extract.settings, "LLM_CHUNK_MAX_TOKENS", 5000):
+            assert _chunk_token_budget(litellm, "ollama/unknown-x", "system", None) == 5000
+
+
+class TestCacheKey:
+    def test_schema_key_order_does_not_matter(self):
+        a = _chunk_cache_key("m", "p", {"a": 1, "b": 2}, "chunk")
+        b = _chunk_cache_key("m", "p", {"b": 2, "a": 1}, "chunk")
+        assert a == b
+
+    def test_every_input_is_part_of_key(self):
+        base = _chunk_cache_key("m", "p", None, "chunk")
+        assert base != _chunk_cache_key("m2", "p", None, "chunk")
+        assert base != _chunk_cache_key("m", "p2", None, "chunk")
+        assert base != _chunk_cache_key("m", "p", {"a": 1}, "chunk")
+        assert base != _chunk_cache_key("m", "p", None, "chunk2")
+
+
+class TestExtractWithLLM:
+    @pytest.mark.asyncio
+    async def test_repeat_extraction_served_from_cache(self):
+        completion = AsyncMock(return_value=_response({"title": "x"}, tokens=321))
+        with _llm(completion):
+            first = await extract_with_llm(None, uuid.uuid4(), "page", prompt="get title")
+            second = await extract_with_llm(None, uuid.uuid4(), "page", prompt="get title")
+            stats = await get_llm_cache_stats()
+        assert first == second == {"title": "x"}
+        assert completion.await_count == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["tokens_saved"] == 321
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_raw_responses_are_not_cached(self):
+        raw = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="not json"))],
+            usage=None,
+        )
+        completion = AsyncMock(return_value=raw)
+        with _llm(completion) as fake:
+            result = await extract_with_llm(None, uuid.uuid4(), "page")
+        assert result == {"raw_response": "not json"}
+        assert not fake.data
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_concurrently_and_merge_in_order(self):
+        in_flight = peak = 0
+
+        async def _complete(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            text = kwargs["messages"][1]["content"]
+            index = int(text.split("[Chunk ")[1].split("/")[0])
+            await asyncio.sleep(0.05 * (5 - index % 5))  # later chunks finish first
+            in_flight -= 1
+            return _response([index])
+
+        with patch.object(llm_extract.settings, "LLM_CHUNK_MAX_TOKENS", 1000), patch.object(
+            llm_extract.settings, "LLM_CHUNK_CONCURRENCY", 3
+        ), _llm(AsyncMock(side_effect=_complete)):
+            result = await extract_with_llm(None, uuid.uuid4(), _paragraphs(20))
+        assert result == list(range(1, len(result) + 1))
+        assert len(result) > 3
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_chunk_failure_raises(self):
+        completion = AsyncMock(side_effect=RuntimeError("quota exceeded"))
+        with patch.object(llm_extract.settings, "LLM_CHUNK_MAX_TOKENS", 1000), _llm(
+            completion
+        ):
+            with pytest.raises(Exception, match="quota exceeded"):
+                await extract_with_llm(None, uuid.uuid4(), _paragraphs(20))
+
+
+class TestProviderLimiter:
+    @pytest.mark.asyncio
+    async def test_requests_are_spaced_by_rpm(self):
+        limiter = _ProviderLimiter(concurrency=10, rpm=600)  # 0.1s apart
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        stamps = []
+
+        async def _call():
+            async with limiter.slot():
+                stamps.append(loop.time() - started)
+
+        await asyncio.gather(*(_call() for _ in range(3)))
+        assert stamps[0] < 0.05
+        assert stamps[2] >= 0.18
@@ -0,0 +1,64 @@
+"""Unit tests for app.core.loop_monitor — loop lag and blocking-call detection."""
+
+import asyncio
+import time
+import traceback
+
+import pytest
+
+import app as app_package
+from app.config import settings
+from app.core.loop_monitor import LoopMonitor, call_site
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def debug_monitor(monkeypatch):
+    monkeypatch.setattr(settings, "LOOP_MONITOR_INTERVAL", 0.02)
+    monkeypatch.setattr(settings, "LOOP_MONITOR_DEBUG", True)
+    monkeypatch.setattr(settings, "LOOP_MONITOR_BLOCK_THRESHOLD_MS", 50)
+    monitor = LoopMonitor()
+    yield monitor
+    monitor.detach()
+
+
+class TestLoopMonitor:
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_charged_to_its_site(self, debug_monitor):
+        debug_monitor.attach(asyncio.get_running_loop(), "test")
+        await asyncio.sleep(0.1)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.1)
+
+        [site] = debug_monitor.report()
+        assert site.site.startswith("tests/test_loop_monitor.py:")
+        assert site.site.endswith("in _block_the_loop")
+        assert site.count == 1
+        assert 0.2 < site.max_seconds < 1.0
+        assert "_block_the_loop" in site.stack
+        assert debug_monitor.take_max_lag() >= site.max_seconds
+        assert debug_monitor.take_max_lag() < 0.2
+
+    @pytest.mark.asyncio
+    async def test_responsive_loop_has_no_sites(self, debug_monitor):
+        debug_monitor.attach(asyncio.get_running_loop(), "test")
+        for _ in range(10):
+            await asyncio.sleep(0.02)
+        assert debug_monitor.report() == []
+        assert debug_monitor.take_max_lag() is not None
+
+    def test_detached_monitor_reports_no_lag(self):
+        assert LoopMonitor().take_max_lag() is None
+
+
+class TestCallSite:
+    def test_prefers_innermost_app_frame(self):
+        app_frame = traceback.FrameSummary(
+            f"{app_package.__path__[0]}/services/scraper.py", 812, "_looks_blocked"
+        )
+        lib_frame = traceback.FrameSummary("/usr/lib/python3/json/encoder.py", 200, "encode")
+        frames = traceback.StackSummary.from_list([app_frame, lib_frame])
+        assert call_site(frames) == "app/services/scraper.py:812 in _looks_blocked"
@@ -0,0 +1,106 @@
+"""Unit tests for app.services.mapper — concurrent, early-stopping map pipeline."""
+
+import asyncio
+from contextlib import ExitStack, aclosing, contextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.schemas.map import LinkResult, MapRequest
+from app.services import mapper
+from app.services.mapper import _expensive_strategies_needed, iter_map_links, map_website
+
+
+def _links(prefix: str, count: int) -> list[LinkResult]:
+    return [
+        LinkResult(url=f"https://example.com/{prefix}/{i}", title=None, description=None)
+        for i in range(count)
+    ]
+
+
+@contextmanager
+def _strategies(sitemap: list[LinkResult], homepage: list[LinkResult], delay=0.0):
+    """Patch every map strategy; yields the browser-backed mocks."""
+
+    async def _sitemap_links(url, limit=None, sitemap_urls=None):
+        for link in sitemap:
+            if delay:
+                await asyncio.sleep(delay)
+            yield link
+
+    mocks = {
+        "_deep_discover_via_stealth_engine": AsyncMock(
+            return_value=("", ["https://example.com/nav/1"], None)
+        ),
+        "_deep_discover_via_local_browser": AsyncMock(return_value=("", [])),
+        "_crawl_homepage_browser": AsyncMock(return_value=[]),
+        "_deep_crawl": AsyncMock(return_value=[]),
+    }
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(mapper, "_iter_sitemap_links", _sitemap_links))
+        stack.enter_context(
+            patch.object(mapper, "_crawl_homepage", AsyncMock(return_value=homepage))
+        )
+        for name, mock in mocks.items():
+            stack.enter_context(patch.object(mapper, name, mock))
+        yield mocks
+
+
+class TestExpensiveStrategiesNeeded:
+    def test_limit_reached(self):
+        assert not _expensive_strategies_needed(100, 100, 0.0, 60.0, True)
+
+    def test_cheap_done_short_of_limit(self):
+        assert _expensive_strategies_needed(10, 100, 0.0, 1.0, True)
+
+    def test_grace_period(self):
+        assert not _expensive_strategies_needed(0, 100, 0.0, 1.0, False)
+
+    def test_projected_yield(self):
+        assert not _expensive_strategies_needed(10, 100, 50.0, 10.0, False)
+        assert _expensive_strategies_needed(10, 100, 1.0, 10.0, False)
+
+
+class TestIterMapLinks:
+    @pytest.mark.asyncio
+    async def test_sitemap_reaching_limit_skips_browser(self):
+        with _strategies(_links("s", 500), _links("h", 5)) as mocks:
+            links = await map_website(MapRequest(url="https://example.com", limit=50))
+        assert len(links) == 50
+        assert len({link.url for link in links}) == 50
+        mocks["_deep_discover_via_stealth_engine"].assert_not_awaited()
+        mocks["_deep_crawl"].assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_short_cheap_results_start_browser_strategies(self):
+        homepage = _links("s", 3)  # duplicates of the sitemap links
+        with _strategies(_links("s", 3) + _links("t", 3), homepage) as mocks:
+            links = await map_website(MapRequest(url="https://example.com", limit=50))
+        urls = [link.url for link in links]
+        assert len(urls) == len(set(urls)) == 7
+        assert "https://example.com/nav/1" in urls
+        mocks["_deep_discover_via_stealth_engine"].assert_awaited_once()
+        mocks["_deep_crawl"].assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_links_stream_before_strategies_finish(self):
+        with _strategies(_links("s", 100), [], delay=0.01):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            async with aclosing(
+                iter_map_links(MapRequest(url="https://example.com", limit=100))
+            ) as links:
+                first = await links.__anext__()
+                first_at = loop.time() - started
+        assert first.url == "https://example.com/s/0"
+        assert first_at < 0.5
+
+    @pytest.mark.asyncio
+    async def test_search_filters_as_links_arrive(self):
+        sitemap = _links("blog", 20) + _links("shop", 20)
+        with _strategies(sitemap, []):
+            links = await map_website(
+                MapRequest(url="https://example.com", limit=10, search="blog")
+            )
+        assert len(links) == 10
+        assert all("/blog/" in link.url for link in links)
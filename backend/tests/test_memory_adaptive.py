@@ -56,3 +56,39 @@ class TestMemoryAdaptiveSemaphore:
         sem = MemoryAdaptiveSemaphore(base_limit=5, min_limit=1, max_limit=10)
         assert sem.current_limit == 5
         assert sem.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_set_limit_wakes_waiters_in_order(self):
+        sem = MemoryAdaptiveSemaphore(base_limit=1, min_limit=1, max_limit=3)
+        await sem.acquire()
+        order = []
+
+        async def worker(n):
+            async with sem:
+                order.append(n)
+                await asyncio.sleep(0.01)
+
+        tasks = [asyncio.create_task(worker(n)) for n in range(3)]
+        await asyncio.sleep(0)
+        assert order == []
+        assert sem.set_limit(10) == 3  # clamped to max_limit
+        await asyncio.sleep(0)
+        assert order == [0, 1]
+        sem.release()
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2]
+        assert sem.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_lowered_limit_applies_to_new_acquisitions(self):
+        sem = MemoryAdaptiveSemaphore(base_limit=2, min_limit=1, max_limit=2)
+        await sem.acquire()
+        await sem.acquire()
+        sem.set_limit(1)
+        sem.release()
+        assert sem.locked()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(sem.acquire(), timeout=0.01)
+        sem.release()
+        await asyncio.wait_for(sem.acquire(), timeout=0.1)
+        assert sem.active_count == 1
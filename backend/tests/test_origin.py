@@ -0,0 +1,106 @@
+"""Unit tests for benchmarks.origin — the synthetic load-test origin."""
+
+import httpx
+import pytest
+
+from app.services.block_detector import (
+    REASON_CHALLENGE_ELEMENT,
+    REASON_SOFT_404,
+    detect_block,
+)
+from app.services.scraper import _looks_blocked
+from benchmarks.load import KindStats
+from benchmarks.origin import SiteConfig, create_site, page_kind, page_links
+
+
+def _client(config: SiteConfig) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_site(config)), base_url="http://origin.test"
+    )
+
+
+class TestSiteGraph:
+    def test_graph_is_deterministic_and_in_range(self):
+        config = SiteConfig(pages=50, seed=7)
+        assert page_links(config, 3) == page_links(SiteConfig(pages=50, seed=7), 3)
+        for n in range(50):
+            for href in page_links(config, n):
+                if href.startswith("/p/"):
+                    assert 0 <= int(href[3:]) < 50
+
+    def test_page_kind_rates(self):
+        config = SiteConfig(pages=2000, soft_404_rate=0.1, challenge_rate=0.05)
+        kinds = [page_kind(config, n) for n in range(config.pages)]
+        assert kinds[0] == "content"
+        assert 100 < kinds.count("soft_404") < 300
+        assert 40 < kinds.count("challenge") < 160
+
+
+class TestOrigin:
+    @pytest.mark.asyncio
+    async def test_content_page_is_not_blocked(self):
+        async with _client(SiteConfig(pages=20, page_kb=4)) as client:
+            resp = await client.get("/p/1")
+        assert resp.status_code == 200
+        assert len(resp.text) > 4000
+        assert '<a href="/p/5">' in resp.text
+        assert not _looks_blocked(resp.text)
+
+    @pytest.mark.asyncio
+    async def test_soft_404_and_challenge_match_detector(self):
+        config = SiteConfig(pages=200, soft_404_rate=0.3, challenge_rate=0.3)
+        soft = next(n for n in range(1, 200) if page_kind(config, n) == "soft_404")
+        challenged = next(n for n in range(1, 200) if page_kind(config, n) == "challenge")
+        async with _client(config) as client:
+            soft_resp = await client.get(f"/p/{soft}")
+            challenge_resp = await client.get(f"/p/{challenged}")
+            stats = (await client.get("/__stats")).json()["counts"]
+        assert soft_resp.status_code == 200
+        assert detect_block(soft_resp.text).reason == REASON_SOFT_404
+        assert challenge_resp.status_code == 403
+        assert detect_block(challenge_resp.text).reason == REASON_CHALLENGE_ELEMENT
+        assert stats["soft_404"] == 1
+        assert stats["challenge"] == 1
+
+    @pytest.mark.asyncio
+    async def test_js_challenge_passes_with_clearance_cookie(self):
+        async with _client(SiteConfig(pages=10, js_challenge=True)) as client:
+            first = await client.get("/p/2")
+            assert first.status_code == 503
+            assert "cf_clearance" in first.text
+            assert _looks_blocked(first.text)
+            second = await client.get("/p/2", cookies={"cf_clearance": "ok"})
+        assert second.status_code == 200
+        assert not _looks_blocked(second.text)
+
+    @pytest.mark.asyncio
+    async def test_robots_and_sitemap_index(self):
+        async with _client(SiteConfig(pages=25, sitemap_chunk=10)) as client:
+            robots = (await client.get("/robots.txt")).text
+            index = (await client.get("/sitemap.xml")).text
+            child = (await client.get("/sitemap-2.xml")).text
+            missing = await client.get("/sitemap-3.xml")
+        assert "Disallow: /private/" in robots
+        assert "Sitemap: http://origin.test/sitemap.xml" in robots
+        assert "<sitemapindex" in index and index.count("<sitemap>") == 3
+        assert child.count("<url>") == 5
+        assert missing.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        async with _client(SiteConfig(pages=10, error_rate=1.0)) as client:
+            resp = await client.get("/p/1")
+        assert resp.status_code == 503
+
+
+class TestLoadStats:
+    def test_summary(self):
+        stats = KindStats(latencies=[0.1, 0.2, 0.3, 0.4], ok=3, pages=30)
+        stats.error("http_429")
+        summary = stats.summary(elapsed=2.0)
+        assert summary["jobs"] == 4
+        assert summary["jobs_per_sec"] == 2.0
+        assert summary["pages_per_sec"] == 15.0
+        assert summary["errors"] == {"http_429": 1}
+        assert summary["latency_ms"]["p50"] == 200.0
+        assert summary["latency_ms"]["max"] == 400.0
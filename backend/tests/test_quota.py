@@ -0,0 +1,155 @@
+"""Unit tests for app.services.quota — Redis counters and DB reconciliation."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.exceptions import RateLimitError
+from app.core.redis import ResilientRedis
+from app.services import quota
+from app.services.quota import (
+    QUOTA_DIRTY_KEY,
+    check_quota,
+    get_or_create_quota,
+    get_quota_summary,
+    increment_usage,
+    reconcile_quotas,
+    refund_usage,
+    reserve_quota,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis():
+    client = ResilientRedis()
+    client._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch.object(quota, "redis_client", client):
+        yield client
+
+
+class TestRedisCounters:
+    @pytest.mark.asyncio
+    async def test_seeded_from_row_and_enforced(self, redis, db_session, test_user):
+        row = await get_or_create_quota(db_session, test_user.id)
+        row.scrape_limit = 3
+        row.scrape_used = 1
+        await db_session.flush()
+
+        await check_quota(db_session, test_user.id, "scrape")
+        await increment_usage(db_session, test_user.id, "scrape", count=2, pages=2)
+        with pytest.raises(RateLimitError) as exc:
+            await check_quota(db_session, test_user.id, "scrape")
+        assert exc.value.headers["X-Quota-Used"] == "3"
+        assert exc.value.headers["X-Quota-Limit"] == "3"
+        assert row.scrape_used == 1  # not written until reconciliation
+
+    @pytest.mark.asyncio
+    async def test_concurrent_increments_are_not_lost(self, redis, db_session, test_user):
+        await check_quota(db_session, test_user.id, "scrape")  # seeds the counters
+        await asyncio.gather(
+            *(increment_usage(db_session, test_user.id, "scrape") for _ in range(50))
+        )
+        summary = await get_quota_summary(db_session, test_user.id)
+        assert summary["operations"]["scrape"]["used"] == 50
+
+    @pytest.mark.asyncio
+    async def test_unlimited(self, redis, db_session, test_user):
+        row = await get_or_create_quota(db_session, test_user.id)
+        row.map_limit = -1
+        row.map_used = 10**6
+        await db_session.flush()
+        await check_quota(db_session, test_user.id, "map")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reservations_stop_at_limit(self, redis, db_session, test_user):
+        row = await get_or_create_quota(db_session, test_user.id)
+        row.scrape_limit = 5
+        await db_session.flush()
+        await check_quota(db_session, test_user.id, "scrape")  # seeds the counters
+
+        results = await asyncio.gather(
+            *(reserve_quota(db_session, test_user.id, "scrape") for _ in range(20)),
+            return_exceptions=True,
+        )
+        assert sum(r is None for r in results) == 5
+        assert all(isinstance(r, RateLimitError) for r in results if r is not None)
+
+        await refund_usage(db_session, test_user.id, "scrape")
+        summary = await get_quota_summary(db_session, test_user.id)
+        assert summary["operations"]["scrape"]["used"] == 4
+        await reserve_quota(db_session, test_user.id, "scrape")
+
+
+class TestReconcile:
+    @pytest.mark.asyncio
+    async def test_deltas_folded_into_row(self, redis, db_session, test_user):
+        await increment_usage(
+            db_session, test_user.id, "scrape", count=3, pages=3, bytes_processed=900
+        )
+        await increment_usage(db_session, test_user.id, "extract")
+        assert await reconcile_quotas(db_session) == 1
+        assert await reconcile_quotas(db_session) == 0
+
+        row = await get_or_create_quota(db_session, test_user.id)
+        await db_session.refresh(row)
+        assert row.scrape_used == 3
+        assert row.extract_used == 1
+        assert row.total_pages_scraped == 3
+        assert row.total_bytes_processed == 900
+
+        # Counters keep going from where they were, and the row keeps adding
+        await increment_usage(db_session, test_user.id, "scrape")
+        await reconcile_quotas(db_session)
+        await db_session.refresh(row)
+        assert row.scrape_used == 4
+
+    @pytest.mark.asyncio
+    async def test_limit_changes_reach_redis(self, redis, db_session, test_user):
+        await increment_usage(db_session, test_user.id, "crawl")
+        row = await get_or_create_quota(db_session, test_user.id)
+        row.crawl_limit = 1
+        await db_session.flush()
+        await reconcile_quotas(db_session)
+        with pytest.raises(RateLimitError):
+            await check_quota(db_session, test_user.id, "crawl")
+
+    @pytest.mark.asyncio
+    async def test_failed_write_restores_deltas(self, redis, db_session, test_user):
+        user_id = test_user.id
+        await db_session.commit()  # keep the user across the rollback
+        await increment_usage(db_session, user_id, "scrape", count=2)
+        with patch.object(db_session, "commit", AsyncMock(side_effect=RuntimeError("db"))):
+            with pytest.raises(RuntimeError):
+                await reconcile_quotas(db_session)
+        assert await redis.scard(QUOTA_DIRTY_KEY) == 1
+        assert await reconcile_quotas(db_session) == 1
+        row = await get_or_create_quota(db_session, user_id)
+        await db_session.refresh(row)
+        assert row.scrape_used == 2
+
+
+class TestDatabaseFallback:
+    @pytest.mark.asyncio
+    async def test_redis_down_uses_row(self, db_session, test_user):
+        down = AsyncMock(return_value=None)
+        with patch.object(quota.redis_client, "run_script", down), patch.object(
+            quota.redis_client, "hgetall", AsyncMock(return_value={})
+        ):
+            await increment_usage(db_session, test_user.id, "search", count=2)
+            summary = await get_quota_summary(db_session, test_user.id)
+        assert summary["operations"]["search"]["used"] == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_down_reservation_is_conditional(self, db_session, test_user):
+        row = await get_or_create_quota(db_session, test_user.id)
+        row.monitor_limit = 1
+        await db_session.flush()
+        with patch.object(quota.redis_client, "run_script", AsyncMock(return_value=None)):
+            await reserve_quota(db_session, test_user.id, "monitor")
+            with pytest.raises(RateLimitError):
+                await reserve_quota(db_session, test_user.id, "monitor")
+            await refund_usage(db_session, test_user.id, "monitor")
+        assert row.monitor_used == 0
@@ -0,0 +1,87 @@
+"""Unit tests for app.core.rate_limiter — GCRA limiter script."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Response
+
+from app.core import rate_limiter
+from app.core.exceptions import RateLimitError
+from app.core.rate_limiter import check_rate_limit_full, enforce_rate_limit
+from app.core.redis import ResilientRedis
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis():
+    client = ResilientRedis()
+    client._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch.object(rate_limiter, "redis_client", client):
+        yield client
+
+
+class TestGCRA:
+    @pytest.mark.asyncio
+    async def test_burst_up_to_limit_then_denied(self, redis):
+        remaining = [(await check_rate_limit_full("rl:a", 5, 60)).remaining for _ in range(5)]
+        assert remaining == [4, 3, 2, 1, 0]
+
+        denied = await check_rate_limit_full("rl:a", 5, 60)
+        assert not denied.allowed
+        # One slot frees up every window / limit = 12s
+        assert 11 <= denied.retry_after <= 12
+        assert abs(denied.reset - (time.time() + 12)) <= 2
+
+    @pytest.mark.asyncio
+    async def test_constant_memory_per_key(self, redis):
+        for _ in range(50):
+            await check_rate_limit_full("rl:b", 100, 60)
+        assert await redis.client.keys("*") == ["rl:b"]
+        assert await redis.client.type("rl:b") == "string"
+        assert 0 < await redis.client.pttl("rl:b") <= 60_000
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, redis):
+        await check_rate_limit_full("rl:c", 1, 60)
+        assert not (await check_rate_limit_full("rl:c", 1, 60)).allowed
+        assert (await check_rate_limit_full("rl:d", 1, 60)).allowed
+
+    @pytest.mark.asyncio
+    async def test_script_reloaded_after_flush(self, redis):
+        await check_rate_limit_full("rl:f", 1, 60)
+        await redis.client.script_flush()
+        # Still enforced: NOSCRIPT reloads the script rather than failing open
+        assert not (await check_rate_limit_full("rl:f", 1, 60)).allowed
+
+    @pytest.mark.asyncio
+    async def test_replaces_legacy_sliding_window_key(self, redis):
+        await redis.client.zadd("rl:g", {"1700000000.0": 1700000000.0})
+        info = await check_rate_limit_full("rl:g", 2, 60)
+        assert info.allowed
+        assert info.remaining == 1
+        assert await redis.client.type("rl:g") == "string"
+
+    @pytest.mark.asyncio
+    async def test_fails_open_without_redis(self):
+        with patch.object(
+            rate_limiter.redis_client, "run_script", AsyncMock(return_value=None)
+        ):
+            info = await check_rate_limit_full("rl:e", 10, 60)
+        assert info.allowed
+        assert info.remaining == 10
+
+
+class TestEnforceRateLimit:
+    @pytest.mark.asyncio
+    async def test_sets_headers_and_raises(self, redis):
+        response = Response()
+        await enforce_rate_limit(response, "rl:f", 1, "Scrape rate limit exceeded.")
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+
+        with pytest.raises(RateLimitError) as exc:
+            await enforce_rate_limit(response, "rl:f", 1, "Scrape rate limit exceeded.")
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) in (59, 60)
+        assert exc.value.detail.startswith("Scrape rate limit exceeded. Try again in")
@@ -0,0 +1,72 @@
+"""Unit tests for app.services.resource_governor."""
+
+import pytest
+
+from app.services.resource_governor import ResourceGovernor, ResourceSample
+
+
+def _sample(memory_percent: float, loop_lag_ms: float = 0.0, process_mb: float = 100.0) -> ResourceSample:
+    return ResourceSample(
+        memory_percent=memory_percent,
+        process_mb=process_mb,
+        renderer_mb=0.0,
+        limit_mb=None,
+        loop_lag_ms=loop_lag_ms,
+    )
+
+
+class TestClassify:
+    def test_levels(self):
+        governor = ResourceGovernor()
+        assert governor.classify(_sample(30)) == "low"
+        assert governor.classify(_sample(70)) == "steady"
+        assert governor.classify(_sample(85)) == "high"
+        assert governor.classify(_sample(95)) == "critical"
+
+    def test_loop_lag_counts_as_pressure(self):
+        governor = ResourceGovernor()
+        assert governor.classify(_sample(30, loop_lag_ms=500)) == "high"
+        # Between half the lag threshold and the threshold: no growth either
+        assert governor.classify(_sample(30, loop_lag_ms=200)) == "steady"
+
+    def test_process_budget(self, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "RESOURCE_GOVERNOR_PROCESS_MB", 512)
+        assert ResourceGovernor().classify(_sample(30, process_mb=600)) == "high"
+
+
+class TestTick:
+    def test_shrinks_and_drops_to_minimum(self):
+        governor = ResourceGovernor()
+        sem = governor.limiter("chromium", 3)
+        assert governor.tick(_sample(85)) == "high"
+        assert sem.current_limit == 2
+        governor.tick(_sample(95))
+        assert sem.current_limit == sem.min_limit == 1
+
+    @pytest.mark.asyncio
+    async def test_grows_after_calm_streak_only_when_saturated(self):
+        governor = ResourceGovernor()
+        busy = governor.limiter("api_scrape", 2)
+        idle = governor.limiter("nodriver_tabs", 2)
+        await busy.acquire()
+        await busy.acquire()
+
+        for _ in range(2):
+            governor.tick(_sample(30))
+        assert busy.current_limit == 2
+        # A steady sample breaks the streak
+        governor.tick(_sample(70))
+        for _ in range(3):
+            governor.tick(_sample(30))
+        assert busy.current_limit == 3
+        assert idle.current_limit == 2
+
+    def test_replacement_keeps_governed_limit(self):
+        governor = ResourceGovernor()
+        governor.limiter("chromium", 4)
+        governor.tick(_sample(85))
+        replacement = governor.limiter("chromium", 4)
+        assert replacement.current_limit == 3
+        assert governor.limiters["chromium"] is replacement
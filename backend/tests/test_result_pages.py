@@ -0,0 +1,46 @@
+"""Unit tests for app.services.result_pages — following a running job's results."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.job import Job
+from app.models.job_result import JobResult
+from app.services.result_pages import LiveResults
+
+
+async def _add_result(db, job_id, name: str, created_at: datetime) -> None:
+    db.add(JobResult(job_id=job_id, url=f"https://example.com/{name}", created_at=created_at))
+    await db.flush()
+
+
+class TestLiveResults:
+    @pytest.mark.asyncio
+    async def test_late_commit_behind_the_cursor_is_streamed(self, db_session, test_user):
+        job = Job(id=uuid.uuid4(), user_id=test_user.id, type="crawl", status="running", config={})
+        db_session.add(job)
+        t0 = datetime.now(timezone.utc)
+        await _add_result(db_session, job.id, "a", t0)
+        await _add_result(db_session, job.id, "c", t0 + timedelta(seconds=2))
+
+        live = LiveResults(job.id)
+        assert [r.url[-1] for r in await live.poll(db_session)] == ["a", "c"]
+
+        # Stamped before "c" by another worker, committed after it was streamed
+        await _add_result(db_session, job.id, "b", t0 + timedelta(seconds=1))
+        assert [r.url[-1] for r in await live.poll(db_session)] == ["b"]
+        assert await live.poll(db_session) == []
+
+    @pytest.mark.asyncio
+    async def test_limit_defers_the_rest(self, db_session, test_user):
+        job = Job(id=uuid.uuid4(), user_id=test_user.id, type="crawl", status="running", config={})
+        db_session.add(job)
+        t0 = datetime.now(timezone.utc)
+        for i in range(5):
+            await _add_result(db_session, job.id, str(i), t0 + timedelta(milliseconds=i))
+
+        live = LiveResults(job.id)
+        first = await live.poll(db_session, limit=3)
+        rest = await live.poll(db_session, limit=3)
+        assert [r.url[-1] for r in first + rest] == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,88 @@
+"""Unit tests for app.core.partitions and app.services.retention."""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.partitions import (
+    add_months,
+    create_partition_sql,
+    expired_partitions,
+    is_partitioned,
+    partition_month,
+)
+from app.models.job import Job
+from app.models.job_result import JobResult
+from app.models.monitor import Monitor, MonitorCheck
+from app.models.webhook_delivery import WebhookDelivery
+from app.services.retention import purge_expired
+
+NOW = datetime(2026, 5, 15, 12, tzinfo=timezone.utc)
+
+
+class TestPartitionHelpers:
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_create_partition_sql(self):
+        sql = create_partition_sql("job_results", date(2025, 12, 1))
+        assert "job_results_p202512 PARTITION OF job_results" in sql
+        assert "FROM ('2025-12-01') TO ('2026-01-01')" in sql
+
+    def test_expired_partitions_keeps_partial_months(self):
+        names = [
+            "job_results_p202602",
+            "job_results_p202603",
+            "job_results_p202604",
+            "job_results_default",
+        ]
+        cutoff = datetime(2026, 4, 1, tzinfo=timezone.utc)
+        assert expired_partitions(names, cutoff) == [
+            "job_results_p202602",
+            "job_results_p202603",
+        ]
+        assert expired_partitions(names, cutoff - timedelta(seconds=1)) == ["job_results_p202602"]
+        assert partition_month("job_results_default") is None
+
+    @pytest.mark.asyncio
+    async def test_sqlite_is_not_partitioned(self, db_session):
+        assert await is_partitioned(db_session, "job_results") is False
+
+
+class TestPurgeExpired:
+    @pytest.mark.asyncio
+    async def test_chunked_purge(self, db_session, test_user):
+        old, recent = NOW - timedelta(days=40), NOW - timedelta(days=2)
+        for created_at in [old] * 5 + [recent] * 2:
+            job = Job(
+                id=uuid.uuid4(), user_id=test_user.id, type="scrape",
+                status="completed", config={}, created_at=created_at,
+            )
+            db_session.add(job)
+            db_session.add(JobResult(job_id=job.id, url="https://example.com", created_at=created_at))
+            db_session.add(
+                WebhookDelivery(
+                    user_id=test_user.id, url="https://hook.example.com",
+                    event="job.completed", payload={}, created_at=created_at,
+                )
+            )
+        monitor = Monitor(user_id=test_user.id, name="m", url="https://example.com")
+        db_session.add(monitor)
+        await db_session.flush()
+        for days in (100, 95, 10):
+            db_session.add(
+                MonitorCheck(monitor_id=monitor.id, checked_at=NOW - timedelta(days=days))
+            )
+        await db_session.commit()
+
+        counts = await purge_expired(db_session, now=NOW, batch_size=2)
+
+        assert counts == {
+            "jobs": 5, "webhook_deliveries": 5, "monitor_checks": 2, "data_queries": 0,
+        }
+        for model in (Job, JobResult, WebhookDelivery):
+            assert (await db_session.execute(select(func.count(model.id)))).scalar() == 2
+        assert (await db_session.execute(select(func.count(MonitorCheck.id)))).scalar() == 1
@@ -0,0 +1,156 @@
+"""Unit tests for the streaming sitemap engine in app.services.mapper."""
+
+import gzip
+from contextlib import aclosing
+from unittest.mock import patch
+
+import pytest
+
+from app.services import mapper
+from app.services.mapper import (
+    _SitemapStreamParser,
+    _iter_sitemap_entries,
+    _iter_sitemap_links,
+)
+
+SM_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+IMG_NS = "http://www.google.com/schemas/sitemap-image/1.1"
+
+
+def _urlset(urls: list[str], xmlns: bool = True) -> bytes:
+    ns = f' xmlns="{SM_NS}" xmlns:image="{IMG_NS}"' if xmlns else ""
+    entries = "".join(
+        f"<url><loc>{u}</loc><lastmod>2024-05-01</lastmod><priority>0.8</priority>"
+        f"<image:image><image:loc>{u}.png</image:loc></image:image></url>"
+        if xmlns
+        else f"<url><loc>{u}</loc></url>"
+        for u in urls
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset{ns}>{entries}</urlset>'.encode()
+
+
+def _index(children: list[str]) -> bytes:
+    entries = "".join(f"<sitemap><loc>{c}</loc></sitemap>" for c in children)
+    return f'<?xml version="1.0"?><sitemapindex xmlns="{SM_NS}">{entries}</sitemapindex>'.encode()
+
+
+def _feed_in_chunks(parser: _SitemapStreamParser, data: bytes, size: int = 37):
+    entries = []
+    for i in range(0, len(data), size):
+        entries.extend(parser.feed(data[i : i + size]))
+    return entries
+
+
+class TestSitemapStreamParser:
+    def test_urlset_entries_with_metadata(self):
+        parser = _SitemapStreamParser()
+        entries = _feed_in_chunks(parser, _urlset(["https://a.com/1", "https://a.com/2"]))
+        assert [kind for kind, _ in entries] == ["url", "url"]
+        link = entries[0][1]
+        assert link.url == "https://a.com/1"
+        assert link.lastmod == "2024-05-01"
+        assert link.priority == 0.8
+        assert "1 image(s)" in link.description
+
+    def test_gzip_index_decompressed_incrementally(self):
+        data = gzip.compress(_index(["https://a.com/s1.xml", "https://a.com/s2.xml.gz"]))
+        entries = _feed_in_chunks(_SitemapStreamParser(), data, size=8)
+        assert entries == [
+            ("sitemap", "https://a.com/s1.xml"),
+            ("sitemap", "https://a.com/s2.xml.gz"),
+        ]
+
+    def test_no_namespace_sitemap(self):
+        entries = _feed_in_chunks(
+            _SitemapStreamParser(), _urlset(["https://a.com/x"], xmlns=False)
+        )
+        assert entries[0][1].url == "https://a.com/x"
+
+    def test_consumed_entries_are_released(self):
+        parser = _SitemapStreamParser()
+        parser.feed(_urlset([f"https://a.com/{i}" for i in range(500)])[:-len(b"</urlset>")])
+        assert len(parser._root) == 0
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestIterSitemapEntries:
+    @pytest.mark.asyncio
+    async def test_html_response_falls_back_to_stealth(self):
+        html = b"<!DOCTYPE html><html><body>Not found</body></html>" + b" " * 300
+        with patch.object(
+            mapper, "_stream_url_bytes", return_value=_chunks(html)
+        ), patch.object(
+            mapper,
+            "_stealth_sitemap_text",
+            return_value=_urlset(["https://a.com/s"]).decode(),
+        ) as stealth:
+            entries = [e async for e in _iter_sitemap_entries("https://a.com/sitemap.xml")]
+        stealth.assert_awaited_once()
+        assert entries[0][1].url == "https://a.com/s"
+
+    @pytest.mark.asyncio
+    async def test_short_xml_body_is_parsed(self):
+        with patch.object(
+            mapper, "_stream_url_bytes", return_value=_chunks(_urlset(["https://a.com/1"]))
+        ), patch.object(mapper, "_stealth_sitemap_text") as stealth:
+            entries = [e async for e in _iter_sitemap_entries("https://a.com/sitemap.xml")]
+        stealth.assert_not_awaited()
+        assert len(entries) == 1
+
+
+class TestIterSitemapLinks:
+    @staticmethod
+    def _fake_site(fetched: list[str]):
+        docs = {
+            "https://a.com/index.xml": _index(
+                [f"https://a.com/child{i}.xml" for i in range(3)] + ["https://a.com/index.xml"]
+            ),
+        }
+        for i in range(3):
+            docs[f"https://a.com/child{i}.xml"] = _urlset(
+                [f"https://a.com/c{i}/p{j}?utm_source=x" for j in range(200)]
+                + ["https://a.com/shared"]
+            )
+
+        async def _entries(url):
+            fetched.append(url)
+            for entry in _SitemapStreamParser().feed(docs[url]):
+                yield entry
+
+        return patch.object(mapper, "_iter_sitemap_entries", _entries)
+
+    @pytest.mark.asyncio
+    async def test_follows_index_and_dedups(self):
+        fetched = []
+        with self._fake_site(fetched):
+            async with aclosing(
+                _iter_sitemap_links(
+                    "https://a.com/", sitemap_urls=["https://a.com/index.xml"]
+                )
+            ) as links:
+                urls = [link.url async for link in links]
+        assert len(fetched) == 4  # index visited once despite self-reference
+        assert len(urls) == 601
+        assert len(set(urls)) == len(urls)
+        assert all("utm_source" not in u for u in urls)
+
+    @pytest.mark.asyncio
+    async def test_limit_stops_early(self):
+        fetched = []
+        with self._fake_site(fetched):
+            async with aclosing(
+                _iter_sitemap_links(
+                    "https://a.com/", limit=10, sitemap_urls=["https://a.com/index.xml"]
+                )
+            ) as links:
+                urls = [link.url async for link in links]
+        assert len(urls) == 10
+
+    @pytest.mark.asyncio
+    async def test_no_sitemaps(self):
+        links = _iter_sitemap_links("https://a.com/", sitemap_urls=[])
+        assert [link async for link in links] == []
@@ -0,0 +1,145 @@
+"""Unit tests for app.core.stage_timing — per-stage metrics and the scrape timing breakdown."""
+
+import asyncio
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core import stage_timing
+from app.schemas.scrape import ScrapeRequest
+from app.services.scraper import _race_strategies, extract_content, scrape_url
+
+PAGE = (
+    "<html><head><title>Timed</title></head><body><main><h1>Heading</h1>"
+    + "<p>Some readable paragraph text for the extractor.</p>" * 20
+    + "<a href='/next'>next</a></main></body></html>"
+)
+
+
+def _count(metric: str, **labels) -> float:
+    return REGISTRY.get_sample_value(f"{metric}_count", labels) or 0.0
+
+
+async def _fetch(html, delay):
+    await asyncio.sleep(delay)
+    return html, 200, {}
+
+
+class TestStageTimer:
+    def test_breakdown_sums_stages(self):
+        with stage_timing.timed_scrape() as timer:
+            stage_timing.record_stage("fetch", 0.25)
+            stage_timing.record_stage("block_check", 0.001)
+            stage_timing.record_stage("block_check", 0.002)
+            timer.tier, timer.strategy = 1, "httpx"
+        assert stage_timing.current_timer() is None
+        breakdown = timer.breakdown()
+        assert breakdown["fetch_ms"] == 250.0
+        assert breakdown["block_check_ms"] == 3.0
+        assert breakdown["tier"] == 1
+        assert breakdown["strategy"] == "httpx"
+        assert "total_ms" in breakdown
+
+    def test_record_outside_scrape_is_noop(self):
+        stage_timing.record_stage("fetch", 1.0)
+        assert stage_timing.current_timer() is None
+
+
+class TestRaceMetrics:
+    @pytest.mark.asyncio
+    async def test_loser_is_recorded_as_waste(self):
+        labels = {"tier": "1", "strategy": "slow", "domain_bucket": "default"}
+        before_waste = _count("scrape_race_wasted_seconds", **labels)
+        before_win = _count(
+            "scrape_fetch_duration_seconds",
+            tier="1", strategy="fast", outcome="success", domain_bucket="default",
+        )
+        with stage_timing.timed_scrape() as timer:
+            race = await _race_strategies(
+                [("fast", _fetch(PAGE, 0.01)), ("slow", _fetch(PAGE, 5))],
+                "https://example.com/",
+                validate_fn=lambda r: bool(r[0]),
+                tier=1,
+            )
+        assert race.winner_name == "fast"
+        assert _count("scrape_race_wasted_seconds", **labels) == before_waste + 1
+        assert _count(
+            "scrape_fetch_duration_seconds",
+            tier="1", strategy="fast", outcome="success", domain_bucket="default",
+        ) == before_win + 1
+        assert _count(
+            "scrape_fetch_duration_seconds",
+            tier="1", strategy="slow", outcome="cancelled", domain_bucket="default",
+        ) >= 1
+        assert timer.stages["race_wasted"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_validation_is_invalid(self):
+        labels = dict(tier="4", strategy="empty", outcome="invalid", domain_bucket="default")
+        before = _count("scrape_fetch_duration_seconds", **labels)
+        race = await _race_strategies(
+            [("empty", _fetch("", 0))],
+            "https://example.com/",
+            validate_fn=lambda r: bool(r[0]),
+            tier=4,
+        )
+        assert not race.success
+        assert _count("scrape_fetch_duration_seconds", **labels) == before + 1
+
+
+class TestExtractMetrics:
+    def test_each_format_observed(self):
+        before = _count("scrape_extract_duration_seconds", format="links", domain_bucket="default")
+        request = ScrapeRequest(url="https://example.com/", formats=["markdown", "links"])
+        extract_content(PAGE, request.url, request, 200, {}, None)
+        assert (
+            _count("scrape_extract_duration_seconds", format="links", domain_bucket="default")
+            == before + 1
+        )
+        assert _count("scrape_extract_duration_seconds", format="markdown", domain_bucket="default")
+
+
+class TestScrapeTimings:
+    @staticmethod
+    def _patched_pipeline():
+        stack = ExitStack()
+        for target, value in [
+            ("app.services.scraper.domain_throttle", None),
+            ("app.services.circuit_breaker.check_breaker", None),
+            ("app.services.circuit_breaker.record_success", None),
+            ("app.core.cache.get_cached_scrape", None),
+            ("app.core.cache.set_cached_scrape", None),
+            ("app.services.scraper.get_domain_strategy", {}),
+            ("app.services.scraper.record_strategy_result", None),
+            ("app.services.scraper._fetch_with_curl_cffi_multi", (PAGE, 200, {})),
+            ("app.services.scraper._fetch_with_httpx", ("", 503, {})),
+        ]:
+            stack.enter_context(patch(target, new=AsyncMock(return_value=value)))
+        return stack
+
+    @pytest.mark.asyncio
+    async def test_breakdown_returned_when_requested(self):
+        with self._patched_pipeline():
+            data = await scrape_url(
+                ScrapeRequest(
+                    url="https://example.com/", formats=["markdown", "links"], include_timings=True
+                )
+            )
+        timings = data.metadata.timings
+        assert data.markdown
+        assert timings["tier"] == 1
+        assert timings["strategy"] in ("curl_cffi:chrome124", "httpx")
+        for key in ("strategy_cache_lookup_ms", "scrape_cache_lookup_ms", "tier1_ms",
+                    "fetch_ms", "extract_ms", "extract_markdown_ms", "extract_links_ms",
+                    "block_check_ms", "total_ms"):
+            assert key in timings, key
+        assert timings["total_ms"] >= timings["extract_ms"]
+
+    @pytest.mark.asyncio
+    async def test_breakdown_omitted_by_default(self):
+        with self._patched_pipeline():
+            data = await scrape_url(ScrapeRequest(url="https://example.com/", formats=["markdown"]))
+        assert data.metadata.timings is None
+        assert "timings" not in data.metadata.model_dump(exclude_none=True)
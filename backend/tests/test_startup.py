@@ -0,0 +1,89 @@
+"""Unit tests for app.core.startup — import budget, preloading and profiling."""
+
+import gc
+import logging
+import sys
+import time
+
+import pytest
+
+from app.config import settings
+from app.core import startup
+from app.core.startup import import_phase, parse_importtime, preload
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       740 |       1075 |     json.scanner
+import time:       703 |       1777 |   json.decoder
+import time:       442 |       2950 | json
+"""
+
+
+@pytest.fixture
+def unfrozen():
+    yield
+    gc.unfreeze()
+
+
+class TestParseImporttime:
+    def test_rows_and_depth(self):
+        rows = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [(r.module, r.depth) for r in rows] == [
+            ("json.scanner", 2),
+            ("json.decoder", 1),
+            ("json", 0),
+        ]
+        assert rows[-1].self_us == 442
+        assert rows[-1].cumulative_us == 2950
+
+    def test_ignores_other_stderr(self):
+        assert parse_importtime("SECRET_KEY not set\n" + IMPORTTIME_OUTPUT)[0].module == "json.scanner"
+
+
+class TestPreload:
+    def test_imports_queue_modules_once(self, monkeypatch, unfrozen):
+        monkeypatch.setitem(startup.QUEUE_PRELOADS, "test", ("colorsys", "json"))
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+        timings = preload(["test"])
+        # json is loaded already, so it costs nothing and isn't reported
+        assert set(timings) == {"colorsys"}
+        assert "colorsys" in sys.modules
+        assert preload(["test"]) == {}
+        assert gc.isenabled()
+
+    def test_live_process_keeps_gc_running(self, monkeypatch, unfrozen):
+        gc.unfreeze()
+        seen = []
+        monkeypatch.setitem(startup.QUEUE_PRELOADS, "test", ("colorsys",))
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+        real_import = startup.importlib.import_module
+        monkeypatch.setattr(
+            startup.importlib, "import_module",
+            lambda name: seen.append(gc.isenabled()) or real_import(name),
+        )
+        preload(["test"], freeze=False)
+        assert seen == [True]
+        assert gc.get_freeze_count() == 0
+
+    def test_missing_module_is_skipped(self, monkeypatch, unfrozen, caplog):
+        monkeypatch.setitem(startup.QUEUE_PRELOADS, "test", ("not_a_module_xyz",))
+        with caplog.at_level(logging.WARNING, logger="app.core.startup"):
+            assert preload(["test"]) == {}
+        assert "not_a_module_xyz" in caplog.text
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "STARTUP_PRELOAD", False)
+        monkeypatch.setitem(startup.QUEUE_PRELOADS, "test", ("not_a_module_xyz",))
+        assert preload(["test"]) == {}
+
+
+class TestImportPhase:
+    def test_over_budget_warns(self, monkeypatch, unfrozen, caplog):
+        monkeypatch.setattr(settings, "STARTUP_IMPORT_BUDGET_MS", 1)
+        with caplog.at_level(logging.WARNING, logger="app.core.startup"):
+            with import_phase("test"):
+                assert not gc.isenabled()
+                time.sleep(0.01)
+        assert gc.isenabled()
+        assert "Startup imports of test took" in caplog.text
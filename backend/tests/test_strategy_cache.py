@@ -0,0 +1,102 @@
+"""Unit tests for app.services.strategy_cache — hash layout and bulk reads."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import strategy_cache
+from app.services.strategy_cache import (
+    _parse_strategy,
+    get_domain_strategies,
+    get_domain_strategy,
+    get_starting_tier,
+    record_strategy_result,
+)
+
+
+def _patch_redis(redis):
+    async def _get():
+        return redis
+
+    return patch.object(strategy_cache, "_get_redis", new=_get)
+
+
+class TestParseStrategy:
+    def test_types_are_restored(self):
+        data = _parse_strategy(
+            {
+                "last_success_strategy": "curl_cffi:chrome124",
+                "last_success_tier": "1",
+                "last_success_time": "1700000000.5",
+                "avg_success_ms": "1234.5",
+                "fail_count_tier1": "0",
+                "fail_count_tier2": "3",
+            }
+        )
+        assert data["last_success_tier"] == 1
+        assert data["fail_count_tier2"] == 3
+        assert data["avg_success_ms"] == 1234.5
+        assert get_starting_tier(data, is_hard_site=False) == 0
+
+    def test_empty_hash_is_none(self):
+        assert _parse_strategy({}) is None
+        assert _parse_strategy(None) is None
+
+
+class TestReads:
+    @pytest.mark.asyncio
+    async def test_prefetched_skips_redis(self):
+        redis = MagicMock()
+        redis.hgetall = AsyncMock()
+        prefetched = {"example.com": {"fail_count_tier1": 3}, "other.com": None}
+        with _patch_redis(redis):
+            assert await get_domain_strategy(
+                "https://www.example.com/a", prefetched=prefetched
+            ) == {"fail_count_tier1": 3}
+            assert await get_domain_strategy(
+                "https://other.com/", prefetched=prefetched
+            ) is None
+        redis.hgetall.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bulk_read_dedups_domains_in_one_pipeline(self):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(
+            return_value=[{"fail_count_tier1": "2"}, {}, Exception("WRONGTYPE")]
+        )
+        redis = MagicMock()
+        redis.pipeline.return_value = pipe
+        with _patch_redis(redis):
+            result = await get_domain_strategies(
+                [
+                    "https://example.com/a",
+                    "https://www.example.com/b",
+                    "https://new.org/",
+                    "https://legacy.net/",
+                ]
+            )
+        assert pipe.hgetall.call_count == 3
+        assert result == {"example.com": {"fail_count_tier1": 2}, "new.org": None}
+
+    @pytest.mark.asyncio
+    async def test_bulk_read_without_redis(self):
+        with _patch_redis(None):
+            assert await get_domain_strategies(["https://example.com/"]) == {}
+
+
+class TestRecord:
+    @pytest.mark.asyncio
+    async def test_record_is_single_atomic_script_call(self):
+        redis = MagicMock()
+        redis.run_script = AsyncMock(return_value=0)
+        redis.get = AsyncMock()
+        redis.set = AsyncMock()
+        with _patch_redis(redis):
+            await record_strategy_result(
+                "https://www.example.com/x", "chromium_stealth", 2, False, 1500
+            )
+        redis.get.assert_not_awaited()
+        redis.set.assert_not_awaited()
+        kwargs = redis.run_script.await_args.kwargs
+        assert kwargs["keys"] == ["strategy:example.com"]
+        assert kwargs["args"][:4] == ["chromium_stealth", 2, 0, "1500.0"]
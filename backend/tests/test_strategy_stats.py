@@ -0,0 +1,191 @@
+"""Unit tests for app.services.strategy_stats and hedged strategy racing."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import strategy_stats
+from app.services.scraper import _race_strategies
+from app.services.strategy_stats import (
+    LATENCY_BUCKETS_MS,
+    StrategyStats,
+    _bucket_index,
+    flush_pending_writes,
+    get_domain_stats,
+    parse_stats,
+    plan_race,
+    record_outcomes_soon,
+)
+
+
+def _stats(attempts, successes, bucket, count=None):
+    buckets = [0.0] * (len(LATENCY_BUCKETS_MS) + 1)
+    buckets[bucket] = successes if count is None else count
+    return StrategyStats(attempts=attempts, successes=successes, buckets=buckets)
+
+
+class TestStrategyStats:
+    def test_bucket_index(self):
+        assert _bucket_index(100) == 0
+        assert _bucket_index(250) == 0
+        assert _bucket_index(251) == 1
+        assert _bucket_index(100000) == len(LATENCY_BUCKETS_MS)
+
+    def test_percentile_and_expected_time(self):
+        s = _stats(attempts=10, successes=8, bucket=2)  # <= 1000ms
+        assert s.latency_percentile(50) == 1000.0
+        assert s.success_rate == pytest.approx(9 / 12)
+        assert s.expected_ms == pytest.approx(1000.0 / (9 / 12))
+
+    def test_no_successes_has_no_percentile(self):
+        s = StrategyStats(attempts=5, successes=0)
+        assert s.latency_percentile(90) is None
+
+    def test_parse_stats_decays(self):
+        now = time.time()
+        raw = {
+            "curl_cffi:chrome124|n": "4",
+            "curl_cffi:chrome124|ok": "2",
+            "curl_cffi:chrome124|b1": "2",
+            "curl_cffi:chrome124|t": str(now - 21600),
+            "garbage": "x",
+        }
+        with patch(
+            "app.services.strategy_stats.settings.STRATEGY_STATS_HALF_LIFE_SECONDS",
+            21600,
+        ):
+            stats = parse_stats(raw, now=now)
+        s = stats["curl_cffi:chrome124"]
+        assert s.attempts == pytest.approx(2.0)
+        assert s.successes == pytest.approx(1.0)
+        assert s.buckets[1] == pytest.approx(1.0)
+
+
+class TestLocalCache:
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        monkeypatch.setattr(strategy_stats, "_local_stats", {})
+        client = AsyncMock()
+        client.hgetall.return_value = {
+            "curl_cffi:chrome124|n": "4",
+            "curl_cffi:chrome124|ok": "4",
+            "curl_cffi:chrome124|b0": "4",
+            "curl_cffi:chrome124|t": str(time.time()),
+        }
+        monkeypatch.setattr(strategy_stats, "_get_redis", AsyncMock(return_value=client))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_reads_are_cached(self, redis):
+        first = await get_domain_stats("https://example.com/a")
+        second = await get_domain_stats("https://example.com/b")
+        assert second is first
+        assert redis.hgetall.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_outcomes_update_cache_and_write_in_background(self, redis):
+        await get_domain_stats("https://example.com/")
+        record_outcomes_soon(
+            "https://example.com/x",
+            [("curl_cffi:chrome124", False, 0.0), ("chromium", True, 300.0)],
+        )
+        stats = await get_domain_stats("https://example.com/")
+        assert stats["curl_cffi:chrome124"].attempts == pytest.approx(5.0)
+        assert stats["chromium"].buckets[_bucket_index(300.0)] == 1
+
+        await flush_pending_writes()
+        assert redis.run_script.await_count == 1
+        assert redis.hgetall.await_count == 1
+
+
+class TestPlanRace:
+    def test_no_history_starts_everything(self):
+        names = ["a", "b", "c"]
+        primary, backups, delay = plan_race(names, {}, top_k=1)
+        assert primary == names
+        assert backups == []
+        assert delay == 0.0
+
+    def test_ranks_by_expected_time(self):
+        stats = {
+            "slow": _stats(attempts=10, successes=9, bucket=5),  # ~8s
+            "fast": _stats(attempts=10, successes=9, bucket=1),  # ~500ms
+            "flaky": _stats(attempts=10, successes=1, bucket=0),
+        }
+        primary, backups, delay = plan_race(
+            ["slow", "flaky", "fast", "new"], stats, top_k=2
+        )
+        assert primary == ["fast", "flaky"]
+        assert backups == ["slow", "new"]
+        assert delay == pytest.approx(0.5)
+
+    def test_unreliable_leader_hedges_quickly_and_clamps(self):
+        stats = {"a": _stats(attempts=10, successes=2, bucket=6, count=2)}
+        _, backups, delay = plan_race(["a", "b"], stats, top_k=1)
+        assert backups == ["b"]
+        assert delay == LATENCY_BUCKETS_MS[1] / 1000.0
+
+        stats = {"a": _stats(attempts=10, successes=9, bucket=7)}
+        _, _, delay = plan_race(["a", "b"], stats, top_k=1, timeout=4)
+        assert delay == 2.0
+
+    def test_too_few_samples_ignored(self):
+        stats = {"a": _stats(attempts=1, successes=1, bucket=0)}
+        primary, backups, _ = plan_race(["b", "a"], stats, top_k=1)
+        assert primary == ["b", "a"]
+        assert backups == []
+
+
+class TestHedgedRace:
+    @staticmethod
+    async def _fetch(html, delay, calls, name):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return html, 200, {}
+
+    @pytest.mark.asyncio
+    async def test_hedge_not_launched_when_primary_wins(self):
+        calls = []
+        with patch("app.services.scraper.record_outcomes_soon") as record:
+            race = await _race_strategies(
+                [("a", self._fetch("<p>ok</p>", 0.01, calls, "a"))],
+                "https://example.com/",
+                validate_fn=lambda r: bool(r[0]),
+                hedged=[("b", self._fetch("<p>ok</p>", 0.01, calls, "b"))],
+                hedge_delay=1.0,
+                record_stats=True,
+            )
+        assert race.winner_name == "a"
+        assert calls == ["a"]
+        outcomes = record.call_args.args[1]
+        assert [(n, ok) for n, ok, _ in outcomes] == [("a", True)]
+
+    @pytest.mark.asyncio
+    async def test_hedge_launched_after_delay(self):
+        calls = []
+        with patch("app.services.scraper.record_outcomes_soon"):
+            race = await _race_strategies(
+                [("slow", self._fetch("<p>ok</p>", 2.0, calls, "slow"))],
+                "https://example.com/",
+                validate_fn=lambda r: bool(r[0]),
+                hedged=[("backup", self._fetch("<p>ok</p>", 0.01, calls, "backup"))],
+                hedge_delay=0.05,
+            )
+        assert race.winner_name == "backup"
+        assert calls == ["slow", "backup"]
+
+    @pytest.mark.asyncio
+    async def test_hedge_launched_immediately_when_primary_fails(self):
+        calls = []
+        start = time.time()
+        race = await _race_strategies(
+            [("bad", self._fetch("", 0.0, calls, "bad"))],
+            "https://example.com/",
+            validate_fn=lambda r: bool(r[0]),
+            hedged=[("backup", self._fetch("<p>ok</p>", 0.0, calls, "backup"))],
+            hedge_delay=5.0,
+        )
+        assert race.winner_name == "backup"
+        assert time.time() - start < 1.0